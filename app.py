@@ -30,12 +30,23 @@ def parse_arguments():
                        help='Enable debug data insertion (default: enabled if flag not present)')
     parser.add_argument('--no-debug-data', action='store_false', dest='enable_debug_data',
                        help='Disable debug data insertion')
+    parser.add_argument('--rebuild-search-index', action='store_true',
+                       help='Rebuild the full-text search index from the database and exit')
+    parser.add_argument('--no-scheduler', action='store_false', dest='scheduler',
+                       help='Do not start the background scheduler with the web server (default: SCHEDULER_ENABLED)')
     
     return parser.parse_args()
 
 if __name__ == '__main__':
     args = parse_arguments()
     
+    if args.rebuild_search_index:
+        from app.data.core.search_index import rebuild_search_index
+        with app.app_context():
+            counts = rebuild_search_index()
+        logger.info(f"Search index rebuilt: {counts}")
+        sys.exit(0)
+    
     logger.debug("Starting Asset Management System...")
     
     # Determine build phase based on arguments
@@ -104,5 +115,10 @@ if __name__ == '__main__':
         sys.exit(0)
     
     logger.debug("")
+    # Only the web server runs scheduled jobs, never the one-shot build and index commands
+    if args.scheduler and app.config['SCHEDULER_ENABLED']:
+        from app.utils.background_scheduler import init_scheduler
+        init_scheduler(app)
+    
     logger.debug("Access the application at: http://localhost:5000")
     app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
\ No newline at end of file
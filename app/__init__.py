@@ -39,18 +39,86 @@ def create_app():
     base_dir = Path(__file__).parent.parent
     instance_dir = base_dir / 'instance'
     instance_dir.mkdir(parents=True, exist_ok=True)
-    """
     db_env = os.environ.get('DATABASE_URL')
     if db_env:
         app.config['SQLALCHEMY_DATABASE_URI'] = db_env
     else:
         # Use absolute path to avoid relative path issues inside the container
-    """
-    default_db_path = instance_dir / 'asset_management.db'
-    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{str(default_db_path.resolve())}"
+        default_db_path = instance_dir / 'asset_management.db'
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{str(default_db_path.resolve())}"
 
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+    # Number of virtual sequence IDs (detail rows, attachment references) reserved
+    # per database round trip. 1 allocates one ID at a time.
+    app.config['SEQUENCE_BLOCK_SIZE'] = int(os.environ.get('SEQUENCE_BLOCK_SIZE', 1))
+
+    # Opt-in per-request SQL profiling (query counts, N+1 detection, slow query plans)
+    app.config['SQL_INSTRUMENTATION'] = os.environ.get('SQL_INSTRUMENTATION', '0').lower() in ('1', 'true', 'yes')
+    app.config['SQL_N_PLUS_ONE_THRESHOLD'] = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', 10))
+    app.config['SQL_SLOW_QUERY_MS'] = float(os.environ.get('SQL_SLOW_QUERY_MS', 100))
+    app.config['SQL_PROFILE_HISTORY'] = int(os.environ.get('SQL_PROFILE_HISTORY', 50))
+
+    # Seconds before cached dashboard statistics are recomputed even without a write
+    app.config['DASHBOARD_STATS_TTL'] = int(os.environ.get('DASHBOARD_STATS_TTL', 300))
+
+    # Seconds before cached availability reports are recomputed even without a blocker write
+    app.config['AVAILABILITY_STATS_TTL'] = int(os.environ.get('AVAILABILITY_STATS_TTL', 300))
+
+    # Seconds before the cached global inventory summary is recomputed even without an inventory write
+    app.config['GLOBAL_INVENTORY_TTL'] = int(os.environ.get('GLOBAL_INVENTORY_TTL', 300))
+
+    # SQLite FTS5 index for global search and searchbars (falls back to ILIKE when off)
+    app.config['SEARCH_INDEX_ENABLED'] = os.environ.get('SEARCH_INDEX_ENABLED', '1').lower() in ('1', 'true', 'yes')
+
+    # Seconds detail table template configurations stay cached without a template write
+    app.config['DETAIL_CONFIG_CACHE_TTL'] = int(os.environ.get('DETAIL_CONFIG_CACHE_TTL', 300))
+
+    # Worker processes for ParallelPlanExecutor; 1 (default) evaluates plans in-process,
+    # a pool only pays off for many large plans
+    app.config['PLANNING_WORKERS'] = int(os.environ.get('PLANNING_WORKERS', 1))
+
+    # In-process background scheduler, started by the web server (app.py) unless disabled;
+    # only the process holding SCHEDULER_LOCK_FILE runs jobs
+    app.config['SCHEDULER_ENABLED'] = os.environ.get('SCHEDULER_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    app.config['SCHEDULER_WORKERS'] = int(os.environ.get('SCHEDULER_WORKERS', 2))
+    app.config['SCHEDULER_TICK_SECONDS'] = float(os.environ.get('SCHEDULER_TICK_SECONDS', 5))
+    app.config['SCHEDULER_HISTORY_DAYS'] = int(os.environ.get('SCHEDULER_HISTORY_DAYS', 30))
+    app.config['SCHEDULER_LOCK_FILE'] = os.environ.get('SCHEDULER_LOCK_FILE', str(instance_dir / 'scheduler.lock'))
+    # Jobs: name, callable path and a 5-field UTC cron expression or an interval in seconds
+    app.config['SCHEDULER_JOBS'] = [
+        {
+            'name': 'maintenance_planning',
+            'func': 'app.buisness.maintenance.planning.maintenance_planner:MaintenancePlanner.run_scheduled_planning',
+            'cron': os.environ.get('PLANNING_JOB_CRON', '0 * * * *'),
+            'description': 'Plan all active maintenance plans and create the due events',
+        },
+        {
+            'name': 'maintenance_incremental_planning',
+            'func': 'app.buisness.maintenance.planning.maintenance_planner:MaintenancePlanner.run_scheduled_incremental_planning',
+            'cron': os.environ.get('INCREMENTAL_PLANNING_CRON', '*/5 * * * *'),
+            'description': 'Re-evaluate the asset/plan pairs marked dirty and update the due index',
+        },
+        {
+            'name': 'meter_usage_refresh',
+            'func': 'app.buisness.core.meter_usage_forecaster:MeterUsageForecaster.run_scheduled_refresh',
+            'cron': os.environ.get('METER_USAGE_REFRESH_CRON', '15 0 * * *'),
+            'description': 'Refit meter usage rates of assets with new meter history and mark them for re-planning',
+        },
+        {
+            'name': 'inventory_snapshot',
+            'func': 'app.buisness.inventory.stock.inventory_snapshot_manager:InventorySnapshotManager.run_scheduled_snapshot',
+            'cron': os.environ.get('INVENTORY_SNAPSHOT_CRON', '0 0 * * *'),
+            'description': 'Snapshot on-hand quantity and value per bin for point-in-time stock queries',
+        },
+        {
+            'name': 'inventory_reconciliation',
+            'func': 'app.buisness.inventory.stock.inventory_reconciliation_manager:InventoryReconciliationManager.run_scheduled_reconciliation',
+            'cron': os.environ.get('INVENTORY_RECONCILIATION_CRON', '30 1 * * *'),
+            'description': 'Check part inventory summaries against bin totals and the movement ledger, repair drift',
+        },
+    ]
+
     logger.debug(f"Database URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
     
     # Initialize extensions with app
@@ -63,6 +131,14 @@ def create_app():
     
     logger.debug("Extensions initialized")
     
+    from app.data.core.virtual_sequence_generator import VirtualSequenceGenerator
+    VirtualSequenceGenerator.configure_block_allocation(app.config['SEQUENCE_BLOCK_SIZE'])
+    
+    if app.config['SQL_INSTRUMENTATION']:
+        from app.utils.sql_instrumentation import init_sql_instrumentation
+        with app.app_context():
+            init_sql_instrumentation(app, db.engine)
+    
     # Import and register blueprints
     from app.data import core, assets
     
@@ -99,6 +175,8 @@ def create_app():
         from app.data.maintenance.templates.template_actions import TemplateActionItem
         from app.data.maintenance.proto_templates.proto_actions import ProtoActionItem
         from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+        from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
+        from app.data.maintenance.planning.maintenance_due_index import MaintenanceDueIndex
         from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
         from app.data.maintenance.base.actions import Action
         from app.data.maintenance.base.part_demands import PartDemand
@@ -110,6 +188,10 @@ def create_app():
     
     logger.debug("Models imported and registered")
     
+    # Keep the full-text search index in sync with ORM writes
+    from app.data.core.search_index import init_search_index
+    init_search_index(app)
+    
     # Register blueprints
     from app.auth import auth
     from app.presentation.routes import main
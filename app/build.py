@@ -184,6 +184,12 @@ def build_database(build_phase='all', data_phase='all', enable_debug_data=True):
     with app.app_context():
         logger.info(f"Starting database build - Build Phase: {build_phase}, Data Phase: {data_phase}")
         
+        # A new (empty) search index must be filled from the existing rows
+        search_index_enabled = app.config['SEARCH_INDEX_ENABLED']
+        if search_index_enabled:
+            from app.data.core.search_index import search_index_tables_exist
+            search_index_missing = not search_index_tables_exist()
+        
         # Build models based on phase
         if build_phase != 'none':
             build_models(build_phase)
@@ -219,7 +225,8 @@ def build_database(build_phase='all', data_phase='all', enable_debug_data=True):
             create_system_initialization_event(system_user_id, force_create=True)
         
         # Insert debug data (if enabled and not --build-only)
-        if enable_debug_data and data_phase != 'none':
+        debug_data_inserted = enable_debug_data and data_phase != 'none'
+        if debug_data_inserted:
             try:
                 from app.debug.debug_data_manager import insert_debug_data
                 logger.info("Inserting debug data...")
@@ -228,6 +235,12 @@ def build_database(build_phase='all', data_phase='all', enable_debug_data=True):
                 logger.error(f"Debug data insertion failed: {e}")
                 raise
         
+        # Re-index after a data build (it writes rows outside the ORM) or when the
+        # index tables were just created; otherwise the mapper hooks keep it current
+        if search_index_enabled and (debug_data_inserted or search_index_missing):
+            from app.data.core.search_index import rebuild_search_index
+            rebuild_search_index()
+        
         logger.info("Database build completed successfully")
 
 def build_models(phase):
@@ -272,6 +285,34 @@ def build_models(phase):
     # Create all tables
     db.create_all()
     logger.info("All database tables created")
+    
+    # create_all() skips indexes on tables that already existed
+    create_missing_indexes()
+    
+    # Full-text search index (FTS5 virtual tables are not part of the metadata)
+    from app.data.core.search_index import create_search_index_tables
+    create_search_index_tables()
+
+def create_missing_indexes():
+    """
+    Create model indexes that are missing from existing tables
+    
+    db.create_all() only creates indexes together with a new table, so
+    indexes added to a model later never reach an existing database.
+    Each index is created with CREATE INDEX IF NOT EXISTS, which is a
+    no-op for indexes that are already present.
+    """
+    from sqlalchemy import inspect
+    from sqlalchemy.schema import CreateIndex
+    
+    existing_tables = set(inspect(db.engine).get_table_names())
+    with db.engine.begin() as connection:
+        for table in db.metadata.tables.values():
+            if table.name not in existing_tables:
+                continue
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+    logger.info("Model indexes verified")
 
 # insert_data() function has been removed
 # All data insertion is now handled by:
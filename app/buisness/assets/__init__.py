@@ -19,10 +19,14 @@ from app.buisness.core.make_model_context import MakeModelContext as CoreMakeMod
 # Import and register the enhanced factories
 from app.buisness.assets.factories.asset_factory import AssetDetailsFactory
 from app.buisness.assets.factories.make_model_factory import MakeModelFactory
+from app.buisness.assets.factories.detail_factory import DetailFactory
 from app.logger import get_logger
 
 logger = get_logger("asset_management.buisness.assets")
 
+# Resolve detail table classes once instead of importing on every lookup
+DetailFactory.resolve_registry()
+
 # Register factory with type-aware guard (prevents duplicate registration)
 # This replaces the core factory with the details factory, enabling detail creation
 # NOTE: We register on CoreAssetContext (the actual class), not the alias below
@@ -3,6 +3,10 @@ Asset Details Context
 Extends AssetContext with detail table management functionality.
 
 Focus: Managing detail relationships (asset_details and model_details)
+
+List and report pages that need details for many assets should use
+AssetDetailsContext.load_many(), which preloads every context's detail
+structs with one query per detail table.
 """
 
 from typing import List, Dict, Any, Optional, Union
@@ -54,6 +58,51 @@ class AssetDetailsContext(AssetContext):
             self._asset_details_struct = AssetDetailsStruct(self._asset_id)
         return self._asset_details_struct
     
+    @property
+    def model_details_struct(self) -> Optional[ModelDetailsStruct]:
+        """
+        Get the structured model details for this asset's make_model.
+        
+        Returns:
+            ModelDetailsStruct instance, or None if the asset has no make_model
+        """
+        if self._model_details_struct is None and self._asset.make_model_id:
+            self._model_details_struct = ModelDetailsStruct(self._asset.make_model_id)
+        return self._model_details_struct
+    
+    @classmethod
+    def load_many(cls, assets: List[Union[Asset, int]]) -> List['AssetDetailsContext']:
+        """
+        Build contexts for many assets with their detail structs preloaded.
+        
+        Loads asset details with one IN query per asset detail table and model
+        details with one IN query per model detail table. Assets sharing a
+        make_model share the same ModelDetailsStruct.
+        
+        Args:
+            assets: Asset instances or asset IDs
+            
+        Returns:
+            List of AssetDetailsContext in the order given (unknown asset IDs are skipped)
+        """
+        asset_ids = [asset for asset in assets if isinstance(asset, int)]
+        loaded = {}
+        if asset_ids:
+            loaded = {asset.id: asset for asset in Asset.query.filter(Asset.id.in_(asset_ids)).all()}
+        assets = [loaded.get(asset) if isinstance(asset, int) else asset for asset in assets]
+        assets = [asset for asset in assets if asset is not None]
+        
+        asset_structs = AssetDetailsStruct.load_many(asset.id for asset in assets)
+        model_structs = ModelDetailsStruct.load_many(asset.make_model_id for asset in assets)
+        
+        contexts = []
+        for asset in assets:
+            context = cls(asset)
+            context._asset_details_struct = asset_structs[asset.id]
+            context._model_details_struct = model_structs.get(asset.make_model_id)
+            contexts.append(context)
+        return contexts
+    
     @property
     def asset_details(self) -> List[Dict[str, Any]]:
         """
@@ -107,7 +156,7 @@ class AssetDetailsContext(AssetContext):
         if self._model_details is None:
             if self._asset.make_model_id:
                 # Use struct internally, convert to list format for backward compatibility
-                struct = ModelDetailsStruct(self._asset.make_model_id)
+                struct = self.model_details_struct
                 details_dict = struct.asdict()
                 
                 self._model_details = []
@@ -203,7 +252,7 @@ class AssetDetailsContext(AssetContext):
         if not self._asset.make_model_id:
             return {}
         
-        struct = ModelDetailsStruct(self._asset.make_model_id)
+        struct = self.model_details_struct
         details_dict = struct.asdict()
         
         details_by_type = {}
@@ -231,7 +280,7 @@ class AssetDetailsContext(AssetContext):
         
         model_detail_count = 0
         if self._asset.make_model_id:
-            model_struct = ModelDetailsStruct(self._asset.make_model_id)
+            model_struct = self.model_details_struct
             # Model details are single objects (not lists), so count non-None values
             model_detail_count = sum(1 for record in model_struct.asdict().values() if record is not None)
         
@@ -4,9 +4,12 @@ Structured class that aggregates all asset detail records for a given asset.
 
 Takes an asset_id and retrieves all records of each detail type.
 Returns lists for all detail types to support many_to_one relationships.
+
+For pages that show details for many assets, AssetDetailsStruct.load_many()
+builds structs for a list of assets with one IN query per detail table.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 from app.data.assets.asset_type_details import (
     PurchaseInfo,
     VehicleRegistration,
@@ -23,7 +26,18 @@ class AssetDetailsStruct:
     Returns lists for all detail types to support many_to_one relationships.
     """
     
-    def __init__(self, asset_id: int):
+    # Attribute name and model of each detail type
+    DETAIL_TYPES = (
+        ('purchase_info', PurchaseInfo),
+        ('vehicle_registration', VehicleRegistration),
+        ('toyota_warranty_receipt', ToyotaWarrantyReceipt),
+        ('smog_record', SmogRecord),
+    )
+    
+    # Maximum number of IDs per IN (...) clause in load_many
+    BATCH_SIZE = 500
+    
+    def __init__(self, asset_id: int, records: Optional[Dict[str, List]] = None):
         """
         Initialize AssetDetailsStruct with an asset_id.
         
@@ -31,25 +45,51 @@ class AssetDetailsStruct:
         
         Args:
             asset_id: The ID of the asset to load details for
+            records: Already loaded records keyed by attribute name (used by
+                     load_many; skips the per-type queries)
         """
         self.asset_id = asset_id
         
-        # Load each detail type (returns lists to support many_to_one)
-        self.purchase_info: List[PurchaseInfo] = PurchaseInfo.query.filter_by(
-            asset_id=asset_id
-        ).all()
+        if records is None:
+            # Load each detail type (returns lists to support many_to_one)
+            records = {
+                attribute: model.query.filter_by(asset_id=asset_id).all()
+                for attribute, model in self.DETAIL_TYPES
+            }
+        
+        self.purchase_info: List[PurchaseInfo] = records.get('purchase_info', [])
+        self.vehicle_registration: List[VehicleRegistration] = records.get('vehicle_registration', [])
+        self.toyota_warranty_receipt: List[ToyotaWarrantyReceipt] = records.get('toyota_warranty_receipt', [])
+        self.smog_record: List[SmogRecord] = records.get('smog_record', [])
+    
+    @classmethod
+    def load_many(cls, asset_ids: Iterable[int]) -> Dict[int, 'AssetDetailsStruct']:
+        """
+        Build structs for many assets at once.
         
-        self.vehicle_registration: List[VehicleRegistration] = VehicleRegistration.query.filter_by(
-            asset_id=asset_id
-        ).all()
+        Runs one IN (...) query per detail table (per BATCH_SIZE assets)
+        instead of one query per detail table per asset.
+        
+        Args:
+            asset_ids: IDs of the assets to load details for
+            
+        Returns:
+            Dictionary mapping asset_id to its AssetDetailsStruct (every
+            requested asset is present, with empty lists if it has no details)
+        """
+        asset_ids = list(dict.fromkeys(asset_ids))
+        records = {
+            asset_id: {attribute: [] for attribute, _ in cls.DETAIL_TYPES}
+            for asset_id in asset_ids
+        }
         
-        self.toyota_warranty_receipt: List[ToyotaWarrantyReceipt] = ToyotaWarrantyReceipt.query.filter_by(
-            asset_id=asset_id
-        ).all()
+        for attribute, model in cls.DETAIL_TYPES:
+            for start in range(0, len(asset_ids), cls.BATCH_SIZE):
+                batch = asset_ids[start:start + cls.BATCH_SIZE]
+                for record in model.query.filter(model.asset_id.in_(batch)).order_by(model.id):
+                    records[record.asset_id][attribute].append(record)
         
-        self.smog_record: List[SmogRecord] = SmogRecord.query.filter_by(
-            asset_id=asset_id
-        ).all()
+        return {asset_id: cls(asset_id, records[asset_id]) for asset_id in asset_ids}
     
     def asdict(self) -> Dict[str, Any]:
         """
@@ -4,6 +4,8 @@ Asset Detail Factory
 Factory class for creating asset detail table rows
 """
 
+from collections import defaultdict
+from sqlalchemy import insert
 from .detail_factory import DetailFactory
 from app.logger import get_logger
 from app import db
@@ -15,6 +17,40 @@ class AssetDetailFactory(DetailFactory):
     Factory class for creating asset detail table rows
     """
     
+    @classmethod
+    def get_asset_type_configs(cls, asset_type_id):
+        """
+        Get the (cached) detail table configurations for an asset type
+        
+        Args:
+            asset_type_id (int): The asset type ID
+            
+        Returns:
+            list: DetailConfig tuples, including configurations for all asset types
+        """
+        from app.data.assets.detail_table_templates.asset_details_from_asset_type import AssetDetailTemplateByAssetType
+        return cls.get_cached_configs(
+            ('asset_type', asset_type_id),
+            lambda: AssetDetailTemplateByAssetType.get_detail_table_types_for_asset_type(asset_type_id)
+        )
+    
+    @classmethod
+    def get_model_type_configs(cls, make_model_id):
+        """
+        Get the (cached) detail table configurations for a make model
+        
+        Args:
+            make_model_id (int): The make model ID
+            
+        Returns:
+            list: DetailConfig tuples
+        """
+        from app.data.assets.detail_table_templates.asset_details_from_model_type import AssetDetailTemplateByModelType
+        return cls.get_cached_configs(
+            ('model_type', make_model_id),
+            lambda: AssetDetailTemplateByModelType.get_detail_table_types_for_model_type(make_model_id)
+        )
+    
     @classmethod
     def create_detail_table_rows(cls, asset):
         """
@@ -64,10 +100,8 @@ class AssetDetailFactory(DetailFactory):
             event_id (int, optional): The asset creation event ID
         """
         try:
-            from app.data.assets.detail_table_templates.asset_details_from_asset_type import AssetDetailTemplateByAssetType
-            
             # Get all detail table configurations for this asset type
-            detail_configs = AssetDetailTemplateByAssetType.get_detail_table_types_for_asset_type(asset_type_id)
+            detail_configs = cls.get_asset_type_configs(asset_type_id)
             logger.debug(f"Found {len(detail_configs)} asset type detail configurations")
 
             for config in detail_configs:
@@ -94,10 +128,8 @@ class AssetDetailFactory(DetailFactory):
             event_id (int, optional): The asset creation event ID
         """
         try:
-            from app.data.assets.detail_table_templates.asset_details_from_model_type import AssetDetailTemplateByModelType
-            
             # Get all detail table configurations for this model type
-            detail_configs = AssetDetailTemplateByModelType.get_detail_table_types_for_model_type(make_model_id)
+            detail_configs = cls.get_model_type_configs(make_model_id)
             logger.debug(f"Found {len(detail_configs)} model type detail configurations")
 
             for config in detail_configs:
@@ -112,4 +144,106 @@ class AssetDetailFactory(DetailFactory):
                 
         except Exception as e:
             logger.debug(f"Error creating model type detail rows for asset {asset.id}: {e}")
-
+    
+    @classmethod
+    def create_detail_table_rows_bulk(cls, assets, event_ids=None):
+        """
+        Create the configured detail rows for many new assets at once
+        
+        Produces the same rows as calling create_detail_table_rows for each
+        asset in order, but with one query for the creation events, one
+        existence check and one executemany INSERT per detail table, and a
+        single sequence allocation for all global detail IDs.
+        
+        Args:
+            assets (list): Flushed Asset objects
+            event_ids (dict, optional): asset_id -> creation event ID. Looked
+                up from the 'Asset Created' events when not given.
+                
+        Returns:
+            dict: Detail table type -> number of rows created
+        """
+        from app.data.core.event_info.event import Event
+        from app.data.core.sequences import AssetDetailIDManager
+        
+        assets = [asset for asset in assets if asset is not None]
+        if not assets:
+            return {}
+        asset_ids = [asset.id for asset in assets]
+        
+        if event_ids is None:
+            event_ids = {}
+            creation_events = (
+                db.session.query(Event.asset_id, Event.id)
+                .filter(Event.asset_id.in_(asset_ids), Event.event_type == 'Asset Created')
+                .order_by(Event.timestamp.asc(), Event.id.asc())
+            )
+            for asset_id, event_id in creation_events:
+                event_ids.setdefault(asset_id, event_id)
+        
+        # Resolve configurations per asset (asset type configs, then model type configs)
+        configs_by_asset = {}
+        for asset in assets:
+            configs = []
+            if asset.asset_type_id:
+                configs.extend(cls.get_asset_type_configs(asset.asset_type_id))
+            if asset.make_model_id:
+                configs.extend(cls.get_model_type_configs(asset.make_model_id))
+            configs_by_asset[asset.id] = configs
+        
+        # One existence check per table for single-row (many_to_one=False) types
+        existing = set()
+        single_row_types = {
+            config.detail_table_type
+            for configs in configs_by_asset.values() for config in configs
+            if not config.many_to_one
+        }
+        for table_type in single_row_types:
+            try:
+                detail_table_class = cls.get_detail_table_class(table_type)
+            except (ValueError, ImportError, AttributeError) as e:
+                logger.warning(f"Skipping detail table '{table_type}': {e}")
+                continue
+            rows = (
+                db.session.query(detail_table_class.asset_id)
+                .filter(detail_table_class.asset_id.in_(asset_ids))
+                .distinct()
+            )
+            existing.update((table_type, asset_id) for (asset_id,) in rows)
+        
+        # Plan rows in the same order the per-asset path would create them
+        planned = []
+        for asset in assets:
+            for config in configs_by_asset[asset.id]:
+                table_type = config.detail_table_type
+                entry = cls.DETAIL_TABLE_REGISTRY.get(table_type)
+                if not entry or not entry['is_asset_detail']:
+                    logger.warning(f"No asset detail table registry entry found for '{table_type}'")
+                    continue
+                if not config.many_to_one and (table_type, asset.id) in existing:
+                    logger.debug(f"Asset detail row already exists for asset {asset.id}, skipping")
+                    continue
+                existing.add((table_type, asset.id))
+                planned.append((table_type, asset.id))
+        
+        if not planned:
+            return {}
+        
+        # Global IDs follow the planned order across all tables
+        rows_by_table = defaultdict(list)
+        global_ids = AssetDetailIDManager.get_next_ids(len(planned))
+        for (table_type, asset_id), global_id in zip(planned, global_ids):
+            rows_by_table[table_type].append({
+                'asset_id': asset_id,
+                'all_asset_detail_id': global_id,
+                'event_id': event_ids.get(asset_id),
+            })
+        
+        counts = {}
+        for table_type, rows in rows_by_table.items():
+            detail_table_class = cls.get_detail_table_class(table_type)
+            db.session.execute(insert(detail_table_class), rows)
+            counts[table_type] = len(rows)
+        
+        logger.debug(f"Bulk created detail rows for {len(assets)} assets: {counts}")
+        return counts
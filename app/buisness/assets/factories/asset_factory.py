@@ -6,7 +6,7 @@ This factory extends CoreAssetFactory to provide detail table creation
 functionality. It delegates to AssetDetailFactory for the actual detail creation.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.buisness.core.factories.core_asset_factory import CoreAssetFactory
 from app.data.core.asset_info.asset import Asset
 from app.logger import get_logger
@@ -79,6 +79,48 @@ class AssetDetailsFactory(CoreAssetFactory):
         
         return asset, created
     
+    def create_assets(
+        self,
+        assets_data: List[Dict[str, Any]],
+        created_by_id: Optional[int] = None,
+        commit: bool = True,
+        enable_detail_insertion: bool = True
+    ) -> List[Asset]:
+        """
+        Create several assets, then all of their detail rows in one batch
+        
+        Assets and creation events are created as in create_asset; detail rows
+        for the whole batch go through AssetDetailFactory.create_detail_table_rows_bulk
+        (one INSERT per detail table) instead of row by row per asset.
+        """
+        assets = [
+            super(AssetDetailsFactory, self).create_asset(
+                created_by_id=created_by_id,
+                commit=False,
+                enable_detail_insertion=False,
+                **asset_data
+            )
+            for asset_data in assets_data
+        ]
+        
+        if enable_detail_insertion and assets:
+            from app import db
+            from app.buisness.assets.factories.asset_detail_factory import AssetDetailFactory
+            # Creation events are still pending; flush so they can be linked
+            db.session.flush()
+            try:
+                AssetDetailFactory.create_detail_table_rows_bulk(assets)
+            except Exception as e:
+                logger.warning(f"Could not create detail rows for {len(assets)} assets: {e}")
+                # Don't fail asset creation if detail creation fails
+        
+        if commit:
+            from app import db
+            db.session.commit()
+            logger.info(f"{len(assets)} assets with details created")
+        
+        return assets
+    
     def _create_detail_rows(self, asset: Asset):
         """
         Create detail table rows for asset
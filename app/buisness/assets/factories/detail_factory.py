@@ -2,15 +2,32 @@
 """
 Base Detail Factory
 Abstract base class for creating detail table rows
+
+Detail table classes are resolved from the registry once and cached.
+Template configurations (which detail tables an asset type / make model gets)
+are cached per asset_type_id / make_model_id and dropped when a template row
+is committed, with DETAIL_CONFIG_CACHE_TTL seconds as fallback for changes
+made by other processes.
 """
 
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import namedtuple
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 from app.logger import get_logger
 from app import db
-from pathlib import Path
 
 logger = get_logger("asset_management.domain.assets.factories")
 
+# Detached copy of a template configuration row
+DetailConfig = namedtuple('DetailConfig', ['detail_table_type', 'many_to_one'])
+
+# Session.info key set when template rows are flushed and consumed on commit
+_CONFIG_DIRTY_FLAG = 'detail_config_dirty'
+
 class DetailFactory(ABC):
     """
     Abstract base class for detail table row creation
@@ -52,6 +69,30 @@ class DetailFactory(ABC):
         }
     }
     
+    DEFAULT_CONFIG_CACHE_TTL = 300
+    
+    # Resolved classes, filled by resolve_registry() / on first lookup
+    _resolved_classes = {}
+    
+    # Cache key -> (expires_at, list of DetailConfig)
+    _config_cache = {}
+    _config_lock = threading.Lock()
+    
+    @classmethod
+    def resolve_registry(cls):
+        """
+        Import every registered detail table class once
+        
+        Called when the assets module is loaded so later lookups are plain
+        dictionary reads. Entries that fail to import are logged and retried
+        on the next lookup.
+        """
+        for table_type in DetailFactory.DETAIL_TABLE_REGISTRY:
+            try:
+                cls.get_detail_table_class(table_type)
+            except (ImportError, AttributeError) as e:
+                logger.warning(f"Could not resolve detail table '{table_type}': {e}")
+    
     @classmethod
     def get_detail_table_class(cls, table_type):
         """
@@ -66,6 +107,10 @@ class DetailFactory(ABC):
         Raises:
             ValueError: If the table type is not found in the registry
         """
+        detail_table_class = DetailFactory._resolved_classes.get(table_type)
+        if detail_table_class is not None:
+            return detail_table_class
+        
         if table_type not in cls.DETAIL_TABLE_REGISTRY:
             raise ValueError(f"Unknown detail table type: {table_type}")
         
@@ -75,7 +120,48 @@ class DetailFactory(ABC):
         
         # Import the module and get the class
         module = __import__(module_path, fromlist=[class_name])
-        return getattr(module, class_name)
+        detail_table_class = getattr(module, class_name)
+        DetailFactory._resolved_classes[table_type] = detail_table_class
+        return detail_table_class
+    
+    @classmethod
+    def get_cached_configs(cls, cache_key, loader):
+        """
+        Get template configurations through the shared configuration cache
+        
+        Args:
+            cache_key (tuple): Cache key, e.g. ('asset_type', asset_type_id)
+            loader (callable): Returns the template rows on a cache miss
+            
+        Returns:
+            list: DetailConfig tuples (safe to use outside the session)
+        """
+        now = time.monotonic()
+        with DetailFactory._config_lock:
+            cached = DetailFactory._config_cache.get(cache_key)
+            if cached is not None and now < cached[0]:
+                return cached[1]
+        
+        configs = [
+            DetailConfig(config.detail_table_type, bool(getattr(config, 'many_to_one', False)))
+            for config in loader()
+        ]
+        with DetailFactory._config_lock:
+            DetailFactory._config_cache[cache_key] = (now + cls._get_config_cache_ttl(), configs)
+        return configs
+    
+    @classmethod
+    def invalidate_config_cache(cls):
+        """Drop all cached template configurations"""
+        with DetailFactory._config_lock:
+            DetailFactory._config_cache.clear()
+        logger.debug("Detail configuration cache invalidated")
+    
+    @classmethod
+    def _get_config_cache_ttl(cls):
+        if has_app_context():
+            return current_app.config.get('DETAIL_CONFIG_CACHE_TTL', cls.DEFAULT_CONFIG_CACHE_TTL)
+        return cls.DEFAULT_CONFIG_CACHE_TTL
     
     @classmethod
     def is_asset_detail(cls, table_type):
@@ -118,10 +204,7 @@ class DetailFactory(ABC):
                 logger.warning(f"No detail table registry entry found for '{detail_table_type}'")
                 return False
             
-            # Import the detail table class
-            module_path, class_name = detail_table_class_path['module_path'], detail_table_class_path['class_name']
-            module = __import__(module_path, fromlist=[class_name])
-            detail_table_class = getattr(module, class_name)
+            detail_table_class = cls.get_detail_table_class(detail_table_type)
             
             # Check if row already exists (only for non-many_to_one types)
             # If many_to_one is True, always create (allow multiple records)
@@ -164,3 +247,34 @@ class DetailFactory(ABC):
         """
         pass
 
+
+def _register_config_invalidation():
+    """Invalidate the configuration cache when template rows change"""
+    from app.data.assets.detail_table_templates.asset_details_from_asset_type import AssetDetailTemplateByAssetType
+    from app.data.assets.detail_table_templates.asset_details_from_model_type import AssetDetailTemplateByModelType
+    from app.data.assets.detail_table_templates.model_detail_table_template import ModelDetailTableTemplate
+    
+    def mark_dirty(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info[_CONFIG_DIRTY_FLAG] = True
+        # Also drop it now so this transaction sees its own changes
+        DetailFactory.invalidate_config_cache()
+    
+    for model in (AssetDetailTemplateByAssetType, AssetDetailTemplateByModelType, ModelDetailTableTemplate):
+        for event_name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, event_name, mark_dirty)
+    
+    @event.listens_for(Session, 'after_commit')
+    def _invalidate_detail_configs_after_commit(session):
+        if session.info.pop(_CONFIG_DIRTY_FLAG, False):
+            DetailFactory.invalidate_config_cache()
+    
+    @event.listens_for(Session, 'after_soft_rollback')
+    def _invalidate_detail_configs_after_rollback(session, previous_transaction):
+        # Configurations read during the rolled back transaction may be cached
+        if not session.in_transaction() and session.info.pop(_CONFIG_DIRTY_FLAG, False):
+            DetailFactory.invalidate_config_cache()
+
+
+_register_config_invalidation()
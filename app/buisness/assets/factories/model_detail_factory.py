@@ -52,7 +52,10 @@ class ModelDetailFactory(DetailFactory):
                 logger.warning(f"Model {model_id} not found")
             
             # Get all detail table configurations for this model
-            detail_configs = ModelDetailTableTemplate.get_detail_table_types_for_model(asset_type_id)
+            detail_configs = cls.get_cached_configs(
+                ('model_template', asset_type_id),
+                lambda: ModelDetailTableTemplate.get_detail_table_types_for_model(asset_type_id)
+            )
             
             for config in detail_configs:
                 cls._create_single_detail_row(
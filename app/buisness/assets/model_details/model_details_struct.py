@@ -4,9 +4,13 @@ Structured class that aggregates all model detail records for a given make/model
 
 Takes a make_model_id and retrieves the top one of each detail type
 (expects only one of each type per model).
+
+For pages that show details for many assets, ModelDetailsStruct.load_many()
+builds one struct per distinct make/model with one IN query per detail table,
+so assets that share a make/model share its details.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from app.data.assets.model_details import (
     ModelInfo,
     EmissionsInfo
@@ -21,7 +25,16 @@ class ModelDetailsStruct:
     Assumes there is only one record of each detail type per make/model.
     """
     
-    def __init__(self, make_model_id: int):
+    # Attribute name and model of each detail type
+    DETAIL_TYPES = (
+        ('model_info', ModelInfo),
+        ('emissions_info', EmissionsInfo),
+    )
+    
+    # Maximum number of IDs per IN (...) clause in load_many
+    BATCH_SIZE = 500
+    
+    def __init__(self, make_model_id: int, records: Optional[Dict[str, Any]] = None):
         """
         Initialize ModelDetailsStruct with a make_model_id.
         
@@ -29,17 +42,51 @@ class ModelDetailsStruct:
         
         Args:
             make_model_id: The ID of the make/model to load details for
+            records: Already loaded records keyed by attribute name (used by
+                     load_many; skips the per-type queries)
         """
         self.make_model_id = make_model_id
         
-        # Load each detail type (expecting only one of each)
-        self.model_info: Optional[ModelInfo] = ModelInfo.query.filter_by(
-            make_model_id=make_model_id
-        ).first()
+        if records is None:
+            # Load each detail type (expecting only one of each)
+            records = {
+                attribute: model.query.filter_by(make_model_id=make_model_id).first()
+                for attribute, model in self.DETAIL_TYPES
+            }
+        
+        self.model_info: Optional[ModelInfo] = records.get('model_info')
+        self.emissions_info: Optional[EmissionsInfo] = records.get('emissions_info')
+    
+    @classmethod
+    def load_many(cls, make_model_ids: Iterable[int]) -> Dict[int, 'ModelDetailsStruct']:
+        """
+        Build structs for many make/models at once.
+        
+        Duplicate IDs are loaded once, so passing the make_model_id of every
+        asset on a page returns one shared struct per make/model. Runs one
+        IN (...) query per detail table (per BATCH_SIZE make/models).
+        
+        Args:
+            make_model_ids: IDs of the make/models to load details for (None is skipped)
+            
+        Returns:
+            Dictionary mapping make_model_id to its ModelDetailsStruct
+        """
+        make_model_ids = [make_model_id for make_model_id in dict.fromkeys(make_model_ids) if make_model_id is not None]
+        records = {
+            make_model_id: {attribute: None for attribute, _ in cls.DETAIL_TYPES}
+            for make_model_id in make_model_ids
+        }
+        
+        for attribute, model in cls.DETAIL_TYPES:
+            for start in range(0, len(make_model_ids), cls.BATCH_SIZE):
+                batch = make_model_ids[start:start + cls.BATCH_SIZE]
+                # Lowest id first, so the kept record matches the single-model .first()
+                for record in model.query.filter(model.make_model_id.in_(batch)).order_by(model.id):
+                    if records[record.make_model_id][attribute] is None:
+                        records[record.make_model_id][attribute] = record
         
-        self.emissions_info: Optional[EmissionsInfo] = EmissionsInfo.query.filter_by(
-            make_model_id=make_model_id
-        ).first()
+        return {make_model_id: cls(make_model_id, records[make_model_id]) for make_model_id in make_model_ids}
     
     def asdict(self) -> Dict[str, Any]:
         """
@@ -62,7 +62,7 @@ class AssetContext:
     # Static factory attribute - can be replaced by feature modules
     # Almost all of the time, this will be AssetDetailsFactory (set when assets module is imported)
     # If assets module is not imported, this will be CoreAssetFactory (created on first use)
-    asset_factory: AssetFactoryBase = None
+    asset_factory: "AssetFactoryBase" = None
     
     def __init__(self, asset: Union[Asset, int]):
         """
@@ -199,6 +199,38 @@ class AssetContext:
         cls._check_asset_factory()
         asset, created = cls.asset_factory.create_asset_from_dict(asset_data, created_by_id=created_by_id, commit=commit, lookup_fields=lookup_fields)
         return cls(asset)
+
+    @classmethod
+    def create_many(
+        cls,
+        assets_data: List[Dict[str, Any]],
+        created_by_id: Optional[int] = None,
+        commit: bool = True,
+        enable_detail_insertion: bool = True
+    ) -> List['AssetContext']:
+        """
+        Create several assets in one transaction.
+
+        With AssetDetailsFactory the detail rows of the whole batch are
+        created together (one insert per detail table).
+
+        Args:
+            assets_data: List of asset field dictionaries (as for create())
+            created_by_id: ID of the user creating the assets
+            commit: Whether to commit the transaction
+            enable_detail_insertion: Whether to create detail rows
+
+        Returns:
+            List of AssetContext instances, in the same order as assets_data
+        """
+        cls._check_asset_factory()
+        assets = cls.asset_factory.create_assets(
+            assets_data,
+            created_by_id=created_by_id,
+            commit=commit,
+            enable_detail_insertion=enable_detail_insertion
+        )
+        return [cls(asset) for asset in assets]
         
     
     @classmethod
@@ -298,6 +330,14 @@ class AssetContext:
         if updated_by_id:
             self._asset.updated_by_id = updated_by_id
         
+        # Meter-based maintenance plans must re-evaluate this asset
+        try:
+            from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
+            PlanningDirtyMark.mark(asset_id=self._asset_id, reason='meters updated')
+        except ImportError:
+            # Maintenance module may be unavailable during certain phases
+            pass
+        
         if commit:
             db.session.commit()
         
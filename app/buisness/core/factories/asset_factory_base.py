@@ -7,7 +7,7 @@ swapped at runtime while maintaining a consistent API.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.data.core.asset_info.asset import Asset
 
 
@@ -58,6 +58,42 @@ class AssetFactoryBase(ABC):
         """
         pass
     
+    def create_assets(
+        self,
+        assets_data: List[Dict[str, Any]],
+        created_by_id: Optional[int] = None,
+        commit: bool = True,
+        enable_detail_insertion: bool = True
+    ) -> List[Asset]:
+        """
+        Create several assets in one transaction
+        
+        Default implementation calls create_asset for each entry; factories
+        may override it to batch the work.
+        
+        Args:
+            assets_data: List of asset field dictionaries (as for create_asset)
+            created_by_id: ID of the user creating the assets
+            commit: Whether to commit the transaction
+            enable_detail_insertion: Whether to create detail rows (may be ignored by basic factory)
+            
+        Returns:
+            list: The created assets, in the same order as assets_data
+        """
+        from app import db
+        assets = [
+            self.create_asset(
+                created_by_id=created_by_id,
+                commit=False,
+                enable_detail_insertion=enable_detail_insertion,
+                **asset_data
+            )
+            for asset_data in assets_data
+        ]
+        if commit:
+            db.session.commit()
+        return assets
+    
     def get_factory_type(self) -> str:
         """
         Get the factory type identifier
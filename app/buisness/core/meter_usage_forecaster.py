@@ -0,0 +1,335 @@
+"""
+Meter Usage Forecaster
+Fits asset meter usage rates from MeterHistory and projects when a meter
+will reach a target value.
+
+- Rates are robust linear fits (Theil-Sen: the median of the slopes between
+  every pair of readings) over the asset's recent readings, with Sen's
+  confidence band on the slope. Outlier readings and irregular intervals
+  barely move the median.
+- Only readings since the last meter reset (a drop that is not a single
+  outlier reading) count, within WINDOW_DAYS of the newest reading and at
+  most MAX_READINGS of them.
+- Fits are cached in MeterUsageRate, one row per asset meter, and refitted
+  only for assets with readings newer than the cached fit. The pairwise
+  slopes of a series are computed over NumPy arrays.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, insert, or_, select
+
+from app import db
+from app.data.core.asset_info.meter_history import MeterHistory
+from app.data.core.asset_info.meter_usage_rates import MeterUsageRate
+from app.logger import get_logger
+
+logger = get_logger("asset_management.business.core.meter_usage")
+
+METER_FIELDS = ('meter1', 'meter2', 'meter3', 'meter4')
+
+
+@dataclass
+class UsageForecast:
+    """Projected date at which an asset meter reaches a target value"""
+    meter_field: str
+    target_meter: float
+    remaining_units: float
+    rate_per_day: float
+    due_date: datetime
+    earliest_due_date: datetime
+    latest_due_date: Optional[datetime] = None  # None: the band's low rate never gets there
+
+
+class MeterUsageForecaster:
+    """
+    Fits, caches and applies meter usage rates.
+
+    Usage:
+        forecaster = MeterUsageForecaster()
+        forecaster.refresh([asset_id])
+        rate = forecaster.get_rates([asset_id], 'meter1').get(asset_id)
+        forecast = forecaster.forecast(rate, current_meter, target_meter)
+    """
+
+    # Readings older than this (relative to the newest one) are ignored
+    WINDOW_DAYS = 180
+
+    # Fewer readings than this give no rate
+    MIN_READINGS = 3
+
+    # Newest readings per asset used for a fit (pairwise slopes grow quadratically)
+    MAX_READINGS = 60
+
+    # Two-sided z value of the confidence band (90%)
+    CONFIDENCE_Z = 1.645
+
+    # Forecasts further out than this are not made
+    MAX_FORECAST_DAYS = 3650
+
+    # Assets per readings query
+    REFRESH_CHUNK_SIZE = 500
+
+    def refresh(self, asset_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Refit the cached rates of assets that have readings newer than their fit.
+
+        Writes to the current session without committing.
+
+        Args:
+            asset_ids: Assets to check (default: every asset with meter history)
+
+        Returns:
+            IDs of the refitted assets
+        """
+        latest_ids = self._find_stale_asset_ids(asset_ids)
+        stale_asset_ids = list(latest_ids)
+        fitted_at = datetime.utcnow()
+        for start in range(0, len(stale_asset_ids), self.REFRESH_CHUNK_SIZE):
+            chunk = stale_asset_ids[start:start + self.REFRESH_CHUNK_SIZE]
+            rows = []
+            for asset_id, readings in self._load_readings(chunk).items():
+                for meter_field in METER_FIELDS:
+                    rows.append(self._fit_row(asset_id, meter_field, readings, latest_ids[asset_id], fitted_at))
+            db.session.execute(delete(MeterUsageRate).where(MeterUsageRate.asset_id.in_(chunk)))
+            if rows:
+                db.session.execute(insert(MeterUsageRate), rows)
+
+        if stale_asset_ids:
+            logger.debug(f"Refitted meter usage rates for {len(stale_asset_ids)} assets")
+        return stale_asset_ids
+
+    @classmethod
+    def run_scheduled_refresh(cls) -> Dict[str, int]:
+        """
+        Background scheduler job: refit every asset with new meter history.
+
+        Meter updates refit their asset on the next incremental planning
+        run; this catches readings recorded any other way (imports, bulk
+        loads). Refitted assets are marked dirty so that run re-plans them.
+
+        Returns:
+            Summary counts, stored in the job's run history
+        """
+        refitted = cls().refresh()
+        if refitted:
+            try:
+                from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
+                db.session.execute(insert(PlanningDirtyMark), [
+                    {'asset_id': asset_id, 'reason': 'meter usage refitted'} for asset_id in refitted
+                ])
+            except ImportError:
+                # Maintenance module may be unavailable during certain phases
+                pass
+        db.session.commit()
+        return {'refitted': len(refitted)}
+
+    def get_rates(self, asset_ids, meter_field: str) -> Dict[int, MeterUsageRate]:
+        """
+        Get the cached rates of one meter for many assets.
+
+        Args:
+            asset_ids: Asset IDs, or a select/query of asset IDs
+            meter_field: Meter to get rates for ('meter1'..'meter4')
+
+        Returns:
+            Dictionary of asset_id -> MeterUsageRate, for assets with a rate
+        """
+        rates = db.session.execute(
+            select(MeterUsageRate).where(
+                MeterUsageRate.asset_id.in_(asset_ids),
+                MeterUsageRate.meter_field == meter_field,
+                MeterUsageRate.rate_per_day.isnot(None)
+            )
+        ).scalars()
+        return {rate.asset_id: rate for rate in rates}
+
+    def forecast(
+        self,
+        rate: Optional[MeterUsageRate],
+        current_meter: Optional[float],
+        target_meter: Optional[float],
+        now: Optional[datetime] = None
+    ) -> Optional[UsageForecast]:
+        """
+        Project when a meter reaches a target value.
+
+        The projection starts at the newest reading of the fit. A target the
+        meter already passed gives the estimated crossing date, without a
+        band.
+
+        Args:
+            rate: Cached rate of the asset meter (None: no forecast)
+            current_meter: Current meter value
+            target_meter: Meter value to reach
+            now: Reference time when the rate has no reading date (default: utcnow)
+
+        Returns:
+            UsageForecast, or None when the meter is not used, has no rate or
+            the target is beyond MAX_FORECAST_DAYS
+        """
+        if rate is None or rate.rate_per_day is None or current_meter is None or target_meter is None:
+            return None
+        if rate.rate_per_day <= 0:
+            return None
+
+        start = rate.last_reading_at or now or datetime.utcnow()
+        remaining = target_meter - current_meter
+        due_date = self._project(start, remaining, rate.rate_per_day)
+        if due_date is None:
+            return None
+        if remaining <= 0:
+            earliest_due_date = latest_due_date = due_date
+        else:
+            earliest_due_date = self._project(start, remaining, max(rate.rate_high, rate.rate_per_day)) or due_date
+            latest_due_date = self._project(start, remaining, rate.rate_low) if rate.rate_low > 0 else None
+
+        return UsageForecast(
+            meter_field=rate.meter_field,
+            target_meter=target_meter,
+            remaining_units=remaining,
+            rate_per_day=rate.rate_per_day,
+            due_date=due_date,
+            earliest_due_date=earliest_due_date,
+            latest_due_date=latest_due_date
+        )
+
+    def _project(self, start: datetime, remaining: float, rate_per_day: float) -> Optional[datetime]:
+        """Date at which remaining units are used up at rate_per_day"""
+        days = remaining / rate_per_day
+        if abs(days) > self.MAX_FORECAST_DAYS:
+            return None
+        return start + timedelta(days=days)
+
+    def _find_stale_asset_ids(self, asset_ids: Optional[Iterable[int]]) -> Dict[int, int]:
+        """Assets whose newest reading is newer than their cached fit, with that reading's ID"""
+        latest = select(MeterHistory.asset_id, func.max(MeterHistory.id).label('latest_id'))
+        fitted = select(
+            MeterUsageRate.asset_id,
+            func.min(MeterUsageRate.last_meter_history_id).label('fitted_id')
+        )
+        if asset_ids is not None:
+            asset_ids = list(asset_ids)
+            latest = latest.where(MeterHistory.asset_id.in_(asset_ids))
+            fitted = fitted.where(MeterUsageRate.asset_id.in_(asset_ids))
+        latest = latest.group_by(MeterHistory.asset_id).subquery()
+        fitted = fitted.group_by(MeterUsageRate.asset_id).subquery()
+
+        return dict(db.session.execute(
+            select(latest.c.asset_id, latest.c.latest_id)
+            .outerjoin(fitted, fitted.c.asset_id == latest.c.asset_id)
+            .where(or_(fitted.c.fitted_id.is_(None), fitted.c.fitted_id < latest.c.latest_id))
+            .order_by(latest.c.asset_id)
+        ).all())
+
+    def _load_readings(self, asset_ids: Sequence[int]) -> Dict[int, List[Tuple]]:
+        """Newest MAX_READINGS readings per asset, oldest first"""
+        ranked = (
+            select(
+                MeterHistory.asset_id,
+                MeterHistory.id,
+                MeterHistory.recorded_at,
+                MeterHistory.meter1,
+                MeterHistory.meter2,
+                MeterHistory.meter3,
+                MeterHistory.meter4,
+                func.row_number().over(
+                    partition_by=MeterHistory.asset_id,
+                    order_by=(MeterHistory.recorded_at.desc(), MeterHistory.id.desc())
+                ).label('rank')
+            )
+            .where(MeterHistory.asset_id.in_(asset_ids))
+            .subquery()
+        )
+        rows = db.session.execute(
+            select(ranked)
+            .where(ranked.c.rank <= self.MAX_READINGS)
+            .order_by(ranked.c.asset_id, ranked.c.recorded_at, ranked.c.id)
+        )
+
+        readings = {}
+        for row in rows:
+            readings.setdefault(row.asset_id, []).append(tuple(row)[1:7])
+        return readings
+
+    def _fit_row(
+        self,
+        asset_id: int,
+        meter_field: str,
+        readings: List[Tuple],
+        latest_id: int,
+        fitted_at: datetime
+    ) -> Dict:
+        """Fit one meter of one asset and build its MeterUsageRate row"""
+        value_index = 2 + METER_FIELDS.index(meter_field)
+        series = [(reading[1], reading[value_index]) for reading in readings if reading[value_index] is not None]
+        values = [value for _, value in series]
+
+        # Meter reset: only readings since the last one count. A drop right
+        # after a high outlier, or a low outlier the next reading recovers
+        # from, is not a reset.
+        start = 0
+        for index in range(1, len(values)):
+            if values[index] >= values[index - 1]:
+                continue
+            after_high_outlier = index >= 2 and values[index] >= values[index - 2]
+            low_outlier = index + 1 < len(values) and values[index + 1] >= values[index - 1]
+            if not after_high_outlier and not low_outlier:
+                start = index
+        times = [recorded_at for recorded_at, _ in series[start:]]
+        values = values[start:]
+
+        if times:
+            window_start = times[-1] - timedelta(days=self.WINDOW_DAYS)
+            first = next(index for index, recorded_at in enumerate(times) if recorded_at >= window_start)
+            times, values = times[first:], values[first:]
+
+        fit = self._fit_rate(times, values) if len(times) >= self.MIN_READINGS else None
+        rate_per_day, rate_low, rate_high = fit or (None, None, None)
+        return {
+            'asset_id': asset_id,
+            'meter_field': meter_field,
+            'rate_per_day': rate_per_day,
+            'rate_low': rate_low,
+            'rate_high': rate_high,
+            'reading_count': len(times),
+            'first_reading_at': times[0] if times else None,
+            'last_reading_at': times[-1] if times else None,
+            'last_meter_history_id': latest_id,
+            'fitted_at': fitted_at
+        }
+
+    def _fit_rate(
+        self,
+        times: Sequence[datetime],
+        values: Sequence[float]
+    ) -> Optional[Tuple[float, float, float]]:
+        """
+        Theil-Sen slope of a series in units per day, with Sen's confidence band.
+
+        Returns:
+            Tuple of (rate, low, high), or None when no two readings are apart in time
+        """
+        origin = times[0]
+        days = [(recorded_at - origin).total_seconds() / 86400 for recorded_at in times]
+
+        day_array = np.array(days, dtype=float)
+        value_array = np.array(values, dtype=float)
+        first, second = np.triu_indices(len(days), k=1)
+        elapsed = day_array[second] - day_array[first]
+        apart = elapsed > 0
+        slopes = np.sort((value_array[second] - value_array[first])[apart] / elapsed[apart])
+        if not len(slopes):
+            return None
+        rate = float(np.median(slopes))
+
+        # Sen (1968): ranks of the band limits among the sorted slopes
+        count = len(days)
+        spread = self.CONFIDENCE_Z * math.sqrt(count * (count - 1) * (2 * count + 5) / 18)
+        low_index = max(0, math.floor((len(slopes) - spread) / 2))
+        high_index = min(len(slopes) - 1, math.ceil((len(slopes) + spread) / 2))
+        return rate, float(slopes[low_index]), float(slopes[high_index])
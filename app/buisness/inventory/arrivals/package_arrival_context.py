@@ -4,7 +4,7 @@ from datetime import date
 
 from app import db
 from app.buisness.inventory.arrivals.arrival_linkage_manager import ArrivalLinkageManager
-from app.buisness.inventory.stock.inventory_manager import InventoryManager
+from app.buisness.inventory.stock.inventory_manager import InventoryManager, ReceiptOperation
 from app.data.inventory.arrivals.package_header import PackageHeader
 from app.data.inventory.arrivals.part_arrival import PartArrival
 from app.data.inventory.ordering.purchase_order_header import PurchaseOrderHeader
@@ -211,7 +211,7 @@ class PackageArrivalContext:
         db.session.add(pkg)
         db.session.flush()
 
-        inventory_manager = InventoryManager()
+        receipts = []
 
         # Create Accepted arrivals + inventory receipts (no PO link)
         for idx, item in enumerate(part_arrivals, start=1):
@@ -245,15 +245,17 @@ class PackageArrivalContext:
             db.session.add(arrival)
             db.session.flush()
 
-            # Create receipt movement and update ActiveInventory/InventorySummary
-            inventory_manager.record_receipt_into_unassigned_bin(
+            receipts.append(ReceiptOperation(
                 part_id=arrival.part_id,
                 storeroom_id=storeroom_id,
                 major_location_id=major_location_id,
-                quantity_received_accepted=qty_f,
+                quantity=qty_f,
                 purchase_order_line_id=None,
                 part_arrival_id=arrival.id,
-            )
+            ))
+
+        # Create receipt movements and update ActiveInventory/InventorySummary in one batch
+        InventoryManager().apply_batch(receipts)
 
         return cls(pkg.id)
 
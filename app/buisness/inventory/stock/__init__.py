@@ -1,9 +1,28 @@
-from app.buisness.inventory.stock.inventory_manager import InventoryManager
+from app.buisness.inventory.stock.inventory_manager import (
+    BatchOperationResult,
+    InventoryManager,
+    IssueOperation,
+    ReceiptOperation,
+    TransferOperation,
+)
+from app.buisness.inventory.stock.inventory_reconciliation_manager import (
+    InventoryReconciliationManager,
+    ReconciliationReport,
+    SummaryDrift,
+)
+from app.buisness.inventory.stock.inventory_snapshot_manager import InventorySnapshotManager, StockAsOf
 from app.buisness.inventory.stock.storeroom_manager import StoreroomManager
 
 __all__ = [
+    "BatchOperationResult",
     "InventoryManager",
+    "InventoryReconciliationManager",
+    "InventorySnapshotManager",
+    "IssueOperation",
+    "ReceiptOperation",
+    "ReconciliationReport",
+    "StockAsOf",
     "StoreroomManager",
+    "SummaryDrift",
+    "TransferOperation",
 ]
-
-
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Sequence, Union
+
+from sqlalchemy import delete, func, insert, select, update
 
 from app import db
 from app.data.inventory.inventory.active_inventory import ActiveInventory
@@ -15,6 +19,86 @@ from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionS
 # Configuration flag: if True, delete active inventory rows when quantity reaches zero
 DELETE_EMPTY_ACTIVE_ROWS = True
 
+# Part ids per IN (...) list when prefetching rows for a batch
+BATCH_PREFETCH_CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class ReceiptOperation:
+    """Receive accepted quantity into the storeroom's unassigned bin (see record_receipt_into_unassigned_bin)"""
+    part_id: int
+    storeroom_id: int
+    major_location_id: int
+    quantity: float
+    purchase_order_line_id: int | None = None
+    part_arrival_id: int | None = None
+
+
+@dataclass(frozen=True)
+class TransferOperation:
+    """
+    Move quantity between bins (see assign_unassigned_to_bin, transfer_between_bins
+    and transfer_cross_storeroom).
+
+    movement_type defaults to BinTransfer within a storeroom and Relocation across storerooms.
+    """
+    part_id: int
+    quantity: float
+    from_storeroom_id: int
+    from_major_location_id: int
+    to_storeroom_id: int
+    to_major_location_id: int
+    from_location_id: int | None = None
+    from_bin_id: int | None = None
+    to_location_id: int | None = None
+    to_bin_id: int | None = None
+    movement_type: str | None = None
+
+
+@dataclass(frozen=True)
+class IssueOperation:
+    """
+    Issue quantity out of a bin and record a PartIssue.
+
+    With part_demand_id the part, asset and requester come from the demand and the
+    issue type is ForPartDemand (see issue_to_part_demand); otherwise part_id and
+    issue_type are required.
+    """
+    storeroom_id: int
+    major_location_id: int
+    quantity: float
+    part_id: int | None = None
+    part_demand_id: int | None = None
+    from_location_id: int | None = None
+    from_bin_id: int | None = None
+    issue_type: str | None = None
+    issued_to_user_id: int | None = None
+    asset_id: int | None = None
+    issued_by_id: int | None = None
+    issue_date: datetime | None = None
+    issue_reason: str | None = None
+    issue_notes: str | None = None
+
+
+InventoryOperation = Union[ReceiptOperation, TransferOperation, IssueOperation]
+
+
+@dataclass
+class _BatchSummary:
+    """In-memory InventorySummary state while a batch is applied (id is None for new summaries)"""
+    id: int | None
+    part_id: int
+    quantity_on_hand_total: float
+    unit_cost_avg: float | None
+    last_updated_at: datetime | None
+
+
+@dataclass(frozen=True)
+class BatchOperationResult:
+    operation: InventoryOperation
+    movement_ids: tuple[int, ...]
+    part_issue_id: int | None = None
+
 
 class InventoryManager:
     """
@@ -24,6 +108,13 @@ class InventoryManager:
     - Maintain ActiveInventory (bin-level) as the source of truth for locations
     - Maintain InventorySummary (part-level) for fast lookups
     - Create InventoryMovement rows for traceability
+
+    Movements form chains through previous_movement_id: the out leg of a transfer
+    and an issue continue the latest movement into their source bin (a receipt or
+    the in leg of a transfer), and the in leg of a transfer continues its out leg.
+    initial_arrival_id is copied from the receipt's part arrival onto every later leg.
+    Stock in a bin is pooled, so when several receipts are mixed in one bin the
+    chain follows the most recent one.
     """
 
     def _get_or_create_summary(self, part_id: int) -> InventorySummary:
@@ -118,6 +209,7 @@ class InventoryManager:
             quantity_delta=quantity_received_accepted,
             unit_cost=unit_cost,
             part_arrival_id=part_arrival_id,
+            initial_arrival_id=part_arrival_id,
             reference_type="purchase_order_line" if purchase_order_line_id else None,
             reference_id=purchase_order_line_id,
             to_major_location_id=major_location_id,
@@ -149,6 +241,7 @@ class InventoryManager:
         )
         if (src.quantity_on_hand or 0.0) < quantity_to_move:
             raise ValueError("Not enough quantity in unassigned bin to move")
+        previous_id, arrival_id = self._latest_inbound_movement(part_id, storeroom_id, None, None)
 
         dst = self._get_or_create_active_inventory(
             part_id,
@@ -173,6 +266,8 @@ class InventoryManager:
             storeroom_id=storeroom_id,
             movement_type="BinTransfer",
             quantity_delta=-quantity_to_move,
+            previous_movement_id=previous_id,
+            initial_arrival_id=arrival_id,
             from_major_location_id=major_location_id,
             from_storeroom_id=storeroom_id,
             from_location_id=None,
@@ -190,7 +285,8 @@ class InventoryManager:
             storeroom_id=storeroom_id,
             movement_type="BinTransfer",
             quantity_delta=quantity_to_move,
-            previous_movement_id=None,  # set after flush if desired
+            previous_movement=neg,  # continues the out leg; the id is assigned at flush
+            initial_arrival_id=arrival_id,
             from_major_location_id=major_location_id,
             from_storeroom_id=storeroom_id,
             from_location_id=None,
@@ -228,6 +324,7 @@ class InventoryManager:
         )
         if (src.quantity_on_hand or 0.0) < quantity_to_move:
             raise ValueError("Not enough quantity in source bin to transfer")
+        previous_id, arrival_id = self._latest_inbound_movement(part_id, storeroom_id, from_location_id, from_bin_id)
 
         dst = self._get_or_create_active_inventory(
             part_id,
@@ -252,6 +349,8 @@ class InventoryManager:
             storeroom_id=storeroom_id,
             movement_type="BinTransfer",
             quantity_delta=-quantity_to_move,
+            previous_movement_id=previous_id,
+            initial_arrival_id=arrival_id,
             from_major_location_id=major_location_id,
             from_storeroom_id=storeroom_id,
             from_location_id=from_location_id,
@@ -269,7 +368,8 @@ class InventoryManager:
             storeroom_id=storeroom_id,
             movement_type="BinTransfer",
             quantity_delta=quantity_to_move,
-            previous_movement_id=neg.id if neg.id else None,
+            previous_movement=neg,
+            initial_arrival_id=arrival_id,
             from_major_location_id=major_location_id,
             from_storeroom_id=storeroom_id,
             from_location_id=from_location_id,
@@ -328,6 +428,9 @@ class InventoryManager:
         )
         if (src.quantity_on_hand or 0.0) < quantity_to_move:
             raise ValueError("Not enough quantity in source to transfer")
+        previous_id, arrival_id = self._latest_inbound_movement(
+            part_id, from_storeroom_id, from_location_id, from_bin_id
+        )
 
         # Get or create destination inventory
         dst = self._get_or_create_active_inventory(
@@ -355,6 +458,8 @@ class InventoryManager:
             storeroom_id=from_storeroom_id,
             movement_type="Relocation",
             quantity_delta=-quantity_to_move,
+            previous_movement_id=previous_id,
+            initial_arrival_id=arrival_id,
             from_major_location_id=from_major_location_id,
             from_storeroom_id=from_storeroom_id,
             from_location_id=from_location_id,
@@ -373,7 +478,8 @@ class InventoryManager:
             storeroom_id=to_storeroom_id,
             movement_type="Relocation",
             quantity_delta=quantity_to_move,
-            previous_movement_id=neg.id if neg.id else None,
+            previous_movement=neg,
+            initial_arrival_id=arrival_id,
             from_major_location_id=from_major_location_id,
             from_storeroom_id=from_storeroom_id,
             from_location_id=from_location_id,
@@ -418,6 +524,7 @@ class InventoryManager:
         )
         if (src.quantity_on_hand or 0.0) < quantity_to_issue:
             raise ValueError("Not enough quantity to issue")
+        previous_id, arrival_id = self._latest_inbound_movement(part_id, storeroom_id, from_location_id, from_bin_id)
 
         src.quantity_on_hand -= quantity_to_issue
         src.last_movement_date = datetime.utcnow()
@@ -440,6 +547,8 @@ class InventoryManager:
             storeroom_id=storeroom_id,
             movement_type="Issue",
             quantity_delta=-quantity_to_issue,
+            previous_movement_id=previous_id,
+            initial_arrival_id=arrival_id,
             from_major_location_id=major_location_id,
             from_storeroom_id=storeroom_id,
             from_location_id=from_location_id,
@@ -563,6 +672,427 @@ class InventoryManager:
         db.session.add(movement)
         return movement
 
+    def apply_batch(self, operations: Sequence[InventoryOperation]) -> list[BatchOperationResult]:
+        """
+        Apply receipts, transfers and issues as one batch.
+
+        The result matches calling the single-operation methods in order (bin and
+        summary quantities, rolling average cost, movement and PartIssue rows), but
+        every ActiveInventory, InventorySummary, purchase order line and part demand
+        row involved is read up front with keyed IN queries, quantities and costs
+        are applied in memory, and bins, summaries, movements and part issues are
+        written with one bulk statement per kind of change. Validation runs before
+        anything is written, so a ValueError leaves the session untouched.
+
+        Movement ids are available in the results; the movements themselves are not
+        loaded into the session.
+
+        Args:
+            operations: ReceiptOperation, TransferOperation and IssueOperation items, applied in order
+
+        Returns:
+            One BatchOperationResult per operation, in the same order
+        """
+        operations = list(operations)
+        if not operations:
+            return []
+
+        po_line_costs = self._prefetch_po_line_costs(operations)
+        demands = self._prefetch_issue_demands(operations)
+
+        # Resolve the part of every operation and the bins it reads or writes
+        resolved = []
+        for op in operations:
+            if not isinstance(op, (ReceiptOperation, TransferOperation, IssueOperation)):
+                raise TypeError(f"Unsupported inventory operation: {op!r}")
+            if op.quantity <= 0:
+                raise ValueError(f"quantity must be > 0 ({op})")
+            if isinstance(op, ReceiptOperation):
+                resolved.append((op, op.part_id, None, (op.part_id, op.storeroom_id, None, None)))
+            elif isinstance(op, TransferOperation):
+                src = (op.part_id, op.from_storeroom_id, op.from_location_id, op.from_bin_id)
+                dst = (op.part_id, op.to_storeroom_id, op.to_location_id, op.to_bin_id)
+                resolved.append((op, op.part_id, src, dst))
+            else:
+                if op.part_demand_id is not None:
+                    if op.part_demand_id not in demands:
+                        raise ValueError(f"Part demand {op.part_demand_id} not found")
+                    part_id = demands[op.part_demand_id]['part_id']
+                elif op.part_id is None or not op.issue_type:
+                    raise ValueError("part_id and issue_type are required for issues without a part demand")
+                else:
+                    part_id = op.part_id
+                resolved.append((op, part_id, (part_id, op.storeroom_id, op.from_location_id, op.from_bin_id), None))
+
+        bin_keys = {key for _, _, src, dst in resolved for key in (src, dst) if key is not None}
+        inventories = self._prefetch_active_inventory(bin_keys)
+        # Transfers are location-only: only receipts and issues touch the part summary
+        summaries = self._prefetch_summaries({
+            part_id for op, part_id, _, _ in resolved if not isinstance(op, TransferOperation)
+        })
+
+        # Pass 1: bin quantities, validated in operation order
+        quantities = {
+            key: inventories[key][1] if key in inventories else 0.0
+            for key in bin_keys
+        }
+        for op, _, src, dst in resolved:
+            if src is not None:
+                if quantities[src] < op.quantity:
+                    raise ValueError(f"Not enough quantity in source bin ({op})")
+                quantities[src] -= op.quantity
+            if dst is not None:
+                quantities[dst] += op.quantity
+
+        # Latest movement into each source bin, as (movement id, row index in this batch, initial arrival)
+        inbound = {
+            key: (movement_id, None, arrival_id)
+            for key, (movement_id, arrival_id) in self._prefetch_inbound_movements(
+                {src for _, _, src, _ in resolved if src is not None}
+            ).items()
+        }
+        # (row index, previous row index) for chain links within the batch, written once ids are known
+        batch_links = []
+
+        # Pass 2: summaries (rolling average cost) and movement rows
+        movement_rows = []
+        issue_rows = []
+        for op, part_id, src, dst in resolved:
+            if src is not None:
+                previous_id, previous_index, arrival_id = inbound.get(src, (None, None, None))
+                if previous_index is not None:
+                    batch_links.append((len(movement_rows), previous_index))
+            if isinstance(op, ReceiptOperation):
+                unit_cost = po_line_costs.get(op.purchase_order_line_id)
+                self._apply_summary_receipt(summaries[part_id], op.quantity, unit_cost)
+                movement_rows.append(self._movement_row(
+                    part_id=part_id,
+                    movement_type="Receipt",
+                    quantity_delta=op.quantity,
+                    unit_cost=unit_cost,
+                    part_arrival_id=op.part_arrival_id,
+                    initial_arrival_id=op.part_arrival_id,
+                    reference_type="purchase_order_line" if op.purchase_order_line_id else None,
+                    reference_id=op.purchase_order_line_id,
+                    to_major_location_id=op.major_location_id,
+                    to_storeroom_id=op.storeroom_id,
+                ))
+                inbound[dst] = (None, len(movement_rows) - 1, op.part_arrival_id)
+            elif isinstance(op, TransferOperation):
+                movement_type = op.movement_type or (
+                    "BinTransfer" if op.from_storeroom_id == op.to_storeroom_id else "Relocation"
+                )
+                locations = dict(
+                    from_major_location_id=op.from_major_location_id,
+                    from_storeroom_id=op.from_storeroom_id,
+                    from_location_id=op.from_location_id,
+                    from_bin_id=op.from_bin_id,
+                    to_major_location_id=op.to_major_location_id,
+                    to_storeroom_id=op.to_storeroom_id,
+                    to_location_id=op.to_location_id,
+                    to_bin_id=op.to_bin_id,
+                )
+                movement_rows.append(self._movement_row(
+                    part_id=part_id, movement_type=movement_type, quantity_delta=-op.quantity,
+                    previous_movement_id=previous_id, initial_arrival_id=arrival_id, **locations
+                ))
+                # The "in" leg continues the "out" leg, as in the single-operation methods
+                batch_links.append((len(movement_rows), len(movement_rows) - 1))
+                movement_rows.append(self._movement_row(
+                    part_id=part_id, movement_type=movement_type, quantity_delta=op.quantity,
+                    initial_arrival_id=arrival_id, **locations
+                ))
+                inbound[dst] = (None, len(movement_rows) - 1, arrival_id)
+            else:
+                summary = summaries[part_id]
+                self._apply_summary_issue(summary, -op.quantity)
+                unit_cost_at_issue = summary.unit_cost_avg
+                movement_rows.append(self._movement_row(
+                    part_id=part_id,
+                    movement_type="Issue",
+                    quantity_delta=-op.quantity,
+                    unit_cost=unit_cost_at_issue,
+                    previous_movement_id=previous_id,
+                    initial_arrival_id=arrival_id,
+                    from_major_location_id=op.major_location_id,
+                    from_storeroom_id=op.storeroom_id,
+                    from_location_id=op.from_location_id,
+                    from_bin_id=op.from_bin_id,
+                    to_major_location_id=op.major_location_id,
+                    to_storeroom_id=op.storeroom_id,
+                ))
+                demand = demands.get(op.part_demand_id)
+                issue_rows.append({
+                    'movement_index': len(movement_rows) - 1,
+                    'part_id': part_id,
+                    'quantity_issued': op.quantity,
+                    'unit_cost_at_issue': unit_cost_at_issue,
+                    'total_cost': (unit_cost_at_issue * op.quantity) if unit_cost_at_issue else None,
+                    'issued_to_user_id': op.issued_to_user_id,
+                    'part_demand_id': op.part_demand_id,
+                    # Demand issues are charged to the asset of the demand's action set
+                    'asset_id': demand['asset_id'] if demand else op.asset_id,
+                    'issue_type': 'ForPartDemand' if demand else op.issue_type,
+                    'issue_date': op.issue_date or datetime.utcnow(),
+                    'issued_from_storeroom_id': op.storeroom_id,
+                    'issued_from_location_id': op.from_location_id,
+                    'issued_from_bin_id': op.from_bin_id,
+                    'requested_by_id': demand['requested_by_id'] if demand else None,
+                    'issued_by_id': op.issued_by_id,
+                    'issue_reason': op.issue_reason,
+                    'issue_notes': op.issue_notes,
+                })
+
+        self._write_batch_quantities(inventories, quantities, resolved, summaries)
+
+        movement_ids = self._bulk_insert_returning_ids(InventoryMovement, movement_rows)
+
+        part_issue_ids = {}
+        if issue_rows:
+            for row in issue_rows:
+                row['inventory_movement_id'] = movement_ids[row.pop('movement_index')]
+            issue_ids = self._bulk_insert_returning_ids(PartIssue, issue_rows)
+            db.session.execute(update(InventoryMovement), [
+                {'id': row['inventory_movement_id'], 'part_issue_id': issue_id}
+                for row, issue_id in zip(issue_rows, issue_ids)
+            ])
+            part_issue_ids = {row['inventory_movement_id']: issue_id for row, issue_id in zip(issue_rows, issue_ids)}
+
+        if batch_links:
+            db.session.execute(update(InventoryMovement), [
+                {'id': movement_ids[index], 'previous_movement_id': movement_ids[previous_index]}
+                for index, previous_index in batch_links
+            ])
+
+        results = []
+        position = 0
+        for op, _, _, _ in resolved:
+            count = 2 if isinstance(op, TransferOperation) else 1
+            ids = tuple(movement_ids[position:position + count])
+            position += count
+            results.append(BatchOperationResult(
+                operation=op,
+                movement_ids=ids,
+                part_issue_id=part_issue_ids.get(ids[0]) if isinstance(op, IssueOperation) else None,
+            ))
+        return results
+
+    @staticmethod
+    def _bulk_insert_returning_ids(model, rows: list[dict]) -> list[int]:
+        """
+        Bulk insert rows and return their new ids in row order.
+
+        sort_by_parameter_order makes SQLite fall back to one INSERT per row (it has no
+        insert sentinel), so the ids are returned unordered and sorted instead: rowids
+        are allocated in ascending order as the rows are inserted, and the transaction
+        already holds the write lock from the bin updates. render_nulls keeps rows with
+        different NULL columns in the same multi-row INSERT.
+        """
+        return sorted(db.session.execute(
+            insert(model).returning(model.id),
+            rows,
+            execution_options={'render_nulls': True}
+        ).scalars())
+
+    @staticmethod
+    def _movement_row(**values) -> dict:
+        # Every row carries the same keys so the bulk insert stays a single batch
+        row = dict.fromkeys((
+            'unit_cost', 'part_arrival_id', 'initial_arrival_id', 'previous_movement_id',
+            'reference_type', 'reference_id',
+            'from_major_location_id', 'from_storeroom_id', 'from_location_id', 'from_bin_id',
+            'to_major_location_id', 'to_storeroom_id', 'to_location_id', 'to_bin_id',
+        ))
+        row.update(values)
+        return row
+
+    def _write_batch_quantities(self, inventories: dict, quantities: dict, resolved: list, summaries: dict) -> None:
+        """
+        Write final bin and summary rows with one bulk statement per kind of change:
+        update, insert, or delete emptied bins
+        """
+        now = datetime.utcnow()
+        touched = {}
+        for _, _, src, dst in resolved:
+            for key in (src, dst):
+                if key is not None:
+                    touched.setdefault(key, None)
+
+        updates, inserts, deleted_ids = [], [], []
+        for key in touched:
+            quantity = quantities[key]
+            inventory_id = inventories[key][0] if key in inventories else None
+            if DELETE_EMPTY_ACTIVE_ROWS and quantity <= 0:
+                if inventory_id is not None:
+                    deleted_ids.append(inventory_id)
+            elif inventory_id is not None:
+                updates.append({'id': inventory_id, 'quantity_on_hand': quantity, 'last_movement_date': now})
+            else:
+                part_id, storeroom_id, location_id, bin_id = key
+                inserts.append({
+                    'part_id': part_id,
+                    'storeroom_id': storeroom_id,
+                    'location_id': location_id,
+                    'bin_id': bin_id,
+                    'quantity_on_hand': quantity,
+                    'quantity_allocated': 0.0,
+                    'last_movement_date': now,
+                })
+
+        for start in range(0, len(deleted_ids), BATCH_PREFETCH_CHUNK_SIZE):
+            db.session.execute(
+                delete(ActiveInventory).where(
+                    ActiveInventory.id.in_(deleted_ids[start:start + BATCH_PREFETCH_CHUNK_SIZE])
+                )
+            )
+        if updates:
+            db.session.execute(update(ActiveInventory), updates)
+        if inserts:
+            db.session.execute(insert(ActiveInventory), inserts, execution_options={'render_nulls': True})
+
+        summary_updates, summary_inserts = [], []
+        for summary in summaries.values():
+            row = {
+                'quantity_on_hand_total': summary.quantity_on_hand_total,
+                'unit_cost_avg': summary.unit_cost_avg,
+                'last_updated_at': summary.last_updated_at,
+            }
+            if summary.id is not None:
+                summary_updates.append({'id': summary.id, **row})
+            else:
+                summary_inserts.append({'part_id': summary.part_id, **row})
+        if summary_updates:
+            db.session.execute(update(InventorySummary), summary_updates)
+        if summary_inserts:
+            db.session.execute(insert(InventorySummary), summary_inserts, execution_options={'render_nulls': True})
+
+        # Bulk updates bypass the identity map: expire rows already loaded in the session
+        updated = {
+            ActiveInventory: {row['id'] for row in updates},
+            InventorySummary: {row['id'] for row in summary_updates},
+        }
+        for instance in list(db.session.identity_map.values()):
+            ids = updated.get(type(instance))
+            if ids and instance.id in ids:
+                db.session.expire(instance)
+
+    def _prefetch_active_inventory(self, keys: set) -> dict:
+        """(id, quantity on hand) of the ActiveInventory row for each (part, storeroom, location, bin) key"""
+        part_ids = sorted({key[0] for key in keys})
+        storeroom_ids = {key[1] for key in keys}
+        inventories = {}
+        for start in range(0, len(part_ids), BATCH_PREFETCH_CHUNK_SIZE):
+            rows = db.session.query(
+                ActiveInventory.id,
+                ActiveInventory.part_id,
+                ActiveInventory.storeroom_id,
+                ActiveInventory.location_id,
+                ActiveInventory.bin_id,
+                ActiveInventory.quantity_on_hand,
+            ).filter(
+                ActiveInventory.part_id.in_(part_ids[start:start + BATCH_PREFETCH_CHUNK_SIZE]),
+                ActiveInventory.storeroom_id.in_(storeroom_ids),
+            ).order_by(ActiveInventory.id)
+            for row in rows:
+                key = (row.part_id, row.storeroom_id, row.location_id, row.bin_id)
+                if key in keys:
+                    inventories.setdefault(key, (row.id, row.quantity_on_hand or 0.0))
+        return inventories
+
+    def _latest_inbound_movement(
+        self,
+        part_id: int,
+        storeroom_id: int,
+        location_id: int | None,
+        bin_id: int | None,
+    ) -> tuple[int | None, int | None]:
+        """(id, initial_arrival_id) of the latest movement into a bin, (None, None) if there is none"""
+        key = (part_id, storeroom_id, location_id, bin_id)
+        return self._prefetch_inbound_movements({key}).get(key, (None, None))
+
+    def _prefetch_inbound_movements(self, keys: set) -> dict:
+        """(id, initial_arrival_id) of the latest movement into each (part, storeroom, location, bin) key"""
+        part_ids = sorted({key[0] for key in keys})
+        storeroom_ids = {key[1] for key in keys}
+        inbound = {}
+        for start in range(0, len(part_ids), BATCH_PREFETCH_CHUNK_SIZE):
+            latest = select(func.max(InventoryMovement.id).label('id')).where(
+                InventoryMovement.part_id.in_(part_ids[start:start + BATCH_PREFETCH_CHUNK_SIZE]),
+                InventoryMovement.to_storeroom_id.in_(storeroom_ids),
+                InventoryMovement.quantity_delta > 0,
+            ).group_by(
+                InventoryMovement.part_id,
+                InventoryMovement.to_storeroom_id,
+                InventoryMovement.to_location_id,
+                InventoryMovement.to_bin_id,
+            ).subquery()
+            rows = db.session.execute(
+                select(
+                    InventoryMovement.id,
+                    InventoryMovement.part_id,
+                    InventoryMovement.to_storeroom_id,
+                    InventoryMovement.to_location_id,
+                    InventoryMovement.to_bin_id,
+                    InventoryMovement.initial_arrival_id,
+                ).join(latest, InventoryMovement.id == latest.c.id)
+            )
+            for row in rows:
+                key = (row.part_id, row.to_storeroom_id, row.to_location_id, row.to_bin_id)
+                if key in keys:
+                    inbound[key] = (row.id, row.initial_arrival_id)
+        return inbound
+
+    def _prefetch_summaries(self, part_ids: set) -> dict:
+        """Summary state per part; parts without a summary get a new one"""
+        part_ids = sorted(part_ids)
+        summaries = {}
+        for start in range(0, len(part_ids), BATCH_PREFETCH_CHUNK_SIZE):
+            rows = db.session.query(
+                InventorySummary.id,
+                InventorySummary.part_id,
+                InventorySummary.quantity_on_hand_total,
+                InventorySummary.unit_cost_avg,
+                InventorySummary.last_updated_at,
+            ).filter(InventorySummary.part_id.in_(part_ids[start:start + BATCH_PREFETCH_CHUNK_SIZE]))
+            for row in rows:
+                summaries.setdefault(row.part_id, _BatchSummary(*row))
+        for part_id in part_ids:
+            summaries.setdefault(part_id, _BatchSummary(None, part_id, 0.0, None, None))
+        return summaries
+
+    def _prefetch_po_line_costs(self, operations: list) -> dict:
+        po_line_ids = sorted({
+            op.purchase_order_line_id for op in operations
+            if isinstance(op, ReceiptOperation) and op.purchase_order_line_id is not None
+        })
+        costs = {}
+        for start in range(0, len(po_line_ids), BATCH_PREFETCH_CHUNK_SIZE):
+            costs.update(db.session.query(PurchaseOrderLine.id, PurchaseOrderLine.unit_cost).filter(
+                PurchaseOrderLine.id.in_(po_line_ids[start:start + BATCH_PREFETCH_CHUNK_SIZE])
+            ).all())
+        return costs
+
+    def _prefetch_issue_demands(self, operations: list) -> dict:
+        """Part, asset (from the demand's action set) and requester per issued part demand"""
+        demand_ids = sorted({
+            op.part_demand_id for op in operations
+            if isinstance(op, IssueOperation) and op.part_demand_id is not None
+        })
+        demands = {}
+        for start in range(0, len(demand_ids), BATCH_PREFETCH_CHUNK_SIZE):
+            rows = db.session.query(
+                PartDemand.id, PartDemand.part_id, PartDemand.requested_by_id, MaintenanceActionSet.asset_id
+            ).join(Action, PartDemand.action_id == Action.id).join(
+                MaintenanceActionSet, Action.maintenance_action_set_id == MaintenanceActionSet.id
+            ).filter(PartDemand.id.in_(demand_ids[start:start + BATCH_PREFETCH_CHUNK_SIZE])).all()
+            for row in rows:
+                demands[row.id] = {
+                    'part_id': row.part_id,
+                    'requested_by_id': row.requested_by_id,
+                    'asset_id': row.asset_id,
+                }
+        return demands
+
     def refresh_inventory_summary(self, *, part_ids: list[int] | None = None) -> None:
         """
         Rebuild InventorySummary totals from ActiveInventory.
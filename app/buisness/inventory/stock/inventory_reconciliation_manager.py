@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from app import db
+from app.data.core.supply.part_definition import PartDefinition
+from app.data.core.user_info.user import User
+from app.data.inventory.inventory.active_inventory import ActiveInventory
+from app.data.inventory.inventory.inventory_movement import InventoryMovement
+from app.data.inventory.inventory.inventory_summary import InventorySummary
+from app.logger import get_logger
+
+logger = get_logger("asset_management.buisness.inventory.stock.reconciliation_manager")
+
+# Part ids checked per set of statements (and per commit when repairing)
+RECONCILE_CHUNK_SIZE = 1000
+
+# Quantity differences up to this are float noise, not drift
+QUANTITY_TOLERANCE = 1e-6
+
+
+@dataclass
+class SummaryDrift:
+    """
+    One disagreement found for a part.
+
+    kind is one of:
+    - 'missing_summary': stock in ActiveInventory but no InventorySummary row
+    - 'quantity': quantity_on_hand_total differs from the ActiveInventory total
+    - 'unit_cost': unit_cost_avg is missing or negative although priced receipts exist
+    - 'ledger': the net quantity of the movement ledger differs from ActiveInventory
+      (reported only: bins changed without a movement need an adjustment)
+    """
+    part_id: int
+    kind: str
+    recorded: float | None
+    expected: float | None
+    repaired: bool = False
+
+
+@dataclass
+class ReconciliationReport:
+    """Outcome of a reconciliation run"""
+    parts_checked: int = 0
+    chunks: int = 0
+    drifts: list[SummaryDrift] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    @property
+    def repaired(self) -> int:
+        return sum(1 for drift in self.drifts if drift.repaired)
+
+    def count(self, kind: str) -> int:
+        return sum(1 for drift in self.drifts if drift.kind == kind)
+
+
+class InventoryReconciliationManager:
+    """
+    Verify InventorySummary against ActiveInventory (and optionally the movement ledger).
+
+    InventoryManager maintains the summary incrementally; this recomputes it.
+    Parts are processed in windows of RECONCILE_CHUNK_SIZE ids. Each window
+    costs one GROUP BY per source (ActiveInventory totals, summary rows,
+    ledger totals) plus, when repairing, one bulk UPDATE (read back to see
+    which rows it wrote) and one bulk INSERT.
+
+    Repairs are compare-and-set: a summary row is only rewritten if it still
+    holds the value that was read (within QUANTITY_TOLERANCE), so an inventory
+    operation committed in between is never overwritten with a stale total.
+    Missing summaries are inserted with ON CONFLICT DO NOTHING; one created by
+    another writer in between is left alone and its drift reported unrepaired.
+
+    Rolling average costs depend on the order of receipts and issues and
+    cannot be recomputed set-based; only missing or negative averages are
+    repaired (from the quantity-weighted cost of the part's priced receipts).
+    """
+
+    def reconcile(
+        self,
+        *,
+        repair: bool = False,
+        check_ledger: bool = False,
+        part_ids: list[int] | None = None,
+        user_id: int | None = None,
+        commit: bool = False,
+    ) -> ReconciliationReport:
+        """
+        Compare summaries with bin totals, and optionally repair them.
+
+        Args:
+            repair: Rewrite drifted summary quantities and costs, create missing summaries
+            check_ledger: Also compare the net movement ledger per part with ActiveInventory
+            part_ids: Only these parts (default: all parts)
+            user_id: User recorded on repaired and created summaries
+            commit: Commit after each window of parts, so long runs release the write lock
+
+        Returns:
+            ReconciliationReport listing every drift found
+        """
+        start = time.perf_counter()
+        report = ReconciliationReport()
+
+        if part_ids is not None:
+            ordered = sorted(set(part_ids))
+            for i in range(0, len(ordered), RECONCILE_CHUNK_SIZE):
+                window = ordered[i:i + RECONCILE_CHUNK_SIZE]
+                self._reconcile_window(
+                    lambda column: column.in_(window), report, repair, check_ledger, user_id, commit
+                )
+        else:
+            last_id = 0
+            while True:
+                window = db.session.execute(
+                    select(PartDefinition.id)
+                    .where(PartDefinition.id > last_id)
+                    .order_by(PartDefinition.id)
+                    .limit(RECONCILE_CHUNK_SIZE)
+                ).scalars().all()
+                if not window:
+                    break
+                first, last = window[0], window[-1]
+                self._reconcile_window(
+                    lambda column: column.between(first, last), report, repair, check_ledger, user_id, commit
+                )
+                last_id = window[-1]
+
+        report.duration_ms = (time.perf_counter() - start) * 1000
+        log = logger.warning if report.drifts else logger.info
+        log(
+            f"Inventory reconciliation: {report.parts_checked} parts in {report.chunks} chunks, "
+            f"{len(report.drifts)} drifts ({report.repaired} repaired) in {report.duration_ms:.0f} ms"
+        )
+        return report
+
+    @classmethod
+    def run_scheduled_reconciliation(cls) -> dict:
+        """
+        Background scheduler job: repair summary drift as the system user.
+
+        Returns:
+            Summary counts, stored in the job's run history
+        """
+        system_user = User.query.filter_by(is_system=True).first()
+        report = cls().reconcile(
+            repair=True,
+            check_ledger=True,
+            user_id=system_user.id if system_user else None,
+            commit=True,
+        )
+        return {
+            'parts_checked': report.parts_checked,
+            'missing_summary': report.count('missing_summary'),
+            'quantity_drift': report.count('quantity'),
+            'unit_cost_drift': report.count('unit_cost'),
+            'ledger_drift': report.count('ledger'),
+            'repaired': report.repaired,
+        }
+
+    def _reconcile_window(self, in_window, report, repair, check_ledger, user_id, commit) -> None:
+        """Check (and repair) the parts selected by in_window(part_id column)"""
+        active_totals = dict(db.session.execute(
+            select(ActiveInventory.part_id, func.sum(ActiveInventory.quantity_on_hand))
+            .where(in_window(ActiveInventory.part_id))
+            .group_by(ActiveInventory.part_id)
+        ).all())
+        summaries = {
+            row.part_id: row
+            for row in db.session.execute(
+                select(
+                    InventorySummary.id,
+                    InventorySummary.part_id,
+                    InventorySummary.quantity_on_hand_total,
+                    InventorySummary.unit_cost_avg,
+                ).where(in_window(InventorySummary.part_id))
+            )
+        }
+        report.chunks += 1
+        report.parts_checked += len(active_totals.keys() | summaries.keys())
+
+        drifts = []
+        for part_id in sorted(active_totals.keys() | summaries.keys()):
+            expected = float(active_totals.get(part_id) or 0.0)
+            summary = summaries.get(part_id)
+            if summary is None:
+                if abs(expected) > QUANTITY_TOLERANCE:
+                    drifts.append(SummaryDrift(part_id, 'missing_summary', None, expected))
+            elif abs((summary.quantity_on_hand_total or 0.0) - expected) > QUANTITY_TOLERANCE:
+                drifts.append(SummaryDrift(part_id, 'quantity', summary.quantity_on_hand_total, expected))
+
+        # Costs only for summaries that have none (or a negative one), and for new summaries
+        cost_candidates = [
+            part_id for part_id, summary in summaries.items()
+            if summary.unit_cost_avg is None or summary.unit_cost_avg < 0
+        ] + [drift.part_id for drift in drifts if drift.kind == 'missing_summary']
+        receipt_costs = self._receipt_costs(cost_candidates)
+        for part_id, summary in summaries.items():
+            if part_id in receipt_costs and (summary.unit_cost_avg is None or summary.unit_cost_avg < 0):
+                drifts.append(SummaryDrift(part_id, 'unit_cost', summary.unit_cost_avg, receipt_costs[part_id]))
+
+        if check_ledger:
+            ledger_totals = dict(db.session.execute(
+                select(InventoryMovement.part_id, func.sum(InventoryMovement.quantity_delta))
+                .where(in_window(InventoryMovement.part_id))
+                .group_by(InventoryMovement.part_id)
+            ).all())
+            for part_id in sorted(ledger_totals.keys() | active_totals.keys()):
+                ledger = float(ledger_totals.get(part_id) or 0.0)
+                expected = float(active_totals.get(part_id) or 0.0)
+                if abs(ledger - expected) > QUANTITY_TOLERANCE:
+                    drifts.append(SummaryDrift(part_id, 'ledger', ledger, expected))
+
+        if repair and drifts:
+            self._repair(drifts, summaries, receipt_costs, user_id)
+            if commit:
+                db.session.commit()
+        report.drifts.extend(drifts)
+
+    def _receipt_costs(self, part_ids: list[int]) -> dict:
+        """Quantity-weighted unit cost of each part's priced receipts"""
+        if not part_ids:
+            return {}
+        moved_quantity = func.abs(InventoryMovement.quantity_delta)
+        return dict(db.session.execute(
+            select(
+                InventoryMovement.part_id,
+                func.sum(InventoryMovement.unit_cost * moved_quantity) / func.sum(moved_quantity),
+            )
+            .where(
+                InventoryMovement.part_id.in_(part_ids),
+                InventoryMovement.movement_type == 'Receipt',
+                InventoryMovement.unit_cost.isnot(None),
+                InventoryMovement.quantity_delta != 0,
+            )
+            .group_by(InventoryMovement.part_id)
+        ).all())
+
+    def _repair(self, drifts: list[SummaryDrift], summaries: dict, receipt_costs: dict, user_id: int | None) -> None:
+        """One compare-and-set bulk UPDATE for drifted summaries, one INSERT for missing ones"""
+        now = datetime.utcnow()
+        updates = {}
+        inserts = {}
+        for drift in drifts:
+            if drift.kind == 'missing_summary':
+                inserts[drift.part_id] = ({
+                    'part_id': drift.part_id,
+                    'quantity_on_hand_total': drift.expected,
+                    'unit_cost_avg': receipt_costs.get(drift.part_id),
+                    'last_updated_at': now,
+                    'created_by_id': user_id,
+                    'updated_by_id': user_id,
+                }, drift)
+            elif drift.kind in ('quantity', 'unit_cost'):
+                summary = summaries[drift.part_id]
+                row = updates.setdefault(drift.part_id, {
+                    'id': summary.id,
+                    'quantity_on_hand_total': summary.quantity_on_hand_total,
+                    'unit_cost_avg': summary.unit_cost_avg,
+                    'last_updated_at': now,
+                    'updated_by_id': user_id,
+                    'b_read_quantity': summary.quantity_on_hand_total,
+                    'b_read_cost': summary.unit_cost_avg,
+                    'drifts': [],
+                })
+                row['quantity_on_hand_total' if drift.kind == 'quantity' else 'unit_cost_avg'] = drift.expected
+                row['drifts'].append(drift)
+
+        if updates:
+            rows = list(updates.values())
+            drifts_by_id = {row['id']: row.pop('drifts') for row in rows}
+            read_cost = bindparam('b_read_cost')
+            db.session.execute(
+                update(InventorySummary).where(
+                    func.abs(
+                        func.coalesce(InventorySummary.quantity_on_hand_total, 0.0)
+                        - func.coalesce(bindparam('b_read_quantity'), 0.0)
+                    ) <= QUANTITY_TOLERANCE,
+                    or_(
+                        and_(InventorySummary.unit_cost_avg.is_(None), read_cost.is_(None)),
+                        func.abs(InventorySummary.unit_cost_avg - read_cost) <= QUANTITY_TOLERANCE,
+                    ),
+                ),
+                rows,
+                # Loaded summaries are expired below instead
+                execution_options={'synchronize_session': None},
+            )
+            # Rows changed since they were read were skipped; the next run checks them again
+            expected = {row['id']: (row['quantity_on_hand_total'], row['unit_cost_avg']) for row in rows}
+            written = {
+                row.id for row in db.session.execute(
+                    select(InventorySummary.id, InventorySummary.quantity_on_hand_total, InventorySummary.unit_cost_avg)
+                    .where(InventorySummary.id.in_(expected))
+                )
+                if self._matches(row.quantity_on_hand_total, expected[row.id][0])
+                and self._matches(row.unit_cost_avg, expected[row.id][1])
+            }
+            if len(written) != len(rows):
+                logger.info(f"{len(rows) - len(written)} inventory summaries changed during reconciliation, skipped")
+            for summary_id in written:
+                for drift in drifts_by_id[summary_id]:
+                    drift.repaired = True
+        if inserts:
+            # A summary created by another writer since the read wins; its part is checked again next run
+            created = set(db.session.execute(
+                insert(InventorySummary)
+                .on_conflict_do_nothing(index_elements=['part_id'])
+                .returning(InventorySummary.part_id),
+                [row for row, _ in inserts.values()],
+                execution_options={'render_nulls': True},
+            ).scalars())
+            if len(created) != len(inserts):
+                logger.info(f"{len(inserts) - len(created)} inventory summaries created during reconciliation, skipped")
+            for part_id in created:
+                inserts[part_id][1].repaired = True
+
+        # Bulk updates bypass the identity map: expire summaries already loaded in the session
+        updated_ids = {row['id'] for row in updates.values()}
+        for instance in list(db.session.identity_map.values()):
+            if isinstance(instance, InventorySummary) and instance.id in updated_ids:
+                db.session.expire(instance)
+
+    @staticmethod
+    def _matches(value: float | None, expected: float | None) -> bool:
+        """Whether a read-back value is the one written, within QUANTITY_TOLERANCE"""
+        if value is None or expected is None:
+            return value is None and expected is None
+        return abs(value - expected) <= QUANTITY_TOLERANCE
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import and_, case, func, insert, or_, select
+
+from app import db
+from app.data.core.user_info.user import User
+from app.data.inventory.inventory.active_inventory import ActiveInventory
+from app.data.inventory.inventory.inventory_movement import InventoryMovement
+from app.data.inventory.inventory.inventory_snapshot import InventorySnapshot, InventorySnapshotLine
+from app.data.inventory.inventory.inventory_summary import InventorySummary
+from app.logger import get_logger
+
+logger = get_logger("asset_management.buisness.inventory.stock.snapshot_manager")
+
+# Movement ids aggregated per statement when replaying the ledger
+SNAPSHOT_CHUNK_SIZE = 50000
+
+# Snapshot lines per bulk insert
+SNAPSHOT_INSERT_CHUNK_SIZE = 5000
+
+# Part ids per current-cost query
+COST_PART_CHUNK_SIZE = 1000
+
+# Net quantities closer to zero than this are empty bins
+QUANTITY_EPSILON = 1e-9
+
+
+@dataclass
+class StockAsOf:
+    """On-hand stock per bin at a point in time, and how it was derived"""
+    as_of: datetime
+    lines: list[dict] = field(default_factory=list)
+    base_snapshot_id: int | None = None
+    base_snapshot_at: datetime | None = None
+    movements_replayed: int = 0
+
+    @property
+    def total_quantity(self) -> float:
+        return sum(line['quantity'] for line in self.lines)
+
+    @property
+    def total_value(self) -> float:
+        return sum(line['value'] or 0.0 for line in self.lines)
+
+
+class InventorySnapshotManager:
+    """
+    Point-in-time stock from periodic snapshots plus movement replay.
+
+    Stock at time T is the nearest snapshot at or before T plus the net
+    quantity_delta of every movement it does not cover:
+    - movements with a higher id than the snapshot's last_movement_id, dated at or before T
+    - movements up to last_movement_id dated after the snapshot and at or before T
+
+    Each movement is applied to one bin: decreases to its "from" location
+    (falling back to "to" for adjustments, which only record "to"),
+    increases to its "to" location. The ledger is replayed in windows of
+    SNAPSHOT_CHUNK_SIZE movement ids, each aggregated per bin in SQL, so
+    memory stays proportional to the number of bins rather than movements.
+    """
+
+    def create_snapshot(
+        self,
+        snapshot_at: datetime | None = None,
+        *,
+        created_by_id: int | None = None,
+        skip_if_unchanged: bool = False,
+    ) -> InventorySnapshot:
+        """
+        Write a snapshot of on-hand stock per bin (not committed).
+
+        Args:
+            snapshot_at: Point in time to snapshot (default: now)
+            created_by_id: User recorded as the snapshot's creator
+            skip_if_unchanged: Return the nearest earlier snapshot instead of writing
+                a new one when no movement was recorded since it
+
+        Returns:
+            The new snapshot (or the unchanged earlier one)
+        """
+        start = time.perf_counter()
+        snapshot_at = snapshot_at or datetime.utcnow()
+        base = self._nearest_snapshot(snapshot_at)
+        quantities, base_lines, replayed, last_movement_id = self._replay(snapshot_at, base)
+
+        if skip_if_unchanged and base is not None and replayed == 0:
+            logger.debug(f"No movements since inventory snapshot {base.id}, not writing a new one")
+            return base
+
+        costs = self._costs(quantities, base_lines, current_first=True)
+        snapshot = InventorySnapshot(
+            snapshot_at=snapshot_at,
+            last_movement_id=last_movement_id,
+            base_snapshot_id=base.id if base else None,
+            movements_replayed=replayed,
+            created_by_id=created_by_id,
+            updated_by_id=created_by_id,
+        )
+        db.session.add(snapshot)
+        db.session.flush()
+
+        # Each chunk of lines is inserted as soon as it is built
+        line_count = 0
+        total_quantity = 0.0
+        total_value = 0.0
+        rows = []
+        for key, quantity in quantities.items():
+            unit_cost = costs.get(key)
+            value = quantity * unit_cost if unit_cost is not None else None
+            rows.append({
+                'snapshot_id': snapshot.id,
+                'part_id': key[0],
+                'storeroom_id': key[1],
+                'location_id': key[2],
+                'bin_id': key[3],
+                'quantity': quantity,
+                'value': value,
+            })
+            line_count += 1
+            total_quantity += quantity
+            total_value += value or 0.0
+            if len(rows) == SNAPSHOT_INSERT_CHUNK_SIZE:
+                self._insert_lines(rows)
+                rows = []
+        if rows:
+            self._insert_lines(rows)
+
+        snapshot.line_count = line_count
+        snapshot.total_quantity = total_quantity
+        snapshot.total_value = total_value
+        snapshot.duration_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Inventory snapshot {snapshot.id} at {snapshot_at}: {line_count} lines, "
+            f"{replayed} movements replayed in {snapshot.duration_ms:.0f} ms"
+        )
+        return snapshot
+
+    def get_stock_as_of(
+        self,
+        as_of: datetime,
+        *,
+        storeroom_id: int | None = None,
+        part_id: int | None = None,
+    ) -> StockAsOf:
+        """
+        On-hand quantity and value per bin at a point in time.
+
+        Values use the unit costs recorded in the base snapshot, falling back to
+        the current bin and part costs for stock the snapshot did not hold.
+
+        Args:
+            as_of: Point in time
+            storeroom_id: Only bins in this storeroom
+            part_id: Only this part
+
+        Returns:
+            StockAsOf with one line per bin holding stock, ordered by storeroom, part and bin
+        """
+        base = self._nearest_snapshot(as_of)
+        quantities, base_lines, replayed, _ = self._replay(
+            as_of, base, storeroom_id=storeroom_id, part_id=part_id
+        )
+        costs = self._costs(quantities, base_lines, current_first=False)
+
+        lines = []
+        # Storeroom, part, location, bin; unassigned (NULL) locations first
+        for key in sorted(quantities, key=lambda key: (key[1] or 0, key[0], key[2] or 0, key[3] or 0)):
+            quantity = quantities[key]
+            unit_cost = costs.get(key)
+            lines.append({
+                'part_id': key[0],
+                'storeroom_id': key[1],
+                'location_id': key[2],
+                'bin_id': key[3],
+                'quantity': quantity,
+                'unit_cost': unit_cost,
+                'value': quantity * unit_cost if unit_cost is not None else None,
+            })
+        return StockAsOf(
+            as_of=as_of,
+            lines=lines,
+            base_snapshot_id=base.id if base else None,
+            base_snapshot_at=base.snapshot_at if base else None,
+            movements_replayed=replayed,
+        )
+
+    @classmethod
+    def run_scheduled_snapshot(cls) -> dict:
+        """
+        Background scheduler job: snapshot current stock as the system user.
+
+        Nothing is written when no movement was recorded since the last snapshot.
+
+        Returns:
+            Summary counts, stored in the job's run history
+        """
+        system_user = User.query.filter_by(is_system=True).first()
+        latest_id = db.session.query(func.max(InventorySnapshot.id)).scalar()
+        snapshot = cls().create_snapshot(
+            created_by_id=system_user.id if system_user else None,
+            skip_if_unchanged=True,
+        )
+        db.session.commit()
+        return {
+            'snapshot_id': snapshot.id,
+            'written': int(snapshot.id != latest_id),
+            'lines': snapshot.line_count,
+            'movements_replayed': snapshot.movements_replayed,
+        }
+
+    @staticmethod
+    def _insert_lines(rows: list[dict]) -> None:
+        db.session.execute(insert(InventorySnapshotLine), rows, execution_options={'render_nulls': True})
+
+    def _nearest_snapshot(self, as_of: datetime) -> InventorySnapshot | None:
+        return (
+            InventorySnapshot.query
+            .filter(InventorySnapshot.snapshot_at <= as_of)
+            .order_by(InventorySnapshot.snapshot_at.desc(), InventorySnapshot.id.desc())
+            .first()
+        )
+
+    def _replay(
+        self,
+        as_of: datetime,
+        base: InventorySnapshot | None,
+        *,
+        storeroom_id: int | None = None,
+        part_id: int | None = None,
+    ) -> tuple[dict, dict, int, int]:
+        """
+        Net quantity per (part, storeroom, location, bin) at as_of.
+
+        Returns:
+            (quantities of bins holding stock, base snapshot lines as key -> (quantity, value),
+             movements replayed, highest movement id considered)
+        """
+        quantities = {}
+        base_lines = {}
+        if base is not None:
+            query = select(
+                InventorySnapshotLine.part_id,
+                InventorySnapshotLine.storeroom_id,
+                InventorySnapshotLine.location_id,
+                InventorySnapshotLine.bin_id,
+                InventorySnapshotLine.quantity,
+                InventorySnapshotLine.value,
+            ).where(InventorySnapshotLine.snapshot_id == base.id)
+            if storeroom_id is not None:
+                query = query.where(InventorySnapshotLine.storeroom_id == storeroom_id)
+            if part_id is not None:
+                query = query.where(InventorySnapshotLine.part_id == part_id)
+            for row in db.session.execute(query):
+                key = (row.part_id, row.storeroom_id, row.location_id, row.bin_id)
+                quantities[key] = row.quantity
+                base_lines[key] = (row.quantity, row.value)
+
+        storeroom, location, bin_column = self._movement_bin_columns()
+        filters = [InventoryMovement.movement_date <= as_of]
+        if storeroom_id is not None:
+            filters.append(storeroom == storeroom_id)
+        if part_id is not None:
+            filters.append(InventoryMovement.part_id == part_id)
+
+        def aggregate(*conditions):
+            return db.session.execute(
+                select(
+                    InventoryMovement.part_id,
+                    storeroom,
+                    location,
+                    bin_column,
+                    func.sum(InventoryMovement.quantity_delta).label('quantity'),
+                    func.count().label('movements'),
+                )
+                .where(*filters, *conditions)
+                .group_by(InventoryMovement.part_id, storeroom, location, bin_column)
+            )
+
+        replayed = 0
+
+        def apply(rows):
+            nonlocal replayed
+            for row in rows:
+                key = (row.part_id, row.storeroom_id, row.location_id, row.bin_id)
+                quantities[key] = quantities.get(key, 0.0) + (row.quantity or 0.0)
+                replayed += row.movements
+
+        last_movement_id = db.session.query(func.max(InventoryMovement.id)).scalar() or 0
+        window_start = base.last_movement_id if base is not None else 0
+        while window_start < last_movement_id:
+            window_end = min(window_start + SNAPSHOT_CHUNK_SIZE, last_movement_id)
+            apply(aggregate(InventoryMovement.id > window_start, InventoryMovement.id <= window_end))
+            window_start = window_end
+
+        if base is not None:
+            # Movements the snapshot saw but that are dated after it (uses the movement_date index)
+            apply(aggregate(
+                InventoryMovement.id <= base.last_movement_id,
+                InventoryMovement.movement_date > base.snapshot_at,
+            ))
+
+        quantities = {key: quantity for key, quantity in quantities.items() if abs(quantity) > QUANTITY_EPSILON}
+        return quantities, base_lines, replayed, last_movement_id
+
+    @staticmethod
+    def _movement_bin_columns():
+        """(storeroom, location, bin) a movement's quantity_delta applies to"""
+        use_from = or_(
+            and_(InventoryMovement.quantity_delta < 0, InventoryMovement.from_storeroom_id.isnot(None)),
+            and_(InventoryMovement.quantity_delta > 0, InventoryMovement.to_storeroom_id.is_(None)),
+        )
+        return (
+            case((use_from, InventoryMovement.from_storeroom_id), else_=InventoryMovement.to_storeroom_id).label('storeroom_id'),
+            case((use_from, InventoryMovement.from_location_id), else_=InventoryMovement.to_location_id).label('location_id'),
+            case((use_from, InventoryMovement.from_bin_id), else_=InventoryMovement.to_bin_id).label('bin_id'),
+        )
+
+    def _costs(self, quantities: dict, base_lines: dict, *, current_first: bool) -> dict:
+        """
+        Unit cost per bin key.
+
+        Sources: the base snapshot's line cost, then its average for the part; the
+        current bin cost (ActiveInventory.unit_cost_avg), then the part's rolling
+        average. New snapshots prefer current costs; as-of queries prefer the snapshot's.
+        """
+        part_ids = {key[0] for key in quantities}
+        if not part_ids:
+            return {}
+
+        base_costs = {}
+        part_totals = {}
+        for key, (quantity, value) in base_lines.items():
+            if value is None or quantity <= QUANTITY_EPSILON:
+                continue
+            base_costs[key] = value / quantity
+            total = part_totals.setdefault(key[0], [0.0, 0.0])
+            total[0] += quantity
+            total[1] += value
+        base_part_costs = {part: value / quantity for part, (quantity, value) in part_totals.items()}
+
+        bin_query = select(
+            ActiveInventory.part_id,
+            ActiveInventory.storeroom_id,
+            ActiveInventory.location_id,
+            ActiveInventory.bin_id,
+            ActiveInventory.unit_cost_avg,
+        ).where(ActiveInventory.unit_cost_avg.isnot(None))
+        summary_query = select(InventorySummary.part_id, InventorySummary.unit_cost_avg).where(
+            InventorySummary.unit_cost_avg.isnot(None)
+        )
+        current_bin_costs = {}
+        current_part_costs = {}
+        ordered = sorted(part_ids)
+        for chunk_start in range(0, len(ordered), COST_PART_CHUNK_SIZE):
+            chunk = ordered[chunk_start:chunk_start + COST_PART_CHUNK_SIZE]
+            for row in db.session.execute(bin_query.where(ActiveInventory.part_id.in_(chunk))):
+                current_bin_costs[(row.part_id, row.storeroom_id, row.location_id, row.bin_id)] = row.unit_cost_avg
+            current_part_costs.update(db.session.execute(summary_query.where(InventorySummary.part_id.in_(chunk))).all())
+
+        costs = {}
+        for key in quantities:
+            snapshot_cost = base_costs.get(key, base_part_costs.get(key[0]))
+            current_cost = current_bin_costs.get(key, current_part_costs.get(key[0]))
+            first, second = (current_cost, snapshot_cost) if current_first else (snapshot_cost, current_cost)
+            costs[key] = first if first is not None else second
+        return costs
@@ -3,13 +3,16 @@ Maintenance Blocker Manager
 Business logic for managing blockers in maintenance events.
 """
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
+from sqlalchemy import bindparam, select
 from app import db
 from app.buisness.maintenance.base.structs.maintenance_action_set_struct import MaintenanceActionSetStruct
 from app.data.maintenance.base.maintenance_blockers import MaintenanceBlocker
 from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+from app.data.core.asset_info.asset import Asset
 from app.data.core.event_info.event import Event
+from app.utils.commit_invalidation import mark_written
 
 
 class MaintenanceBlockerManager:
@@ -20,8 +23,26 @@ class MaintenanceBlockerManager:
     - Cached blocker list
     - Convenience properties (asset_id, status, etc.)
     - Consistent data access patterns
+    
+    Adding, ending and updating a blocker recomputes the mission capability
+    status of the event's asset in the same commit.
     """
     
+    # Mission capability statuses, worst first (unknown statuses rank after these)
+    MISSION_CAPABILITY_PRIORITY = {
+        'Non Mission Capable': 1,
+        'Partially Mission Capable - Functional Limitations': 2,
+        'Mission Capable - Temporary Procedural or Hardware Work Arounds': 3,
+        'Mission Capable - Ignorable Damage or Issue': 4,
+        'Fully Mission Capable': 5
+    }
+    
+    # Status of an asset without active blockers
+    DEFAULT_MISSION_CAPABILITY = 'Fully Mission Capable'
+    
+    # Assets per query when recomputing a list of assets
+    RECOMPUTE_CHUNK_SIZE = 500
+    
     def __init__(self, struct: MaintenanceActionSetStruct):
         """
         Initialize with MaintenanceActionSetStruct.
@@ -87,6 +108,8 @@ class MaintenanceBlockerManager:
                 self._maintenance_action_set.blocker_notes = notes
         
         db.session.add(blocker)
+        db.session.flush()
+        self._recompute_own_asset()
         db.session.commit()
         self._struct.refresh()
         
@@ -146,6 +169,8 @@ class MaintenanceBlockerManager:
             if remaining_active == 0:  # No more active blockers after this one ends
                 self._maintenance_action_set.status = 'In Progress'
         
+        db.session.flush()
+        self._recompute_own_asset()
         db.session.commit()
         self._struct.refresh()
         
@@ -224,6 +249,8 @@ class MaintenanceBlockerManager:
                 if remaining_active == 0:  # No more active blockers after this one ends
                     self._maintenance_action_set.status = 'In Progress'
         
+        db.session.flush()
+        self._recompute_own_asset()
         db.session.commit()
         self._struct.refresh()
         
@@ -263,55 +290,118 @@ class MaintenanceBlockerManager:
         Returns:
             Worst mission capability status string
         """
-        # Query all active blockers for this asset
-        # Join blockers -> maintenance_action_sets -> events (to get asset_id)
-        active_blockers = db.session.query(MaintenanceBlocker).join(
+        worst = self.calculate_worst_statuses([asset_id])
+        return worst.get(asset_id, self.DEFAULT_MISSION_CAPABILITY)
+    
+    def update_asset_blocked_status(self) -> None:
+        """
+        Query all active blockers associated with the asset and determine the worst mission capability status.
+        Updates the asset's mission capability status based on all active blockers.
+        """
+        if self._recompute_own_asset():
+            db.session.commit()
+    
+    @classmethod
+    def calculate_worst_statuses(cls, asset_ids: Optional[Iterable[int]] = None) -> Dict[int, str]:
+        """
+        Worst active blocker status of many assets, in one GROUP BY query per chunk.
+        
+        Args:
+            asset_ids: Assets to calculate (default: every asset with an active blocker)
+            
+        Returns:
+            Dictionary of asset_id -> worst status, for assets with an active
+            blocker that has a status
+        """
+        # Blockers reach their asset through maintenance action set -> event
+        query = select(Event.asset_id, MaintenanceBlocker.mission_capability_status).join(
             MaintenanceActionSet,
             MaintenanceBlocker.maintenance_action_set_id == MaintenanceActionSet.id
         ).join(
             Event,
             MaintenanceActionSet.event_id == Event.id
-        ).filter(
-            Event.asset_id == asset_id,
-            MaintenanceBlocker.end_date.is_(None)  # Only active blockers
-        ).distinct().all()
-        
-        if not active_blockers:
-            # No active blockers - asset should be fully mission capable
-            return 'Fully Mission Capable'
-        
-        # Get distinct mission capability statuses from active blockers
-        statuses = [b.mission_capability_status for b in active_blockers if b.mission_capability_status]
-        distinct_statuses = list(set(statuses))
+        ).where(
+            MaintenanceBlocker.end_date.is_(None),
+            MaintenanceBlocker.mission_capability_status.isnot(None),
+            Event.asset_id.isnot(None)
+        ).group_by(Event.asset_id, MaintenanceBlocker.mission_capability_status)
         
-        if not distinct_statuses:
-            return 'Fully Mission Capable'
+        if asset_ids is None:
+            queries = [query]
+        else:
+            asset_ids = list(asset_ids)
+            queries = [
+                query.where(Event.asset_id.in_(asset_ids[start:start + cls.RECOMPUTE_CHUNK_SIZE]))
+                for start in range(0, len(asset_ids), cls.RECOMPUTE_CHUNK_SIZE)
+            ]
         
-        # Determine worst status based on priority order
-        status_priority = {
-            'Non Mission Capable': 1,
-            'Partially Mission Capable - Functional Limitations': 2,
-            'Mission Capable - Temporary Procedural or Hardware Work Arounds': 3,
-            'Mission Capable - Ignorable Damage or Issue': 4,
-            'Fully Mission Capable': 5
-        }
-        
-        worst_status = min(distinct_statuses, key=lambda s: status_priority.get(s, 999))
-        return worst_status
+        worst = {}
+        for chunk_query in queries:
+            for asset_id, status in db.session.execute(chunk_query):
+                current = worst.get(asset_id)
+                if current is None or cls._status_rank(status) < cls._status_rank(current):
+                    worst[asset_id] = status
+        return worst
     
-    def update_asset_blocked_status(self) -> None:
+    @classmethod
+    def recompute_mission_capability(cls, asset_ids: Optional[Iterable[int]] = None) -> int:
         """
-        Query all active blockers associated with the asset and determine the worst mission capability status.
-        Updates the asset's mission capability status based on all active blockers.
+        Set Asset.mission_capability_status from active blockers for many assets.
+        
+        Reads the worst statuses with calculate_worst_statuses and the current
+        statuses with one column query, then writes only the assets whose
+        status changed in a single executemany UPDATE. Writes to the current
+        session without committing.
+        
+        Args:
+            asset_ids: Assets to recompute (default: the whole fleet)
+            
+        Returns:
+            Number of assets whose status changed
         """
-        if not self._maintenance_action_set.asset_id:
-            return
+        if asset_ids is not None:
+            asset_ids = list(set(asset_ids))
+            if not asset_ids:
+                return 0
+        worst = cls.calculate_worst_statuses(asset_ids)
         
-        worst_status = self.calculate_asset_mission_capability(self._maintenance_action_set.asset_id)
+        current_query = select(Asset.id, Asset.mission_capability_status)
+        if asset_ids is None:
+            current = db.session.execute(current_query).all()
+        else:
+            current = []
+            for start in range(0, len(asset_ids), cls.RECOMPUTE_CHUNK_SIZE):
+                chunk = asset_ids[start:start + cls.RECOMPUTE_CHUNK_SIZE]
+                current += db.session.execute(current_query.where(Asset.id.in_(chunk))).all()
         
-        # Update asset mission capability status
-        asset = self._maintenance_action_set.asset
-        if asset:
-            asset.mission_capability_status = worst_status
-            db.session.commit()
-
+        changes = []
+        for asset_id, status in current:
+            new_status = worst.get(asset_id, cls.DEFAULT_MISSION_CAPABILITY)
+            if status != new_status:
+                changes.append({'asset_id': asset_id, 'new_status': new_status})
+        if changes:
+            db.session.execute(
+                Asset.__table__.update()
+                .where(Asset.id == bindparam('asset_id'))
+                .values(mission_capability_status=bindparam('new_status')),
+                changes
+            )
+            # Core executemany skips the session hooks of the caches built from assets
+            mark_written(db.session, Asset, ['mission_capability_status'])
+            # Loaded assets would otherwise keep the old status
+            for asset in db.session.identity_map.values():
+                if isinstance(asset, Asset):
+                    db.session.expire(asset, ['mission_capability_status'])
+        return len(changes)
+    
+    @classmethod
+    def _status_rank(cls, status: str) -> int:
+        return cls.MISSION_CAPABILITY_PRIORITY.get(status, 999)
+    
+    def _recompute_own_asset(self) -> bool:
+        """Recompute the event's asset; False when the event has no asset"""
+        asset_id = self._maintenance_action_set.asset_id
+        if not asset_id:
+            return False
+        self.recompute_mission_capability([asset_id])
+        return True
@@ -9,9 +9,13 @@ from datetime import datetime
 from app import db
 from app.buisness.maintenance.base.structs.maintenance_action_set_struct import MaintenanceActionSetStruct
 from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
 from app.data.core.event_info.event import Event
 from app.buisness.core.event_context import EventContext
 from app.buisness.core.asset_context import AssetContext
+from app.logger import get_logger
+
+logger = get_logger("asset_management.business.maintenance")
 
 
 class MaintenanceContext:
@@ -210,7 +214,7 @@ class MaintenanceContext:
                 raise ValueError(f"Meter verification failed: {str(e)}")
             
             # Now complete the maintenance event
-            self.maintenance_action_set.status = 'Complete'
+            self.maintenance_action_set.status = MaintenanceActionSet.COMPLETED_STATUS
             self.maintenance_action_set.end_date = datetime.utcnow()
             if user_id:
                 self.maintenance_action_set.completed_by_id = user_id
@@ -228,6 +232,9 @@ class MaintenanceContext:
                 self.maintenance_action_set.completion_notes = notes
             self._sync_event_status()
             
+            # New baseline for every plan covering the asset
+            PlanningDirtyMark.mark(asset_id=self._struct.asset_id, reason='maintenance completed')
+            
             # Commit entire transaction (meter history + asset meters + maintenance event)
             # If this fails, entire transaction is rolled back (meter history, asset meters, maintenance event)
             db.session.commit()
@@ -251,11 +258,12 @@ class MaintenanceContext:
             if notes:
                 self.maintenance_action_set.completion_notes = notes
             self._sync_event_status()
+            # The open event no longer blocks a new one (duplicate prevention)
+            PlanningDirtyMark.mark(asset_id=self._struct.asset_id, reason='maintenance cancelled')
             db.session.commit()
             self.refresh()
         return self
     
-    
     def add_comment(self, user_id: int, content: str, is_human_made: bool = False) -> 'MaintenanceContext':
         """
         Add a comment to the associated event.
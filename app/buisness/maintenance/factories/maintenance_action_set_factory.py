@@ -4,7 +4,7 @@ Factory for creating MaintenanceActionSet from TemplateActionSet.
 Handles Event creation, metadata copying, and relationship setup.
 """
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from app import db
 from app.logger import get_logger
@@ -136,4 +136,72 @@ class MaintenanceActionSetFactory:
             logger.info(f"Created MaintenanceActionSet {maintenance_action_set.id} from template {template_action_set_id} (not committed)")
         
         return maintenance_action_set
-
+    
+    @classmethod
+    def create_many_from_template(
+        cls,
+        template_action_set_id: int,
+        entries: List[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        priority: str = 'Medium',
+        commit: bool = True
+    ) -> List[MaintenanceActionSet]:
+        """
+        Create many MaintenanceActionSets from one TemplateActionSet.
+        
+        Same records as create_from_template for each entry, but the rows are
+        built with MaintenanceActionSet.bulk_create: detail IDs come from one
+        sequence call and the Events from one Event.bulk_add_events insert.
+        
+        Args:
+            template_action_set_id: Template action set ID to copy from
+            entries: Dicts with asset_id and optional planned_start_datetime
+                and maintenance_plan_id, one per maintenance event
+            user_id: User ID creating the maintenance events
+            priority: Priority level for every event - defaults to 'Medium'
+            commit: Whether to commit the transaction (default: True)
+            
+        Returns:
+            Created MaintenanceActionSet instances, in the order of entries
+        """
+        if not entries:
+            return []
+        
+        template_action_set = TemplateActionSet.query.get_or_404(template_action_set_id)
+        
+        if not template_action_set.is_active:
+            logger.warning(f"Creating maintenance from inactive template: {template_action_set_id}")
+        
+        if not user_id:
+            user_id = template_action_set.created_by_id
+        
+        now = datetime.utcnow()
+        rows = [
+            {
+                'template_action_set_id': template_action_set_id,
+                'asset_id': entry['asset_id'],
+                'maintenance_plan_id': entry.get('maintenance_plan_id'),
+                'task_name': template_action_set.task_name,
+                'estimated_duration': template_action_set.estimated_duration,
+                'safety_review_required': template_action_set.safety_review_required,
+                'staff_count': template_action_set.staff_count,
+                'parts_cost': template_action_set.parts_cost,
+                'labor_hours': template_action_set.labor_hours,
+                'planned_start_datetime': entry.get('planned_start_datetime') or now,
+                'status': 'Planned',
+                'priority': priority,
+                'created_by_id': user_id,
+                'updated_by_id': user_id,
+            }
+            for entry in entries
+        ]
+        maintenance_action_sets = MaintenanceActionSet.bulk_create(rows)
+        
+        if commit:
+            db.session.commit()
+            logger.info(f"Created {len(maintenance_action_sets)} MaintenanceActionSets from template {template_action_set_id}")
+        else:
+            db.session.flush()
+            logger.info(f"Created {len(maintenance_action_sets)} MaintenanceActionSets from template {template_action_set_id} (not committed)")
+        
+        return maintenance_action_sets
@@ -4,7 +4,7 @@ Main factory for creating complete maintenance workflows from templates.
 Coordinates all factories, handles transaction management, and validates business rules.
 """
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from app import db
 from app.logger import get_logger
@@ -160,6 +160,77 @@ class MaintenanceFactory:
             logger.error(f"Failed to create maintenance from template {template_action_set_id}: {str(e)}")
             raise
     
+    @classmethod
+    def create_many_from_template(
+        cls,
+        template_action_set_id: int,
+        entries: List[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        commit: bool = True
+    ) -> List[MaintenanceActionSet]:
+        """
+        Create many complete maintenance events from one template.
+        
+        Used by planning, which creates events for many assets at once. The
+        MaintenanceActionSets and their Events are inserted together (see
+        MaintenanceActionSetFactory.create_many_from_template); Actions,
+        PartDemands and ActionTools are then copied per event as in
+        create_from_template. Either every event is created or none is.
+        
+        Args:
+            template_action_set_id: Template action set ID to copy from
+            entries: Dicts with asset_id and optional planned_start_datetime
+                and maintenance_plan_id, one per maintenance event
+            user_id: User ID creating the maintenance events
+            commit: Whether to commit the transaction (default: True)
+            
+        Returns:
+            Created MaintenanceActionSet instances, in the order of entries
+            
+        Raises:
+            ValueError: If template not found, invalid parameters, or business rule violation
+        """
+        if not entries:
+            return []
+        
+        try:
+            maintenance_action_sets = MaintenanceActionSetFactory.create_many_from_template(
+                template_action_set_id=template_action_set_id,
+                entries=entries,
+                user_id=user_id,
+                commit=False
+            )
+            
+            action_count = 0
+            for maintenance_action_set in maintenance_action_sets:
+                actions = ActionFactory.create_from_template_action_set(
+                    template_action_set_id=template_action_set_id,
+                    maintenance_action_set_id=maintenance_action_set.id,
+                    user_id=maintenance_action_set.created_by_id,
+                    commit=False
+                )
+                action_count += len(actions)
+            
+            if not action_count:
+                logger.warning(f"No actions created from template {template_action_set_id}")
+            
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
+            logger.info(
+                f"Created {len(maintenance_action_sets)} maintenance events "
+                f"from template {template_action_set_id} with {action_count} actions"
+                f"{'' if commit else ' (not committed)'}"
+            )
+            
+            return maintenance_action_sets
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to create maintenance events from template {template_action_set_id}: {str(e)}")
+            raise
+    
     @classmethod
     def create_from_maintenance_plan(
         cls,
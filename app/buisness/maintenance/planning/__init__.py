@@ -9,6 +9,11 @@ from app.buisness.maintenance.planning.planning_result import PlanningResult
 from app.buisness.maintenance.planning.base_planner_behavior import BasePlannerBehavior
 from app.buisness.maintenance.planning.behaviors.time_based_planner import TimeBasedPlanner
 from app.buisness.maintenance.planning.behaviors.meter_based_planner import MeterBasedPlanner
+from app.buisness.maintenance.planning.behaviors.hybrid_planner import HybridPlanner
+from app.buisness.maintenance.planning.parallel_plan_executor import ParallelPlanExecutor, PlanRecord
+from app.buisness.maintenance.planning.maintenance_simulator import (
+    MaintenanceSimulator, MonthlyProjection, SimulationResult
+)
 
 __all__ = [
     'MaintenancePlanContext',
@@ -17,5 +22,11 @@ __all__ = [
     'BasePlannerBehavior',
     'TimeBasedPlanner',
     'MeterBasedPlanner',
+    'HybridPlanner',
+    'ParallelPlanExecutor',
+    'PlanRecord',
+    'MaintenanceSimulator',
+    'MonthlyProjection',
+    'SimulationResult',
 ]
 
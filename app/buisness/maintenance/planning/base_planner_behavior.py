@@ -1,11 +1,15 @@
 """
 Base Planner Behavior
 Abstract base class defining the interface for planner behaviors.
+
+Also provides the shared helpers used by the batch planning passes.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import contains_eager, lazyload
 from app.data.core.asset_info.asset import Asset
 from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
 from app.buisness.maintenance.planning.planning_result import PlanningResult
@@ -90,4 +94,65 @@ class BasePlannerBehavior(ABC):
             True if maintenance should be created
         """
         pass
-
+    
+    def find_last_relevant_maintenance_batch(
+        self,
+        plan_context: MaintenancePlanContext,
+        maintenance_template_action_set: TemplateActionSet
+    ) -> Dict[int, MaintenanceActionSet]:
+        """
+        Find the last completed maintenance for every asset the plan matches.
+        
+        One query: ROW_NUMBER() over each asset's completed maintenance for
+        the template (newest end_date first), joined to its meter reading,
+        which is loaded onto the returned objects.
+        
+        Args:
+            plan_context: MaintenancePlanContext whose matching assets to cover
+            maintenance_template_action_set: TemplateActionSet to match against
+            
+        Returns:
+            Dictionary mapping asset_id to its last completed MaintenanceActionSet
+        """
+        matching_asset_ids = plan_context.get_matching_assets_query().with_entities(Asset.id)
+        ranked = (
+            select(
+                MaintenanceActionSet.id.label('id'),
+                func.row_number().over(
+                    partition_by=MaintenanceActionSet.asset_id,
+                    order_by=(MaintenanceActionSet.end_date.desc(), MaintenanceActionSet.id.desc())
+                ).label('row_number')
+            )
+            .where(
+                MaintenanceActionSet.template_action_set_id == maintenance_template_action_set.id,
+                MaintenanceActionSet.status == MaintenanceActionSet.COMPLETED_STATUS,
+                MaintenanceActionSet.asset_id.in_(matching_asset_ids.scalar_subquery())
+            )
+            .subquery()
+        )
+        
+        last_maintenances = (
+            MaintenanceActionSet.query
+            .join(ranked, and_(ranked.c.id == MaintenanceActionSet.id, ranked.c.row_number == 1))
+            .outerjoin(MaintenanceActionSet.meter_reading)
+            .options(
+                contains_eager(MaintenanceActionSet.meter_reading),
+                # Not needed for planning; still available on access
+                lazyload(MaintenanceActionSet.actions),
+                lazyload(MaintenanceActionSet.blockers)
+            )
+            .all()
+        )
+        return {maintenance.asset_id: maintenance for maintenance in last_maintenances}
+    
+    def _error_result(self, asset: Asset, plan_context: MaintenancePlanContext, error: Exception) -> PlanningResult:
+        """Build the PlanningResult reported when an asset cannot be analyzed"""
+        return PlanningResult(
+            asset_id=asset.id,
+            asset=asset,
+            maintenance_plan_id=plan_context.id,
+            maintenance_plan=plan_context,
+            needs_maintenance=False,
+            reason=f"Error analyzing asset: {str(error)}",
+            errors=[str(error)]
+        )
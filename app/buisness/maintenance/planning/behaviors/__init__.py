@@ -5,6 +5,7 @@ Concrete implementations of planner behaviors for different frequency types.
 
 from app.buisness.maintenance.planning.behaviors.time_based_planner import TimeBasedPlanner
 from app.buisness.maintenance.planning.behaviors.meter_based_planner import MeterBasedPlanner
+from app.buisness.maintenance.planning.behaviors.hybrid_planner import HybridPlanner
 
-__all__ = ['TimeBasedPlanner', 'MeterBasedPlanner']
+__all__ = ['TimeBasedPlanner', 'MeterBasedPlanner', 'HybridPlanner']
 
@@ -0,0 +1,331 @@
+"""
+Hybrid Planner Behavior
+Handles planning for frequency types: time_or_meter1 .. time_or_meter4
+
+Maintenance is due when delta_days have passed since the last maintenance
+OR the meter advanced by its delta, whichever comes first ("every 6 months
+or 5,000 miles"). One plan covers both criteria, so an asset due on both
+gets a single event through the usual duplicate prevention.
+
+Both criteria are evaluated for the whole plan in one batch: one query for
+the last completed maintenance of every candidate asset, the meter
+thresholds over arrays (MeterBasedPlanner) and the usage-rate forecasts
+from the rate cache. The due date is the earlier of the time due date and
+the forecast meter due date. Each result reports the criterion that
+triggered in triggered_by.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from app.data.core.asset_info.asset import Asset
+from app.buisness.core.meter_usage_forecaster import MeterUsageForecaster, UsageForecast
+from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+from app.buisness.maintenance.planning.planning_result import PlanningResult
+from app.buisness.maintenance.planning.base_planner_behavior import BasePlannerBehavior
+from app.buisness.maintenance.planning.behaviors.meter_based_planner import MeterBasedPlanner
+from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+from app.data.maintenance.templates.template_action_sets import TemplateActionSet
+
+
+class HybridPlanner(BasePlannerBehavior):
+    """Planner behavior for hybrid time-or-meter maintenance (time_or_meter1-4)"""
+
+    def __init__(self):
+        self._meter_planner = MeterBasedPlanner()
+        self._forecaster = MeterUsageForecaster()
+
+    def find_assets_needing_maintenance(
+        self,
+        plan_context: MaintenancePlanContext,
+        batch: bool = True
+    ) -> List[PlanningResult]:
+        """
+        Find assets that need maintenance by time or meter, whichever comes first.
+
+        Args:
+            plan_context: MaintenancePlanContext for the plan to analyze
+            batch: Analyze all assets with one query (False: one query per asset)
+
+        Returns:
+            List of PlanningResult objects
+        """
+        matching_assets = plan_context.get_matching_assets()
+        active_assets = [asset for asset in matching_assets if asset.is_active]
+        if not plan_context.meter_field or not active_assets:
+            return []
+
+        template_action_set = plan_context.template_action_set
+        try:
+            if batch:
+                last_by_asset = self.find_last_relevant_maintenance_batch(plan_context, template_action_set)
+                rates = self._forecaster.get_rates(
+                    plan_context.get_matching_assets_query().with_entities(Asset.id),
+                    plan_context.meter_field
+                )
+            else:
+                last_by_asset = {
+                    asset.id: self.find_last_relevant_maintenance(asset, template_action_set)
+                    for asset in active_assets
+                }
+                rates = self._forecaster.get_rates([asset.id for asset in active_assets], plan_context.meter_field)
+        except Exception as e:
+            return [self._error_result(asset, plan_context, e) for asset in active_assets]
+
+        return self._evaluate(plan_context, active_assets, last_by_asset, rates, datetime.utcnow())
+
+    def calculate_due_date(
+        self,
+        asset: Asset,
+        plan_context: MaintenancePlanContext,
+        last_maintenance: Optional[MaintenanceActionSet] = None
+    ) -> Optional[datetime]:
+        """
+        Calculate when maintenance is due for a specific asset.
+
+        The earlier of the time due date and the forecast meter due date.
+
+        Args:
+            asset: Asset to calculate due date for
+            plan_context: MaintenancePlanContext for the plan
+            last_maintenance: Last completed maintenance (if available)
+
+        Returns:
+            Due date or None if cannot be calculated
+        """
+        return self._evaluate_one(asset, plan_context, last_maintenance).due_date
+
+    def find_last_relevant_maintenance(
+        self,
+        asset: Asset,
+        maintenance_template_action_set: TemplateActionSet
+    ) -> Optional[MaintenanceActionSet]:
+        """
+        Find the last completed maintenance for an asset that matches the template.
+
+        Args:
+            asset: Asset to find maintenance for
+            maintenance_template_action_set: TemplateActionSet to match against
+
+        Returns:
+            MaintenanceActionSet or None if no maintenance found
+        """
+        return (
+            MaintenanceActionSet.query
+            .filter_by(
+                asset_id=asset.id,
+                template_action_set_id=maintenance_template_action_set.id,
+                status=MaintenanceActionSet.COMPLETED_STATUS
+            )
+            .order_by(MaintenanceActionSet.end_date.desc(), MaintenanceActionSet.id.desc())
+            .first()
+        )
+
+    def should_create_maintenance(
+        self,
+        asset: Asset,
+        plan_context: MaintenancePlanContext,
+        last_maintenance: Optional[MaintenanceActionSet] = None
+    ) -> bool:
+        """
+        Determine if maintenance should be created for this asset.
+
+        Args:
+            asset: Asset to check
+            plan_context: MaintenancePlanContext for the plan
+            last_maintenance: Last completed maintenance (if available)
+
+        Returns:
+            True if the time or the meter threshold is reached
+        """
+        return self._evaluate_one(asset, plan_context, last_maintenance).needs_maintenance
+
+    def _evaluate_one(
+        self,
+        asset: Asset,
+        plan_context: MaintenancePlanContext,
+        last_maintenance: Optional[MaintenanceActionSet]
+    ) -> PlanningResult:
+        """Evaluate a single asset"""
+        rates = self._forecaster.get_rates([asset.id], plan_context.meter_field) if plan_context.meter_field else {}
+        return self._evaluate(plan_context, [asset], {asset.id: last_maintenance}, rates, datetime.utcnow())[0]
+
+    def _evaluate(
+        self,
+        plan_context: MaintenancePlanContext,
+        assets: Sequence[Asset],
+        last_by_asset: Dict[int, Optional[MaintenanceActionSet]],
+        rates: Dict,
+        now: datetime
+    ) -> List[PlanningResult]:
+        """
+        Evaluate both criteria for loaded assets.
+
+        Args:
+            plan_context: MaintenancePlanContext for the plan
+            assets: Assets to evaluate
+            last_by_asset: Last completed maintenance per asset ID
+            rates: Cached MeterUsageRate per asset ID for the plan's meter
+            now: Reference time for the time criterion
+
+        Returns:
+            List of PlanningResult objects, in asset order
+        """
+        meter_field = plan_context.meter_field
+        meter_delta = plan_context.meter_delta
+        delta_days = plan_context.maintenance_plan.delta_days
+
+        last_maintenances = [last_by_asset.get(asset.id) for asset in assets]
+        last_readings = [maintenance.meter_reading if maintenance else None for maintenance in last_maintenances]
+        current_values = [getattr(asset, meter_field) for asset in assets]
+        last_values = [getattr(reading, meter_field) if reading else None for reading in last_readings]
+        meter_needs, meter_deltas = self._meter_planner._evaluate_meter_thresholds(
+            current_values, last_values, meter_delta
+        )
+
+        results = []
+        for index, asset in enumerate(assets):
+            last_maintenance = last_maintenances[index]
+            try:
+                # Time criterion: same baseline as TimeBasedPlanner
+                last_maintenance_date = None
+                if last_maintenance and last_maintenance.end_date:
+                    last_maintenance_date = last_maintenance.end_date
+                elif asset.created_at:
+                    last_maintenance_date = asset.created_at
+                days_since = None
+                time_due_date = None
+                if last_maintenance_date:
+                    days_since = (now - last_maintenance_date).total_seconds() / 86400
+                    if delta_days:
+                        time_due_date = last_maintenance_date + timedelta(days=delta_days)
+                time_triggered = bool(delta_days) and (days_since is None or days_since >= delta_days)
+
+                # Meter criterion: same baseline as MeterBasedPlanner
+                meter_triggered = meter_needs[index]
+                forecast = self._forecaster.forecast(
+                    rates.get(asset.id),
+                    current_values[index],
+                    MeterBasedPlanner.next_due_meter(current_values[index], last_values[index], meter_delta)
+                )
+
+                if time_triggered and meter_triggered:
+                    triggered_by = 'time and meter'
+                elif time_triggered:
+                    triggered_by = 'time'
+                elif meter_triggered:
+                    triggered_by = 'meter'
+                else:
+                    triggered_by = None
+                needs_maintenance = triggered_by is not None
+
+                meter_readings_at_last = {'meter1': None, 'meter2': None, 'meter3': None, 'meter4': None}
+                meter_delta_values = {'meter1': None, 'meter2': None, 'meter3': None, 'meter4': None}
+                meter_reading = last_readings[index]
+                if meter_reading:
+                    meter_readings_at_last = {
+                        'meter1': meter_reading.meter1,
+                        'meter2': meter_reading.meter2,
+                        'meter3': meter_reading.meter3,
+                        'meter4': meter_reading.meter4
+                    }
+                    meter_delta_values[meter_field] = meter_deltas[index]
+
+                due_date, due_date_earliest, due_date_latest = self.combine_due_dates(time_due_date, forecast)
+                results.append(PlanningResult(
+                    asset_id=asset.id,
+                    asset=asset,
+                    maintenance_plan_id=plan_context.id,
+                    maintenance_plan=plan_context,
+                    needs_maintenance=needs_maintenance,
+                    reason=self._determine_reason(
+                        plan_context,
+                        time_triggered,
+                        meter_triggered,
+                        days_since,
+                        current_values[index],
+                        last_values[index],
+                        meter_deltas[index]
+                    ),
+                    due_date=due_date,
+                    due_date_earliest=due_date_earliest,
+                    due_date_latest=due_date_latest,
+                    last_maintenance_date=last_maintenance_date,
+                    last_maintenance=last_maintenance,
+                    current_meter_readings={
+                        'meter1': asset.meter1,
+                        'meter2': asset.meter2,
+                        'meter3': asset.meter3,
+                        'meter4': asset.meter4
+                    },
+                    meter_readings_at_last_maintenance=meter_readings_at_last,
+                    days_since_last_maintenance=days_since,
+                    meter_delta=meter_delta_values,
+                    recommended_start_date=now if needs_maintenance else None,
+                    triggered_by=triggered_by
+                ))
+            except Exception as e:
+                results.append(self._error_result(asset, plan_context, e))
+
+        return results
+
+    @staticmethod
+    def combine_due_dates(
+        time_due_date: Optional[datetime],
+        forecast: Optional[UsageForecast]
+    ) -> Tuple[Optional[datetime], Optional[datetime], Optional[datetime]]:
+        """
+        Due date and confidence band of "whichever comes first".
+
+        The time due date is exact; the meter due date lies in the forecast
+        band (open-ended when the forecast has no latest date).
+
+        Returns:
+            Tuple of (due date, earliest, latest)
+        """
+        if forecast is None:
+            return time_due_date, None, None
+        if time_due_date is None:
+            return forecast.due_date, forecast.earliest_due_date, forecast.latest_due_date
+        latest = min(time_due_date, forecast.latest_due_date) if forecast.latest_due_date else time_due_date
+        return (
+            min(time_due_date, forecast.due_date),
+            min(time_due_date, forecast.earliest_due_date),
+            latest
+        )
+
+    def _determine_reason(
+        self,
+        plan_context: MaintenancePlanContext,
+        time_triggered: bool,
+        meter_triggered: bool,
+        days_since: Optional[float],
+        current_meter: Optional[float],
+        last_meter: Optional[float],
+        meter_delta: Optional[float]
+    ) -> str:
+        """Determine the reason for the planning result"""
+        meter_field = plan_context.meter_field
+        delta_days = plan_context.maintenance_plan.delta_days
+        delta_threshold = plan_context.meter_delta
+
+        if days_since is not None and delta_days:
+            time_status = f"{days_since:.1f} of {delta_days} days"
+        elif delta_days:
+            time_status = f"no baseline date ({delta_days} days)"
+        else:
+            time_status = "no days threshold"
+        if current_meter is None:
+            meter_status = f"no current {meter_field} reading"
+        elif delta_threshold:
+            used = meter_delta if meter_delta is not None and meter_delta >= 0 else current_meter
+            meter_status = f"{meter_field} {used:.1f} of {delta_threshold}"
+        else:
+            meter_status = f"no {meter_field} threshold"
+
+        if time_triggered and meter_triggered:
+            return f"Days and {meter_field.upper()} thresholds exceeded ({time_status}; {meter_status})"
+        if time_triggered:
+            return f"Days threshold ({delta_days}) exceeded first ({time_status}; {meter_status})"
+        if meter_triggered:
+            return f"{meter_field.upper()} threshold ({delta_threshold}) exceeded first ({time_status}; {meter_status})"
+        return f"Maintenance not yet due ({time_status}; {meter_status})"
@@ -1,11 +1,24 @@
 """
 Meter-Based Planner Behavior
 Handles planning for frequency types: meter1, meter2, meter3, meter4
+
+By default the whole plan is analyzed in one batch: the last completed
+maintenance (with its meter reading) of every candidate asset is loaded with
+one window-function query, and deltas and thresholds are evaluated in one
+pass over the candidates. The per-asset path
+(batch=False) is kept for reference and produces the same results.
+
+Due dates are forecast from each asset's fitted usage rate
+(MeterUsageForecaster): the date the meter is projected to reach the next
+due meter value, with a confidence band. Assets without enough meter
+history get no due date.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 from app.data.core.asset_info.asset import Asset
+from app.data.core.asset_info.meter_usage_rates import MeterUsageRate
+from app.buisness.core.meter_usage_forecaster import MeterUsageForecaster, UsageForecast
 from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
 from app.buisness.maintenance.planning.planning_result import PlanningResult
 from app.buisness.maintenance.planning.base_planner_behavior import BasePlannerBehavior
@@ -19,17 +32,22 @@ class MeterBasedPlanner(BasePlannerBehavior):
     
     def find_assets_needing_maintenance(
         self, 
-        plan_context: MaintenancePlanContext
+        plan_context: MaintenancePlanContext,
+        batch: bool = True
     ) -> List[PlanningResult]:
         """
         Find assets that need maintenance based on meter readings.
         
         Args:
             plan_context: MaintenancePlanContext for the plan to analyze
+            batch: Analyze all assets with one query (False: one query per asset)
             
         Returns:
             List of PlanningResult objects
         """
+        if batch:
+            return self.find_assets_needing_maintenance_batch(plan_context)
+        
         results = []
         matching_assets = plan_context.get_matching_assets()
         
@@ -45,6 +63,12 @@ class MeterBasedPlanner(BasePlannerBehavior):
             # Invalid frequency type
             return results
         
+        # Usage rates of every candidate asset, loaded once
+        rates = MeterUsageForecaster().get_rates(
+            plan_context.get_matching_assets_query().with_entities(Asset.id),
+            meter_field
+        )
+        
         for asset in active_assets:
             try:
                 # Find last completed maintenance
@@ -60,11 +84,12 @@ class MeterBasedPlanner(BasePlannerBehavior):
                     last_maintenance
                 )
                 
-                # Calculate due date (for meter-based, this is less meaningful)
-                due_date = self.calculate_due_date(
+                # Forecast due date from the asset's usage rate
+                forecast = self.forecast_due_date(
                     asset,
                     plan_context,
-                    last_maintenance
+                    last_maintenance,
+                    rates=rates
                 )
                 
                 # Get current meter readings
@@ -134,7 +159,9 @@ class MeterBasedPlanner(BasePlannerBehavior):
                     maintenance_plan=plan_context,
                     needs_maintenance=needs_maintenance,
                     reason=reason,
-                    due_date=due_date,
+                    due_date=forecast.due_date if forecast else None,
+                    due_date_earliest=forecast.earliest_due_date if forecast else None,
+                    due_date_latest=forecast.latest_due_date if forecast else None,
                     last_maintenance_date=last_maintenance_date,
                     last_maintenance=last_maintenance,
                     current_meter_readings=current_meter_readings,
@@ -161,6 +188,158 @@ class MeterBasedPlanner(BasePlannerBehavior):
         
         return results
     
+    def find_assets_needing_maintenance_batch(
+        self,
+        plan_context: MaintenancePlanContext
+    ) -> List[PlanningResult]:
+        """
+        Find assets that need maintenance for the whole plan in one pass.
+        
+        Returns the same PlanningResult list as the per-asset path, but loads
+        the last completed maintenance of every asset with a single query and
+        evaluates the meter thresholds over arrays.
+        
+        Args:
+            plan_context: MaintenancePlanContext for the plan to analyze
+            
+        Returns:
+            List of PlanningResult objects
+        """
+        matching_assets = plan_context.get_matching_assets()
+        active_assets = [asset for asset in matching_assets if asset.is_active]
+        
+        template_action_set = plan_context.template_action_set
+        frequency_type = plan_context.maintenance_plan.frequency_type
+        
+        meter_field = self._get_meter_field(frequency_type)
+        if not meter_field or not active_assets:
+            return []
+        
+        try:
+            last_by_asset = self.find_last_relevant_maintenance_batch(plan_context, template_action_set)
+        except Exception as e:
+            return [self._error_result(asset, plan_context, e) for asset in active_assets]
+        
+        last_maintenances = [last_by_asset.get(asset.id) for asset in active_assets]
+        last_readings = [
+            maintenance.meter_reading if maintenance else None
+            for maintenance in last_maintenances
+        ]
+        current_values = [getattr(asset, meter_field) for asset in active_assets]
+        last_values = [
+            getattr(reading, meter_field) if reading else None
+            for reading in last_readings
+        ]
+        
+        delta_threshold = self._get_delta_threshold(plan_context, frequency_type)
+        needs, deltas = self._evaluate_meter_thresholds(current_values, last_values, delta_threshold)
+        
+        forecaster = MeterUsageForecaster()
+        rates = forecaster.get_rates(
+            plan_context.get_matching_assets_query().with_entities(Asset.id),
+            meter_field
+        )
+        
+        now = datetime.utcnow()
+        results = []
+        for index, asset in enumerate(active_assets):
+            last_maintenance = last_maintenances[index]
+            try:
+                forecast = forecaster.forecast(
+                    rates.get(asset.id),
+                    current_values[index],
+                    self.next_due_meter(current_values[index], last_values[index], delta_threshold)
+                )
+                meter_reading = last_readings[index]
+                current_meter_readings = {
+                    'meter1': asset.meter1,
+                    'meter2': asset.meter2,
+                    'meter3': asset.meter3,
+                    'meter4': asset.meter4
+                }
+                meter_readings_at_last = {'meter1': None, 'meter2': None, 'meter3': None, 'meter4': None}
+                meter_delta = {'meter1': None, 'meter2': None, 'meter3': None, 'meter4': None}
+                if meter_reading:
+                    meter_readings_at_last = {
+                        'meter1': meter_reading.meter1,
+                        'meter2': meter_reading.meter2,
+                        'meter3': meter_reading.meter3,
+                        'meter4': meter_reading.meter4
+                    }
+                    meter_delta[meter_field] = deltas[index]
+                
+                days_since = None
+                last_maintenance_date = None
+                if last_maintenance and last_maintenance.end_date:
+                    last_maintenance_date = last_maintenance.end_date
+                elif asset.created_at:
+                    last_maintenance_date = asset.created_at
+                if last_maintenance_date:
+                    days_since = (now - last_maintenance_date).total_seconds() / 86400
+                
+                needs_maintenance = needs[index]
+                results.append(PlanningResult(
+                    asset_id=asset.id,
+                    asset=asset,
+                    maintenance_plan_id=plan_context.id,
+                    maintenance_plan=plan_context,
+                    needs_maintenance=needs_maintenance,
+                    reason=self._determine_reason(
+                        plan_context,
+                        needs_maintenance,
+                        meter_field,
+                        current_values[index],
+                        meter_readings_at_last[meter_field],
+                        meter_delta[meter_field]
+                    ),
+                    due_date=forecast.due_date if forecast else None,
+                    due_date_earliest=forecast.earliest_due_date if forecast else None,
+                    due_date_latest=forecast.latest_due_date if forecast else None,
+                    last_maintenance_date=last_maintenance_date,
+                    last_maintenance=last_maintenance,
+                    current_meter_readings=current_meter_readings,
+                    meter_readings_at_last_maintenance=meter_readings_at_last,
+                    days_since_last_maintenance=days_since,
+                    meter_delta=meter_delta,
+                    recommended_start_date=now if needs_maintenance else None
+                ))
+            except Exception as e:
+                results.append(self._error_result(asset, plan_context, e))
+        
+        return results
+    
+    def _evaluate_meter_thresholds(
+        self,
+        current_values: Sequence[Optional[float]],
+        last_values: Sequence[Optional[float]],
+        delta_threshold: Optional[float]
+    ) -> Tuple[List[bool], List[Optional[float]]]:
+        """
+        Evaluate should_create_maintenance for many assets at once.
+        
+        Args:
+            current_values: Current meter value per asset (None if missing)
+            last_values: Meter value at last maintenance per asset (None if missing)
+            delta_threshold: Plan delta for the meter (None: never due)
+            
+        Returns:
+            Tuple of (needs maintenance per asset, current - last per asset or
+            None when either value is missing)
+        """
+        needs = []
+        deltas = []
+        for current, last in zip(current_values, last_values):
+            deltas.append(current - last if current is not None and last is not None else None)
+            if current is None or delta_threshold is None:
+                needs.append(False)
+                continue
+            # No previous reading compares to 0; a meter that went backwards was reset
+            effective_delta = current - (last if last is not None else 0)
+            if effective_delta < 0:
+                effective_delta = current
+            needs.append(effective_delta >= delta_threshold)
+        return needs, deltas
+    
     def calculate_due_date(
         self,
         asset: Asset,
@@ -169,7 +348,7 @@ class MeterBasedPlanner(BasePlannerBehavior):
     ) -> Optional[datetime]:
         """
         Calculate when maintenance is due for a specific asset.
-        For meter-based planning, this is less meaningful but can estimate based on usage.
+        For meter-based planning, this is forecast from the asset's usage rate.
         
         Args:
             asset: Asset to calculate due date for
@@ -179,9 +358,76 @@ class MeterBasedPlanner(BasePlannerBehavior):
         Returns:
             Due date or None if cannot be calculated
         """
-        # For meter-based, we can't really predict a due date
-        # Return None to indicate it's meter-based
-        return None
+        forecast = self.forecast_due_date(asset, plan_context, last_maintenance)
+        return forecast.due_date if forecast else None
+    
+    def forecast_due_date(
+        self,
+        asset: Asset,
+        plan_context: MaintenancePlanContext,
+        last_maintenance: Optional[MaintenanceActionSet] = None,
+        rates: Optional[Dict[int, MeterUsageRate]] = None
+    ) -> Optional[UsageForecast]:
+        """
+        Forecast when an asset's meter reaches the plan's next due meter value.
+        
+        Args:
+            asset: Asset to forecast for
+            plan_context: MaintenancePlanContext for the plan
+            last_maintenance: Last completed maintenance (if available)
+            rates: Usage rates of the plan's meter by asset ID, preloaded for
+                many assets (default: load this asset's rate)
+            
+        Returns:
+            UsageForecast with the due date and its confidence band, or None
+            without a usage rate or threshold
+        """
+        frequency_type = plan_context.maintenance_plan.frequency_type
+        meter_field = self._get_meter_field(frequency_type)
+        if not meter_field:
+            return None
+        
+        current_meter = getattr(asset, meter_field, None)
+        last_meter = None
+        if last_maintenance and last_maintenance.meter_reading:
+            last_meter = getattr(last_maintenance.meter_reading, meter_field, None)
+        
+        forecaster = MeterUsageForecaster()
+        if rates is None:
+            rates = forecaster.get_rates([asset.id], meter_field)
+        return forecaster.forecast(
+            rates.get(asset.id),
+            current_meter,
+            self.next_due_meter(current_meter, last_meter, self._get_delta_threshold(plan_context, frequency_type))
+        )
+    
+    @staticmethod
+    def next_due_meter(
+        current_meter: Optional[float],
+        last_meter: Optional[float],
+        delta_threshold: Optional[float]
+    ) -> Optional[float]:
+        """
+        Meter value at which maintenance is next due.
+        
+        Uses the same baseline as should_create_maintenance: no reading at
+        the last maintenance counts from 0, and so does a meter below that
+        reading (reset).
+        
+        Args:
+            current_meter: Current meter value
+            last_meter: Meter value at the last maintenance
+            delta_threshold: Plan delta for the meter
+            
+        Returns:
+            Next due meter value, or None without a threshold
+        """
+        if not delta_threshold:
+            return None
+        baseline = last_meter or 0
+        if current_meter is not None and current_meter < baseline:
+            baseline = 0
+        return baseline + delta_threshold
     
     def find_last_relevant_maintenance(
         self,
@@ -204,9 +450,9 @@ class MeterBasedPlanner(BasePlannerBehavior):
             .filter_by(
                 asset_id=asset.id,
                 template_action_set_id=maintenance_template_action_set.id,
-                status='Completed'
+                status=MaintenanceActionSet.COMPLETED_STATUS
             )
-            .order_by(MaintenanceActionSet.end_date.desc())
+            .order_by(MaintenanceActionSet.end_date.desc(), MaintenanceActionSet.id.desc())
             .first()
         )
         
@@ -1,6 +1,12 @@
 """
 Time-Based Planner Behavior
 Handles planning for frequency types: hours, days
+
+By default the whole plan is analyzed in one batch: the last completed
+maintenance of every candidate asset is loaded with one window-function
+query, and days-since and due dates are computed from the loaded baselines
+against a single timestamp. The per-asset path (batch=False) is kept for
+reference and produces the same results.
 """
 
 from typing import List, Optional
@@ -19,17 +25,22 @@ class TimeBasedPlanner(BasePlannerBehavior):
     
     def find_assets_needing_maintenance(
         self, 
-        plan_context: MaintenancePlanContext
+        plan_context: MaintenancePlanContext,
+        batch: bool = True
     ) -> List[PlanningResult]:
         """
         Find assets that need maintenance based on time since last maintenance.
         
         Args:
             plan_context: MaintenancePlanContext for the plan to analyze
+            batch: Analyze all assets with one query (False: one query per asset)
             
         Returns:
             List of PlanningResult objects
         """
+        if batch:
+            return self.find_assets_needing_maintenance_batch(plan_context)
+        
         results = []
         matching_assets = plan_context.get_matching_assets()
         
@@ -139,6 +150,90 @@ class TimeBasedPlanner(BasePlannerBehavior):
         
         return results
     
+    def find_assets_needing_maintenance_batch(
+        self,
+        plan_context: MaintenancePlanContext
+    ) -> List[PlanningResult]:
+        """
+        Find assets that need maintenance for the whole plan in one pass.
+        
+        Returns the same PlanningResult list as the per-asset path. The
+        number of queries does not depend on the number of assets.
+        
+        Args:
+            plan_context: MaintenancePlanContext for the plan to analyze
+            
+        Returns:
+            List of PlanningResult objects
+        """
+        matching_assets = plan_context.get_matching_assets()
+        active_assets = [asset for asset in matching_assets if asset.is_active]
+        if not active_assets:
+            return []
+        
+        template_action_set = plan_context.template_action_set
+        try:
+            last_by_asset = self.find_last_relevant_maintenance_batch(plan_context, template_action_set)
+        except Exception as e:
+            return [self._error_result(asset, plan_context, e) for asset in active_assets]
+        
+        now = datetime.utcnow()
+        results = []
+        for asset in active_assets:
+            last_maintenance = last_by_asset.get(asset.id)
+            try:
+                # Baseline: last maintenance end date, else asset creation date
+                last_maintenance_date = None
+                if last_maintenance and last_maintenance.end_date:
+                    last_maintenance_date = last_maintenance.end_date
+                elif asset.created_at:
+                    last_maintenance_date = asset.created_at
+                
+                days_since = None
+                if last_maintenance_date:
+                    days_since = (now - last_maintenance_date).total_seconds() / 86400
+                needs_maintenance = self._is_time_threshold_exceeded(plan_context, last_maintenance_date, now)
+                
+                meter_readings_at_last = {'meter1': None, 'meter2': None, 'meter3': None, 'meter4': None}
+                if last_maintenance and last_maintenance.meter_reading:
+                    meter_reading = last_maintenance.meter_reading
+                    meter_readings_at_last = {
+                        'meter1': meter_reading.meter1,
+                        'meter2': meter_reading.meter2,
+                        'meter3': meter_reading.meter3,
+                        'meter4': meter_reading.meter4
+                    }
+                
+                results.append(PlanningResult(
+                    asset_id=asset.id,
+                    asset=asset,
+                    maintenance_plan_id=plan_context.id,
+                    maintenance_plan=plan_context,
+                    needs_maintenance=needs_maintenance,
+                    reason=self._determine_reason(
+                        plan_context,
+                        needs_maintenance,
+                        days_since,
+                        last_maintenance_date
+                    ),
+                    due_date=self.calculate_due_date(asset, plan_context, last_maintenance),
+                    last_maintenance_date=last_maintenance_date,
+                    last_maintenance=last_maintenance,
+                    current_meter_readings={
+                        'meter1': asset.meter1,
+                        'meter2': asset.meter2,
+                        'meter3': asset.meter3,
+                        'meter4': asset.meter4
+                    },
+                    meter_readings_at_last_maintenance=meter_readings_at_last,
+                    days_since_last_maintenance=days_since,
+                    recommended_start_date=now if needs_maintenance else None
+                ))
+            except Exception as e:
+                results.append(self._error_result(asset, plan_context, e))
+        
+        return results
+    
     def calculate_due_date(
         self,
         asset: Asset,
@@ -206,9 +301,9 @@ class TimeBasedPlanner(BasePlannerBehavior):
             .filter_by(
                 asset_id=asset.id,
                 template_action_set_id=maintenance_template_action_set.id,
-                status='Completed'
+                status=MaintenanceActionSet.COMPLETED_STATUS
             )
-            .order_by(MaintenanceActionSet.end_date.desc())
+            .order_by(MaintenanceActionSet.end_date.desc(), MaintenanceActionSet.id.desc())
             .first()
         )
         
@@ -231,16 +326,27 @@ class TimeBasedPlanner(BasePlannerBehavior):
         Returns:
             True if maintenance should be created
         """
-        frequency_type = plan_context.maintenance_plan.frequency_type
-        plan = plan_context.maintenance_plan
-        now = datetime.utcnow()
-        
         # Determine baseline date
         if last_maintenance and last_maintenance.end_date:
             baseline_date = last_maintenance.end_date
         elif asset.created_at:
             baseline_date = asset.created_at
         else:
+            baseline_date = None
+        
+        return self._is_time_threshold_exceeded(plan_context, baseline_date, datetime.utcnow())
+    
+    def _is_time_threshold_exceeded(
+        self,
+        plan_context: MaintenancePlanContext,
+        baseline_date: Optional[datetime],
+        now: datetime
+    ) -> bool:
+        """Check the plan's hours/days threshold for time elapsed since baseline_date"""
+        frequency_type = plan_context.maintenance_plan.frequency_type
+        plan = plan_context.maintenance_plan
+        
+        if baseline_date is None:
             # No baseline, can't determine - default to needing maintenance
             return True
         
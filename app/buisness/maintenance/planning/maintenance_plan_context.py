@@ -4,13 +4,17 @@ Business logic context manager for maintenance plans.
 Provides plan scheduling, frequency management, and maintenance event creation.
 """
 
-from typing import List, Optional, Union, Dict, Any
+from typing import List, Optional, Union, Dict, Any, Iterable
 from datetime import datetime, timedelta
 from app import db
 from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
 from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
 from app.data.core.asset_info.asset import Asset
 from app.data.core.event_info.event import Event
+from app.logger import get_logger
+
+logger = get_logger("asset_management.business.maintenance.planning")
 
 
 class MaintenancePlanContext:
@@ -21,12 +25,24 @@ class MaintenancePlanContext:
     Provides plan scheduling, frequency management, template assignment, and maintenance event creation.
     """
     
-    def __init__(self, maintenance_plan: Union[MaintenancePlan, int]):
+    # Frequency types driven by a single asset meter
+    METER_FIELDS = ('meter1', 'meter2', 'meter3', 'meter4')
+    
+    # Hybrid frequency types: 'time_or_meter1'..'time_or_meter4' (delta_days or the meter delta)
+    HYBRID_PREFIX = 'time_or_'
+    
+    def __init__(
+        self,
+        maintenance_plan: Union[MaintenancePlan, int],
+        asset_ids: Optional[Iterable[int]] = None
+    ):
         """
         Initialize MaintenancePlanContext with MaintenancePlan instance or ID.
         
         Args:
             maintenance_plan: MaintenancePlan instance or ID
+            asset_ids: Optional asset IDs to restrict the plan's matching assets to
+                       (incremental planning)
         """
         if isinstance(maintenance_plan, int):
             self._maintenance_plan = MaintenancePlan.query.get_or_404(maintenance_plan)
@@ -34,6 +50,7 @@ class MaintenancePlanContext:
         else:
             self._maintenance_plan = maintenance_plan
             self._maintenance_plan_id = maintenance_plan.id
+        self._asset_ids = list(asset_ids) if asset_ids is not None else None
     
     @property
     def maintenance_plan(self) -> MaintenancePlan:
@@ -50,6 +67,11 @@ class MaintenancePlanContext:
         """Get the maintenance plan ID (alias)"""
         return self._maintenance_plan_id
     
+    @property
+    def asset_ids(self) -> Optional[List[int]]:
+        """Get the asset IDs matching is restricted to (None: all matching assets)"""
+        return self._asset_ids
+    
     # Convenience properties
     @property
     def name(self) -> str:
@@ -66,6 +88,23 @@ class MaintenancePlanContext:
         """Check if plan is active"""
         return self._maintenance_plan.status == 'Active'
     
+    @property
+    def meter_field(self) -> Optional[str]:
+        """Get the meter the plan is driven by ('meter1'..'meter4'), for meter and hybrid plans"""
+        meter_field = self._maintenance_plan.frequency_type.replace(self.HYBRID_PREFIX, '', 1)
+        return meter_field if meter_field in self.METER_FIELDS else None
+    
+    @property
+    def meter_delta(self) -> Optional[float]:
+        """Get the plan's delta for its meter (None without a meter)"""
+        meter_field = self.meter_field
+        return getattr(self._maintenance_plan, f'delta_m{meter_field[-1]}') if meter_field else None
+    
+    @property
+    def is_hybrid(self) -> bool:
+        """Check if the plan is due on time or meter, whichever comes first"""
+        return self._maintenance_plan.frequency_type.startswith(self.HYBRID_PREFIX)
+    
     @property
     def template_action_set(self):
         """Get the associated TemplateActionSet"""
@@ -84,6 +123,7 @@ class MaintenancePlanContext:
             self for chaining
         """
         self._maintenance_plan.status = 'Active'
+        PlanningDirtyMark.mark(maintenance_plan_id=self._maintenance_plan_id, reason='plan activated')
         db.session.commit()
         return self
     
@@ -95,15 +135,26 @@ class MaintenancePlanContext:
             self for chaining
         """
         self._maintenance_plan.status = 'Inactive'
+        PlanningDirtyMark.mark(maintenance_plan_id=self._maintenance_plan_id, reason='plan deactivated')
         db.session.commit()
         return self
     
-    def calculate_next_due_date(self, last_maintenance_date: Optional[datetime] = None) -> Optional[datetime]:
+    def calculate_next_due_date(
+        self,
+        last_maintenance_date: Optional[datetime] = None,
+        asset: Optional[Asset] = None,
+        last_meter: Optional[float] = None
+    ) -> Optional[datetime]:
         """
         Calculate next due date based on plan frequency.
         
+        Hybrid plans are due at the earlier of the time due date and, when
+        an asset is given, its forecast meter due date (HybridPlanner's rule).
+        
         Args:
             last_maintenance_date: Last maintenance date (defaults to now)
+            asset: Asset whose meter forecast is included (hybrid plans)
+            last_meter: The asset's meter value at the last maintenance (hybrid plans)
             
         Returns:
             Next due date or None if cannot be calculated
@@ -113,7 +164,9 @@ class MaintenancePlanContext:
         
         frequency_type = self._maintenance_plan.frequency_type
         
-        if frequency_type == 'hours' and self._maintenance_plan.delta_hours:
+        if self.is_hybrid:
+            return self._calculate_hybrid_due_date(last_maintenance_date, asset, last_meter)
+        elif frequency_type == 'hours' and self._maintenance_plan.delta_hours:
             return last_maintenance_date + timedelta(hours=self._maintenance_plan.delta_hours)
         elif frequency_type == 'meter1' and self._maintenance_plan.delta_m1:
             # Meter-based calculations would need current meter reading
@@ -132,6 +185,33 @@ class MaintenancePlanContext:
         
         return None
     
+    def _calculate_hybrid_due_date(
+        self,
+        last_maintenance_date: datetime,
+        asset: Optional[Asset],
+        last_meter: Optional[float]
+    ) -> Optional[datetime]:
+        """Earlier of the delta_days due date and the asset's forecast meter due date"""
+        # Planner behaviors import this module
+        from app.buisness.core.meter_usage_forecaster import MeterUsageForecaster
+        from app.buisness.maintenance.planning.behaviors.hybrid_planner import HybridPlanner
+        from app.buisness.maintenance.planning.behaviors.meter_based_planner import MeterBasedPlanner
+        
+        delta_days = self._maintenance_plan.delta_days
+        time_due_date = last_maintenance_date + timedelta(days=delta_days) if delta_days else None
+        
+        forecast = None
+        meter_field = self.meter_field
+        if asset is not None and meter_field:
+            forecaster = MeterUsageForecaster()
+            current_meter = getattr(asset, meter_field)
+            forecast = forecaster.forecast(
+                forecaster.get_rates([asset.id], meter_field).get(asset.id),
+                current_meter,
+                MeterBasedPlanner.next_due_meter(current_meter, last_meter, self.meter_delta)
+            )
+        return HybridPlanner.combine_due_dates(time_due_date, forecast)[0]
+    
     def get_matching_assets(self) -> List[Asset]:
         """
         Get assets that match this maintenance plan's criteria.
@@ -139,6 +219,19 @@ class MaintenancePlanContext:
         Returns:
             List of Asset instances that match the plan's asset_type_id and model_id
         """
+        return self.get_matching_assets_query().all()
+    
+    def get_matching_assets_query(self):
+        """
+        Get the query for assets that match this maintenance plan's criteria.
+        
+        Useful as a subquery when loading per-asset data for the whole plan
+        in one statement.
+        
+        Returns:
+            Asset query filtered by the plan's asset_type_id and model_id
+            (and by asset_ids, if the context was created with them)
+        """
         query = Asset.query
         
         if self._maintenance_plan.asset_type_id:
@@ -149,7 +242,10 @@ class MaintenancePlanContext:
         if self._maintenance_plan.model_id:
             query = query.filter(Asset.make_model_id == self._maintenance_plan.model_id)
         
-        return query.all()
+        if self._asset_ids is not None:
+            query = query.filter(Asset.id.in_(self._asset_ids))
+        
+        return query
     
     def create_maintenance_event(
         self,
@@ -192,6 +288,45 @@ class MaintenancePlanContext:
         
         return maintenance_action_set
     
+    def create_maintenance_events(
+        self,
+        planned_starts: Dict[int, Optional[datetime]],
+        user_id: Optional[int] = None
+    ) -> List[MaintenanceActionSet]:
+        """
+        Create maintenance events from this plan for many assets at once.
+        
+        Delegates to MaintenanceFactory.create_many_from_template, which
+        inserts the action sets and their events in one batch.
+        
+        Args:
+            planned_starts: Planned start datetime per asset ID (None means now)
+            user_id: User ID creating the events
+            
+        Returns:
+            Created MaintenanceActionSets (empty if the plan has no template)
+        """
+        # Import here to avoid circular imports
+        from app.buisness.maintenance.factories.maintenance_factory import MaintenanceFactory
+        
+        template_action_set = self._maintenance_plan.template_action_set
+        if not template_action_set or not planned_starts:
+            return []
+        
+        now = datetime.utcnow()
+        return MaintenanceFactory.create_many_from_template(
+            template_action_set_id=template_action_set.id,
+            entries=[
+                {
+                    'asset_id': asset_id,
+                    'maintenance_plan_id': self._maintenance_plan_id,
+                    'planned_start_datetime': planned_start_datetime or now,
+                }
+                for asset_id, planned_start_datetime in planned_starts.items()
+            ],
+            user_id=user_id
+        )
+    
     @property
     def maintenance_action_sets(self) -> List[MaintenanceActionSet]:
         """
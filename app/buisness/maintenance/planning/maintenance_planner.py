@@ -4,16 +4,26 @@ Main orchestrator class for maintenance planning operations.
 Handles plan selection, behavior delegation, and result aggregation.
 """
 
-from typing import List, Optional, Union
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, delete, insert, or_, select
 from app import db
+from app.buisness.core.meter_usage_forecaster import MeterUsageForecaster
 from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
 from app.buisness.maintenance.planning.planning_result import PlanningResult
 from app.buisness.maintenance.planning.behaviors.time_based_planner import TimeBasedPlanner
 from app.buisness.maintenance.planning.behaviors.meter_based_planner import MeterBasedPlanner
+from app.buisness.maintenance.planning.behaviors.hybrid_planner import HybridPlanner
 from app.buisness.maintenance.planning.base_planner_behavior import BasePlannerBehavior
 from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
+from app.data.maintenance.planning.maintenance_due_index import MaintenanceDueIndex
 from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+from app.data.core.asset_info.asset import Asset
+from app.data.core.asset_info.make_model import MakeModel
+from app.data.core.user_info.user import User
 from app.logger import get_logger
 
 logger = get_logger("asset_management.business.maintenance.planning")
@@ -28,9 +38,13 @@ class MaintenancePlanner:
     - Behavior selection based on frequency type
     - Asset analysis and result aggregation
     - Optional maintenance event creation
+    - Incremental re-planning of changed (asset, plan) pairs
     - Error handling and logging
     """
     
+    # Above this many candidate assets, plan_incremental re-evaluates the whole plan
+    INCREMENTAL_MAX_ASSET_IDS = 500
+    
     def __init__(self, plan_context: Optional[MaintenancePlanContext] = None):
         """
         Initialize MaintenancePlanner.
@@ -87,18 +101,19 @@ class MaintenancePlanner:
         # Find assets needing maintenance
         results = planner_behavior.find_assets_needing_maintenance(plan_context)
         
-        # Filter out duplicate events (check for existing Planned/In Progress events)
+        # Filter out duplicate events (check for existing open events)
+        open_events = set()
+        if any(result.needs_maintenance for result in results):
+            open_events = self._find_open_event_keys([plan_context.id])
+        
         filtered_results = []
         for result in results:
             if result.needs_maintenance:
                 # Check for duplicate
-                has_duplicate = self._check_duplicate_events(
-                    result.asset_id,
-                    result.maintenance_plan_id
-                )
+                has_duplicate = (result.asset_id, result.maintenance_plan_id) in open_events
                 if has_duplicate:
                     result.needs_maintenance = False
-                    result.reason = f"Duplicate prevention: Existing Planned or In Progress maintenance event found"
+                    result.reason = "Duplicate prevention: Existing open (Planned, In Progress or Blocked) maintenance event found"
                     logger.debug(f"Duplicate event prevented for asset {result.asset_id}, plan {result.maintenance_plan_id}")
             
             filtered_results.append(result)
@@ -109,9 +124,22 @@ class MaintenancePlanner:
         """
         Plan maintenance for all active maintenance plans.
         
+        With PLANNING_WORKERS above 1, plans are evaluated across a process
+        pool by ParallelPlanExecutor; otherwise one after another here.
+        Either way the usage rates of assets with new meter readings are
+        refitted first (see refresh_marked_usage_rates).
+        
         Returns:
             List of PlanningResult objects from all active plans
         """
+        if current_app.config.get('PLANNING_WORKERS', 1) > 1:
+            # Imported here: the executor module imports this one
+            from app.buisness.maintenance.planning.parallel_plan_executor import (
+                ParallelPlanExecutor, records_to_results
+            )
+            return records_to_results(ParallelPlanExecutor().evaluate())
+        
+        self.refresh_marked_usage_rates()
         all_results = []
         active_plans = MaintenancePlan.query.filter_by(status='Active').all()
         
@@ -128,6 +156,280 @@ class MaintenancePlanner:
         
         return all_results
     
+    def refresh_marked_usage_rates(self) -> List[int]:
+        """
+        Refit the meter usage rates of assets marked dirty as a whole.
+        
+        Meter updates mark their asset, and its cached usage rate predates
+        the new reading until the mark is consumed by plan_incremental.
+        Full and single-plan planning refit those assets first, so every
+        path forecasts meter due dates from the same rates. Writes to the
+        current session without committing.
+        
+        Returns:
+            IDs of the refitted assets
+        """
+        asset_ids = set(db.session.execute(
+            select(PlanningDirtyMark.asset_id).where(
+                PlanningDirtyMark.asset_id.isnot(None),
+                PlanningDirtyMark.maintenance_plan_id.is_(None)
+            )
+        ).scalars())
+        if not asset_ids:
+            return []
+        return MeterUsageForecaster().refresh(asset_ids)
+    
+    @classmethod
+    def run_scheduled_planning(cls) -> Dict[str, int]:
+        """
+        Background scheduler job: plan all active plans and create the due events.
+        
+        Events are created as the system user and committed.
+        
+        Returns:
+            Summary counts, stored in the job's run history
+        """
+        planner = cls()
+        results = planner.plan_all_active_plans()
+        system_user = User.query.filter_by(is_system=True).first()
+        created_events = planner.create_events_from_results(
+            results, user_id=system_user.id if system_user else None
+        )
+        db.session.commit()
+        
+        return {
+            'results': len(results),
+            'due': sum(1 for result in results if result.needs_maintenance),
+            'events_created': len(created_events),
+            'errors': sum(1 for result in results if result.errors)
+        }
+    
+    @classmethod
+    def run_scheduled_incremental_planning(cls) -> Dict[str, int]:
+        """
+        Background scheduler job: re-evaluate the pairs changed since the last run.
+        
+        Request handlers only write dirty marks; this job brings the due
+        index up to date with them.
+        
+        Returns:
+            Summary counts, stored in the job's run history
+        """
+        results = cls().plan_incremental()
+        return {
+            'results': len(results),
+            'due': sum(1 for result in results if result.needs_maintenance),
+            'errors': sum(1 for result in results if result.errors)
+        }
+    
+    def plan_incremental(self) -> List[PlanningResult]:
+        """
+        Re-evaluate only the (asset, plan) pairs that may have changed since they were last evaluated.
+        
+        Candidates per active plan:
+        - pairs marked dirty (PlanningDirtyMark), with wildcards expanded
+          against the plans' asset criteria
+        - pairs whose indexed due date passed since their last evaluation
+          (time-based plans)
+        - matching pairs not in the due index yet (new assets and plans;
+          on the first run this is every pair)
+        
+        The meter usage rates of assets marked as a whole are refitted
+        first, so their meter-based due dates use the new readings.
+        
+        Each evaluated pair is written to MaintenanceDueIndex and the
+        consumed dirty marks are deleted, in one commit. Every plan is
+        evaluated inside a savepoint: a plan that fails leaves none of its
+        index writes behind and is marked dirty again so the next run
+        retries it.
+        
+        Returns:
+            List of PlanningResult objects for the re-evaluated pairs
+        """
+        now = datetime.utcnow()
+        marks = db.session.execute(
+            select(PlanningDirtyMark.id, PlanningDirtyMark.asset_id, PlanningDirtyMark.maintenance_plan_id)
+        ).all()
+        last_mark_id = max((mark.id for mark in marks), default=None)
+        
+        active_plans = {
+            plan.id: plan
+            for plan in MaintenancePlan.query.filter_by(status='Active').order_by(MaintenancePlan.id)
+        }
+        
+        full_plan_ids = set()
+        asset_wide_ids = set()
+        candidates = defaultdict(set)
+        for _, asset_id, plan_id in marks:
+            if asset_id is None and plan_id is None:
+                full_plan_ids.update(active_plans)
+            elif asset_id is None:
+                full_plan_ids.add(plan_id)
+            elif plan_id is None:
+                asset_wide_ids.add(asset_id)
+            else:
+                candidates[plan_id].add(asset_id)
+        
+        # Meter updates mark their asset: refit only those assets' usage rates.
+        # Readings written any other way are picked up by the meter usage job.
+        if asset_wide_ids:
+            MeterUsageForecaster().refresh(asset_wide_ids)
+        
+        # Plans that were edited to inactive (or deleted) leave the index
+        stale_plan_ids = full_plan_ids - set(active_plans)
+        if stale_plan_ids:
+            db.session.execute(
+                delete(MaintenanceDueIndex).where(MaintenanceDueIndex.maintenance_plan_id.in_(stale_plan_ids))
+            )
+        
+        pair_queries = [self._plan_asset_pairs_query(unindexed_only=True)]
+        if asset_wide_ids:
+            pair_queries.append(self._plan_asset_pairs_query(asset_ids=asset_wide_ids))
+        pair_queries.append(
+            select(MaintenanceDueIndex.asset_id, MaintenanceDueIndex.maintenance_plan_id)
+            .where(
+                MaintenanceDueIndex.next_due_date > MaintenanceDueIndex.evaluated_at,
+                MaintenanceDueIndex.next_due_date <= now
+            )
+        )
+        for pair_query in pair_queries:
+            for asset_id, plan_id in db.session.execute(pair_query):
+                candidates[plan_id].add(asset_id)
+        
+        results = []
+        for plan_id, plan in active_plans.items():
+            if plan_id in full_plan_ids:
+                asset_ids = None
+            else:
+                asset_ids = candidates.get(plan_id)
+                if not asset_ids:
+                    continue
+                if len(asset_ids) > self.INCREMENTAL_MAX_ASSET_IDS:
+                    asset_ids = None
+            
+            try:
+                with db.session.begin_nested():
+                    plan_results = self._evaluate_and_index(plan, asset_ids, now)
+                results.extend(plan_results)
+            except Exception as e:
+                logger.error(f"Error planning incrementally for plan {plan_id}: {e}")
+                PlanningDirtyMark.mark(maintenance_plan_id=plan_id, reason='planning failed')
+        
+        if last_mark_id is not None:
+            db.session.execute(delete(PlanningDirtyMark).where(PlanningDirtyMark.id <= last_mark_id))
+        db.session.commit()
+        
+        logger.info(f"Incremental planning re-evaluated {len(results)} asset/plan pairs from {len(marks)} dirty marks")
+        return results
+    
+    def _evaluate_and_index(
+        self,
+        plan: MaintenancePlan,
+        asset_ids: Optional[Iterable[int]],
+        evaluated_at: datetime
+    ) -> List[PlanningResult]:
+        """
+        Plan one plan (optionally restricted to some assets) and record the results in the due index.
+        
+        Returns:
+            List of PlanningResult objects
+        """
+        plan_context = MaintenancePlanContext(plan, asset_ids=asset_ids)
+        plan_results = self.plan_maintenance(plan_context)
+        self._record_due_index(plan_context, plan_results, full_plan=asset_ids is None, evaluated_at=evaluated_at)
+        return plan_results
+    
+    def _plan_asset_pairs_query(
+        self,
+        asset_ids: Optional[Iterable[int]] = None,
+        unindexed_only: bool = False
+    ):
+        """
+        Build a query of (asset_id, maintenance_plan_id) for assets matched by active plans.
+        
+        Matches assets the same way as MaintenancePlanContext.get_matching_assets_query,
+        for all active plans in one statement.
+        
+        Args:
+            asset_ids: Optional asset IDs to limit the pairs to
+            unindexed_only: Only pairs without a MaintenanceDueIndex row
+        """
+        query = (
+            select(Asset.id, MaintenancePlan.id)
+            .join(MakeModel, Asset.make_model_id == MakeModel.id)
+            .join(MaintenancePlan, and_(
+                MaintenancePlan.status == 'Active',
+                MaintenancePlan.asset_type_id == MakeModel.asset_type_id,
+                or_(MaintenancePlan.model_id.is_(None), MaintenancePlan.model_id == Asset.make_model_id)
+            ))
+        )
+        if asset_ids is not None:
+            query = query.where(Asset.id.in_(list(asset_ids)))
+        if unindexed_only:
+            query = (
+                query.outerjoin(MaintenanceDueIndex, and_(
+                    MaintenanceDueIndex.asset_id == Asset.id,
+                    MaintenanceDueIndex.maintenance_plan_id == MaintenancePlan.id
+                ))
+                .where(MaintenanceDueIndex.id.is_(None))
+            )
+        return query
+    
+    def _record_due_index(
+        self,
+        plan_context: MaintenancePlanContext,
+        results: List[PlanningResult],
+        full_plan: bool,
+        evaluated_at: datetime
+    ) -> None:
+        """
+        Replace the due index rows of the pairs just evaluated for a plan.
+        
+        Every asset the (possibly restricted) context matches gets a row,
+        including inactive assets that produced no result, so they are not
+        picked up again as unindexed.
+        
+        Args:
+            plan_context: Context the results were planned with
+            results: PlanningResult objects from plan_maintenance
+            full_plan: Whether the whole plan was evaluated (drops rows of assets it no longer matches)
+            evaluated_at: Timestamp of the planning run
+        """
+        stale_rows = delete(MaintenanceDueIndex).where(MaintenanceDueIndex.maintenance_plan_id == plan_context.id)
+        if not full_plan:
+            stale_rows = stale_rows.where(MaintenanceDueIndex.asset_id.in_(plan_context.asset_ids))
+        db.session.execute(stale_rows)
+        
+        meter_field = plan_context.meter_field
+        meter_delta = plan_context.meter_delta
+        
+        results_by_asset = {result.asset_id: result for result in results}
+        rows = []
+        for (asset_id,) in plan_context.get_matching_assets_query().with_entities(Asset.id):
+            result = results_by_asset.get(asset_id)
+            last_maintenance = result.last_maintenance if result else None
+            last_meter_value = None
+            next_due_meter = None
+            if result and meter_field:
+                last_meter_value = result.meter_readings_at_last_maintenance.get(meter_field)
+                next_due_meter = MeterBasedPlanner.next_due_meter(
+                    result.current_meter_readings.get(meter_field), last_meter_value, meter_delta
+                )
+            rows.append({
+                'asset_id': asset_id,
+                'maintenance_plan_id': plan_context.id,
+                'last_maintenance_id': last_maintenance.id if last_maintenance else None,
+                'last_completed_at': last_maintenance.end_date if last_maintenance else None,
+                'meter_field': meter_field,
+                'last_meter_value': last_meter_value,
+                'next_due_meter': next_due_meter,
+                'needs_maintenance': bool(result and result.needs_maintenance),
+                'next_due_date': result.due_date if result else None,
+                'evaluated_at': evaluated_at
+            })
+        if rows:
+            db.session.execute(insert(MaintenanceDueIndex), rows)
+    
     def plan_plans(
         self, 
         plan_contexts: List[MaintenancePlanContext]
@@ -141,6 +443,7 @@ class MaintenancePlanner:
         Returns:
             List of PlanningResult objects from all plans
         """
+        self.refresh_marked_usage_rates()
         all_results = []
         
         for plan_context in plan_contexts:
@@ -162,6 +465,9 @@ class MaintenancePlanner:
         """
         Create maintenance events from planning results.
         
+        Each plan's events are created in one batch; if a batch fails it is
+        retried one event at a time and failures are recorded on the results.
+        
         Args:
             results: List of PlanningResult objects
             user_id: User ID creating the events
@@ -176,33 +482,58 @@ class MaintenancePlanner:
         if not auto_create:
             results = [r for r in results if r.needs_maintenance]
         
+        # One lookup for every plan involved instead of one query per result
+        open_events = self._find_open_event_keys({r.maintenance_plan_id for r in results}) if results else set()
+        
+        # Group by plan so each plan's events are inserted in one batch
+        pending: Dict[int, List[PlanningResult]] = defaultdict(list)
         for result in results:
-            if not result.needs_maintenance and not auto_create:
+            if (result.asset_id, result.maintenance_plan_id) in open_events:
+                logger.warning(f"Duplicate event prevented for asset {result.asset_id}, plan {result.maintenance_plan_id}")
                 continue
+            open_events.add((result.asset_id, result.maintenance_plan_id))
+            pending[result.maintenance_plan_id].append(result)
+        
+        for plan_results in pending.values():
+            plan_context = plan_results[0].maintenance_plan
+            try:
+                maintenance_events = plan_context.create_maintenance_events(
+                    {
+                        result.asset_id: result.recommended_start_date
+                        for result in plan_results
+                    },
+                    user_id=user_id
+                )
+            except Exception as e:
+                # The batch was rolled back; create one at a time so one bad asset does not block the rest
+                logger.error(f"Error creating maintenance events for plan {plan_context.id}, retrying individually: {e}")
+                maintenance_events = self._create_events_individually(plan_results, user_id)
             
+            for maintenance_event in maintenance_events:
+                created_events.append(maintenance_event)
+                logger.info(f"Created maintenance event {maintenance_event.id} for asset {maintenance_event.asset_id}, plan {maintenance_event.maintenance_plan_id}")
+        
+        return created_events
+    
+    def _create_events_individually(
+        self,
+        results: List[PlanningResult],
+        user_id: Optional[int]
+    ) -> List[MaintenanceActionSet]:
+        """Create one maintenance event per result, recording failures on the result"""
+        created_events = []
+        for result in results:
             try:
-                # Double-check for duplicates before creating
-                if self._check_duplicate_events(result.asset_id, result.maintenance_plan_id):
-                    logger.warning(f"Duplicate event prevented for asset {result.asset_id}, plan {result.maintenance_plan_id}")
-                    continue
-                
-                # Create maintenance event
-                plan_context = result.maintenance_plan
-                maintenance_event = plan_context.create_maintenance_event(
+                maintenance_event = result.maintenance_plan.create_maintenance_event(
                     asset_id=result.asset_id,
                     planned_start_datetime=result.recommended_start_date or datetime.utcnow(),
                     user_id=user_id
                 )
-                
                 if maintenance_event:
                     created_events.append(maintenance_event)
-                    logger.info(f"Created maintenance event {maintenance_event.id} for asset {result.asset_id}, plan {result.maintenance_plan_id}")
-                
             except Exception as e:
                 logger.error(f"Error creating maintenance event for asset {result.asset_id}: {e}")
                 result.errors.append(f"Error creating event: {str(e)}")
-                # Continue with other results
-        
         return created_events
     
     def _select_planner_behavior(
@@ -224,9 +555,8 @@ class MaintenancePlanner:
             return TimeBasedPlanner()
         elif frequency_type in ['meter1', 'meter2', 'meter3', 'meter4']:
             return MeterBasedPlanner()
-        # Future: Add HybridPlanner for combined time+meter logic
-        # elif frequency_type.startswith('time_and_'):
-        #     return HybridPlanner()
+        elif plan_context.is_hybrid:
+            return HybridPlanner()
         
         return None
     
@@ -236,7 +566,7 @@ class MaintenancePlanner:
         maintenance_plan_id: int
     ) -> bool:
         """
-        Check for existing Planned or In Progress maintenance events for the same plan+asset.
+        Check for existing open (Planned, In Progress or Blocked) maintenance events for the same plan+asset.
         
         Args:
             asset_id: Asset ID
@@ -251,12 +581,38 @@ class MaintenancePlanner:
                 asset_id=asset_id,
                 maintenance_plan_id=maintenance_plan_id
             )
-            .filter(MaintenanceActionSet.status.in_(['Planned', 'In Progress']))
+            .filter(MaintenanceActionSet.status.in_(MaintenanceActionSet.OPEN_STATUSES))
             .first()
         )
         
         return existing is not None
     
+    def _find_open_event_keys(
+        self,
+        maintenance_plan_ids: Iterable[int]
+    ) -> Set[Tuple[int, int]]:
+        """
+        Find every (asset, plan) pair with an open maintenance event.
+        
+        Batch counterpart of _check_duplicate_events: one query covers all
+        assets of the given plans.
+        
+        Args:
+            maintenance_plan_ids: Maintenance plan IDs to look up
+            
+        Returns:
+            Set of (asset_id, maintenance_plan_id) tuples
+        """
+        rows = db.session.execute(
+            select(MaintenanceActionSet.asset_id, MaintenanceActionSet.maintenance_plan_id)
+            .where(
+                MaintenanceActionSet.maintenance_plan_id.in_(list(maintenance_plan_ids)),
+                MaintenanceActionSet.status.in_(MaintenanceActionSet.OPEN_STATUSES)
+            )
+            .distinct()
+        )
+        return {(asset_id, plan_id) for asset_id, plan_id in rows}
+    
     def get_assets_needing_maintenance(
         self,
         plan_context: Optional[MaintenancePlanContext] = None
@@ -270,6 +626,7 @@ class MaintenancePlanner:
         Returns:
             List of PlanningResult objects where needs_maintenance=True
         """
+        self.refresh_marked_usage_rates()
         results = self.plan_maintenance(plan_context)
         return [r for r in results if r.needs_maintenance]
 
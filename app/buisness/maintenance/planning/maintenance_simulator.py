@@ -0,0 +1,671 @@
+"""
+Maintenance Simulator
+Projects the maintenance a set of plans will generate over the coming
+months ("what-if"): event counts, labor hours, parts cost and part
+quantities by part_id, per month.
+
+The simulation works on arrays, not ORM objects:
+- plans with their templates, required template part demands, active
+  assets, the last completed maintenance per asset and template, open
+  events and cached meter usage rates are loaded with column queries
+- every (asset, plan) pair the plans match is one element of flat arrays
+  holding the time and meter value at which it is next due
+- time advances in steps of step_days. Each round moves every pair to the
+  first step at which its time or meter criterion is met, records an event
+  there and resets both baselines, so a year of weekly steps takes as many
+  rounds as the busiest pair has events
+- meters advance at the asset's fitted usage rate (MeterUsageForecaster);
+  a meter without a rate only triggers if it is already due
+
+Baselines match the planners: the last completed maintenance (end date and
+meter reading), else the asset's creation date and meter 0. A pair with an
+open (Planned, In Progress or Blocked) event starts as if that event were completed
+at the start of the simulation, since duplicate prevention holds it back
+until then.
+"""
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app import db
+from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+from app.data.core.asset_info.asset import Asset
+from app.data.core.asset_info.make_model import MakeModel
+from app.data.core.asset_info.meter_history import MeterHistory
+from app.data.core.asset_info.meter_usage_rates import MeterUsageRate
+from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+from app.data.maintenance.templates.template_action_sets import TemplateActionSet
+from app.data.maintenance.templates.template_actions import TemplateActionItem
+from app.data.maintenance.templates.template_part_demands import TemplatePartDemand
+from app.logger import get_logger
+
+logger = get_logger("asset_management.buisness.maintenance.planning.simulator")
+
+INFINITY = float('inf')
+
+
+@dataclass
+class MonthlyProjection:
+    """Maintenance projected for one month of a simulation"""
+    month_start: datetime
+    event_count: int = 0
+    labor_hours: float = 0.0
+    parts_cost: float = 0.0
+    part_quantities: Dict[int, float] = field(default_factory=dict)  # part_id -> quantity
+    events_by_plan: Dict[int, int] = field(default_factory=dict)  # maintenance_plan_id -> events
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'month_start': self.month_start.isoformat(),
+            'event_count': self.event_count,
+            'labor_hours': self.labor_hours,
+            'parts_cost': self.parts_cost,
+            'part_quantities': self.part_quantities,
+            'events_by_plan': self.events_by_plan
+        }
+
+
+@dataclass
+class SimulationResult:
+    """Monthly projections of a maintenance simulation"""
+    start: datetime
+    end: datetime
+    step_days: float
+    plan_ids: List[int] = field(default_factory=list)
+    pair_count: int = 0  # (asset, plan) pairs simulated
+    months: List[MonthlyProjection] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def event_count(self) -> int:
+        """Events over the whole simulation"""
+        return sum(month.event_count for month in self.months)
+
+    @property
+    def labor_hours(self) -> float:
+        """Labor hours over the whole simulation"""
+        return sum(month.labor_hours for month in self.months)
+
+    @property
+    def parts_cost(self) -> float:
+        """Parts cost over the whole simulation"""
+        return sum(month.parts_cost for month in self.months)
+
+    @property
+    def part_quantities(self) -> Dict[int, float]:
+        """Part quantities by part_id over the whole simulation"""
+        totals = {}
+        for month in self.months:
+            for part_id, quantity in month.part_quantities.items():
+                totals[part_id] = totals.get(part_id, 0.0) + quantity
+        return totals
+
+    @property
+    def events_by_plan(self) -> Dict[int, int]:
+        """Events by maintenance_plan_id over the whole simulation"""
+        totals = {}
+        for month in self.months:
+            for plan_id, count in month.events_by_plan.items():
+                totals[plan_id] = totals.get(plan_id, 0) + count
+        return totals
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'step_days': self.step_days,
+            'plan_ids': self.plan_ids,
+            'pair_count': self.pair_count,
+            'event_count': self.event_count,
+            'labor_hours': self.labor_hours,
+            'parts_cost': self.parts_cost,
+            'months': [month.to_dict() for month in self.months],
+            'errors': self.errors
+        }
+
+
+class _PlanSpec(NamedTuple):
+    """Simulation inputs of one maintenance plan"""
+    plan_id: int
+    template_id: int
+    asset_type_id: int
+    model_id: Optional[int]
+    interval_days: Optional[float]  # time criterion (None: no time criterion)
+    meter_field: Optional[str]  # meter criterion (None: no meter criterion)
+    meter_delta: Optional[float]
+    labor_hours: float  # per event
+    parts_cost: float  # per event
+
+
+class _AssetTable(NamedTuple):
+    """Active assets as column lists (times in days from the simulation start)"""
+    ids: List[int]
+    position_by_id: Dict[int, int]
+    created_days: List[Optional[float]]
+    meters: Dict[str, List[Optional[float]]]  # meter_field -> current value per asset
+    positions_by_model: Dict[Tuple[int, int], List[int]]  # (asset_type_id, make_model_id) -> positions
+    positions_by_type: Dict[int, List[int]]  # asset_type_id -> positions
+
+
+class _PairInputs(NamedTuple):
+    """Starting state of the (asset, plan) pairs of one plan"""
+    due_days: np.ndarray  # time due, days from start (-inf: due now, inf: never)
+    due_meter: np.ndarray  # meter value due (inf: never)
+    meter_start: np.ndarray  # meter value at the start (projected from the last reading)
+    rates: np.ndarray  # meter units per day (0: no rate)
+
+
+class MaintenanceSimulator:
+    """
+    Projects the maintenance workload of plans over the coming months.
+
+    Usage:
+        simulator = MaintenanceSimulator()
+        result = simulator.simulate()  # all active plans, 12 months, weekly steps
+        result = simulator.simulate(plan_ids=[proposed_plan.id], months=6)
+        for month in result.months:
+            print(month.month_start, month.event_count, month.labor_hours)
+    """
+
+    DEFAULT_MONTHS = 12
+    DEFAULT_STEP_DAYS = 7
+
+    # Intervals TimeBasedPlanner uses when a time plan has no delta_days
+    DEFAULT_INTERVAL_DAYS = {'days': 30.0, 'hours': 1.0}
+
+    # Plans are simulated in chunks of about this many (asset, plan) pairs
+    PAIR_CHUNK_SIZE = 1_000_000
+
+    def simulate(
+        self,
+        plan_ids: Optional[Iterable[int]] = None,
+        months: int = DEFAULT_MONTHS,
+        step_days: float = DEFAULT_STEP_DAYS,
+        start: Optional[datetime] = None
+    ) -> SimulationResult:
+        """
+        Simulate plans and project their maintenance per month.
+
+        Read-only: nothing is written to the database.
+
+        Args:
+            plan_ids: Plans to simulate, whatever their status (default: all active plans)
+            months: Number of months to project
+            step_days: Time resolution; events fall on steps of this many days
+            start: Start of the simulation (default: utcnow)
+
+        Returns:
+            SimulationResult with one MonthlyProjection per month
+        """
+        start = start or datetime.utcnow()
+        month_starts = [self._add_months(start, index) for index in range(months)]
+        end = self._add_months(start, months)
+        step_count = math.ceil(self._days_between(start, end) / step_days)
+        boundaries = [self._days_between(start, month_start) for month_start in month_starts[1:]]
+        step_months = [bisect_right(boundaries, step * step_days) for step in range(step_count)]
+
+        plans, errors = self._load_plans(plan_ids)
+        result = SimulationResult(
+            start=start,
+            end=end,
+            step_days=step_days,
+            plan_ids=[plan.plan_id for plan in plans],
+            months=[MonthlyProjection(month_start=month_start) for month_start in month_starts],
+            errors=errors
+        )
+        if not plans or step_count <= 0:
+            return result
+
+        template_ids = {plan.template_id for plan in plans}
+        assets = self._load_assets(start)
+        last_by_template = self._load_last_maintenance(template_ids, assets, start)
+        open_pairs = self._load_open_pairs([plan.plan_id for plan in plans], assets)
+        rates = self._load_rates(sorted({plan.meter_field for plan in plans if plan.meter_field}), assets, start)
+        demands = self._load_part_demands(template_ids)
+
+        arrays = self._asset_arrays(assets, rates)
+        counts = [[0] * len(plans) for _ in month_starts]  # events per month and plan
+        chunk = []
+        chunk_pairs = 0
+        for plan_index, plan in enumerate(plans):
+            positions = self._matching_positions(plan, assets)
+            result.pair_count += len(positions)
+            chunk.append((plan_index, positions))
+            chunk_pairs += len(positions)
+            if chunk_pairs < self.PAIR_CHUNK_SIZE and plan_index < len(plans) - 1:
+                continue
+            self._run_chunk(
+                chunk, plans, arrays, last_by_template, open_pairs, step_days, step_count, step_months, counts
+            )
+            chunk = []
+            chunk_pairs = 0
+
+        for month, month_counts in zip(result.months, counts):
+            for plan, count in zip(plans, month_counts):
+                if not count:
+                    continue
+                month.event_count += count
+                month.labor_hours += count * plan.labor_hours
+                month.parts_cost += count * plan.parts_cost
+                month.events_by_plan[plan.plan_id] = count
+                for part_id, quantity in demands.get(plan.template_id, {}).items():
+                    month.part_quantities[part_id] = month.part_quantities.get(part_id, 0.0) + count * quantity
+
+        logger.debug(
+            f"Simulated {len(plans)} plans, {result.pair_count} asset/plan pairs, "
+            f"{step_count} steps: {result.event_count} events"
+        )
+        return result
+
+    def _run_chunk(
+        self,
+        chunk: Sequence[Tuple[int, List[int]]],
+        plans: Sequence[_PlanSpec],
+        arrays: Dict,
+        last_by_template: Dict,
+        open_pairs: Dict[int, set],
+        step_days: float,
+        step_count: int,
+        step_months: List[int],
+        counts: List[List[int]]
+    ):
+        """Step the pairs of a chunk of plans over arrays and add their events to counts"""
+        columns = ('due_days', 'due_meter', 'meter_start', 'rates', 'interval', 'delta', 'plan')
+        parts = {column: [] for column in columns}
+        for plan_index, positions in chunk:
+            if not positions:
+                continue
+            plan = plans[plan_index]
+            inputs = self._pair_inputs(
+                plan, np.asarray(positions, dtype=np.int64), arrays, last_by_template, open_pairs
+            )
+            for column, values in zip(_PairInputs._fields, inputs):
+                parts[column].append(values)
+            parts['interval'].append(np.full(len(positions), self._interval(plan)))
+            parts['delta'].append(np.full(len(positions), self._meter_delta(plan)))
+            parts['plan'].append(np.full(len(positions), plan_index, dtype=np.int64))
+        if not parts['plan']:
+            return
+        due_days, due_meter, meter_start, rate, interval, delta, plan_of = (
+            np.concatenate(parts[column]) for column in columns
+        )
+
+        event_steps = []
+        event_plans = []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time_steps = np.maximum(np.ceil(due_days / step_days), 0.0)
+            remaining = due_meter - meter_start
+            meter_steps = np.where(
+                remaining <= 0, 0.0,
+                np.where(rate > 0, np.ceil(remaining / (rate * step_days)), INFINITY)
+            )
+            meter_steps = np.where(np.isnan(remaining), INFINITY, meter_steps)
+            steps = np.minimum(time_steps, meter_steps)
+
+            pending = np.nonzero(steps < step_count)[0]
+            steps = steps[pending]
+            while pending.size:
+                event_steps.append(steps.astype(np.int64))
+                event_plans.append(plan_of[pending])
+
+                # Maintenance done at the event resets both baselines
+                next_time = np.maximum(np.ceil((steps * step_days + interval[pending]) / step_days), steps + 1)
+                pending_rate = rate[pending]
+                pending_start = meter_start[pending]
+                meter_at_event = pending_start + pending_rate * (steps * step_days)
+                next_meter = np.where(
+                    pending_rate > 0,
+                    np.maximum(
+                        np.ceil((meter_at_event + delta[pending] - pending_start) / (pending_rate * step_days)),
+                        steps + 1
+                    ),
+                    INFINITY
+                )
+                steps = np.minimum(next_time, next_meter)
+                keep = steps < step_count
+                pending = pending[keep]
+                steps = steps[keep]
+
+        if not event_steps:
+            return
+        plan_count = len(plans)
+        event_months = np.asarray(step_months, dtype=np.int64)[np.concatenate(event_steps)]
+        totals = np.bincount(
+            event_months * plan_count + np.concatenate(event_plans), minlength=len(counts) * plan_count
+        ).reshape(len(counts), plan_count)
+        for month_counts, month_totals in zip(counts, totals.tolist()):
+            for plan_index, count in enumerate(month_totals):
+                month_counts[plan_index] += count
+
+    def _pair_inputs(
+        self,
+        plan: _PlanSpec,
+        positions,
+        arrays: Dict,
+        last_by_template: Dict,
+        open_pairs: Dict[int, set]
+    ) -> _PairInputs:
+        """Starting state of a plan's pairs, as arrays"""
+        pair_count = len(positions)
+        last_by_position = last_by_template.get(plan.template_id, {})
+        open_positions = open_pairs.get(plan.plan_id)
+        if open_positions:
+            is_open = np.isin(positions, np.fromiter(open_positions, dtype=np.int64, count=len(open_positions)))
+        else:
+            is_open = np.zeros(pair_count, dtype=bool)
+
+        due_days = np.full(pair_count, INFINITY)
+        if plan.interval_days:
+            baseline = self._last_array(last_by_position, len(arrays['created_days']), lambda last: last[0])[positions]
+            baseline = np.where(np.isnan(baseline), arrays['created_days'][positions], baseline)
+            due_days = np.where(np.isnan(baseline), -INFINITY, baseline + plan.interval_days)
+            due_days = np.where(is_open, plan.interval_days, due_days)
+
+        due_meter = np.full(pair_count, INFINITY)
+        meter_start = np.zeros(pair_count)
+        rate = np.zeros(pair_count)
+        if plan.meter_field and plan.meter_delta:
+            current = arrays['meters'][plan.meter_field][positions]
+            has_meter = ~np.isnan(current)
+            meter_start = arrays['meter_start'][plan.meter_field][positions]
+            rate = np.where(has_meter, arrays['rates'][plan.meter_field][positions], 0.0)
+            # Baseline of MeterBasedPlanner.next_due_meter: no reading counts from 0, and so does a reset meter
+            baseline = self._last_array(
+                last_by_position, len(arrays['created_days']), lambda last: last[1][plan.meter_field]
+            )[positions]
+            baseline = np.where(np.isnan(baseline), 0.0, baseline)
+            baseline = np.where(current < baseline, 0.0, baseline)
+            due_meter = np.where(has_meter, baseline + plan.meter_delta, INFINITY)
+            due_meter = np.where(is_open & has_meter, meter_start + plan.meter_delta, due_meter)
+        return _PairInputs(due_days, due_meter, meter_start, rate)
+
+    def _asset_arrays(self, assets: _AssetTable, rates: Dict[str, List[float]]) -> Dict:
+        """Asset columns as NumPy arrays (None -> NaN), with meters projected to the start"""
+        arrays = {
+            'created_days': self._to_array(assets.created_days),
+            'meters': {},
+            'meter_start': {},
+            'rates': {}
+        }
+        for meter_field, values in assets.meters.items():
+            current = self._to_array(values)
+            arrays['meters'][meter_field] = current
+            if meter_field in rates:
+                rate = np.asarray(rates[meter_field], dtype=float)
+                arrays['rates'][meter_field] = rate
+                since = np.asarray(rates[f'{meter_field}_since'], dtype=float)
+                arrays['meter_start'][meter_field] = current + rate * since
+        return arrays
+
+    def _last_array(self, last_by_position: Dict, asset_count: int, value_of) -> 'np.ndarray':
+        """One value of the last completed maintenance per asset position (NaN: none)"""
+        values = np.full(asset_count, np.nan)
+        if last_by_position:
+            positions = np.fromiter(last_by_position.keys(), dtype=np.int64, count=len(last_by_position))
+            values[positions] = self._to_array([value_of(last) for last in last_by_position.values()])
+        return values
+
+    def _interval(self, plan: _PlanSpec) -> float:
+        """Days between events by time (inf: no time criterion)"""
+        return plan.interval_days or INFINITY
+
+    def _meter_delta(self, plan: _PlanSpec) -> float:
+        """Meter units between events by meter (inf: no meter criterion)"""
+        return plan.meter_delta if plan.meter_field and plan.meter_delta else INFINITY
+
+    def _load_plans(self, plan_ids: Optional[Iterable[int]]) -> Tuple[List[_PlanSpec], List[str]]:
+        """
+        Load plans with the labor and parts cost of their template.
+
+        Returns:
+            Tuple of (plan specs in plan ID order, errors for plans that cannot be simulated)
+        """
+        query = (
+            select(
+                MaintenancePlan.id, MaintenancePlan.template_action_set_id, MaintenancePlan.asset_type_id,
+                MaintenancePlan.model_id, MaintenancePlan.frequency_type, MaintenancePlan.delta_days,
+                MaintenancePlan.delta_m1, MaintenancePlan.delta_m2, MaintenancePlan.delta_m3,
+                MaintenancePlan.delta_m4, TemplateActionSet.labor_hours, TemplateActionSet.estimated_duration,
+                TemplateActionSet.parts_cost
+            )
+            .join(TemplateActionSet, TemplateActionSet.id == MaintenancePlan.template_action_set_id)
+            .order_by(MaintenancePlan.id)
+        )
+        if plan_ids is None:
+            query = query.where(MaintenancePlan.status == 'Active')
+        else:
+            query = query.where(MaintenancePlan.id.in_(list(plan_ids)))
+
+        plans = []
+        errors = []
+        for row in db.session.execute(query):
+            frequency_type = row.frequency_type or ''
+            meter_field = None
+            interval_days = None
+            if frequency_type == 'days':
+                interval_days = row.delta_days or self.DEFAULT_INTERVAL_DAYS['days']
+            elif frequency_type == 'hours':
+                # delta_days holds hours for hours plans
+                interval_days = row.delta_days / 24 if row.delta_days else self.DEFAULT_INTERVAL_DAYS['hours']
+            elif frequency_type in MaintenancePlanContext.METER_FIELDS:
+                meter_field = frequency_type
+            elif frequency_type[len(MaintenancePlanContext.HYBRID_PREFIX):] in MaintenancePlanContext.METER_FIELDS \
+                    and frequency_type.startswith(MaintenancePlanContext.HYBRID_PREFIX):
+                meter_field = frequency_type[len(MaintenancePlanContext.HYBRID_PREFIX):]
+                interval_days = row.delta_days or None
+            else:
+                errors.append(f"Plan {row.id}: unsupported frequency type '{frequency_type}'")
+                continue
+
+            plans.append(_PlanSpec(
+                plan_id=row.id,
+                template_id=row.template_action_set_id,
+                asset_type_id=row.asset_type_id,
+                model_id=row.model_id,
+                interval_days=interval_days,
+                meter_field=meter_field,
+                meter_delta=getattr(row, f'delta_m{meter_field[-1]}') if meter_field else None,
+                labor_hours=row.labor_hours if row.labor_hours is not None else (row.estimated_duration or 0.0),
+                parts_cost=row.parts_cost or 0.0
+            ))
+        return plans, errors
+
+    def _load_assets(self, start: datetime) -> _AssetTable:
+        """Load the active assets plans can match, with their asset type through make_model"""
+        rows = db.session.execute(
+            select(
+                Asset.id, MakeModel.asset_type_id, Asset.make_model_id, Asset.created_at,
+                Asset.meter1, Asset.meter2, Asset.meter3, Asset.meter4
+            )
+            .join(MakeModel, Asset.make_model_id == MakeModel.id)
+            .where(Asset.is_active.is_(True))
+            .order_by(Asset.id)
+        ).all()
+
+        assets = _AssetTable(
+            ids=[],
+            position_by_id={},
+            created_days=[],
+            meters={meter_field: [] for meter_field in MaintenancePlanContext.METER_FIELDS},
+            positions_by_model={},
+            positions_by_type={}
+        )
+        for position, row in enumerate(rows):
+            assets.ids.append(row.id)
+            assets.position_by_id[row.id] = position
+            assets.created_days.append(self._days_between(start, row.created_at) if row.created_at else None)
+            for meter_field in MaintenancePlanContext.METER_FIELDS:
+                assets.meters[meter_field].append(getattr(row, meter_field))
+            assets.positions_by_model.setdefault((row.asset_type_id, row.make_model_id), []).append(position)
+            assets.positions_by_type.setdefault(row.asset_type_id, []).append(position)
+        return assets
+
+    def _matching_positions(self, plan: _PlanSpec, assets: _AssetTable) -> List[int]:
+        """Asset positions a plan matches, as MaintenancePlanContext.get_matching_assets_query"""
+        if plan.model_id:
+            return assets.positions_by_model.get((plan.asset_type_id, plan.model_id), [])
+        return assets.positions_by_type.get(plan.asset_type_id, [])
+
+    def _load_last_maintenance(
+        self,
+        template_ids: Iterable[int],
+        assets: _AssetTable,
+        start: datetime
+    ) -> Dict[int, Dict[int, Tuple[Optional[float], Dict[str, Optional[float]]]]]:
+        """
+        Load the last completed maintenance per asset and template, with its meter reading.
+
+        Same ordering as BasePlannerBehavior.find_last_relevant_maintenance_batch.
+
+        Returns:
+            Dictionary of template_id -> asset position -> (end date in days
+            from start or None, meter values at the maintenance)
+        """
+        ranked = (
+            select(
+                MaintenanceActionSet.asset_id,
+                MaintenanceActionSet.template_action_set_id,
+                MaintenanceActionSet.end_date,
+                MaintenanceActionSet.meter_reading_id,
+                func.row_number().over(
+                    partition_by=(MaintenanceActionSet.asset_id, MaintenanceActionSet.template_action_set_id),
+                    order_by=(MaintenanceActionSet.end_date.desc(), MaintenanceActionSet.id.desc())
+                ).label('row_number')
+            )
+            .where(
+                MaintenanceActionSet.template_action_set_id.in_(list(template_ids)),
+                MaintenanceActionSet.status == MaintenanceActionSet.COMPLETED_STATUS
+            )
+            .subquery()
+        )
+        rows = db.session.execute(
+            select(
+                ranked.c.asset_id, ranked.c.template_action_set_id, ranked.c.end_date,
+                MeterHistory.meter1, MeterHistory.meter2, MeterHistory.meter3, MeterHistory.meter4
+            )
+            .outerjoin(MeterHistory, MeterHistory.id == ranked.c.meter_reading_id)
+            .where(ranked.c.row_number == 1)
+        )
+
+        last_by_template = {}
+        for row in rows:
+            position = assets.position_by_id.get(row.asset_id)
+            if position is None:
+                continue
+            end_days = self._days_between(start, row.end_date) if row.end_date else None
+            meters = {meter_field: getattr(row, meter_field) for meter_field in MaintenancePlanContext.METER_FIELDS}
+            last_by_template.setdefault(row.template_action_set_id, {})[position] = (end_days, meters)
+        return last_by_template
+
+    def _load_open_pairs(self, plan_ids: Sequence[int], assets: _AssetTable) -> Dict[int, set]:
+        """
+        Load the assets with an open event, per plan.
+
+        Returns:
+            Dictionary of maintenance_plan_id -> set of asset positions
+        """
+        rows = db.session.execute(
+            select(MaintenanceActionSet.maintenance_plan_id, MaintenanceActionSet.asset_id)
+            .where(
+                MaintenanceActionSet.maintenance_plan_id.in_(list(plan_ids)),
+                MaintenanceActionSet.status.in_(MaintenanceActionSet.OPEN_STATUSES)
+            )
+            .distinct()
+        )
+        open_pairs = {}
+        for plan_id, asset_id in rows:
+            position = assets.position_by_id.get(asset_id)
+            if position is not None:
+                open_pairs.setdefault(plan_id, set()).add(position)
+        return open_pairs
+
+    def _load_rates(self, meter_fields: Sequence[str], assets: _AssetTable, start: datetime) -> Dict[str, List[float]]:
+        """
+        Load the cached usage rates of the meters plans use.
+
+        Returns:
+            Dictionary of meter_field -> rate per asset position (0: no rate),
+            and '<meter_field>_since' -> days from the rate's newest reading
+            to start, over which the current meter is projected
+        """
+        rates = {}
+        for meter_field in meter_fields:
+            rates[meter_field] = [0.0] * len(assets.ids)
+            rates[f'{meter_field}_since'] = [0.0] * len(assets.ids)
+        if not meter_fields:
+            return rates
+
+        rows = db.session.execute(
+            select(
+                MeterUsageRate.asset_id, MeterUsageRate.meter_field,
+                MeterUsageRate.rate_per_day, MeterUsageRate.last_reading_at
+            )
+            .where(
+                MeterUsageRate.meter_field.in_(list(meter_fields)),
+                MeterUsageRate.rate_per_day > 0
+            )
+        )
+        for asset_id, meter_field, rate_per_day, last_reading_at in rows:
+            position = assets.position_by_id.get(asset_id)
+            if position is None:
+                continue
+            rates[meter_field][position] = rate_per_day
+            if last_reading_at:
+                rates[f'{meter_field}_since'][position] = max(self._days_between(last_reading_at, start), 0.0)
+        return rates
+
+    def _load_part_demands(self, template_ids: Iterable[int]) -> Dict[int, Dict[int, float]]:
+        """
+        Load the required part quantities per event of each template.
+
+        Optional template part demands are not projected.
+
+        Returns:
+            Dictionary of template_id -> part_id -> quantity
+        """
+        rows = db.session.execute(
+            select(
+                TemplateActionItem.template_action_set_id,
+                TemplatePartDemand.part_id,
+                func.sum(TemplatePartDemand.quantity_required)
+            )
+            .join(TemplateActionItem, TemplateActionItem.id == TemplatePartDemand.template_action_item_id)
+            .where(
+                TemplateActionItem.template_action_set_id.in_(list(template_ids)),
+                TemplatePartDemand.is_optional.isnot(True)
+            )
+            .group_by(TemplateActionItem.template_action_set_id, TemplatePartDemand.part_id)
+        )
+        demands = {}
+        for template_id, part_id, quantity in rows:
+            demands.setdefault(template_id, {})[part_id] = quantity or 0.0
+        return demands
+
+    @staticmethod
+    def _to_array(values: Sequence[Optional[float]]) -> 'np.ndarray':
+        """Float array of values, None -> NaN"""
+        return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+    @staticmethod
+    def _days_between(start: datetime, end: datetime) -> float:
+        """Days from start to end"""
+        return (end - start).total_seconds() / 86400
+
+    @staticmethod
+    def _add_months(value: datetime, months: int) -> datetime:
+        """Same day and time months later (clamped to the end of shorter months)"""
+        month_index = value.month - 1 + months
+        year = value.year + month_index // 12
+        month = month_index % 12 + 1
+        next_month = datetime(year + month // 12, month % 12 + 1, 1)
+        last_day = (next_month - timedelta(days=1)).day
+        return value.replace(year=year, month=month, day=min(value.day, last_day))
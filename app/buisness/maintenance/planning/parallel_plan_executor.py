@@ -0,0 +1,344 @@
+"""
+Parallel Plan Executor
+Evaluates many maintenance plans across a process pool.
+
+- Plans are split into chunks and evaluated by worker processes, each with
+  its own app, app context and database session
+- Workers only read: on SQLite their connections are opened with
+  PRAGMA query_only, and every chunk ends with a rollback
+- Workers return compact PlanRecord tuples instead of PlanningResult objects
+  (no ORM instances cross the process boundary); records are merged in plan
+  order
+- Event creation runs afterwards in the calling process as a single writer
+  step, which re-checks for duplicate events against the current database
+
+The worker count comes from the PLANNING_WORKERS setting (default 1, so
+the pool is opt-in), and MaintenancePlanner.plan_all_active_plans (used by
+the scheduled planning job) goes through this executor when it is above 1.
+With one worker, or an in-memory database that other processes cannot
+open, plans are evaluated in-process. Workers are spawned, not forked: the
+pool is started from scheduler threads of the web server, and a forked
+child could inherit locks (logging handlers) held by other threads.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from app import db
+from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+from app.buisness.maintenance.planning.planning_result import PlanningResult
+from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+from app.logger import get_logger
+
+logger = get_logger("asset_management.business.maintenance.planning.parallel")
+
+# Chunks per worker: small enough to balance uneven plans, large enough to
+# keep per-chunk overhead low
+CHUNKS_PER_WORKER = 4
+
+# Ids per query when turning records back into PlanningResult objects
+RESULT_LOAD_CHUNK_SIZE = 500
+
+# App context of the current worker process (set by _init_worker)
+_worker_app_context = None
+
+
+class PlanRecord(NamedTuple):
+    """Compact, picklable summary of a PlanningResult"""
+    asset_id: int
+    maintenance_plan_id: int
+    needs_maintenance: bool
+    reason: str
+    due_date: Optional[datetime] = None
+    due_date_earliest: Optional[datetime] = None
+    due_date_latest: Optional[datetime] = None
+    last_maintenance_id: Optional[int] = None
+    last_maintenance_date: Optional[datetime] = None
+    days_since_last_maintenance: Optional[float] = None
+    recommended_start_date: Optional[datetime] = None
+    triggered_by: Optional[str] = None
+    # Meter name -> value, as in PlanningResult
+    current_meter_readings: Optional[Dict[str, Optional[float]]] = None
+    meter_readings_at_last_maintenance: Optional[Dict[str, Optional[float]]] = None
+    meter_delta: Optional[Dict[str, Optional[float]]] = None
+    errors: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_result(cls, result: PlanningResult) -> 'PlanRecord':
+        """Build a record from a PlanningResult"""
+        return cls(
+            asset_id=result.asset_id,
+            maintenance_plan_id=result.maintenance_plan_id,
+            needs_maintenance=result.needs_maintenance,
+            reason=result.reason,
+            due_date=result.due_date,
+            due_date_earliest=result.due_date_earliest,
+            due_date_latest=result.due_date_latest,
+            last_maintenance_id=result.last_maintenance.id if result.last_maintenance else None,
+            last_maintenance_date=result.last_maintenance_date,
+            days_since_last_maintenance=result.days_since_last_maintenance,
+            recommended_start_date=result.recommended_start_date,
+            triggered_by=result.triggered_by,
+            current_meter_readings=dict(result.current_meter_readings),
+            meter_readings_at_last_maintenance=dict(result.meter_readings_at_last_maintenance),
+            meter_delta=dict(result.meter_delta),
+            errors=tuple(result.errors)
+        )
+
+    def to_dict(self) -> Dict:
+        """Convert PlanRecord to dictionary for serialization"""
+        return {
+            'asset_id': self.asset_id,
+            'maintenance_plan_id': self.maintenance_plan_id,
+            'needs_maintenance': self.needs_maintenance,
+            'reason': self.reason,
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'due_date_earliest': self.due_date_earliest.isoformat() if self.due_date_earliest else None,
+            'due_date_latest': self.due_date_latest.isoformat() if self.due_date_latest else None,
+            'last_maintenance_id': self.last_maintenance_id,
+            'last_maintenance_date': self.last_maintenance_date.isoformat() if self.last_maintenance_date else None,
+            'days_since_last_maintenance': self.days_since_last_maintenance,
+            'recommended_start_date': self.recommended_start_date.isoformat() if self.recommended_start_date else None,
+            'triggered_by': self.triggered_by,
+            'current_meter_readings': self.current_meter_readings,
+            'meter_readings_at_last_maintenance': self.meter_readings_at_last_maintenance,
+            'meter_delta': self.meter_delta,
+            'errors': list(self.errors)
+        }
+
+
+def records_to_results(records: List[PlanRecord]) -> List[PlanningResult]:
+    """
+    Turn records back into PlanningResult objects in the calling process.
+
+    Plan contexts, assets and last maintenance events are loaded with one
+    query per RESULT_LOAD_CHUNK_SIZE ids rather than one per record.
+
+    Args:
+        records: PlanRecord objects from evaluate()
+
+    Returns:
+        List of PlanningResult objects, in record order
+    """
+    from app.data.core.asset_info.asset import Asset
+
+    plan_contexts = {
+        plan.id: MaintenancePlanContext(plan)
+        for plan in _load_by_ids(MaintenancePlan, {record.maintenance_plan_id for record in records})
+    }
+    assets = {asset.id: asset for asset in _load_by_ids(Asset, {record.asset_id for record in records})}
+    last_maintenance = {
+        action_set.id: action_set
+        for action_set in _load_by_ids(
+            MaintenanceActionSet,
+            {record.last_maintenance_id for record in records if record.last_maintenance_id}
+        )
+    }
+
+    results = []
+    for record in records:
+        result = PlanningResult(
+            asset_id=record.asset_id,
+            asset=assets.get(record.asset_id),
+            maintenance_plan_id=record.maintenance_plan_id,
+            maintenance_plan=plan_contexts.get(record.maintenance_plan_id),
+            needs_maintenance=record.needs_maintenance,
+            reason=record.reason,
+            due_date=record.due_date,
+            due_date_earliest=record.due_date_earliest,
+            due_date_latest=record.due_date_latest,
+            last_maintenance_date=record.last_maintenance_date,
+            last_maintenance=last_maintenance.get(record.last_maintenance_id),
+            days_since_last_maintenance=record.days_since_last_maintenance,
+            recommended_start_date=record.recommended_start_date,
+            triggered_by=record.triggered_by,
+            errors=list(record.errors)
+        )
+        # Keep the result's default meter dicts when the record has none
+        for name in ('current_meter_readings', 'meter_readings_at_last_maintenance', 'meter_delta'):
+            if getattr(record, name) is not None:
+                setattr(result, name, dict(getattr(record, name)))
+        results.append(result)
+    return results
+
+
+def _load_by_ids(model, ids) -> List:
+    """Load model rows by id in chunks of RESULT_LOAD_CHUNK_SIZE"""
+    ids = sorted(ids)
+    rows = []
+    for start in range(0, len(ids), RESULT_LOAD_CHUNK_SIZE):
+        rows.extend(model.query.filter(model.id.in_(ids[start:start + RESULT_LOAD_CHUNK_SIZE])).all())
+    return rows
+
+
+def evaluate_plans(plan_ids: Iterable[int]) -> List[PlanRecord]:
+    """
+    Evaluate plans in the current app context without writing anything.
+
+    Plans that fail are logged and skipped, as in plan_all_active_plans.
+
+    Args:
+        plan_ids: Maintenance plan IDs to evaluate
+
+    Returns:
+        List of PlanRecord objects, in plan order
+    """
+    planner = MaintenancePlanner()
+    records = []
+    for plan_id in plan_ids:
+        try:
+            results = planner.plan_maintenance(MaintenancePlanContext(plan_id))
+            records.extend(PlanRecord.from_result(result) for result in results)
+        except Exception as e:
+            logger.error(f"Error planning for plan {plan_id}: {e}")
+    return records
+
+
+def _set_query_only(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only = ON")
+    cursor.close()
+
+
+def _init_worker(database_url: str) -> None:
+    """Process pool initializer: build this worker's app and push its context"""
+    global _worker_app_context
+    os.environ['DATABASE_URL'] = database_url
+
+    # Listen on the Engine class before create_app, so every connection this
+    # worker opens (including any opened while the app is built) is read-only
+    if make_url(database_url).get_backend_name() == 'sqlite':
+        event.listen(Engine, 'connect', _set_query_only)
+
+    from app import create_app
+    app = create_app()
+    _worker_app_context = app.app_context()
+    _worker_app_context.push()
+
+
+def _evaluate_chunk(plan_ids: List[int]) -> List[PlanRecord]:
+    """Process pool task: evaluate one chunk of plans"""
+    try:
+        return evaluate_plans(plan_ids)
+    finally:
+        # Discard anything the evaluation loaded or touched
+        db.session.rollback()
+        db.session.remove()
+
+
+class ParallelPlanExecutor:
+    """
+    Evaluates maintenance plans in parallel and creates their events.
+
+    Usage:
+        executor = ParallelPlanExecutor()
+        records = executor.evaluate()
+        events = executor.create_events(records, user_id=user_id)
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize ParallelPlanExecutor.
+
+        Args:
+            workers: Number of worker processes (default: PLANNING_WORKERS setting)
+        """
+        if workers is None:
+            workers = current_app.config.get('PLANNING_WORKERS', 1)
+        self.workers = max(1, workers)
+
+    def evaluate(self, plan_ids: Optional[List[int]] = None) -> List[PlanRecord]:
+        """
+        Evaluate plans and merge the records of all workers.
+
+        Args:
+            plan_ids: Plans to evaluate (default: all active plans)
+
+        Returns:
+            List of PlanRecord objects, in plan order
+        """
+        if plan_ids is None:
+            plan_ids = [
+                plan_id for (plan_id,) in
+                db.session.query(MaintenancePlan.id).filter_by(status='Active').order_by(MaintenancePlan.id)
+            ]
+        if not plan_ids:
+            return []
+
+        refitted = MaintenancePlanner().refresh_marked_usage_rates()
+
+        database_url = db.engine.url.render_as_string(hide_password=False)
+        workers = min(self.workers, len(plan_ids))
+        if workers <= 1 or db.engine.url.database in (None, '', ':memory:'):
+            logger.info(f"Evaluating {len(plan_ids)} plans in-process")
+            return evaluate_plans(plan_ids)
+
+        # Workers only see committed data
+        if refitted:
+            db.session.commit()
+
+        chunk_count = min(len(plan_ids), workers * CHUNKS_PER_WORKER)
+        chunks = [plan_ids[index::chunk_count] for index in range(chunk_count)]
+
+        logger.info(f"Evaluating {len(plan_ids)} plans with {workers} workers ({chunk_count} chunks)")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(database_url,)) as pool:
+            chunk_records = list(pool.map(_evaluate_chunk, chunks))
+
+        # Chunks interleave plans; restore plan order
+        records_by_plan = {}
+        for records in chunk_records:
+            for record in records:
+                records_by_plan.setdefault(record.maintenance_plan_id, []).append(record)
+        return [record for plan_id in plan_ids for record in records_by_plan.get(plan_id, [])]
+
+    def create_events(
+        self,
+        records: List[PlanRecord],
+        user_id: Optional[int] = None
+    ) -> List[MaintenanceActionSet]:
+        """
+        Create maintenance events for due records in the calling process.
+
+        Duplicate prevention runs again here, against the database as it is
+        now rather than as the workers saw it.
+
+        Args:
+            records: PlanRecord objects from evaluate()
+            user_id: User ID creating the events
+
+        Returns:
+            List of created MaintenanceActionSet objects
+        """
+        due_records = [record for record in records if record.needs_maintenance]
+        return MaintenancePlanner().create_events_from_results(records_to_results(due_records), user_id=user_id)
+
+    def run(
+        self,
+        plan_ids: Optional[List[int]] = None,
+        create_events: bool = False,
+        user_id: Optional[int] = None
+    ) -> Tuple[List[PlanRecord], List[MaintenanceActionSet]]:
+        """
+        Evaluate plans, then optionally create their events.
+
+        Args:
+            plan_ids: Plans to evaluate (default: all active plans)
+            create_events: Create events for due records after evaluation
+            user_id: User ID creating the events
+
+        Returns:
+            Tuple of (records, created events)
+        """
+        records = self.evaluate(plan_ids)
+        created_events = self.create_events(records, user_id=user_id) if create_events else []
+        return records, created_events
@@ -21,6 +21,9 @@ class PlanningResult:
     needs_maintenance: bool
     reason: str  # Why maintenance is needed (or why not)
     due_date: Optional[datetime] = None
+    # Confidence band of a forecast due date (meter-based plans)
+    due_date_earliest: Optional[datetime] = None
+    due_date_latest: Optional[datetime] = None
     last_maintenance_date: Optional[datetime] = None
     last_maintenance: Optional[MaintenanceActionSet] = None
     current_meter_readings: Dict[str, Optional[float]] = field(default_factory=lambda: {
@@ -43,6 +46,8 @@ class PlanningResult:
         'meter4': None
     })
     recommended_start_date: Optional[datetime] = None
+    # Criterion that made maintenance due on a hybrid plan: 'time', 'meter' or 'time and meter'
+    triggered_by: Optional[str] = None
     errors: List[str] = field(default_factory=list)
     
     def to_dict(self) -> Dict:
@@ -53,12 +58,15 @@ class PlanningResult:
             'needs_maintenance': self.needs_maintenance,
             'reason': self.reason,
             'due_date': self.due_date.isoformat() if self.due_date else None,
+            'due_date_earliest': self.due_date_earliest.isoformat() if self.due_date_earliest else None,
+            'due_date_latest': self.due_date_latest.isoformat() if self.due_date_latest else None,
             'last_maintenance_date': self.last_maintenance_date.isoformat() if self.last_maintenance_date else None,
             'days_since_last_maintenance': self.days_since_last_maintenance,
             'current_meter_readings': self.current_meter_readings,
             'meter_readings_at_last_maintenance': self.meter_readings_at_last_maintenance,
             'meter_delta': self.meter_delta,
             'recommended_start_date': self.recommended_start_date.isoformat() if self.recommended_start_date else None,
+            'triggered_by': self.triggered_by,
             'errors': self.errors
         }
 
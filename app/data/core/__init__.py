@@ -8,6 +8,8 @@ from .asset_info.asset_type import AssetType
 from .asset_info.make_model import MakeModel
 from .asset_info.asset import Asset
 from .asset_info.meter_history import MeterHistory
+from .asset_info.meter_usage_rates import MeterUsageRate
+from .scheduled_job_runs import ScheduledJobRun
 from .event_info.event import Event, EventDetailVirtual
 from .event_info.attachment import Attachment
 from .event_info.comment import Comment, CommentAttachment
@@ -22,6 +24,8 @@ __all__ = [
     'MakeModel',
     'Asset',
     'MeterHistory',
+    'MeterUsageRate',
+    'ScheduledJobRun',
     'Event',
     'EventDetailVirtual',
     'Attachment',
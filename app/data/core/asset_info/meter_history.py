@@ -33,7 +33,7 @@ class MeterHistory(UserCreatedBase):
     # Indexes for efficient queries
     __table_args__ = (
         Index('idx_meter_history_asset_id', 'asset_id'),
-        Index('idx_meter_history_recorded_at', 'recorded_at'),
+        Index('idx_meter_history_recorded_at', 'recorded_at', 'id'),
     )
     
     def __repr__(self):
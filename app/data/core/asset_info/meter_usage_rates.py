@@ -0,0 +1,40 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import Index
+
+
+class MeterUsageRate(db.Model):
+    """
+    Meter Usage Rate - fitted usage rate of one asset meter, in units per day.
+
+    Cached fit over the asset's recent MeterHistory readings (see
+    MeterUsageForecaster). Every meter of an asset is fitted together from the
+    same readings; last_meter_history_id records the newest reading used, so
+    only assets with newer readings are refitted. rate_per_day is None when
+    there were too few readings since the window start or the last meter
+    reset.
+    """
+    __tablename__ = 'meter_usage_rates'
+
+    id = db.Column(db.Integer, primary_key=True)
+    asset_id = db.Column(db.Integer, db.ForeignKey('assets.id'), nullable=False)
+    meter_field = db.Column(db.String(10), nullable=False)
+
+    # Robust slope and its confidence band (units per day)
+    rate_per_day = db.Column(db.Float, nullable=True)
+    rate_low = db.Column(db.Float, nullable=True)
+    rate_high = db.Column(db.Float, nullable=True)
+
+    # Readings the fit was computed from
+    reading_count = db.Column(db.Integer, default=0, nullable=False)
+    first_reading_at = db.Column(db.DateTime, nullable=True)
+    last_reading_at = db.Column(db.DateTime, nullable=True)
+    last_meter_history_id = db.Column(db.Integer, nullable=False)
+    fitted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_meter_usage_rates_asset_meter', 'asset_id', 'meter_field', unique=True),
+    )
+
+    def __repr__(self):
+        return f'<MeterUsageRate Asset {self.asset_id} {self.meter_field}: {self.rate_per_day}/day>'
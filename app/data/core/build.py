@@ -20,9 +20,11 @@ def build_models():
     import app.data.core.asset_info.make_model
     import app.data.core.asset_info.asset
     import app.data.core.asset_info.meter_history
+    import app.data.core.asset_info.meter_usage_rates
     import app.data.core.event_info.event
     import app.data.core.event_info.attachment
     import app.data.core.event_info.comment
+    import app.data.core.scheduled_job_runs
     
     # Initialize attachment sequence
     from app.data.core.sequences import AttachmentIDManager
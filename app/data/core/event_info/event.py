@@ -22,6 +22,11 @@ class Event(UserCreatedBase, DataInsertionMixin):
     asset = db.relationship('Asset', overlaps="asset_ref,events")
     major_location = db.relationship('MajorLocation')
     
+    # Keyset pagination of the event list seeks on (timestamp, id)
+    __table_args__ = (
+        db.Index('idx_events_timestamp_id', 'timestamp', 'id'),
+    )
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Auto-set major_location_id from asset if not provided
@@ -69,6 +74,77 @@ class Event(UserCreatedBase, DataInsertionMixin):
         db.session.flush()  # Get the ID without committing
         return event.id 
     
+    @classmethod
+    def bulk_add_events(cls, events):
+        """
+        Create and save many events in one batch
+        
+        Unlike add_event, this does not construct ORM objects. Missing
+        major_location_id values are resolved for the whole batch with one
+        Asset query, and all rows are written with a single executemany
+        INSERT ... RETURNING, so the cost no longer grows by several queries
+        per event.
+        
+        Args:
+            events (list): Dicts with the same keys as add_event
+                (event_type, description, user_id, asset_id, major_location_id, status)
+                and optionally timestamp
+            
+        Returns:
+            list: IDs of the created events, in the same order as events
+        """
+        from app.data.core.asset_info.asset import Asset
+        from sqlalchemy import insert
+        
+        if not events:
+            return []
+        
+        # Resolve locations for every asset in the batch at once
+        asset_ids = {
+            data['asset_id'] for data in events
+            if data.get('asset_id') and not data.get('major_location_id')
+        }
+        asset_locations = {}
+        if asset_ids:
+            asset_locations = dict(
+                db.session.query(Asset.id, Asset.major_location_id)
+                .filter(Asset.id.in_(asset_ids))
+                .all()
+            )
+        
+        now = datetime.utcnow()
+        rows = []
+        for data in events:
+            asset_id = data.get('asset_id')
+            user_id = data.get('user_id')
+            rows.append({
+                'event_type': data['event_type'],
+                'description': data['description'],
+                'timestamp': data.get('timestamp') or now,
+                'user_id': user_id,
+                'asset_id': asset_id,
+                'major_location_id': data.get('major_location_id') or asset_locations.get(asset_id),
+                'status': data.get('status'),
+                'created_at': now,
+                'updated_at': now,
+                'created_by_id': data.get('created_by_id', user_id),
+                'updated_by_id': data.get('updated_by_id', user_id),
+            })
+        
+        result = db.session.execute(
+            insert(cls).returning(cls.id, sort_by_parameter_order=True),
+            rows
+        )
+        event_ids = list(result.scalars())
+        
+        # Bulk inserts skip the mapper hooks that maintain the search index
+        from app.data.core.search_index import index_rows
+        index_rows('events', (
+            {'id': event_id, 'description': row['description']}
+            for event_id, row in zip(event_ids, rows)
+        ))
+        return event_ids
+    
 
 # EventDetailIDManager moved to app.models.core.sequences
 
@@ -108,6 +184,45 @@ class EventDetailVirtual(UserCreatedBase):
 
         super().__init__(*args, **kwargs)
 
+    @classmethod
+    def bulk_create(cls, rows, event_data=None):
+        """
+        Construct many detail rows together with their events
+        
+        Detail IDs are allocated from the sequence in one call and the events
+        are inserted with Event.bulk_add_events, instead of one sequence
+        update, one Asset lookup and one flush per row.
+        
+        Args:
+            rows (list): Keyword argument dicts, one per detail row
+            event_data (list, optional): Event dicts (see Event.bulk_add_events),
+                one per row. Defaults to get_event_data() of each row.
+            
+        Returns:
+            list: The new detail rows, added to the session but not committed
+        """
+        from app.data.core.sequences import EventDetailIDManager
+        if not rows:
+            return []
+        if event_data is not None and len(event_data) != len(rows):
+            raise ValueError("event_data must contain one entry per detail row")
+        detail_ids = EventDetailIDManager.get_next_ids(len(rows))
+        details = [cls(**{'event_id': None, **kwargs, 'all_details_id': detail_id})
+                   for kwargs, detail_id in zip(rows, detail_ids)]
+        if event_data is None:
+            event_data = [detail.get_event_data() for detail in details]
+        event_ids = Event.bulk_add_events(event_data)
+        for detail, event_id in zip(details, event_ids):
+            detail.event_id = event_id
+        db.session.add_all(details)
+        return details
+
+    def get_event_data(self):
+        """Build the Event fields for this detail row (used by bulk_create)
+        Subclasses with custom create_event logic should override this to match."""
+        return {'event_type': self.event_type, 'description': self.description,
+                'user_id': self.created_by_id, 'asset_id': self.asset_id}
+
     @abstractmethod
     def create_event(self):
         # Assign global row ID before calling parent constructor
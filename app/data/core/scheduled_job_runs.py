@@ -0,0 +1,38 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import Index
+
+
+class ScheduledJobRun(db.Model):
+    """
+    Scheduled Job Run - one execution of a background scheduler job.
+
+    Written by the scheduler (app.utils.background_scheduler): a 'Running'
+    row when the job starts, completed with its status, duration and
+    result summary or error when it ends. trigger is 'schedule' for runs
+    due by the job's schedule and 'manual' for runs started by an admin.
+    """
+    __tablename__ = 'scheduled_job_runs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False)
+    trigger = db.Column(db.String(20), default='schedule', nullable=False)
+    status = db.Column(db.String(20), default='Running', nullable=False)  # Running/Succeeded/Failed
+
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_ms = db.Column(db.Float, nullable=True)
+
+    # Summary returned by the job, or the error it raised
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    # host:pid of the process that ran the job
+    worker = db.Column(db.String(100), nullable=True)
+
+    __table_args__ = (
+        Index('idx_scheduled_job_runs_job_started', 'job_name', 'started_at'),
+    )
+
+    def __repr__(self):
+        return f'<ScheduledJobRun {self.id}: {self.job_name} {self.status}>'
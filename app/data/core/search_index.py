@@ -0,0 +1,352 @@
+"""
+Full-Text Search Index
+SQLite FTS5 index over the text columns users search from the global search
+page and the HTMX searchbars.
+
+- One FTS5 table per indexed entity (search_<name>), rowid = entity id
+- Kept in sync by mapper after_insert/after_update/after_delete hooks that
+  write through the flushing connection, so index changes commit and roll
+  back together with the entity change
+- Writes that bypass the ORM (Core bulk inserts, raw SQL) are picked up by
+  rebuild_search_index(), which runs after a build that inserted data or
+  created the index tables, and from the command line with
+  `python app.py --rebuild-search-index`
+- Queries are ranked (bm25 with per-column weights) prefix queries: every
+  word of the search term must match the start of a word in the entity.
+  This replaces the substring matching of the ILIKE filters: "pump" finds
+  "Pump" and "pumps" but no longer "sump-pump"
+- On databases without FTS5, or before the index tables exist, searches fall
+  back to the previous ILIKE '%term%' filters
+"""
+
+import importlib
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import column, event, func, inspect, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection
+
+from app import db
+from app.logger import get_logger
+
+logger = get_logger("asset_management.data.core.search_index")
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class SearchIndexSpec:
+    """
+    Definition of one FTS5 table.
+
+    Args:
+        name: Index name, used in the table name and by callers
+        model_path: Dotted path to the indexed model class
+        columns: Model attributes copied into the index
+        weights: bm25 weight per column (higher ranks matches in that column first)
+    """
+
+    def __init__(self, name: str, model_path: str, columns: Tuple[str, ...], weights: Tuple[float, ...]):
+        self.name = name
+        self.model_path = model_path
+        self.columns = columns
+        self.weights = weights
+        self._model = None
+
+    @property
+    def table_name(self) -> str:
+        return f"search_{self.name}"
+
+    @property
+    def model(self):
+        """Indexed model class, imported on first use"""
+        if self._model is None:
+            module_path, class_name = self.model_path.rsplit('.', 1)
+            self._model = getattr(importlib.import_module(module_path), class_name)
+        return self._model
+
+    def fts_table(self):
+        """Lightweight table construct for building statements"""
+        return table(self.table_name, column('rowid'), *[column(name) for name in self.columns])
+
+    def row_values(self, target) -> Dict:
+        return {name: getattr(target, name) for name in self.columns}
+
+
+SEARCH_INDEXES: Dict[str, SearchIndexSpec] = {
+    spec.name: spec for spec in (
+        SearchIndexSpec('assets', 'app.data.core.asset_info.asset.Asset',
+                        ('name', 'serial_number'), (10.0, 5.0)),
+        SearchIndexSpec('parts', 'app.data.core.supply.part_definition.PartDefinition',
+                        ('part_number', 'part_name', 'description'), (10.0, 5.0, 1.0)),
+        SearchIndexSpec('events', 'app.data.core.event_info.event.Event',
+                        ('description',), (1.0,)),
+        SearchIndexSpec('comments', 'app.data.core.event_info.comment.Comment',
+                        ('content',), (1.0,)),
+        SearchIndexSpec('template_action_sets', 'app.data.maintenance.templates.template_action_sets.TemplateActionSet',
+                        ('task_name',), (1.0,)),
+    )
+}
+
+# Database URL -> whether the FTS5 tables exist there
+_availability: Dict[str, bool] = {}
+_listeners_registered = False
+
+
+def build_match_query(term: Optional[str]) -> Optional[str]:
+    """
+    Turn free text into an FTS5 prefix query.
+
+    Each word becomes a quoted prefix term ("word"*), and all words must
+    match. Returns None when the term has no searchable words.
+    """
+    words = _WORD_RE.findall(term or '')
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_index_available(bind=None) -> bool:
+    """
+    Check whether the FTS5 index can be used on the current database.
+
+    The table check is cached per database URL; create_search_index_tables()
+    refreshes it.
+
+    Args:
+        bind: Engine or Connection to check (default: db.engine). Pass the
+              flushing connection from write hooks so no second connection
+              is opened mid-transaction.
+    """
+    if has_app_context() and not current_app.config.get('SEARCH_INDEX_ENABLED', True):
+        return False
+
+    bind = bind if bind is not None else db.engine
+    key = str(bind.engine.url)
+    if key not in _availability:
+        _availability[key] = search_index_tables_exist(bind)
+    return _availability[key]
+
+
+def search_index_tables_exist(bind=None) -> bool:
+    """
+    Check the database for the FTS5 tables (uncached).
+
+    Args:
+        bind: Engine or Connection to check (default: db.engine)
+    """
+    bind = bind if bind is not None else db.engine
+    engine = bind.engine
+    if engine.dialect.name != 'sqlite':
+        return False
+
+    names = [spec.table_name for spec in SEARCH_INDEXES.values()]
+    statement = select(func.count()).select_from(text('sqlite_master')).where(
+        literal_column('type') == 'table',
+        literal_column('name').in_(names)
+    )
+    if isinstance(bind, Connection):
+        found = bind.execute(statement).scalar()
+    else:
+        with engine.connect() as connection:
+            found = connection.execute(statement).scalar()
+    return found == len(names)
+
+
+def create_search_index_tables() -> bool:
+    """
+    Create the FTS5 tables if they do not exist.
+
+    Returns:
+        True if the index is available afterwards
+    """
+    engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        logger.info("Full-text search index requires SQLite FTS5; using ILIKE search")
+        return False
+
+    try:
+        with engine.begin() as connection:
+            for spec in SEARCH_INDEXES.values():
+                connection.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {spec.table_name} USING fts5("
+                    f"{', '.join(spec.columns)}, "
+                    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+                ))
+    except Exception as e:
+        logger.warning(f"Could not create full-text search index (FTS5 unavailable?): {e}")
+        _availability[str(engine.url)] = False
+        return False
+
+    _availability[str(engine.url)] = True
+    logger.info("Full-text search index tables ready")
+    return True
+
+
+def rebuild_search_index(names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Repopulate index tables from their source tables.
+
+    Args:
+        names: Index names to rebuild (default: all)
+
+    Returns:
+        Dictionary of index name -> number of indexed rows
+    """
+    if not create_search_index_tables():
+        return {}
+
+    existing_tables = set(inspect(db.engine).get_table_names())
+    counts = {}
+    for name in (names or SEARCH_INDEXES.keys()):
+        spec = SEARCH_INDEXES[name]
+        model = spec.model
+        if model.__tablename__ not in existing_tables:
+            # Partial (phased) builds may not have created every source table
+            continue
+        fts = spec.fts_table()
+        db.session.execute(fts.delete())
+        db.session.execute(fts.insert().from_select(
+            ['rowid', *spec.columns],
+            select(model.id, *[getattr(model, attr) for attr in spec.columns])
+        ))
+        counts[name] = db.session.execute(select(func.count()).select_from(fts)).scalar()
+    db.session.commit()
+
+    logger.info(f"Full-text search index rebuilt: {counts}")
+    return counts
+
+
+def index_rows(name: str, rows: Iterable[Dict]) -> None:
+    """
+    Add rows written outside the ORM unit of work (e.g. Core bulk inserts).
+
+    Runs in the current session transaction.
+
+    Args:
+        name: Index name
+        rows: Dictionaries with 'id' and the indexed columns
+    """
+    spec = SEARCH_INDEXES[name]
+    rows = list(rows)
+    if not rows or not search_index_available():
+        return
+    db.session.execute(
+        text(f"INSERT INTO {spec.table_name} (rowid, {', '.join(spec.columns)}) "
+             f"VALUES (:id, {', '.join(f':{attr}' for attr in spec.columns)})"),
+        [{'id': row['id'], **{attr: row.get(attr) for attr in spec.columns}} for row in rows]
+    )
+
+
+def ranked_matches(name: str, term: Optional[str]):
+    """
+    Subquery of (id, rank) for entities matching term, best match first.
+
+    Returns:
+        Subquery, or None if the index is unavailable or term has no words
+    """
+    match_query = build_match_query(term)
+    if match_query is None or not search_index_available():
+        return None
+
+    spec = SEARCH_INDEXES[name]
+    fts = literal_column(spec.table_name)
+    return (
+        select(
+            literal_column('rowid').label('id'),
+            func.bm25(fts, *spec.weights).label('rank')
+        )
+        .select_from(table(spec.table_name))
+        .where(fts.op('MATCH')(match_query))
+        .subquery(f"{spec.table_name}_hits")
+    )
+
+
+def apply_text_search(query, name: str, term: Optional[str]):
+    """
+    Restrict an ORM query on an indexed model to entities matching term.
+
+    Uses the FTS5 index when available, otherwise ILIKE '%term%' over the
+    indexed columns.
+
+    Returns:
+        Tuple of (query, rank column or None). Order by the rank column
+        (ascending) for best matches first; it is None when falling back.
+    """
+    spec = SEARCH_INDEXES[name]
+    model = spec.model
+    hits = ranked_matches(name, term)
+    if hits is None:
+        return query.filter(or_(*[getattr(model, attr).ilike(f'%{term}%') for attr in spec.columns])), None
+    return query.join(hits, hits.c.id == model.id), hits.c.rank
+
+
+def search(name: str, term: Optional[str], limit: int = 10, query=None) -> List:
+    """
+    Get entities matching term, best match first.
+
+    Args:
+        name: Index name
+        term: Search text
+        limit: Maximum number of results
+        query: Optional base query on the indexed model (for extra filters)
+    """
+    model = SEARCH_INDEXES[name].model
+    query, rank = apply_text_search(query if query is not None else model.query, name, term)
+    return query.order_by(rank if rank is not None else model.id.desc()).limit(limit).all()
+
+
+# ============================================================================
+# ORM write hooks
+# ============================================================================
+
+def _write_index_row(connection, spec, target, insert=True):
+    if not search_index_available(connection):
+        return
+    connection.execute(text(f"DELETE FROM {spec.table_name} WHERE rowid = :id"), {'id': target.id})
+    if insert:
+        connection.execute(
+            text(f"INSERT INTO {spec.table_name} (rowid, {', '.join(spec.columns)}) "
+                 f"VALUES (:id, {', '.join(f':{attr}' for attr in spec.columns)})"),
+            {'id': target.id, **spec.row_values(target)}
+        )
+
+
+def _make_listeners(spec):
+    def after_insert(mapper, connection, target):
+        _write_index_row(connection, spec, target)
+
+    def after_update(mapper, connection, target):
+        state = inspect(target)
+        if any(state.attrs[attr].history.has_changes() for attr in spec.columns):
+            _write_index_row(connection, spec, target)
+
+    def after_delete(mapper, connection, target):
+        _write_index_row(connection, spec, target, insert=False)
+
+    return after_insert, after_update, after_delete
+
+
+def init_search_index(app) -> None:
+    """
+    Attach the ORM write hooks that keep the index in sync.
+
+    Models that cannot be imported (optional modules) are skipped.
+    """
+    global _listeners_registered
+    if not app.config.get('SEARCH_INDEX_ENABLED', True) or _listeners_registered:
+        return
+
+    for spec in SEARCH_INDEXES.values():
+        try:
+            model = spec.model
+        except ImportError as e:
+            logger.warning(f"Search index '{spec.name}' disabled, model unavailable: {e}")
+            continue
+        after_insert, after_update, after_delete = _make_listeners(spec)
+        event.listen(model, 'after_insert', after_insert, propagate=True)
+        event.listen(model, 'after_update', after_update, propagate=True)
+        event.listen(model, 'after_delete', after_delete, propagate=True)
+
+    _listeners_registered = True
+    logger.debug("Full-text search index hooks registered")
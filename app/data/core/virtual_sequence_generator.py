@@ -2,22 +2,93 @@
 """
 Virtual Sequence Generator Base Class
 Provides common functionality for managing database sequences across different modules
+
+Two allocation modes are supported:
+- Row mode (block_size == 1, the default): every ID costs an UPDATE and a SELECT
+  on the sequence counter table.
+- Block mode (block_size > 1, hi/lo allocation): a process reserves a contiguous
+  range of IDs with a single UPDATE and hands them out from memory.
+
+Block reservations run inside the caller's session transaction, exactly like the
+row mode counter update. Because the counter row is locked by that transaction,
+reservations are atomic across worker processes. A reserved block is only shared
+with other sessions once its transaction commits; if the transaction rolls back
+the unused part of the block is discarded, leaving a gap in the sequence but
+never a duplicate ID.
 """
 
 from app import db
-from sqlalchemy import text
+from sqlalchemy import text, event
+from sqlalchemy.orm import Session
 from contextlib import contextmanager
 import threading
+import weakref
 from abc import ABC, abstractmethod
 
+
+class SequenceBlock:
+    """
+    A contiguous range of reserved sequence IDs held in memory.
+
+    The block remembers the session whose transaction reserved it. Until that
+    transaction commits, only the owning session may draw IDs from the block.
+    """
+
+    def __init__(self, first_value, last_value, session):
+        self.next_value = first_value
+        self.last_value = last_value
+        self.committed = False
+        self._session_ref = weakref.ref(session)
+
+    @property
+    def remaining(self):
+        """Number of IDs still available in the block"""
+        return max(0, self.last_value - self.next_value + 1)
+
+    def is_owned_by(self, session):
+        """Check whether the block was reserved by the given session"""
+        return self._session_ref() is session
+
+    def is_usable_by(self, session):
+        """Check whether the given session may draw IDs from the block"""
+        return self.remaining > 0 and (self.committed or self.is_owned_by(session))
+
+    def take(self, count=1):
+        """
+        Take up to count IDs from the block
+
+        Returns:
+            list: The IDs taken (may be shorter than count if the block runs out)
+        """
+        count = min(count, self.remaining)
+        values = list(range(self.next_value, self.next_value + count))
+        self.next_value += count
+        return values
+
+
 class VirtualSequenceGenerator(ABC):
     """
     Abstract base class for sequence generators
     Provides common functionality for managing database sequences
+
+    Each subclass gets its own lock and its own in-memory block, so allocating
+    attachment IDs never waits on asset detail IDs and vice versa.
     """
-    
-    _lock = threading.Lock()
-    
+
+    # Number of IDs reserved per database round trip (1 = row mode)
+    block_size = 1
+
+    _lock = threading.RLock()
+    _block = None
+    _generators = []
+
+    def __init_subclass__(cls, **kwargs):
+        """Give every sequence its own lock and block state"""
+        super().__init_subclass__(**kwargs)
+        cls._lock = threading.RLock()
+        cls._block = None
+        VirtualSequenceGenerator._generators.append(cls)
+
     @classmethod
     @abstractmethod
     def get_sequence_table_name(cls):
@@ -26,19 +97,120 @@ class VirtualSequenceGenerator(ABC):
         Must be implemented by subclasses
         """
         pass
-    
+
+    @classmethod
+    def configure_block_allocation(cls, block_size):
+        """
+        Set the number of IDs reserved per database round trip
+
+        Calling this on VirtualSequenceGenerator configures every sequence that
+        does not override block_size; calling it on a subclass configures only
+        that sequence.
+
+        Args:
+            block_size (int): IDs per reservation; 1 disables block allocation
+        """
+        block_size = int(block_size)
+        if block_size < 1:
+            raise ValueError(f"Sequence block size must be at least 1, got {block_size}")
+
+        cls.block_size = block_size
+        for generator in VirtualSequenceGenerator._generators:
+            if issubclass(generator, cls):
+                with generator._lock:
+                    generator._block = None
+
     @classmethod
     def get_next_id(cls):
         """
         Get the next available ID from the sequence
         Uses database counter table for thread safety
         """
+        return cls.get_next_ids(1)[0]
+
+    @classmethod
+    def get_next_ids(cls, count):
+        """
+        Get several IDs from the sequence at once
+
+        In row mode the counter is advanced by count in one UPDATE. In block
+        mode IDs come from the in-memory block, reserving a new block only when
+        the current one is exhausted.
+
+        Args:
+            count (int): Number of IDs to allocate
+
+        Returns:
+            list: Allocated IDs in ascending order
+        """
+        if count < 1:
+            return []
+
+        with cls._lock:
+            if cls.block_size <= 1:
+                last_value = cls._advance_counter(count)
+                return list(range(last_value - count + 1, last_value + 1))
+
+            session = db.session()
+            ids = []
+            block = cls._block
+            if block is not None and block.is_usable_by(session):
+                ids.extend(block.take(count))
+
+            needed = count - len(ids)
+            if needed > 0:
+                block = cls._reserve_block(session, max(needed, cls.block_size))
+                cls._block = block
+                ids.extend(block.take(needed))
+            return ids
+
+    @classmethod
+    def _advance_counter(cls, count):
+        """
+        Advance the counter by count inside the current session transaction
+
+        Returns:
+            int: The new counter value (the highest allocated ID)
+        """
+        table_name = cls.get_sequence_table_name()
+        db.session.execute(
+            text(f"UPDATE {table_name} SET current_value = current_value + :count"),
+            {'count': count}
+        )
+        result = db.session.execute(text(f"SELECT current_value FROM {table_name}"))
+        return result.scalar()
+
+    @classmethod
+    def _reserve_block(cls, session, size):
+        """
+        Reserve a block of IDs in the database
+
+        Args:
+            session: The session whose transaction holds the reservation
+            size (int): Number of IDs to reserve
+
+        Returns:
+            SequenceBlock: The reserved (not yet committed) block
+        """
+        last_value = cls._advance_counter(size)
+        return SequenceBlock(last_value - size + 1, last_value, session)
+
+    @classmethod
+    def _on_session_commit(cls, session):
+        """Share blocks reserved by a committed transaction with all sessions"""
         with cls._lock:
-            # Update counter and get new value atomically
-            db.session.execute(text(f"UPDATE {cls.get_sequence_table_name()} SET current_value = current_value + 1"))
-            result = db.session.execute(text(f"SELECT current_value FROM {cls.get_sequence_table_name()}"))
-            return result.scalar()
-    
+            block = cls._block
+            if block is not None and not block.committed and block.is_owned_by(session):
+                block.committed = True
+
+    @classmethod
+    def _on_session_rollback(cls, session):
+        """Discard blocks whose reservation was rolled back"""
+        with cls._lock:
+            block = cls._block
+            if block is not None and not block.committed and block.is_owned_by(session):
+                cls._block = None
+
     @classmethod
     def create_sequence_if_not_exists(cls):
         """
@@ -53,18 +225,18 @@ class VirtualSequenceGenerator(ABC):
                     current_value INTEGER DEFAULT 0
                 )
             """))
-            
+
             # Initialize the counter if it doesn't exist
             result = db.session.execute(text(f"SELECT COUNT(*) FROM {cls.get_sequence_table_name()}"))
             if result.scalar() == 0:
                 db.session.execute(text(f"INSERT INTO {cls.get_sequence_table_name()} (current_value) VALUES (0)"))
-            
+
             db.session.commit()
-                
+
         except Exception as e:
             db.session.rollback()
             raise e
-    
+
     @classmethod
     def reset_sequence(cls, start_value=1):
         """
@@ -74,15 +246,19 @@ class VirtualSequenceGenerator(ABC):
         with cls._lock:
             db.session.execute(text(f"UPDATE {cls.get_sequence_table_name()} SET current_value = {start_value - 1}"))
             db.session.commit()
-    
+            cls._block = None
+
     @classmethod
     def get_current_sequence_value(cls):
         """
         Get the current value of the sequence
+
+        In block mode this is the high-water mark of reserved IDs, not the last
+        ID handed out.
         """
         result = db.session.execute(text(f"SELECT current_value FROM {cls.get_sequence_table_name()}"))
         return result.scalar()
-    
+
     @classmethod
     def get_sequence_info(cls):
         """
@@ -90,8 +266,24 @@ class VirtualSequenceGenerator(ABC):
         """
         result = db.session.execute(text(f"SELECT current_value FROM {cls.get_sequence_table_name()}"))
         current_value = result.scalar()
+        block = cls._block
         return {
             'table_name': cls.get_sequence_table_name(),
-            'current_value': current_value
+            'current_value': current_value,
+            'block_size': cls.block_size,
+            'block_remaining': block.remaining if block is not None else 0,
         }
 
+
+@event.listens_for(Session, 'after_commit')
+def _sequence_blocks_after_commit(session):
+    """Mark blocks reserved by this session as committed"""
+    for generator in VirtualSequenceGenerator._generators:
+        generator._on_session_commit(session)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _sequence_blocks_after_rollback(session, previous_transaction):
+    """Drop uncommitted blocks reserved by this session"""
+    for generator in VirtualSequenceGenerator._generators:
+        generator._on_session_rollback(session)
@@ -34,18 +34,21 @@ class DispatchRequest(EventDetailVirtual):
     
     # Note: Use DispatchContext to access outcomes and perform operations
 
-    def create_event(self):
+    def get_event_data(self):
         # Ensure coherent description and status on Event creation
         description = f"Dispatch request created for asset type {self.asset_type_id}"
         status = 'RequestCreated' if self.status == 'Draft' else self.status
 
-        self.event_id = Event.add_event(
-            event_type=self.event_type,
-            description=description,
-            user_id=self.created_by_id,
-            asset_id=self.asset_id,
-            status=status,
-        )
+        return {
+            'event_type': self.event_type,
+            'description': description,
+            'user_id': self.created_by_id,
+            'asset_id': self.asset_id,
+            'status': status,
+        }
+
+    def create_event(self):
+        self.event_id = Event.add_event(**self.get_event_data())
 
 
 
@@ -18,7 +18,9 @@ from app.data.inventory.arrivals import (
 from app.data.inventory.inventory import (
     Storeroom,
     ActiveInventory,
-    InventoryMovement
+    InventoryMovement,
+    InventorySnapshot,
+    InventorySnapshotLine
 )
 
 
@@ -39,7 +41,9 @@ def build_models():
         PartArrival,
         Storeroom,
         ActiveInventory,
-        InventoryMovement
+        InventoryMovement,
+        InventorySnapshot,
+        InventorySnapshotLine
     ]
     
     print(f"Phase 6: Registered {len(models)} inventory models")
@@ -171,6 +175,16 @@ def get_model_info():
                 'name': 'InventoryMovement',
                 'table': 'inventory_movements',
                 'description': 'Inventory movement audit trail with traceability'
+            },
+            {
+                'name': 'InventorySnapshot',
+                'table': 'inventory_snapshots',
+                'description': 'Periodic point-in-time stock snapshots'
+            },
+            {
+                'name': 'InventorySnapshotLine',
+                'table': 'inventory_snapshot_lines',
+                'description': 'Snapshot quantity and value per bin'
             }
         ],
         'features': [
@@ -181,7 +195,8 @@ def get_model_info():
             'Complete traceability chain (initial_arrival_id, previous_movement_id)',
             'Integration with maintenance part demands',
             'Cost tracking and valuation',
-            '6-month average cost calculation'
+            '6-month average cost calculation',
+            'Point-in-time stock from snapshots plus movement replay'
         ]
     }
 
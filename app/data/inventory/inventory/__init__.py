@@ -6,6 +6,7 @@ from app.data.inventory.inventory.active_inventory import ActiveInventory
 from app.data.inventory.inventory.inventory_movement import InventoryMovement
 from app.data.inventory.inventory.inventory_summary import InventorySummary
 from app.data.inventory.inventory.part_issue import PartIssue
+from app.data.inventory.inventory.inventory_snapshot import InventorySnapshot, InventorySnapshotLine
 
 __all__ = [
     'Storeroom',
@@ -14,5 +15,7 @@ __all__ = [
     'InventoryMovement',
     'InventorySummary',
     'PartIssue',
+    'InventorySnapshot',
+    'InventorySnapshotLine',
 ]
 
@@ -72,6 +72,7 @@ class InventoryMovement(UserCreatedBase):
     to_bin = db.relationship('Bin', foreign_keys=[to_bin_id])
     
     # Alias relationships for BinPrototype compatibility
+    major_location = db.relationship('MajorLocation', foreign_keys=[to_major_location_id], viewonly=True)
     storeroom = db.relationship('Storeroom', foreign_keys=[to_storeroom_id], viewonly=True)
     location = db.relationship('Location', foreign_keys=[to_location_id], viewonly=True)
     
@@ -92,6 +93,19 @@ class InventoryMovement(UserCreatedBase):
         backref='subsequent_movements'
     )
     
+    # Keyset pagination of the movement list seeks on (movement_date, id);
+    # lineage queries walk previous_movement_id downstream from arrivals;
+    # reconciliation sums quantity per part range from (part_id, quantity) alone;
+    # InventoryManager finds the latest movement into a bin by (part_id, to_* bin)
+    __table_args__ = (
+        db.Index('idx_inventory_movements_movement_date_id', 'movement_date', 'id'),
+        db.Index('idx_inventory_movements_part_id_quantity', 'part_id', 'quantity'),
+        db.Index('idx_inventory_movements_previous_movement_id', 'previous_movement_id'),
+        db.Index('idx_inventory_movements_part_arrival_id', 'part_arrival_id'),
+        db.Index('idx_inventory_movements_part_id_to_bin',
+                 'part_id', 'to_storeroom_id', 'to_location_id', 'to_bin_id'),
+    )
+    
     def __repr__(self):
         return f'<InventoryMovement {self.movement_type}: Part {self.part_id}, ΔQty {self.quantity_delta}>'
     
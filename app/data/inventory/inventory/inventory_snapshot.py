@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from app import db
+from app.data.core.user_created_base import UserCreatedBase
+
+
+class InventorySnapshot(UserCreatedBase):
+    """
+    Point-in-time record of on-hand stock, one line per (part, storeroom, location, bin).
+
+    A snapshot covers every inventory movement dated at or before `snapshot_at`
+    with an id up to `last_movement_id`. Movements written later (including
+    back-dated ones) are replayed on top of it by InventorySnapshotManager to
+    answer as-of queries.
+
+    Notes:
+    - Written by the business layer (InventorySnapshotManager), normally from the
+      background scheduler.
+    - Values use the unit costs current when the snapshot was written.
+    """
+
+    __tablename__ = "inventory_snapshots"
+
+    snapshot_at = db.Column(db.DateTime, nullable=False)
+    last_movement_id = db.Column(db.Integer, nullable=False, default=0)
+
+    # Snapshot this one was rolled forward from (None when replayed from the start of the ledger)
+    base_snapshot_id = db.Column(db.Integer, db.ForeignKey("inventory_snapshots.id"), nullable=True)
+    movements_replayed = db.Column(db.Integer, nullable=False, default=0)
+
+    line_count = db.Column(db.Integer, nullable=False, default=0)
+    total_quantity = db.Column(db.Float, nullable=False, default=0.0)
+    total_value = db.Column(db.Float, nullable=False, default=0.0)
+    duration_ms = db.Column(db.Float, nullable=True)
+
+    __table_args__ = (
+        db.Index("idx_inventory_snapshots_snapshot_at", "snapshot_at"),
+    )
+
+    # Relationships
+    lines = db.relationship(
+        "InventorySnapshotLine",
+        back_populates="snapshot",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="dynamic",
+    )
+
+    def __repr__(self):
+        return f"<InventorySnapshot {self.id} at {self.snapshot_at}: {self.line_count} lines>"
+
+
+class InventorySnapshotLine(db.Model):
+    """
+    Quantity and value of one bin in an InventorySnapshot.
+
+    Kept compact (no audit columns, no foreign keys to locations or bins) so
+    snapshots stay small and remain valid after bins are removed.
+    """
+
+    __tablename__ = "inventory_snapshot_lines"
+
+    id = db.Column(db.Integer, primary_key=True)
+    snapshot_id = db.Column(
+        db.Integer, db.ForeignKey("inventory_snapshots.id", ondelete="CASCADE"), nullable=False
+    )
+
+    part_id = db.Column(db.Integer, nullable=False)
+    storeroom_id = db.Column(db.Integer, nullable=True)
+    location_id = db.Column(db.Integer, nullable=True)
+    bin_id = db.Column(db.Integer, nullable=True)
+
+    quantity = db.Column(db.Float, nullable=False)
+    value = db.Column(db.Float, nullable=True)
+
+    __table_args__ = (
+        db.Index("idx_inventory_snapshot_lines_snapshot_storeroom_part", "snapshot_id", "storeroom_id", "part_id"),
+    )
+
+    # Relationships
+    snapshot = db.relationship("InventorySnapshot", back_populates="lines")
+
+    def __repr__(self):
+        return f"<InventorySnapshotLine Snapshot:{self.snapshot_id} Part:{self.part_id} Qty:{self.quantity}>"
@@ -68,7 +68,9 @@ class PartIssue(UserCreatedBase):
         db.CheckConstraint(
             '(part_demand_id IS NULL) OR (part_demand_id IS NOT NULL AND asset_id IS NOT NULL)',
             name='check_part_demand_requires_asset'
-        )
+        ),
+        # Keyset pagination of the part issue list seeks on (issue_date, id)
+        db.Index('idx_part_issues_issue_date_id', 'issue_date', 'id'),
     )
     
     def __repr__(self):
@@ -8,6 +8,10 @@ from .base import (
     MaintenanceBlocker
 )
 
+# Planning state models
+from .planning.planning_dirty_marks import PlanningDirtyMark
+from .planning.maintenance_due_index import MaintenanceDueIndex
+
 # Template models
 from .templates import (
     TemplateActionSet,
@@ -48,6 +52,10 @@ __all__ = [
     'ActionTool',
     'MaintenanceBlocker',
     
+    # Planning state models
+    'PlanningDirtyMark',
+    'MaintenanceDueIndex',
+    
     # Template models
     'TemplateActionSet',
     'TemplateActionItem',
@@ -11,6 +11,18 @@ class MaintenanceActionSet(EventDetailVirtual, VirtualActionSet):
     Only one MaintenanceActionSet per Event (ONE-TO-ONE relationship)
     """
     __tablename__ = 'maintenance_action_sets'
+
+    # Status MaintenanceContext.complete() stores; planning takes its last maintenance from these
+    COMPLETED_STATUS = 'Complete'
+    # Events still to be worked: planning does not create another one for the same asset and plan
+    OPEN_STATUSES = ('Planned', 'In Progress', 'Blocked')
+
+    __table_args__ = (
+        # Last completed maintenance per asset for a template (planning)
+        db.Index('idx_mas_template_status_asset_end', 'template_action_set_id', 'status', 'asset_id', 'end_date'),
+        # Open events per plan (duplicate prevention)
+        db.Index('idx_mas_plan_status_asset', 'maintenance_plan_id', 'status', 'asset_id'),
+    )
     
     # Event coupling - REQUIRED, ONE-TO-ONE
     # event_id inherited from EventDetailVirtual (REQUIRED)
@@ -72,6 +84,15 @@ class MaintenanceActionSet(EventDetailVirtual, VirtualActionSet):
         return ['Planned', 'In Progress', 'Complete', 'Cancelled','Failed', 'Skipped', 'Blocked']
 
     
+    def get_event_data(self):
+        """Event fields for bulk creation, matching MaintenanceActionSetFactory"""
+        return {
+            'event_type': self.event_type,
+            'description': f'Maintenance: {self.task_name}',
+            'user_id': self.created_by_id,
+            'asset_id': self.asset_id,
+        }
+    
     def create_event(self):
         """Create event for this maintenance action set"""
         from app.data.core.event_info.event import Event
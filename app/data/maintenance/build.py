@@ -24,6 +24,8 @@ def build_models():
     import app.data.maintenance.base.actions
     import app.data.maintenance.base.maintenance_action_sets
     import app.data.maintenance.planning.maintenance_plans
+    import app.data.maintenance.planning.planning_dirty_marks
+    import app.data.maintenance.planning.maintenance_due_index
     import app.data.maintenance.base.maintenance_blockers
     import app.data.maintenance.base.part_demands
     import app.data.maintenance.base.action_tools
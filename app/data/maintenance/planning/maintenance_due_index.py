@@ -0,0 +1,51 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import Index
+
+
+class MaintenanceDueIndex(db.Model):
+    """
+    Maintenance Due Index - planning state per (asset, plan) as of the last
+    time the pair was evaluated.
+
+    Holds the last completion, the plan meter's value at that completion and
+    the next due date / next due meter value, so "what is due" becomes a
+    range scan instead of a planner run (see MaintenanceDueService).
+
+    Written by MaintenancePlanner for every pair it evaluates on
+    incremental runs. Completions, cancellations and plan edits only write
+    dirty marks, which the incremental planning job picks up. Meter updates
+    need no rewrite because next_due_meter is compared with the asset's
+    live meter. A time-based pair whose next_due_date falls after
+    evaluated_at but is now in the past crossed its due date since then and
+    is re-evaluated on the next incremental run. Matching pairs without a
+    row have never been evaluated (new assets and plans).
+    """
+    __tablename__ = 'maintenance_due_index'
+
+    id = db.Column(db.Integer, primary_key=True)
+    asset_id = db.Column(db.Integer, db.ForeignKey('assets.id'), nullable=False)
+    maintenance_plan_id = db.Column(db.Integer, db.ForeignKey('maintenance_plans.id'), nullable=False)
+
+    # Last completed maintenance for the plan's template
+    last_maintenance_id = db.Column(db.Integer, db.ForeignKey('maintenance_action_sets.id'), nullable=True)
+    last_completed_at = db.Column(db.DateTime, nullable=True)
+
+    # Meter the plan is driven by ('meter1'..'meter4', None for time-based plans)
+    meter_field = db.Column(db.String(10), nullable=True)
+    last_meter_value = db.Column(db.Float, nullable=True)
+    next_due_meter = db.Column(db.Float, nullable=True)
+
+    # Planning result at evaluation time
+    needs_maintenance = db.Column(db.Boolean, default=False, nullable=False)
+    next_due_date = db.Column(db.DateTime, nullable=True)
+    evaluated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_maintenance_due_index_asset_plan', 'asset_id', 'maintenance_plan_id', unique=True),
+        Index('idx_maintenance_due_index_plan', 'maintenance_plan_id'),
+        Index('idx_maintenance_due_index_next_due', 'next_due_date'),
+    )
+
+    def __repr__(self):
+        return f'<MaintenanceDueIndex Asset {self.asset_id} Plan {self.maintenance_plan_id}: due {self.next_due_date}>'
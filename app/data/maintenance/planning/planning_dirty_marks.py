@@ -0,0 +1,49 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import Index
+
+
+class PlanningDirtyMark(db.Model):
+    """
+    Planning Dirty Mark - an (asset, plan) pair to re-evaluate on the next
+    incremental planning run (MaintenancePlanner.plan_incremental).
+
+    Either side may be a wildcard:
+    - asset_id None: every asset of the plan (plan created or edited)
+    - maintenance_plan_id None: every plan covering the asset (meters
+      updated, maintenance completed or cancelled)
+
+    Marks are appended in the caller's transaction and not deduplicated on
+    write; the planner reads them as a set and deletes the ones it consumed.
+    """
+    __tablename__ = 'planning_dirty_marks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    asset_id = db.Column(db.Integer, db.ForeignKey('assets.id'), nullable=True)
+    maintenance_plan_id = db.Column(db.Integer, db.ForeignKey('maintenance_plans.id'), nullable=True)
+    reason = db.Column(db.String(50), nullable=True)
+    marked_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_planning_dirty_marks_plan', 'maintenance_plan_id'),
+    )
+
+    @classmethod
+    def mark(cls, asset_id=None, maintenance_plan_id=None, reason=None):
+        """
+        Add a dirty mark to the current session (committed by the caller).
+
+        Args:
+            asset_id: Asset to re-evaluate (None: all assets of the plan)
+            maintenance_plan_id: Plan to re-evaluate (None: all plans of the asset)
+            reason: Short description of the change, for diagnostics
+
+        Returns:
+            PlanningDirtyMark instance
+        """
+        dirty_mark = cls(asset_id=asset_id, maintenance_plan_id=maintenance_plan_id, reason=reason)
+        db.session.add(dirty_mark)
+        return dirty_mark
+
+    def __repr__(self):
+        return f'<PlanningDirtyMark {self.id}: Asset {self.asset_id} Plan {self.maintenance_plan_id}>'
@@ -0,0 +1,5 @@
+"""
+Benchmark scripts for performance-sensitive code paths.
+Each script builds a throwaway SQLite database and can be run directly, e.g.
+    python -m app.debug.benchmarks.benchmark_sequence_allocation
+"""
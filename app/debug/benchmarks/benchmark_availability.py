@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark: availability and downtime report from blocker intervals
+
+Builds a fleet spread over locations where most assets have maintenance
+events carrying several blockers over the past year: overlapping, nested
+and back-to-back intervals at mixed capability levels, some still open,
+some without a status. Then:
+
+- builds the report for the last 365 days and checks each asset's total
+  downtime against merging its sorted intervals one by one
+- reads the cached report again, and checks the cache survives a
+  rolled-back blocker update but not a committed one (ORM bulk UPDATE and
+  ORM flush)
+- checks one hand-built asset against the expected hours per level
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_availability [assets] [blockers_per_asset]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_utils import create_benchmark_app, create_benchmark_assets, print_results, timed
+
+STATUSES = (
+    'Non Mission Capable',
+    'Partially Mission Capable - Functional Limitations',
+    'Mission Capable - Temporary Procedural or Hardware Work Arounds',
+    'Mission Capable - Ignorable Damage or Issue',
+    None,
+)
+
+LOCATION_COUNT = 8
+
+
+def _insert_blockers(asset_blockers, now):
+    """
+    Insert one maintenance event per asset with its blockers.
+
+    Args:
+        asset_blockers: List of (asset_id, [(status, start, end), ...])
+    """
+    from app import db
+    from app.data.core.event_info.event import Event
+    from app.data.core.sequences import EventDetailIDManager
+    from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+    from app.data.maintenance.base.maintenance_blockers import MaintenanceBlocker
+
+    event_ids = Event.bulk_add_events([
+        {'event_type': 'Maintenance', 'description': 'Availability service',
+         'user_id': 0, 'asset_id': asset_id, 'major_location_id': None}
+        for asset_id, _ in asset_blockers
+    ])
+    detail_ids = EventDetailIDManager.get_next_ids(len(asset_blockers))
+    action_set_ids = list(db.session.execute(
+        db.insert(MaintenanceActionSet).returning(MaintenanceActionSet.id, sort_by_parameter_order=True),
+        [
+            {'event_id': event_id, 'all_details_id': detail_id, 'asset_id': asset_id,
+             'task_name': 'Availability service', 'status': 'Blocked', 'created_by_id': 0, 'updated_by_id': 0}
+            for (asset_id, _), event_id, detail_id in zip(asset_blockers, event_ids, detail_ids)
+        ]
+    ).scalars())
+    db.session.execute(db.insert(MaintenanceBlocker), [
+        {'maintenance_action_set_id': action_set_id, 'mission_capability_status': status,
+         'reason': 'Parts Not Available', 'start_date': start, 'end_date': end,
+         'priority': 'Medium', 'created_by_id': 0, 'updated_by_id': 0}
+        for action_set_id, (_, blockers) in zip(action_set_ids, asset_blockers)
+        for status, start, end in blockers
+    ])
+    db.session.commit()
+
+
+def _build_fleet(asset_count, blockers_per_asset, now):
+    """Insert locations, assets and blockers; return the asset IDs"""
+    from app import db
+    from app.data.core.asset_info.asset import Asset
+    from app.data.core.major_location import MajorLocation
+
+    location_ids = []
+    for index in range(LOCATION_COUNT):
+        location = MajorLocation(name=f'Availability site {index}', created_by_id=0, updated_by_id=0)
+        db.session.add(location)
+        db.session.flush()
+        location_ids.append(location.id)
+    asset_ids = sorted(create_benchmark_assets(asset_count, make='Avail', model='Availability'))
+    db.session.execute(Asset.__table__.update().where(Asset.id == db.bindparam('asset_id')), [
+        {'asset_id': asset_id, 'major_location_id': location_ids[index % LOCATION_COUNT]}
+        for index, asset_id in enumerate(asset_ids)
+    ])
+
+    asset_blockers = []
+    for index, asset_id in enumerate(asset_ids):
+        if index % 5 == 0:
+            continue
+        blockers = []
+        for number in range(blockers_per_asset):
+            start = now - timedelta(days=(index * 7 + number * 41) % 420, hours=(index + number) % 24)
+            duration = timedelta(hours=6 + (index * 13 + number * 29) % 400)
+            end = None if (index + number) % 17 == 0 else start + duration
+            blockers.append((STATUSES[(index + number) % len(STATUSES)], start, end))
+        asset_blockers.append((asset_id, blockers))
+    _insert_blockers(asset_blockers, now)
+    return asset_ids
+
+
+def _merged_hours(asset_ids, start, end):
+    """Downtime hours per asset at any level, merging each asset's sorted intervals in plain Python"""
+    from app.services.maintenance.availability_service import AvailabilityService
+
+    asset_rows, _, starts, ends = AvailabilityService._load_intervals(
+        start, end, {asset_id: asset_id for asset_id in asset_ids}
+    )
+    intervals = {}
+    for asset_id, interval_start, interval_end in zip(asset_rows.tolist(), starts.tolist(), ends.tolist()):
+        intervals.setdefault(asset_id, []).append((interval_start, interval_end))
+
+    hours = {}
+    for asset_id, asset_intervals in intervals.items():
+        asset_intervals.sort()
+        total = 0.0
+        merged_start, merged_end = asset_intervals[0]
+        for interval_start, interval_end in asset_intervals[1:]:
+            if interval_start > merged_end:
+                total += merged_end - merged_start
+                merged_start, merged_end = interval_start, interval_end
+            else:
+                merged_end = max(merged_end, interval_end)
+        hours[asset_id] = (total + merged_end - merged_start) / 3600
+    return hours
+
+
+def run_benchmark(asset_count=20000, blockers_per_asset=8):
+    app = create_benchmark_app('availability')
+
+    with app.app_context():
+        from app import db
+        from app.data.maintenance.base.maintenance_blockers import MaintenanceBlocker
+        from app.services.maintenance.availability_service import AvailabilityService
+
+        now = datetime.utcnow()
+        asset_ids = _build_fleet(asset_count, blockers_per_asset, now)
+
+        # One asset with known overlaps inside a fixed window:
+        # NMC 10-20h, PMC 15-30h (10h after NMC), MCI 0-40h (15h outside both), open MCW ignored (ends before)
+        window_start = now - timedelta(days=30)
+        known_asset_id = create_benchmark_assets(1, make='Known', model='Known')[0]
+        base = window_start + timedelta(days=1)
+        _insert_blockers([(known_asset_id, [
+            ('Non Mission Capable', base + timedelta(hours=10), base + timedelta(hours=20)),
+            ('Partially Mission Capable - Functional Limitations', base + timedelta(hours=15), base + timedelta(hours=30)),
+            ('Mission Capable - Ignorable Damage or Issue', base, base + timedelta(hours=40)),
+            ('Mission Capable - Ignorable Damage or Issue', base + timedelta(hours=35), base + timedelta(hours=38)),
+            ('Non Mission Capable', window_start - timedelta(days=5), window_start - timedelta(days=1)),
+        ])], now)
+        expected = {'NMC': 10.0, 'PMC': 10.0, 'MCW': 0.0, 'MCI': 20.0}
+
+        start, end = now - timedelta(days=365), now
+        results = {}
+        with timed(results, 'report'):
+            report = AvailabilityService._compute_report(start, end, now)
+        with timed(results, 'reference'):
+            reference = _merged_hours(asset_ids, start, now)
+        report_hours = {
+            row['id']: row['total_downtime_hours'] for row in report['by_asset'] if row['id'] in reference
+        }
+        merge_matches = report_hours.keys() == reference.keys() and all(
+            abs(report_hours[asset_id] - hours) < 1e-6 for asset_id, hours in reference.items()
+        )
+
+        with timed(results, 'first_read'):
+            AvailabilityService.get_report(start, end)
+        with timed(results, 'cached_read'):
+            AvailabilityService.get_report(start, end)
+
+        # Writes invalidate the cache on commit only
+        blocker_id = db.session.query(db.func.min(MaintenanceBlocker.id)).scalar()
+        db.session.execute(db.update(MaintenanceBlocker).where(MaintenanceBlocker.id == blocker_id)
+                           .values(end_date=now))
+        db.session.rollback()
+        kept_on_rollback = bool(AvailabilityService._reports)
+        db.session.execute(db.update(MaintenanceBlocker).where(MaintenanceBlocker.id == blocker_id)
+                           .values(end_date=now))
+        db.session.commit()
+        bulk_invalidates = not AvailabilityService._reports
+        AvailabilityService.get_report(start, end)
+        db.session.get(MaintenanceBlocker, blocker_id).notes = 'Reviewed'
+        db.session.commit()
+        flush_invalidates = not AvailabilityService._reports
+        invalidation_ok = kept_on_rollback and bulk_invalidates and flush_invalidates
+
+        known = AvailabilityService._compute_report(window_start, now, now)
+        known_row = next((row for row in known['by_asset'] if row['id'] == known_asset_id), None)
+        known_ok = known_row is not None and all(
+            abs(known_row['downtime_hours'][code] - hours) < 1e-6 for code, hours in expected.items()
+        )
+
+        fleet = report['fleet']
+        print_results(
+            f"Availability report, {asset_count:,} assets, up to {blockers_per_asset} blockers each",
+            [
+                ("Blocker intervals in window", f"{report['interval_count']:,}"),
+                ("Report", f"{results['report']:.3f} s"),
+                ("Per-asset sorted merge (reference)", f"{results['reference']:.3f} s"),
+                ("First read / cached read", f"{results['first_read']:.3f} s / {results['cached_read'] * 1000:.3f} ms"),
+                ("Fleet availability", f"{fleet['availability_percent']:.2f}%"),
+                ("Fleet NMC", f"{fleet['percent']['NMC']:.2f}%"),
+                ("Assets with downtime", f"{len(report['by_asset']):,}"),
+                ("Downtime matches sorted merge", merge_matches),
+                ("Hand-built asset hours", known_row['downtime_hours'] if known_row else '-'),
+                ("Hand-built asset matches", known_ok),
+                ("Cache kept on rollback", kept_on_rollback),
+                ("Invalidated by bulk UPDATE / flush", f"{bulk_invalidates} / {flush_invalidates}"),
+            ]
+        )
+        return 0 if merge_matches and known_ok and invalidation_ok else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    blockers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    sys.exit(run_benchmark(assets, blockers))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: registering a batch of vehicles with automatic detail creation
+
+Configures asset type and model type detail templates (single-row and
+many_to_one), then registers the same number of vehicles twice: once with
+AssetContext.create() per asset (one detail row at a time) and once with
+AssetContext.create_many() (cached configuration, one INSERT per detail table).
+
+Also checks both runs produce the same detail rows per asset, in the same
+global detail ID order.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_detail_creation [assets]
+"""
+
+import sys
+
+from app.debug.benchmarks.benchmark_utils import create_benchmark_app, print_results, timed
+
+
+def _configure_templates(asset_type_id, make_model_id):
+    """Add asset type and model type detail templates for the benchmark fleet"""
+    from app import db
+    from app.data.assets.detail_table_templates.asset_details_from_asset_type import AssetDetailTemplateByAssetType
+    from app.data.assets.detail_table_templates.asset_details_from_model_type import AssetDetailTemplateByModelType
+
+    AssetDetailTemplateByAssetType.query.delete()
+    AssetDetailTemplateByModelType.query.delete()
+    db.session.add_all([
+        AssetDetailTemplateByAssetType(asset_type_id=asset_type_id, detail_table_type='purchase_info'),
+        AssetDetailTemplateByAssetType(asset_type_id=asset_type_id, detail_table_type='vehicle_registration'),
+        AssetDetailTemplateByAssetType(asset_type_id=asset_type_id, detail_table_type='smog_record', many_to_one=True),
+        AssetDetailTemplateByModelType(make_model_id=make_model_id, detail_table_type='toyota_warranty_receipt'),
+        # Already created by the asset type template, so skipped per asset
+        AssetDetailTemplateByModelType(make_model_id=make_model_id, detail_table_type='purchase_info'),
+    ])
+    db.session.commit()
+
+
+def _detail_signature(asset_ids):
+    """Per-asset list of detail table names, ordered by global detail ID"""
+    from app.buisness.assets.asset_details_context import AssetDetailsContext
+
+    return [
+        [detail['table_name'] for detail in context.asset_details]
+        for context in AssetDetailsContext.load_many(asset_ids)
+    ]
+
+
+def run_benchmark(asset_count=500):
+    app = create_benchmark_app('detail_creation')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.assets import AssetContext
+        from app.data.core.asset_info.asset_type import AssetType
+        from app.data.core.asset_info.make_model import MakeModel
+
+        asset_type = AssetType.query.filter_by(name='Vehicle').first()
+        make_model = MakeModel(make='Bench', model='Hauler', asset_type_id=asset_type.id,
+                               meter1_unit='miles', created_by_id=0, updated_by_id=0)
+        db.session.add(make_model)
+        db.session.commit()
+        _configure_templates(asset_type.id, make_model.id)
+
+        def batch(prefix):
+            return [
+                {'name': f'{prefix} {index}', 'serial_number': f'{prefix}-{index:06d}',
+                 'make_model_id': make_model.id, 'status': 'Active'}
+                for index in range(asset_count)
+            ]
+
+        results = {}
+        with timed(results, 'single'):
+            single_ids = [
+                AssetContext.create(created_by_id=0, commit=False, **asset_data).asset_id
+                for asset_data in batch('SINGLE')
+            ]
+            db.session.commit()
+
+        with timed(results, 'bulk'):
+            bulk_ids = [
+                context.asset_id
+                for context in AssetContext.create_many(batch('BULK'), created_by_id=0)
+            ]
+
+        single_details = _detail_signature(single_ids)
+        bulk_details = _detail_signature(bulk_ids)
+        same_details = single_details == bulk_details
+
+        print_results(f"Registering {asset_count} vehicles with automatic detail rows", [
+            ("AssetContext.create per asset", f"{results['single'] * 1000:.0f} ms"),
+            ("AssetContext.create_many", f"{results['bulk'] * 1000:.0f} ms"),
+            ("Speedup", f"{results['single'] / results['bulk']:.1f}x"),
+            ("Detail rows per asset", len(bulk_details[0]) if bulk_details else 0),
+            ("Same detail rows and order", same_details),
+        ])
+        return 0 if same_details else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sys.exit(run_benchmark(assets))
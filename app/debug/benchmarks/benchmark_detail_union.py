@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-table detail listing vs SQL UNION ALL paging
+
+Inserts asset detail records spread over every registered detail table, then
+times fetching a deep page the old way (load every table, sort in Python,
+slice) and with AssetDetailUnionService.get_all_details (UNION ALL with
+ORDER BY / LIMIT / OFFSET in SQL, then one hydration query per table).
+
+Also checks both approaches return the same records in the same order.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_detail_union [records] [offset] [limit]
+"""
+
+import sys
+from datetime import datetime
+
+from app.debug.benchmarks.benchmark_utils import create_benchmark_app, create_benchmark_assets, print_results, timed
+
+
+def _insert_details(tables, asset_ids, count):
+    """Insert count detail rows round-robin over tables, with global IDs in insert order"""
+    from app import db
+    from app.data.core.sequences import AssetDetailIDManager
+
+    rows_by_table = {table_class: [] for table_class in tables}
+    global_ids = AssetDetailIDManager.get_next_ids(count)
+    now = datetime.utcnow()
+    for index in range(count):
+        table_class = tables[index % len(tables)]
+        rows_by_table[table_class].append({
+            'asset_id': asset_ids[index % len(asset_ids)],
+            'all_asset_detail_id': global_ids[index],
+            'created_at': now,
+            'updated_at': now,
+        })
+    for table_class, rows in rows_by_table.items():
+        db.session.execute(table_class.__table__.insert(), rows)
+    db.session.commit()
+
+
+def _python_page(tables, limit, offset):
+    """The previous approach: materialize every table, sort and slice in Python"""
+    records = []
+    for table_class in tables:
+        records.extend((record.all_asset_detail_id, table_class.__tablename__, record.id)
+                       for record in table_class.query.all())
+    records.sort()
+    return [(table_name, record_id) for _, table_name, record_id in records[offset:offset + limit]]
+
+
+def run_benchmark(record_count=40000, offset=30000, limit=50):
+    app = create_benchmark_app('detail_union')
+
+    with app.app_context():
+        from app import db
+        from app.services.assets.asset_detail_union_service import AssetDetailUnionService
+
+        tables = AssetDetailUnionService.ASSET_DETAIL_TABLES
+        asset_ids = create_benchmark_assets(200)
+        _insert_details(tables, asset_ids, record_count)
+
+        results = {}
+        db.session.expunge_all()
+        with timed(results, 'python'):
+            expected = _python_page(tables, limit, offset)
+        db.session.expunge_all()
+        with timed(results, 'union'):
+            page = AssetDetailUnionService.get_all_details(limit=limit, offset=offset)
+
+        same_rows = [(detail['table_name'], detail['id']) for detail in page] == expected
+
+        print_results(f"Detail page at offset {offset:,} ({limit} rows, {record_count:,} records, {len(tables)} tables)", [
+            ("Load all + Python sort", f"{results['python'] * 1000:.2f} ms"),
+            ("UNION ALL page + hydrate", f"{results['union'] * 1000:.2f} ms"),
+            ("Speedup", f"{results['python'] / results['union']:.1f}x"),
+            ("Same records and order", same_rows),
+        ])
+        return 0 if same_rows else 1
+
+
+if __name__ == '__main__':
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    page_offset = int(sys.argv[2]) if len(sys.argv) > 2 else 30000
+    page_limit = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    sys.exit(run_benchmark(records, page_offset, page_limit))
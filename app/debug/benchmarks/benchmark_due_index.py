@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: "what is due" from a planner run vs a due index range query
+
+Builds several fleets with one plan each (alternating days and meter1
+plans), indexes every pair with MaintenancePlanner.plan_incremental, then
+answers "unscheduled work due within the next DAYS days or METER_UNITS
+meter units" two ways:
+
+- running the planner over every active plan and filtering its results
+- MaintenanceDueService.get_due_work over the maintenance_due_index table
+
+Also checks both return the same (asset, plan) pairs, and that cancelling an
+open maintenance event (MaintenanceContext.cancel) refreshes the asset's rows
+so the pair shows up as unscheduled due work.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_due_index [plans] [assets_per_plan]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_utils import (
+    count_queries, create_benchmark_app, create_planning_fleet, print_results, timed
+)
+
+DAYS = 14
+METER_UNITS = 1000
+
+
+def _planner_due_pairs(planner, plans):
+    """Pairs due within the horizon according to a full planner run"""
+    horizon = datetime.utcnow() + timedelta(days=DAYS)
+    results = planner.plan_all_active_plans()
+    open_events = planner._find_open_event_keys([plan.id for plan in plans])
+    deltas = {plan.id: (plan.frequency_type, plan.delta_m1) for plan in plans}
+
+    due = set()
+    for result in results:
+        pair = (result.asset_id, result.maintenance_plan_id)
+        if pair in open_events:
+            continue
+        frequency_type, delta = deltas[result.maintenance_plan_id]
+        current = result.current_meter_readings.get(frequency_type) if frequency_type == 'meter1' else None
+        meter_due = False
+        if current is not None and delta:
+            baseline = result.meter_readings_at_last_maintenance.get('meter1') or 0
+            if current < baseline:
+                baseline = 0
+            meter_due = baseline + delta - current <= METER_UNITS
+        if result.needs_maintenance or (result.due_date and result.due_date <= horizon) or meter_due:
+            due.add(pair)
+    return due, len(results)
+
+
+def run_benchmark(plan_count=20, assets_per_plan=500):
+    app = create_benchmark_app('due_index')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.base.maintenance_context import MaintenanceContext
+        from app.buisness.maintenance.base.structs.maintenance_action_set_struct import MaintenanceActionSetStruct
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+        from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+        from app.data.maintenance.planning.maintenance_due_index import MaintenanceDueIndex
+        from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+        from app.services.maintenance.maintenance_due_service import MaintenanceDueService
+
+        for index in range(plan_count):
+            if index % 2:
+                create_planning_fleet(assets_per_plan, frequency_type='meter1', name=f'Fleet {index}', delta_m1=5000)
+            else:
+                create_planning_fleet(assets_per_plan, frequency_type='days', name=f'Fleet {index}', delta_days=30)
+
+        planner = MaintenancePlanner()
+        planner.plan_incremental()
+        plans = MaintenancePlan.query.filter_by(status='Active').all()
+
+        results = {}
+        db.session.expunge_all()
+        with timed(results, 'planner'):
+            expected, pair_count = _planner_due_pairs(planner, plans)
+        db.session.expunge_all()
+        with timed(results, 'index'), count_queries(results, 'index_queries'):
+            rows = MaintenanceDueService.get_due_work(days=DAYS, meter_units=METER_UNITS)
+        actual = {(row['asset_id'], row['maintenance_plan_id']) for row in rows}
+
+        for pair in sorted(expected ^ actual)[:10]:
+            print(f"{pair}: planner {pair in expected}, index {pair in actual}")
+
+        # Cancelling an open event marks the asset dirty; the incremental run rewrites its index rows
+        open_event = MaintenanceActionSet.query.filter(
+            MaintenanceActionSet.status.in_(MaintenanceActionSet.OPEN_STATUSES),
+            MaintenanceActionSet.maintenance_plan_id.isnot(None)
+        ).order_by(MaintenanceActionSet.id).first()
+        refreshed = True
+        if open_event:
+            pair = (open_event.asset_id, open_event.maintenance_plan_id)
+            MaintenanceContext(MaintenanceActionSetStruct(open_event)).cancel()
+            planner.plan_incremental()
+            row = MaintenanceDueIndex.query.filter_by(asset_id=pair[0], maintenance_plan_id=pair[1]).one()
+            due_pairs = {
+                (due['asset_id'], due['maintenance_plan_id'])
+                for due in MaintenanceDueService.get_due_work(days=DAYS, meter_units=METER_UNITS)
+            }
+            refreshed = row.needs_maintenance and pair in due_pairs
+
+        print_results(f"{plan_count} plans, {pair_count:,} pairs, due within {DAYS} days / {METER_UNITS} units", [
+            ("Planner run + filter", f"{results['planner'] * 1000:.0f} ms"),
+            ("Due index range query", f"{results['index'] * 1000:.1f} ms, {results['index_queries']} statements"),
+            ("Speedup", f"{results['planner'] / results['index']:.0f}x"),
+            ("Pairs due", f"{len(actual):,}"),
+            ("Same pairs", expected == actual),
+            ("Cancellation re-indexed by incremental run", refreshed),
+        ])
+        return 0 if expected == actual and refreshed else 1
+
+
+if __name__ == '__main__':
+    plans = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    assets = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    sys.exit(run_benchmark(plans, assets))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: creating maintenance events from planning results
+
+Plans a meter1 fleet and creates events for its due assets: half of them one
+at a time through MaintenancePlanContext.create_maintenance_event (one event
+insert, sequence update and flush each) and the other half through
+MaintenancePlanner.create_events_from_results, which inserts each plan's
+action sets and events in one batch (EventDetailVirtual.bulk_create).
+
+Also checks both halves produce the same event fields, unique global detail
+IDs, and that a second run creates nothing.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_event_creation [assets]
+"""
+
+import sys
+
+from app.debug.benchmarks.benchmark_utils import (
+    count_queries, create_benchmark_app, create_planning_fleet, print_results, timed,
+)
+
+
+def _event_fields(action_sets):
+    """Fields that must not depend on the creation path, per asset"""
+    from app import db
+    from app.data.core.asset_info.asset import Asset
+
+    locations = dict(db.session.query(Asset.id, Asset.major_location_id).all())
+    return [
+        (
+            action_set.event.event_type,
+            action_set.event.description,
+            action_set.event.asset_id == action_set.asset_id,
+            action_set.event.major_location_id == locations[action_set.asset_id],
+            action_set.status,
+            action_set.maintenance_plan_id,
+            action_set.template_action_set_id,
+            action_set.created_by_id,
+        )
+        for action_set in action_sets
+    ]
+
+
+def run_benchmark(asset_count=2000):
+    app = create_benchmark_app('event_creation')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+        from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+
+        plan_id = create_planning_fleet(asset_count, delta_m1=5000)
+        planner = MaintenancePlanner()
+        due = [
+            result for result in planner.plan_maintenance(MaintenancePlanContext(plan_id))
+            if result.needs_maintenance
+        ]
+        single_results, batch_results = due[0::2], due[1::2]
+
+        results = {}
+        with timed(results, 'single'), count_queries(results, 'single_queries'):
+            single = planner._create_events_individually(single_results, user_id=0)
+        with timed(results, 'batch'), count_queries(results, 'batch_queries'):
+            batch = planner.create_events_from_results(batch_results, user_id=0)
+        db.session.commit()
+        repeated = planner.create_events_from_results(batch_results, user_id=0)
+
+        same_fields = (
+            len(single) == len(single_results) and len(batch) == len(batch_results)
+            and set(_event_fields(single)) == set(_event_fields(batch))
+            and len(set(_event_fields(batch))) == 1
+        )
+        detail_ids = [row[0] for row in db.session.query(MaintenanceActionSet.all_details_id).all()]
+        unique_ids = len(detail_ids) == len(set(detail_ids))
+        passed = same_fields and unique_ids and not repeated
+
+        print_results(f"Maintenance events for {len(due):,} due assets of {asset_count:,}", [
+            ("One at a time", f"{results['single'] * 1000:.0f} ms, {results['single_queries']:,} queries "
+                              f"({len(single):,} events)"),
+            ("create_events_from_results", f"{results['batch'] * 1000:.0f} ms, {results['batch_queries']:,} queries "
+                                           f"({len(batch):,} events)"),
+            ("Speedup", f"{results['single'] / results['batch']:.1f}x"),
+            ("Same event fields", same_fields),
+            ("Unique global detail IDs", unique_ids),
+            ("Events created on second run", len(repeated)),
+        ])
+        return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sys.exit(run_benchmark(assets))
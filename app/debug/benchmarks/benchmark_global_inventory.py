@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark: global inventory summary over many parts
+
+Stocks parts across storerooms at several major locations (one inactive
+storeroom is ignored by the view), with one to three bins per part,
+rolling average costs on the part summaries and priced receipts over the
+last year. Then:
+
+- builds the summary the old way: every active inventory row loaded, one
+  part lookup and one movement query per part (up to LEGACY_MAX_PARTS)
+- builds it with GlobalInventoryView (cold, then cached) and counts the
+  statements each takes
+- checks both agree per part
+- records a receipt through InventoryManager, commits, and checks the
+  next read sees it
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_global_inventory [parts]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_utils import count_queries, create_benchmark_app, print_results, timed
+
+LOCATION_COUNT = 4
+STOREROOMS_PER_LOCATION = 3
+
+# Larger inventories skip the legacy path (its per-part queries grow quadratically with the session)
+LEGACY_MAX_PARTS = 20000
+
+
+def _build_inventory(part_count, now):
+    """Insert locations, storerooms, parts, bins, summaries and receipts; return (part IDs, storerooms)"""
+    from app import db
+    from app.data.core.major_location import MajorLocation
+    from app.data.core.supply.part_definition import PartDefinition
+    from app.data.inventory.inventory.active_inventory import ActiveInventory
+    from app.data.inventory.inventory.inventory_movement import InventoryMovement
+    from app.data.inventory.inventory.inventory_summary import InventorySummary
+    from app.data.inventory.inventory.storeroom import Storeroom
+
+    storerooms = []
+    for location_index in range(LOCATION_COUNT):
+        location = MajorLocation(name=f'Stock site {location_index}', created_by_id=0, updated_by_id=0)
+        db.session.add(location)
+        db.session.flush()
+        for room_index in range(STOREROOMS_PER_LOCATION):
+            storeroom = Storeroom(room_name=f'Room {location_index}-{room_index}', major_location_id=location.id,
+                                  is_active=not (location_index == 0 and room_index == 0),
+                                  created_by_id=0, updated_by_id=0)
+            db.session.add(storeroom)
+            db.session.flush()
+            storerooms.append((storeroom.id, location.id))
+
+    part_ids = list(db.session.execute(
+        db.insert(PartDefinition).returning(PartDefinition.id, sort_by_parameter_order=True),
+        [{'part_number': f'GI-{index:06d}', 'part_name': f'Global part {index}', 'created_by_id': 0, 'updated_by_id': 0}
+         for index in range(part_count)]
+    ).scalars())
+
+    bins = []
+    for index, part_id in enumerate(part_ids):
+        for number in range(index % 3 + 1):
+            storeroom_id, _ = storerooms[(index + number * 5) % len(storerooms)]
+            bins.append({
+                'part_id': part_id, 'storeroom_id': storeroom_id, 'location_id': None, 'bin_id': None,
+                'quantity_on_hand': float(1 + (index * 7 + number) % 40) if number else float(1 + index % 25),
+                'quantity_allocated': float((index + number) % 4),
+                'unit_cost_avg': 3.0 + index % 11 if number == 1 else None,
+                'created_by_id': 0, 'updated_by_id': 0,
+            })
+    # One bin per (part, storeroom): the unique constraint allows a single storeroom-level row
+    unique_bins = {(row['part_id'], row['storeroom_id']): row for row in bins}
+    db.session.execute(db.insert(ActiveInventory), list(unique_bins.values()))
+    db.session.execute(db.insert(InventorySummary), [
+        {'part_id': part_id, 'quantity_on_hand_total': 0.0,
+         'unit_cost_avg': None if index % 13 == 0 else 5.0 + index % 17,
+         'created_by_id': 0, 'updated_by_id': 0}
+        for index, part_id in enumerate(part_ids)
+    ])
+    db.session.execute(db.insert(InventoryMovement), [
+        {'part_id': part_id, 'movement_type': movement_type, 'quantity_delta': quantity,
+         'movement_date': now - timedelta(days=(index * 11 + number * 97) % 365),
+         'unit_cost': None if (index + number) % 9 == 0 else 4.0 + (index + number) % 23,
+         'to_storeroom_id': storerooms[index % len(storerooms)][0],
+         'to_major_location_id': storerooms[index % len(storerooms)][1],
+         'created_by_id': 0, 'updated_by_id': 0}
+        for index, part_id in enumerate(part_ids)
+        for number, (movement_type, quantity) in enumerate((('Receipt', 10.0 + index % 7), ('Receipt', 4.0),
+                                                            ('Issue', -2.0), ('Receipt', 1.0 + index % 3)))
+    ])
+    db.session.commit()
+    return part_ids, storerooms
+
+
+def _legacy_summary(cost_types, days):
+    """The summary built the pre-aggregation way: row loop, per-part lookups and movement queries"""
+    from app.data.core.supply.part_definition import PartDefinition
+    from app.data.inventory.inventory import ActiveInventory, InventoryMovement, Storeroom
+    from app.data.inventory.inventory.inventory_summary import InventorySummary
+
+    summaries = {}
+    for inv in ActiveInventory.query.join(Storeroom).filter(Storeroom.is_active == True).all():
+        if inv.part_id not in summaries:
+            part = PartDefinition.query.get(inv.part_id)
+            part_summary = InventorySummary.query.filter_by(part_id=inv.part_id).first()
+            summaries[inv.part_id] = {
+                'part_number': part.part_number, 'total_quantity_on_hand': 0.0, 'total_value': 0.0,
+                'storerooms': set(), 'bin_count': 0, 'six_month_avg_cost': None,
+                'part_cost': part_summary.unit_cost_avg if part_summary else None,
+            }
+        summary = summaries[inv.part_id]
+        summary['total_quantity_on_hand'] += inv.quantity_on_hand
+        summary['total_value'] += inv.quantity_on_hand * (inv.unit_cost_avg or summary['part_cost'] or 0.0)
+        summary['storerooms'].add(inv.storeroom_id)
+        summary['bin_count'] += 1
+
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    for part_id, summary in summaries.items():
+        movements = InventoryMovement.query.filter(
+            InventoryMovement.part_id == part_id,
+            InventoryMovement.movement_date >= cutoff,
+            InventoryMovement.movement_type.in_(cost_types),
+            InventoryMovement.unit_cost.isnot(None)
+        ).all()
+        quantity = sum(abs(m.quantity_delta) for m in movements)
+        if quantity > 0:
+            summary['six_month_avg_cost'] = sum(m.unit_cost * abs(m.quantity_delta) for m in movements) / quantity
+    return summaries
+
+
+def _close(first, second):
+    if first is None or second is None:
+        return first is None and second is None
+    return abs(first - second) < 1e-6
+
+
+def run_benchmark(part_count=10000):
+    app = create_benchmark_app('global_inventory')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.inventory.stock.inventory_manager import InventoryManager
+        from app.services.inventory.inventory.global_inventory_view import GlobalInventoryView
+
+        now = datetime.utcnow()
+        part_ids, storerooms = _build_inventory(part_count, now)
+
+        results = {}
+        legacy = None
+        if part_count <= LEGACY_MAX_PARTS:
+            with timed(results, 'legacy'), count_queries(results, 'legacy_queries'):
+                legacy = _legacy_summary(GlobalInventoryView.COST_MOVEMENT_TYPES, GlobalInventoryView.AVG_COST_DAYS)
+            db.session.expunge_all()
+
+        GlobalInventoryView.invalidate()
+        with timed(results, 'cold'), count_queries(results, 'cold_queries'):
+            parts = GlobalInventoryView.get_global_summary()
+            totals = GlobalInventoryView.get_global_totals()
+        with timed(results, 'cached'), count_queries(results, 'cached_queries'):
+            GlobalInventoryView.get_global_summary()
+            GlobalInventoryView.get_global_total_value()
+            GlobalInventoryView.get_global_storeroom_count()
+
+        mismatches = 0
+        for part in parts if legacy is not None else []:
+            old = legacy.get(part['part_id'])
+            if (old is None or old['part_number'] != part['part_number']
+                    or not _close(old['total_quantity_on_hand'], part['total_quantity_on_hand'])
+                    or not _close(old['total_value'], part['total_value'])
+                    or len(old['storerooms']) != part['storeroom_count']
+                    or old['bin_count'] != part['bin_count']
+                    or not _close(old['six_month_avg_cost'], part['six_month_avg_cost'])):
+                mismatches += 1
+        if legacy is not None:
+            mismatches += abs(len(legacy) - len(parts))
+
+        # A receipt through InventoryManager invalidates the cache on commit
+        part_id = parts[0]['part_id']
+        storeroom_id, major_location_id = storerooms[1]
+        before = next(part['total_quantity_on_hand'] for part in parts if part['part_id'] == part_id)
+        InventoryManager().record_receipt_into_unassigned_bin(
+            part_id=part_id, storeroom_id=storeroom_id, major_location_id=major_location_id,
+            quantity_received_accepted=5.0, purchase_order_line_id=None, part_arrival_id=None
+        )
+        db.session.commit()
+        with count_queries(results, 'after_receipt_queries'):
+            after = next(part['total_quantity_on_hand'] for part in GlobalInventoryView.get_global_summary()
+                         if part['part_id'] == part_id)
+        invalidated = abs(after - before - 5.0) < 1e-9 and results['after_receipt_queries'] > 0
+
+        print_results(
+            f"Global inventory summary, {part_count:,} parts",
+            [
+                ("Legacy row loop + per-part queries",
+                 f"{results['legacy']:.2f} s ({results['legacy_queries']:,} statements)" if legacy is not None else 'skipped'),
+                ("Aggregated, cold", f"{results['cold']:.3f} s ({results['cold_queries']} statements)"),
+                ("Aggregated, cached", f"{results['cached'] * 1000:.3f} ms ({results['cached_queries']} statements)"),
+                ("Parts summarised", f"{len(parts):,}"),
+                ("Total value", f"{totals['total_value']:,.2f}"),
+                ("Storerooms / locations", f"{totals['storeroom_count']} / {totals['location_count']}"),
+                ("Parts differing from legacy", mismatches if legacy is not None else '-'),
+                ("Receipt invalidates cache", invalidated),
+            ]
+        )
+        return 0 if mismatches == 0 and invalidated and results['cached_queries'] == 0 else 1
+
+
+if __name__ == '__main__':
+    parts = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sys.exit(run_benchmark(parts))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark: hybrid time-or-meter planning vs separate days and meter plans
+
+Builds a fleet with maintenance history (see create_planning_fleet) and one
+time_or_meter1 plan ("every N days or M units, whichever comes first"), plus
+a days plan and a meter1 plan with the same deltas on the same assets and
+template. Then:
+
+- times the hybrid plan (one batched pass) against planning both separate
+  plans, and the hybrid batch path against its per-asset path
+- checks the hybrid plan is due exactly when either separate plan is, and
+  that triggered_by names the criteria that fired
+- counts the events two separate plans would create for assets due on both
+  criteria, which the hybrid plan creates once
+- creates events for some due assets and checks the next planning run
+  prevents duplicates for them
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_hybrid_planning [assets] [delta_days] [delta_m1]
+"""
+
+import sys
+
+from app.debug.benchmarks.benchmark_utils import (
+    create_benchmark_app, create_planning_fleet, planning_results_match, print_results, timed
+)
+
+# Due assets that get an event before the duplicate prevention check
+EVENT_SAMPLE_SIZE = 50
+
+
+def _expected_trigger(time_due, meter_due):
+    """triggered_by value for the criteria that fired"""
+    if time_due and meter_due:
+        return 'time and meter'
+    if time_due:
+        return 'time'
+    if meter_due:
+        return 'meter'
+    return None
+
+
+def run_benchmark(asset_count=10000, delta_days=60, delta_m1=5000):
+    app = create_benchmark_app('hybrid_planning')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.planning.behaviors.hybrid_planner import HybridPlanner
+        from app.buisness.maintenance.planning.behaviors.meter_based_planner import MeterBasedPlanner
+        from app.buisness.maintenance.planning.behaviors.time_based_planner import TimeBasedPlanner
+        from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+        from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+
+        hybrid_id = create_planning_fleet(
+            asset_count, frequency_type='time_or_meter1', name='Hybrid', delta_days=delta_days, delta_m1=delta_m1
+        )
+        hybrid = db.session.get(MaintenancePlan, hybrid_id)
+        separate = {}
+        for frequency_type in ('days', 'meter1'):
+            plan = MaintenancePlan(
+                name=f'Hybrid plan ({frequency_type})',
+                asset_type_id=hybrid.asset_type_id,
+                model_id=hybrid.model_id,
+                template_action_set_id=hybrid.template_action_set_id,
+                frequency_type=frequency_type,
+                delta_days=delta_days,
+                delta_m1=delta_m1,
+                status='Active',
+                created_by_id=0,
+                updated_by_id=0
+            )
+            db.session.add(plan)
+            db.session.flush()
+            separate[frequency_type] = plan.id
+        db.session.commit()
+
+        planner = MaintenancePlanner()
+        results = {}
+        db.session.expunge_all()
+        with timed(results, 'separate'):
+            planner.plan_maintenance(MaintenancePlanContext(separate['days']))
+            planner.plan_maintenance(MaintenancePlanContext(separate['meter1']))
+        days_results = TimeBasedPlanner().find_assets_needing_maintenance(MaintenancePlanContext(separate['days']))
+        meter_results = MeterBasedPlanner().find_assets_needing_maintenance(MaintenancePlanContext(separate['meter1']))
+        db.session.expunge_all()
+        with timed(results, 'hybrid'):
+            hybrid_results = planner.plan_maintenance(MaintenancePlanContext(hybrid_id))
+        db.session.expunge_all()
+        with timed(results, 'per_asset'):
+            per_asset = HybridPlanner().find_assets_needing_maintenance(MaintenancePlanContext(hybrid_id), batch=False)
+        db.session.expunge_all()
+        batch = HybridPlanner().find_assets_needing_maintenance(MaintenancePlanContext(hybrid_id))
+        differences = planning_results_match(per_asset, batch)
+        for difference in differences[:10]:
+            print(difference)
+
+        # Hybrid is due exactly when either separate plan is. Compared before
+        # duplicate prevention: the fleet's open events belong to the hybrid plan.
+        days_due = {result.asset_id: result.needs_maintenance for result in days_results}
+        meter_due = {result.asset_id: result.needs_maintenance for result in meter_results}
+        mismatches = [
+            result.asset_id for result in batch
+            if result.needs_maintenance != (days_due[result.asset_id] or meter_due[result.asset_id])
+            or result.triggered_by != _expected_trigger(days_due[result.asset_id], meter_due[result.asset_id])
+        ]
+        for asset_id in mismatches[:10]:
+            print(f"asset {asset_id}: hybrid disagrees with days={days_due[asset_id]} meter={meter_due[asset_id]}")
+        triggers = {}
+        for result in batch:
+            triggers[result.triggered_by] = triggers.get(result.triggered_by, 0) + 1
+        separate_events = sum(days_due.values()) + sum(meter_due.values())
+        hybrid_due = [result for result in batch if result.needs_maintenance]
+
+        # Events for some due assets; the next run must not plan them again
+        sample = [result for result in hybrid_results if result.needs_maintenance][:EVENT_SAMPLE_SIZE]
+        created = planner.create_events_from_results(sample, user_id=0)
+        db.session.commit()
+        sample_ids = {result.asset_id for result in sample}
+        replanned = planner.plan_maintenance(MaintenancePlanContext(hybrid_id))
+        prevented = {
+            result.asset_id for result in replanned
+            if result.asset_id in sample_ids and not result.needs_maintenance
+        }
+        recreated = planner.create_events_from_results(
+            [result for result in replanned if result.asset_id in sample_ids], user_id=0
+        )
+
+        print_results(
+            f"Hybrid planning, {asset_count:,} assets ({len(hybrid_results):,} active), "
+            f"every {delta_days} days or {delta_m1:g} meter1",
+            [
+                ("Separate days + meter1 plans", f"{results['separate'] * 1000:.0f} ms"),
+                ("Hybrid plan (batch)", f"{results['hybrid'] * 1000:.0f} ms"),
+                ("Hybrid per-asset path", f"{results['per_asset'] * 1000:.0f} ms"),
+                ("Due by time / meter / both",
+                 f"{triggers.get('time', 0):,} / {triggers.get('meter', 0):,} / {triggers.get('time and meter', 0):,}"),
+                ("Events: separate plans / hybrid", f"{separate_events:,} / {len(hybrid_due):,}"),
+                ("Duplicate events avoided", f"{separate_events - len(hybrid_due):,}"),
+                ("Hybrid matches days OR meter", not mismatches),
+                ("Batch and per-asset paths agree", not differences),
+                ("Duplicates prevented after events", f"{len(prevented)} / {len(created)}"),
+            ]
+        )
+        ok = (
+            not mismatches
+            and not differences
+            and len(created) == len(sample)
+            and prevented == sample_ids
+            and not recreated
+        )
+        return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    meter = float(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    sys.exit(run_benchmark(assets, days, meter))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full re-planning vs incremental planning from the dirty set
+
+Builds several fleets with one plan each (alternating days and meter1
+plans), runs MaintenancePlanner.plan_incremental once to index every pair,
+then applies a small batch of changes:
+
+- meter updates on a few assets (AssetContext.update_meters)
+- one plan edit (delta changed, plan marked dirty)
+- one day passing for the due index, so time-based pairs whose due date
+  fell in that day are picked up
+
+and times plan_all_active_plans against plan_incremental.
+
+Also checks that the due index after the incremental run agrees with a full
+re-plan for every pair, and that the re-evaluated pairs match the full run.
+Finally one plan is made to fail half-way through writing its index rows:
+its rows must be left as they were, the other plans must still be
+re-indexed, and the failed plan must be marked dirty again.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_incremental_planning [plans] [assets_per_plan] [meter_updates]
+"""
+
+import sys
+from datetime import timedelta
+
+from app.debug.benchmarks.benchmark_utils import (
+    create_benchmark_app, create_planning_fleet, planning_results_match, print_results, timed
+)
+
+
+def run_benchmark(plan_count=20, assets_per_plan=500, meter_updates=50):
+    app = create_benchmark_app('incremental_planning')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.core.asset_context import AssetContext
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+        from app.data.core.asset_info.asset import Asset
+        from app.data.maintenance.planning.maintenance_due_index import MaintenanceDueIndex
+        from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+        from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
+
+        plan_ids = []
+        for index in range(plan_count):
+            if index % 2:
+                plan_ids.append(create_planning_fleet(assets_per_plan, frequency_type='meter1',
+                                                      name=f'Fleet {index}', delta_m1=5000))
+            else:
+                plan_ids.append(create_planning_fleet(assets_per_plan, frequency_type='days',
+                                                      name=f'Fleet {index}', delta_days=30))
+
+        planner = MaintenancePlanner()
+        results = {}
+        with timed(results, 'bootstrap'):
+            bootstrap = planner.plan_incremental()
+
+        # A small batch of changes since the last run
+        asset_ids = [asset_id for (asset_id,) in
+                     db.session.query(Asset.id).filter(Asset.meter1.isnot(None)).order_by(Asset.id)]
+        step = max(1, len(asset_ids) // meter_updates)
+        for asset_id in asset_ids[::step][:meter_updates]:
+            asset = db.session.get(Asset, asset_id)
+            AssetContext(asset).update_meters(meter1=asset.meter1 + 6000, updated_by_id=0)
+        edited_plan = db.session.get(MaintenancePlan, plan_ids[0])
+        edited_plan.delta_days = 20
+        PlanningDirtyMark.mark(maintenance_plan_id=edited_plan.id, reason='plan edited')
+        db.session.execute(
+            MaintenanceDueIndex.__table__.update().where(MaintenanceDueIndex.id == db.bindparam('row_id')),
+            [{'row_id': row_id, 'evaluated_at': evaluated_at - timedelta(days=1)}
+             for row_id, evaluated_at in db.session.query(MaintenanceDueIndex.id, MaintenanceDueIndex.evaluated_at)]
+        )
+        db.session.commit()
+
+        db.session.expunge_all()
+        with timed(results, 'full'):
+            full = planner.plan_all_active_plans()
+        db.session.expunge_all()
+        with timed(results, 'incremental'):
+            incremental = planner.plan_incremental()
+
+        # Re-evaluated pairs match the full run
+        full_by_pair = {(result.maintenance_plan_id, result.asset_id): result for result in full}
+        incremental = sorted(incremental, key=lambda result: (result.maintenance_plan_id, result.asset_id))
+        differences = planning_results_match(
+            [full_by_pair.get((result.maintenance_plan_id, result.asset_id)) or result for result in incremental],
+            incremental
+        )
+        # The index agrees with a full re-plan for every pair
+        indexed = {
+            (row.maintenance_plan_id, row.asset_id): (row.needs_maintenance, row.next_due_date)
+            for row in MaintenanceDueIndex.query.filter(
+                MaintenanceDueIndex.maintenance_plan_id.in_(plan_ids))
+        }
+        for pair, result in full_by_pair.items():
+            if indexed.get(pair) != (result.needs_maintenance, result.due_date):
+                differences.append(f"index {pair}: {indexed.get(pair)} != {(result.needs_maintenance, result.due_date)}")
+        for difference in differences[:10]:
+            print(difference)
+        marks_left = PlanningDirtyMark.query.count()
+
+        # A plan failing half-way through its index writes is rolled back to its savepoint
+        failing_plan_id, other_plan_id = plan_ids[0], plan_ids[1]
+        PlanningDirtyMark.mark(maintenance_plan_id=failing_plan_id, reason='benchmark failure')
+        PlanningDirtyMark.mark(maintenance_plan_id=other_plan_id, reason='benchmark')
+        db.session.commit()
+        index_before = _index_rows(failing_plan_id)
+        other_evaluated = db.session.query(db.func.max(MaintenanceDueIndex.evaluated_at)) \
+            .filter_by(maintenance_plan_id=other_plan_id).scalar()
+        record_due_index = planner._record_due_index
+
+        def failing_record_due_index(plan_context, *args, **kwargs):
+            record_due_index(plan_context, *args, **kwargs)
+            if plan_context.id == failing_plan_id:
+                raise RuntimeError('simulated failure after writing index rows')
+
+        planner._record_due_index = failing_record_due_index
+        try:
+            planner.plan_incremental()
+        finally:
+            del planner._record_due_index
+        db.session.expire_all()
+        failure_contained = (
+            _index_rows(failing_plan_id) == index_before
+            and db.session.query(db.func.max(MaintenanceDueIndex.evaluated_at))
+            .filter_by(maintenance_plan_id=other_plan_id).scalar() > other_evaluated
+            and PlanningDirtyMark.query.filter_by(maintenance_plan_id=failing_plan_id).count() == 1
+        )
+
+        print_results(f"{plan_count} plans, {plan_count * assets_per_plan:,} assets", [
+            ("First incremental run (indexes all)", f"{results['bootstrap'] * 1000:.0f} ms, {len(bootstrap):,} pairs"),
+            ("Full re-plan", f"{results['full'] * 1000:.0f} ms, {len(full):,} pairs"),
+            ("Incremental re-plan", f"{results['incremental'] * 1000:.0f} ms, {len(incremental):,} pairs"),
+            ("Speedup", f"{results['full'] / results['incremental']:.1f}x"),
+            ("Dirty marks left", marks_left),
+            ("Index agrees with full run", not differences),
+            ("Failed plan rolled back, re-marked", failure_contained),
+        ])
+        return 0 if not differences and failure_contained else 1
+
+
+def _index_rows(plan_id):
+    from app.data.maintenance.planning.maintenance_due_index import MaintenanceDueIndex
+
+    return sorted(
+        (row.asset_id, row.needs_maintenance, row.next_due_date, row.evaluated_at)
+        for row in MaintenanceDueIndex.query.filter_by(maintenance_plan_id=plan_id)
+    )
+
+
+if __name__ == '__main__':
+    plans = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    assets = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    updates = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    sys.exit(run_benchmark(plans, assets, updates))
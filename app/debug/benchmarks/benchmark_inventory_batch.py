@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched inventory transactions against one call per operation
+
+Stocks parts in the unassigned bins of two storerooms, with priced purchase
+order lines and part demands on maintenance actions. Then builds an ordered
+list of operations per part (PO receipt, put-away to a bin, relocation to the
+other storeroom, demand issue out of the bin, and a second receipt that moves
+the rolling average; odd parts keep one unit unassigned) and applies it twice
+inside rolled-back transactions:
+
+- one InventoryManager call per operation (record_receipt_into_unassigned_bin,
+  assign_unassigned_to_bin, transfer_cross_storeroom, issue_to_part_demand)
+- InventoryManager.apply_batch
+
+and checks both leave the same bins, summaries, movements and part issues.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_inventory_batch [parts]
+"""
+
+import sys
+
+from app.debug.benchmarks.benchmark_utils import (
+    count_queries,
+    create_benchmark_app,
+    create_benchmark_assets,
+    print_results,
+    timed,
+)
+
+BINS_PER_STOREROOM = 10
+
+
+def _build_stock(part_count):
+    """Insert storerooms, bins, parts, PO lines, demands and starting stock"""
+    from app import db
+    from app.data.core.event_info.event import Event
+    from app.data.core.major_location import MajorLocation
+    from app.data.core.sequences import EventDetailIDManager
+    from app.data.core.supply.part_definition import PartDefinition
+    from app.data.inventory.inventory.active_inventory import ActiveInventory
+    from app.data.inventory.inventory.inventory_summary import InventorySummary
+    from app.data.inventory.inventory.storeroom import Storeroom
+    from app.data.inventory.locations.bin import Bin
+    from app.data.inventory.locations.location import Location
+    from app.data.inventory.ordering.purchase_order_header import PurchaseOrderHeader
+    from app.data.inventory.ordering.purchase_order_line import PurchaseOrderLine
+    from app.data.maintenance.base.actions import Action
+    from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+    from app.data.maintenance.base.part_demands import PartDemand
+
+    location = MajorLocation(name='Batch site', created_by_id=0, updated_by_id=0)
+    db.session.add(location)
+    db.session.flush()
+    storerooms = []
+    for index in range(2):
+        storeroom = Storeroom(room_name=f'Batch room {index}', major_location_id=location.id,
+                              created_by_id=0, updated_by_id=0)
+        db.session.add(storeroom)
+        db.session.flush()
+        bins = []
+        for number in range(BINS_PER_STOREROOM):
+            shelf = Location(location=f'S{number}', storeroom_id=storeroom.id, created_by_id=0, updated_by_id=0)
+            db.session.add(shelf)
+            db.session.flush()
+            bin_obj = Bin(bin_tag=f'B{number}', location_id=shelf.id, created_by_id=0, updated_by_id=0)
+            db.session.add(bin_obj)
+            db.session.flush()
+            bins.append((shelf.id, bin_obj.id))
+        storerooms.append({'id': storeroom.id, 'major_location_id': location.id, 'bins': bins})
+
+    part_ids = list(db.session.execute(
+        db.insert(PartDefinition).returning(PartDefinition.id, sort_by_parameter_order=True),
+        [{'part_number': f'BT-{index:06d}', 'part_name': f'Batch part {index}', 'created_by_id': 0, 'updated_by_id': 0}
+         for index in range(part_count)]
+    ).scalars())
+
+    header = PurchaseOrderHeader(po_number='PO-BATCH', vendor_name='Batch vendor', created_by_id=0, updated_by_id=0)
+    db.session.add(header)
+    db.session.flush()
+    po_line_ids = list(db.session.execute(
+        db.insert(PurchaseOrderLine).returning(PurchaseOrderLine.id, sort_by_parameter_order=True),
+        [{'purchase_order_id': header.id, 'part_id': part_id, 'line_number': index + 1,
+          'quantity_ordered': 50.0, 'unit_cost': 2.0 + index % 19, 'created_by_id': 0, 'updated_by_id': 0}
+         for index, part_id in enumerate(part_ids)]
+    ).scalars())
+
+    # One maintenance event per 50 parts, one action and demand per part
+    asset_ids = sorted(create_benchmark_assets(max(1, part_count // 50), make='Bt', model='Batch'))
+    event_ids = Event.bulk_add_events([
+        {'event_type': 'Maintenance', 'description': 'Parts issue', 'user_id': 0,
+         'asset_id': asset_id, 'major_location_id': None}
+        for asset_id in asset_ids
+    ])
+    detail_ids = EventDetailIDManager.get_next_ids(len(asset_ids))
+    action_set_ids = list(db.session.execute(
+        db.insert(MaintenanceActionSet).returning(MaintenanceActionSet.id, sort_by_parameter_order=True),
+        [{'event_id': event_id, 'all_details_id': detail_id, 'asset_id': asset_id, 'task_name': 'Parts issue',
+          'status': 'In Progress', 'created_by_id': 0, 'updated_by_id': 0}
+         for asset_id, event_id, detail_id in zip(asset_ids, event_ids, detail_ids)]
+    ).scalars())
+    action_ids = list(db.session.execute(
+        db.insert(Action).returning(Action.id, sort_by_parameter_order=True),
+        [{'maintenance_action_set_id': action_set_ids[index % len(action_set_ids)], 'action_name': f'Fit {index}',
+          'created_by_id': 0, 'updated_by_id': 0}
+         for index in range(part_count)]
+    ).scalars())
+    demand_ids = list(db.session.execute(
+        db.insert(PartDemand).returning(PartDemand.id, sort_by_parameter_order=True),
+        [{'action_id': action_id, 'part_id': part_id, 'quantity_required': 2.0,
+          'requested_by_id': 0, 'created_by_id': 0, 'updated_by_id': 0}
+         for action_id, part_id in zip(action_ids, part_ids)]
+    ).scalars())
+
+    # Starting stock in storeroom 0's unassigned bin; summaries for two thirds of the parts
+    db.session.execute(db.insert(ActiveInventory), [
+        {'part_id': part_id, 'storeroom_id': storerooms[0]['id'], 'location_id': None, 'bin_id': None,
+         'quantity_on_hand': float(index % 6), 'quantity_allocated': 0.0, 'created_by_id': 0, 'updated_by_id': 0}
+        for index, part_id in enumerate(part_ids) if index % 6
+    ])
+    db.session.execute(db.insert(InventorySummary), [
+        {'part_id': part_id, 'quantity_on_hand_total': float(index % 6),
+         'unit_cost_avg': 1.0 + index % 7, 'created_by_id': 0, 'updated_by_id': 0}
+        for index, part_id in enumerate(part_ids) if index % 3
+    ])
+    db.session.commit()
+    return part_ids, po_line_ids, demand_ids, storerooms
+
+
+def _operations(part_ids, po_line_ids, demand_ids, storerooms):
+    from app.buisness.inventory.stock.inventory_manager import IssueOperation, ReceiptOperation, TransferOperation
+
+    home, other = storerooms
+    operations = []
+    for index, (part_id, po_line_id, demand_id) in enumerate(zip(part_ids, po_line_ids, demand_ids)):
+        shelf_id, bin_id = home['bins'][index % BINS_PER_STOREROOM]
+        other_shelf_id, other_bin_id = other['bins'][index % BINS_PER_STOREROOM]
+        received = 4.0 + index % 5
+        operations += [
+            ReceiptOperation(part_id=part_id, storeroom_id=home['id'], major_location_id=home['major_location_id'],
+                             quantity=received, purchase_order_line_id=po_line_id),
+            TransferOperation(part_id=part_id, quantity=received + max(0, index % 6 - index % 2),
+                              from_storeroom_id=home['id'], from_major_location_id=home['major_location_id'],
+                              to_storeroom_id=home['id'], to_major_location_id=home['major_location_id'],
+                              to_location_id=shelf_id, to_bin_id=bin_id),
+            TransferOperation(part_id=part_id, quantity=1.0,
+                              from_storeroom_id=home['id'], from_major_location_id=home['major_location_id'],
+                              from_location_id=shelf_id, from_bin_id=bin_id,
+                              to_storeroom_id=other['id'], to_major_location_id=other['major_location_id'],
+                              to_location_id=other_shelf_id, to_bin_id=other_bin_id),
+            IssueOperation(part_demand_id=demand_id, storeroom_id=home['id'],
+                           major_location_id=home['major_location_id'], quantity=2.0,
+                           from_location_id=shelf_id, from_bin_id=bin_id),
+            ReceiptOperation(part_id=part_id, storeroom_id=other['id'], major_location_id=other['major_location_id'],
+                             quantity=3.0, purchase_order_line_id=po_line_id),
+        ]
+    return operations
+
+
+def _apply_one_at_a_time(operations):
+    from app.buisness.inventory.stock.inventory_manager import InventoryManager, ReceiptOperation, TransferOperation
+
+    manager = InventoryManager()
+    for op in operations:
+        if isinstance(op, ReceiptOperation):
+            manager.record_receipt_into_unassigned_bin(
+                part_id=op.part_id, storeroom_id=op.storeroom_id, major_location_id=op.major_location_id,
+                quantity_received_accepted=op.quantity, purchase_order_line_id=op.purchase_order_line_id,
+                part_arrival_id=op.part_arrival_id)
+        elif isinstance(op, TransferOperation) and op.from_storeroom_id == op.to_storeroom_id:
+            manager.assign_unassigned_to_bin(
+                part_id=op.part_id, storeroom_id=op.from_storeroom_id, major_location_id=op.from_major_location_id,
+                quantity_to_move=op.quantity, to_location_id=op.to_location_id, to_bin_id=op.to_bin_id)
+        elif isinstance(op, TransferOperation):
+            manager.transfer_cross_storeroom(
+                part_id=op.part_id, quantity_to_move=op.quantity,
+                from_storeroom_id=op.from_storeroom_id, from_major_location_id=op.from_major_location_id,
+                from_location_id=op.from_location_id, from_bin_id=op.from_bin_id,
+                to_storeroom_id=op.to_storeroom_id, to_major_location_id=op.to_major_location_id,
+                to_location_id=op.to_location_id, to_bin_id=op.to_bin_id)
+        else:
+            manager.issue_to_part_demand(
+                part_demand_id=op.part_demand_id, storeroom_id=op.storeroom_id,
+                major_location_id=op.major_location_id, quantity_to_issue=op.quantity,
+                from_location_id=op.from_location_id, from_bin_id=op.from_bin_id)
+
+
+def _state():
+    """Bins, summaries, movements and part issues with ids and timestamps left out"""
+    from app import db
+    from app.data.inventory.inventory.active_inventory import ActiveInventory
+    from app.data.inventory.inventory.inventory_movement import InventoryMovement
+    from app.data.inventory.inventory.inventory_summary import InventorySummary
+    from app.data.inventory.inventory.part_issue import PartIssue
+
+    db.session.flush()
+    db.session.expire_all()
+    bins = sorted(db.session.query(
+        ActiveInventory.part_id, ActiveInventory.storeroom_id, ActiveInventory.location_id,
+        ActiveInventory.bin_id, ActiveInventory.quantity_on_hand
+    ).all(), key=lambda row: tuple(-1 if value is None else value for value in row))
+    summaries = sorted(
+        (row.part_id, row.quantity_on_hand_total, round(row.unit_cost_avg or 0.0, 9))
+        for row in db.session.query(InventorySummary.part_id, InventorySummary.quantity_on_hand_total,
+                                    InventorySummary.unit_cost_avg)
+    )
+    movements = [tuple(row) for row in db.session.query(
+        InventoryMovement.part_id, InventoryMovement.movement_type, InventoryMovement.quantity_delta,
+        InventoryMovement.unit_cost, InventoryMovement.reference_type, InventoryMovement.reference_id,
+        InventoryMovement.part_arrival_id, InventoryMovement.initial_arrival_id, InventoryMovement.previous_movement_id,
+        InventoryMovement.from_major_location_id, InventoryMovement.from_storeroom_id,
+        InventoryMovement.from_location_id, InventoryMovement.from_bin_id,
+        InventoryMovement.to_major_location_id, InventoryMovement.to_storeroom_id,
+        InventoryMovement.to_location_id, InventoryMovement.to_bin_id,
+        InventoryMovement.part_issue_id.isnot(None),
+    ).order_by(InventoryMovement.id)]
+    issues = [tuple(row) for row in db.session.query(
+        PartIssue.part_id, PartIssue.quantity_issued, PartIssue.unit_cost_at_issue, PartIssue.total_cost,
+        PartIssue.part_demand_id, PartIssue.asset_id, PartIssue.issue_type, PartIssue.issued_from_storeroom_id,
+        PartIssue.issued_from_location_id, PartIssue.issued_from_bin_id, PartIssue.requested_by_id,
+        InventoryMovement.part_issue_id == PartIssue.id,
+    ).join(InventoryMovement, PartIssue.inventory_movement_id == InventoryMovement.id).order_by(PartIssue.id)]
+    return bins, summaries, movements, issues
+
+
+def run_benchmark(part_count=2000):
+    app = create_benchmark_app('inventory_batch')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.inventory.stock.inventory_manager import InventoryManager
+
+        operations = _operations(*_build_stock(part_count))
+        results = {}
+
+        with timed(results, 'single'), count_queries(results, 'single_queries'):
+            _apply_one_at_a_time(operations)
+            db.session.flush()
+        expected = _state()
+        db.session.rollback()
+
+        with timed(results, 'batch'), count_queries(results, 'batch_queries'):
+            InventoryManager().apply_batch(operations)
+            db.session.flush()
+        actual = _state()
+        db.session.rollback()
+
+        labels = ('bins', 'summaries', 'movements', 'part issues')
+        differing = [label for label, first, second in zip(labels, expected, actual) if first != second]
+
+        print_results(
+            f"Inventory transactions, {len(operations):,} operations on {part_count:,} parts",
+            [
+                ("One call per operation", f"{results['single']:.2f} s ({results['single_queries']:,} statements)"),
+                ("apply_batch", f"{results['batch']:.2f} s ({results['batch_queries']:,} statements)"),
+                ("Speedup", f"{results['single'] / results['batch']:.1f}x"),
+                ("Movements / part issues", f"{len(actual[2]):,} / {len(actual[3]):,}"),
+                ("Results differing", ', '.join(differing) or 'none'),
+            ]
+        )
+        return 0 if not differing else 1
+
+
+if __name__ == '__main__':
+    parts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sys.exit(run_benchmark(parts))
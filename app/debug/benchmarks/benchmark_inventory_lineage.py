@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Benchmark: movement lineage by recursive CTE against ORM lazy loading
+
+Builds chains of inventory movements through InventoryManager: a receipt
+against a part arrival, a put-away to a bin, relocations back and forth
+between two storerooms, and an issue. Half the chains are written by one
+apply_batch call, the other half by one apply_batch call per step (so links
+are found in the database rather than within a batch), and a sample through
+the single-operation methods. Then traces them two ways and checks both
+find the same movements:
+
+- upstream from every part issue: walking PartIssue.inventory_movement and
+  InventoryMovement.previous_movement one lazy load at a time, against
+  InventoryLineageService.trace_issues
+- downstream from a sample of receipts: walking subsequent_movements, against
+  InventoryLineageService.get_movement_lineage
+
+and that every issue traces back to its part's arrival through a chain of
+depth movements carrying that arrival's initial_arrival_id.
+
+A chain is a receipt, a two-leg put-away, two-leg relocations and an issue,
+so depth must be even and at least 4.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_inventory_lineage [chains] [depth]
+"""
+
+import sys
+
+from app.debug.benchmarks.benchmark_utils import (
+    count_queries,
+    create_benchmark_app,
+    print_results,
+    timed,
+)
+
+DOWNSTREAM_SAMPLE = 200
+SINGLE_OPERATION_CHAINS = 20
+
+
+def _chain_operations(part_id, arrival_id, storerooms, relocations):
+    """Receipt, put-away, relocations and (last) the issue of one chain"""
+    from app.buisness.inventory.stock.inventory_manager import (
+        IssueOperation,
+        ReceiptOperation,
+        TransferOperation,
+    )
+
+    home = storerooms[0]
+    steps = [
+        ReceiptOperation(part_id=part_id, storeroom_id=home['id'],
+                         major_location_id=home['major_location_id'], quantity=5.0,
+                         part_arrival_id=arrival_id),
+        TransferOperation(part_id=part_id, quantity=5.0,
+                          from_storeroom_id=home['id'], from_major_location_id=home['major_location_id'],
+                          to_storeroom_id=home['id'], to_major_location_id=home['major_location_id'],
+                          to_location_id=home['location_id'], to_bin_id=home['bin_id']),
+    ]
+    for level in range(relocations):
+        source, target = storerooms[level % 2], storerooms[(level + 1) % 2]
+        steps.append(TransferOperation(
+            part_id=part_id, quantity=5.0,
+            from_storeroom_id=source['id'], from_major_location_id=source['major_location_id'],
+            from_location_id=source['location_id'], from_bin_id=source['bin_id'],
+            to_storeroom_id=target['id'], to_major_location_id=target['major_location_id'],
+            to_location_id=target['location_id'], to_bin_id=target['bin_id'],
+        ))
+    last = storerooms[relocations % 2]
+    steps.append(IssueOperation(part_id=part_id, storeroom_id=last['id'],
+                                major_location_id=last['major_location_id'], quantity=2.0,
+                                from_location_id=last['location_id'], from_bin_id=last['bin_id'],
+                                issue_type='DirectToUser', issued_to_user_id=0))
+    return steps
+
+
+def _apply_single_operations(manager, steps):
+    """The receipt and transfers through the single-operation methods (issues need a part demand there)"""
+    from app.buisness.inventory.stock.inventory_manager import ReceiptOperation
+
+    for op in steps:
+        if isinstance(op, ReceiptOperation):
+            manager.record_receipt_into_unassigned_bin(
+                part_id=op.part_id, storeroom_id=op.storeroom_id, major_location_id=op.major_location_id,
+                quantity_received_accepted=op.quantity, purchase_order_line_id=None,
+                part_arrival_id=op.part_arrival_id)
+        elif op.from_location_id is None:
+            manager.assign_unassigned_to_bin(
+                part_id=op.part_id, storeroom_id=op.from_storeroom_id, major_location_id=op.from_major_location_id,
+                quantity_to_move=op.quantity, to_location_id=op.to_location_id, to_bin_id=op.to_bin_id)
+        else:
+            manager.transfer_cross_storeroom(
+                part_id=op.part_id, quantity_to_move=op.quantity,
+                from_storeroom_id=op.from_storeroom_id, from_major_location_id=op.from_major_location_id,
+                from_location_id=op.from_location_id, from_bin_id=op.from_bin_id,
+                to_storeroom_id=op.to_storeroom_id, to_major_location_id=op.to_major_location_id,
+                to_location_id=op.to_location_id, to_bin_id=op.to_bin_id)
+
+
+def _build_chains(chain_count, depth):
+    """
+    Write chain_count chains of depth movements (one part per chain) through InventoryManager
+
+    Returns:
+        PartIssue ids, receipt movement ids, and the arrival id per part
+    """
+    from app import db
+    from app.buisness.inventory.stock.inventory_manager import InventoryManager
+    from app.data.core.major_location import MajorLocation
+    from app.data.core.supply.part_definition import PartDefinition
+    from app.data.inventory.arrivals.package_header import PackageHeader
+    from app.data.inventory.arrivals.part_arrival import PartArrival
+    from app.data.inventory.inventory.inventory_movement import InventoryMovement
+    from app.data.inventory.inventory.part_issue import PartIssue
+    from app.data.inventory.inventory.storeroom import Storeroom
+    from app.data.inventory.locations.bin import Bin
+    from app.data.inventory.locations.location import Location
+
+    location = MajorLocation(name='Lineage site', created_by_id=0, updated_by_id=0)
+    db.session.add(location)
+    db.session.flush()
+    storerooms = []
+    for index in range(2):
+        storeroom = Storeroom(room_name=f'Lineage room {index}', major_location_id=location.id,
+                              created_by_id=0, updated_by_id=0)
+        db.session.add(storeroom)
+        db.session.flush()
+        shelf = Location(location='S1', storeroom_id=storeroom.id, created_by_id=0, updated_by_id=0)
+        db.session.add(shelf)
+        db.session.flush()
+        bin_obj = Bin(bin_tag='B1', location_id=shelf.id, created_by_id=0, updated_by_id=0)
+        db.session.add(bin_obj)
+        db.session.flush()
+        storerooms.append({'id': storeroom.id, 'major_location_id': location.id,
+                           'location_id': shelf.id, 'bin_id': bin_obj.id})
+
+    part_ids = list(db.session.execute(
+        db.insert(PartDefinition).returning(PartDefinition.id, sort_by_parameter_order=True),
+        [{'part_number': f'LN-{index:06d}', 'part_name': f'Lineage part {index}', 'created_by_id': 0, 'updated_by_id': 0}
+         for index in range(chain_count)]
+    ).scalars())
+    package = PackageHeader(package_number='PKG-LINEAGE', major_location_id=location.id,
+                            created_by_id=0, updated_by_id=0)
+    db.session.add(package)
+    db.session.flush()
+    arrival_ids = list(db.session.execute(
+        db.insert(PartArrival).returning(PartArrival.id, sort_by_parameter_order=True),
+        [{'package_header_id': package.id, 'part_id': part_id, 'major_location_id': location.id,
+          'storeroom_id': storerooms[0]['id'], 'quantity_received': 5.0, 'status': 'Accepted',
+          'created_by_id': 0, 'updated_by_id': 0}
+         for part_id in part_ids]
+    ).scalars())
+    arrivals = dict(zip(part_ids, arrival_ids))
+    db.session.commit()
+
+    relocations = (depth - 4) // 2
+    chains = [
+        _chain_operations(part_id, arrivals[part_id], storerooms, relocations)
+        for part_id in part_ids
+    ]
+    manager = InventoryManager()
+    single, rest = chains[:SINGLE_OPERATION_CHAINS], chains[SINGLE_OPERATION_CHAINS:]
+    whole, stepwise = rest[:len(rest) // 2], rest[len(rest) // 2:]
+
+    for steps in single:
+        _apply_single_operations(manager, steps[:-1])
+    manager.apply_batch([steps[-1] for steps in single])
+    manager.apply_batch([op for steps in whole for op in steps])
+    for level in range(relocations + 3):
+        manager.apply_batch([steps[level] for steps in stepwise])
+    db.session.commit()
+
+    issue_ids = sorted(db.session.execute(db.select(PartIssue.id)).scalars())
+    receipt_ids = sorted(db.session.execute(
+        db.select(InventoryMovement.id).where(InventoryMovement.movement_type == 'Receipt')
+    ).scalars())
+    return issue_ids, receipt_ids, arrivals
+
+
+def _walk_upstream(issue_ids):
+    from app.data.inventory.inventory.part_issue import PartIssue
+
+    chains = {}
+    for issue_id in issue_ids:
+        movement = PartIssue.query.get(issue_id).inventory_movement
+        chain = []
+        while movement is not None:
+            chain.append(movement.id)
+            movement = movement.previous_movement
+        chains[issue_id] = chain
+    return chains
+
+
+def _walk_downstream(receipt_ids):
+    from app.data.inventory.inventory.inventory_movement import InventoryMovement
+
+    chains = {}
+    for receipt_id in receipt_ids:
+        level = [InventoryMovement.query.get(receipt_id)]
+        chain = []
+        while level:
+            chain += sorted(movement.id for movement in level)
+            level = [child for movement in level for child in movement.subsequent_movements]
+        chains[receipt_id] = chain
+    return chains
+
+
+def run_benchmark(chain_count=5000, depth=20):
+    app = create_benchmark_app('inventory_lineage')
+
+    with app.app_context():
+        from app import db
+        from app.services.inventory.inventory.inventory_lineage_service import (
+            DOWNSTREAM,
+            InventoryLineageService,
+        )
+
+        issue_ids, receipt_ids, arrivals = _build_chains(chain_count, depth)
+        sample = receipt_ids[::max(1, len(receipt_ids) // DOWNSTREAM_SAMPLE)][:DOWNSTREAM_SAMPLE]
+        results = {}
+
+        with timed(results, 'orm_up'), count_queries(results, 'orm_up_queries'):
+            expected_up = _walk_upstream(issue_ids)
+        db.session.expire_all()
+        with timed(results, 'cte_up'), count_queries(results, 'cte_up_queries'):
+            traced = InventoryLineageService.trace_issues(issue_ids)
+        actual_up = {issue_id: [row['id'] for row in chain] for issue_id, chain in traced.items()}
+
+        db.session.expire_all()
+        with timed(results, 'orm_down'), count_queries(results, 'orm_down_queries'):
+            expected_down = _walk_downstream(sample)
+        db.session.expire_all()
+        with timed(results, 'cte_down'), count_queries(results, 'cte_down_queries'):
+            actual_down = {
+                receipt_id: [row['id'] for row in InventoryLineageService.get_movement_lineage(receipt_id, DOWNSTREAM)]
+                for receipt_id in sample
+            }
+
+        # Every issue goes back to its part's receipt, all legs carrying the arrival
+        broken = [
+            issue_id for issue_id in issue_ids
+            if len(traced.get(issue_id, ())) != depth
+            or traced[issue_id][-1]['movement_type'] != 'Receipt'
+            or traced[issue_id][-1]['part_arrival_id'] != arrivals[traced[issue_id][0]['part_id']]
+            or {row['initial_arrival_id'] for row in traced[issue_id]} != {arrivals[traced[issue_id][0]['part_id']]}
+        ]
+        arrival_sample = issue_ids[:DOWNSTREAM_SAMPLE]
+        from_arrivals = [
+            issue_id for issue_id in arrival_sample
+            if [row['id'] for row in InventoryLineageService.get_arrival_lineage(
+                arrivals[traced[issue_id][0]['part_id']])] != actual_up[issue_id][::-1]
+        ] if not broken else arrival_sample
+
+        limited = InventoryLineageService.get_issue_lineage(issue_ids[0], max_depth=3)
+        differing = [
+            label for label, matches in (
+                ('upstream', expected_up == actual_up),
+                ('downstream', expected_down == actual_down),
+                ('issue to receipt', not broken),
+                ('arrival lineage', not from_arrivals),
+                ('max_depth', [row['depth'] for row in limited] == [0, 1, 2, 3]),
+            ) if not matches
+        ]
+
+        print_results(
+            f"Movement lineage, {chain_count:,} chains of {depth} movements",
+            [
+                (f"Upstream of {len(issue_ids):,} issues: lazy loads",
+                 f"{results['orm_up']:.2f} s ({results['orm_up_queries']:,} statements)"),
+                ("Upstream: trace_issues",
+                 f"{results['cte_up']:.2f} s ({results['cte_up_queries']:,} statements)"),
+                (f"Downstream of {len(sample)} receipts: lazy loads",
+                 f"{results['orm_down']:.2f} s ({results['orm_down_queries']:,} statements)"),
+                ("Downstream: get_movement_lineage",
+                 f"{results['cte_down']:.2f} s ({results['cte_down_queries']:,} statements)"),
+                ("Issues traced to their arrival", f"{len(issue_ids) - len(broken):,} of {len(issue_ids):,}"),
+                ("Results differing", ', '.join(differing) or 'none'),
+            ]
+        )
+        return 0 if not differing else 1
+
+
+if __name__ == '__main__':
+    chains = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    if depth < 4 or depth % 2:
+        sys.exit(f"depth must be an even number of at least 4 movements, got {depth}")
+    sys.exit(run_benchmark(chains, depth))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark: inventory summary reconciliation
+
+Stocks parts in three storerooms with a priced receipt movement per bin and
+a matching InventorySummary, then injects drift:
+
+- every 50th summary gets a wrong quantity
+- every 97th part loses its summary
+- every 101st summary loses its unit cost
+- every 199th part has a bin quantity changed without a movement (ledger drift)
+
+and compares, inside rolled-back transactions:
+
+- InventoryManager.refresh_inventory_summary (per-part ORM rebuild of quantities)
+- InventoryReconciliationManager.reconcile, report only
+- reconcile with repair and ledger check, followed by a second run that
+  must find nothing left to repair
+- repairs racing another writer between read and write: float noise on the
+  read quantity still repairs, a real change or a summary created in
+  between is skipped (and no IntegrityError is raised)
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_inventory_reconciliation [parts]
+"""
+
+import sys
+
+from app.debug.benchmarks.benchmark_utils import (
+    count_queries,
+    create_benchmark_app,
+    print_results,
+    timed,
+)
+
+STOREROOMS = 3
+
+
+def _build_stock(part_count):
+    """Insert parts, bins, receipts and summaries; returns the expected drift counts"""
+    from app import db
+    from app.data.core.major_location import MajorLocation
+    from app.data.core.supply.part_definition import PartDefinition
+    from app.data.inventory.inventory.active_inventory import ActiveInventory
+    from app.data.inventory.inventory.inventory_movement import InventoryMovement
+    from app.data.inventory.inventory.inventory_summary import InventorySummary
+    from app.data.inventory.inventory.storeroom import Storeroom
+
+    location = MajorLocation(name='Reconciliation site', created_by_id=0, updated_by_id=0)
+    db.session.add(location)
+    db.session.flush()
+    storerooms = []
+    for index in range(STOREROOMS):
+        storeroom = Storeroom(room_name=f'Reconciliation room {index}', major_location_id=location.id,
+                              created_by_id=0, updated_by_id=0)
+        db.session.add(storeroom)
+        db.session.flush()
+        storerooms.append(storeroom.id)
+
+    part_ids = list(db.session.execute(
+        db.insert(PartDefinition).returning(PartDefinition.id, sort_by_parameter_order=True),
+        [{'part_number': f'RC-{index:06d}', 'part_name': f'Reconciliation part {index}',
+          'created_by_id': 0, 'updated_by_id': 0}
+         for index in range(part_count)]
+    ).scalars())
+
+    bins, receipts, summaries = [], [], []
+    for index, part_id in enumerate(part_ids):
+        total = 0.0
+        for room, storeroom_id in enumerate(storerooms[:1 + index % STOREROOMS]):
+            quantity = float(1 + (index + room) % 9)
+            total += quantity
+            bins.append({'part_id': part_id, 'storeroom_id': storeroom_id, 'quantity_on_hand': quantity,
+                         'quantity_allocated': 0.0, 'created_by_id': 0, 'updated_by_id': 0})
+            receipts.append({'part_id': part_id, 'movement_type': 'Receipt', 'quantity_delta': quantity,
+                             'unit_cost': 2.0 + index % 13, 'to_major_location_id': location.id,
+                             'to_storeroom_id': storeroom_id, 'created_by_id': 0, 'updated_by_id': 0})
+        summaries.append({'part_id': part_id, 'quantity_on_hand_total': total, 'unit_cost_avg': 2.0 + index % 13,
+                          'created_by_id': 0, 'updated_by_id': 0})
+    db.session.execute(db.insert(ActiveInventory), bins)
+    db.session.execute(db.insert(InventoryMovement), receipts)
+    db.session.execute(db.insert(InventorySummary), summaries)
+
+    # Drift
+    drifted = {'quantity': 0, 'missing_summary': 0, 'unit_cost': 0, 'ledger': 0}
+    for index, part_id in enumerate(part_ids):
+        if index % 97 == 5:
+            db.session.execute(db.delete(InventorySummary).where(InventorySummary.part_id == part_id))
+            drifted['missing_summary'] += 1
+            continue
+        if index % 50 == 7:
+            db.session.execute(db.update(InventorySummary).where(InventorySummary.part_id == part_id)
+                               .values(quantity_on_hand_total=InventorySummary.quantity_on_hand_total + 3))
+            drifted['quantity'] += 1
+        if index % 101 == 11:
+            db.session.execute(db.update(InventorySummary).where(InventorySummary.part_id == part_id)
+                               .values(unit_cost_avg=None))
+            drifted['unit_cost'] += 1
+        if index % 199 == 13:
+            # A bin edited by hand: summary and ledger both disagree with ActiveInventory
+            db.session.execute(db.update(ActiveInventory).where(ActiveInventory.part_id == part_id,
+                                                                ActiveInventory.storeroom_id == storerooms[0])
+                               .values(quantity_on_hand=ActiveInventory.quantity_on_hand + 1))
+            drifted['ledger'] += 1
+            drifted['quantity'] += 1 if index % 50 != 7 else 0
+    db.session.commit()
+    return drifted
+
+
+def _quantities():
+    from app import db
+    from app.data.inventory.inventory.inventory_summary import InventorySummary
+
+    db.session.expire_all()
+    return dict(db.session.query(InventorySummary.part_id, InventorySummary.quantity_on_hand_total))
+
+
+def _race_other_writer(reconciler):
+    """Repair drift read before another writer touched the rows; returns what came out wrong"""
+    from app import db
+    from app.buisness.inventory.stock.inventory_reconciliation_manager import SummaryDrift
+    from app.data.inventory.inventory.inventory_summary import InventorySummary
+
+    noisy, changed, created = db.session.execute(
+        db.select(InventorySummary.id, InventorySummary.part_id, InventorySummary.quantity_on_hand_total,
+                  InventorySummary.unit_cost_avg)
+        .where(InventorySummary.unit_cost_avg.isnot(None))
+        .order_by(InventorySummary.id).limit(3)
+    ).all()
+    for row, delta in ((noisy, 1e-9), (changed, 1.0)):
+        db.session.execute(db.update(InventorySummary).where(InventorySummary.id == row.id)
+                           .values(quantity_on_hand_total=InventorySummary.quantity_on_hand_total + delta))
+    drifts = [
+        SummaryDrift(noisy.part_id, 'quantity', noisy.quantity_on_hand_total, noisy.quantity_on_hand_total + 5),
+        SummaryDrift(changed.part_id, 'quantity', changed.quantity_on_hand_total, changed.quantity_on_hand_total + 5),
+        # Read as missing, created by the other writer since
+        SummaryDrift(created.part_id, 'missing_summary', None, 7.0),
+    ]
+    reconciler._repair(drifts, {row.part_id: row for row in (noisy, changed)}, {}, None)
+    db.session.flush()
+    quantities = _quantities()
+    wrong = []
+    if not drifts[0].repaired or quantities[noisy.part_id] != noisy.quantity_on_hand_total + 5:
+        wrong.append('float noise not repaired')
+    if drifts[1].repaired or quantities[changed.part_id] != changed.quantity_on_hand_total + 1:
+        wrong.append('concurrent change overwritten')
+    if drifts[2].repaired or quantities[created.part_id] != created.quantity_on_hand_total:
+        wrong.append('concurrent summary overwritten')
+    return wrong
+
+
+def run_benchmark(part_count=20000):
+    app = create_benchmark_app('inventory_reconciliation')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.inventory.stock.inventory_manager import InventoryManager
+        from app.buisness.inventory.stock.inventory_reconciliation_manager import InventoryReconciliationManager
+        from app.data.inventory.inventory.active_inventory import ActiveInventory
+
+        drifted = _build_stock(part_count)
+        expected_totals = {
+            part_id: float(total) for part_id, total in
+            db.session.query(ActiveInventory.part_id, db.func.sum(ActiveInventory.quantity_on_hand))
+            .group_by(ActiveInventory.part_id)
+        }
+        reconciler = InventoryReconciliationManager()
+        results = {}
+        failures = []
+
+        with timed(results, 'refresh'), count_queries(results, 'refresh_queries'):
+            InventoryManager().refresh_inventory_summary()
+            db.session.flush()
+        if _quantities() != expected_totals:
+            failures.append('refresh_inventory_summary')
+        db.session.rollback()
+
+        with timed(results, 'report'), count_queries(results, 'report_queries'):
+            report = reconciler.reconcile(check_ledger=True)
+        found = {kind: report.count(kind) for kind in drifted}
+        if found != drifted:
+            failures.append(f'found {found}, injected {drifted}')
+
+        with timed(results, 'repair'), count_queries(results, 'repair_queries'):
+            repaired = reconciler.reconcile(repair=True, check_ledger=True)
+            db.session.flush()
+        if _quantities() != expected_totals:
+            failures.append('repaired quantities')
+        second = reconciler.reconcile(check_ledger=True)
+        if len(second.drifts) != second.count('ledger'):
+            failures.append('drift left after repair')
+        db.session.rollback()
+
+        failures += _race_other_writer(reconciler)
+        db.session.rollback()
+
+        print_results(
+            f"Inventory summary reconciliation, {part_count:,} parts",
+            [
+                ("Injected drift", ', '.join(f"{kind} {count}" for kind, count in drifted.items())),
+                ("refresh_inventory_summary",
+                 f"{results['refresh']:.2f} s ({results['refresh_queries']:,} statements, quantities only)"),
+                ("reconcile (report)",
+                 f"{results['report']:.2f} s ({results['report_queries']:,} statements, {report.chunks} chunks)"),
+                ("reconcile (repair)",
+                 f"{results['repair']:.2f} s ({results['repair_queries']:,} statements, "
+                 f"{repaired.repaired} repaired)"),
+                ("Drift after repair", f"{len(second.drifts)} (ledger only: {second.count('ledger')})"),
+                ("Mismatches", '; '.join(failures) or 'none'),
+            ]
+        )
+        return 0 if not failures else 1
+
+
+if __name__ == '__main__':
+    parts = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sys.exit(run_benchmark(parts))
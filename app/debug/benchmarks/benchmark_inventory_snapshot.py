@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark: point-in-time stock from snapshots against full ledger replay
+
+Builds a movement ledger with InventoryManager.apply_batch, one round of
+operations per day (receipts, put-away to bins, relocations between the two
+storerooms, issues on the first day), then:
+
+- checks a full replay of the ledger equals current ActiveInventory
+- writes a snapshot part-way through, adds back-dated movements behind it,
+  and checks snapshot plus replayed delta equals a full replay for dates
+  before, at and after the snapshot
+- times as-of queries with and without a snapshot, and snapshot creation
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_inventory_snapshot [parts] [days]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_inventory_batch import BINS_PER_STOREROOM, _build_stock, _operations
+from app.debug.benchmarks.benchmark_utils import (
+    count_queries,
+    create_benchmark_app,
+    print_results,
+    timed,
+)
+
+START_DATE = datetime(2026, 1, 1, 12, 0)
+
+
+def _daily_operations(day, part_ids, storerooms):
+    """Receipt, put-away and a relocation per part, alternating storerooms by day"""
+    from app.buisness.inventory.stock.inventory_manager import ReceiptOperation, TransferOperation
+
+    home, other = storerooms if day % 2 else storerooms[::-1]
+    operations = []
+    for index, part_id in enumerate(part_ids):
+        shelf_id, bin_id = home['bins'][(index + day) % BINS_PER_STOREROOM]
+        other_shelf_id, other_bin_id = other['bins'][index % BINS_PER_STOREROOM]
+        operations += [
+            ReceiptOperation(part_id=part_id, storeroom_id=home['id'], major_location_id=home['major_location_id'],
+                             quantity=2.0 + (index + day) % 3),
+            TransferOperation(part_id=part_id, quantity=2.0,
+                              from_storeroom_id=home['id'], from_major_location_id=home['major_location_id'],
+                              to_storeroom_id=home['id'], to_major_location_id=home['major_location_id'],
+                              to_location_id=shelf_id, to_bin_id=bin_id),
+            TransferOperation(part_id=part_id, quantity=1.0,
+                              from_storeroom_id=home['id'], from_major_location_id=home['major_location_id'],
+                              from_location_id=shelf_id, from_bin_id=bin_id,
+                              to_storeroom_id=other['id'], to_major_location_id=other['major_location_id'],
+                              to_location_id=other_shelf_id, to_bin_id=other_bin_id),
+        ]
+    return operations
+
+
+def _record_opening_stock(movement_date):
+    """Adjustment movements for the starting stock _build_stock inserts without a ledger"""
+    from app import db
+    from app.data.inventory.inventory.active_inventory import ActiveInventory
+    from app.data.inventory.inventory.inventory_movement import InventoryMovement
+
+    db.session.execute(db.insert(InventoryMovement), [
+        {'part_id': row.part_id, 'movement_type': 'Adjustment', 'quantity_delta': row.quantity_on_hand,
+         'movement_date': movement_date, 'to_major_location_id': row.major_location_id,
+         'to_storeroom_id': row.storeroom_id, 'to_location_id': row.location_id, 'to_bin_id': row.bin_id,
+         'created_by_id': 0, 'updated_by_id': 0}
+        for row in db.session.query(ActiveInventory).filter(ActiveInventory.quantity_on_hand != 0)
+    ], execution_options={'render_nulls': True})
+    db.session.commit()
+
+
+def _apply_dated(operations, movement_date):
+    """Apply a batch and date its movements"""
+    from app import db
+    from app.buisness.inventory.stock.inventory_manager import InventoryManager
+    from app.data.inventory.inventory.inventory_movement import InventoryMovement
+
+    first_id = (db.session.query(db.func.max(InventoryMovement.id)).scalar() or 0) + 1
+    InventoryManager().apply_batch(operations)
+    db.session.execute(
+        db.update(InventoryMovement.__table__)
+        .where(InventoryMovement.__table__.c.id >= first_id)
+        .values(movement_date=movement_date)
+    )
+    db.session.commit()
+
+
+def _quantities(lines):
+    return {
+        (line['part_id'], line['storeroom_id'], line['location_id'], line['bin_id']): round(line['quantity'], 6)
+        for line in lines
+    }
+
+
+def _full_replay(manager, as_of):
+    """Replay of the whole ledger, ignoring snapshots"""
+    quantities, _, replayed, _ = manager._replay(as_of, None)
+    return {key: round(quantity, 6) for key, quantity in quantities.items()}, replayed
+
+
+def run_benchmark(part_count=2000, days=30):
+    app = create_benchmark_app('inventory_snapshot')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.inventory.stock.inventory_snapshot_manager import InventorySnapshotManager
+        from app.data.inventory.inventory.active_inventory import ActiveInventory
+        from app.data.inventory.inventory.inventory_movement import InventoryMovement
+
+        part_ids, po_line_ids, demand_ids, storerooms = _build_stock(part_count)
+        snapshot_day = days * 2 // 3
+
+        with timed({}, 'ledger'):
+            _record_opening_stock(START_DATE - timedelta(days=1))
+            _apply_dated(_operations(part_ids, po_line_ids, demand_ids, storerooms), START_DATE)
+            for day in range(1, days):
+                _apply_dated(_daily_operations(day, part_ids, storerooms), START_DATE + timedelta(days=day))
+        manager = InventorySnapshotManager()
+        snapshot_at = START_DATE + timedelta(days=snapshot_day, hours=1)
+        snapshot = manager.create_snapshot(snapshot_at, created_by_id=0)
+        db.session.commit()
+
+        # Back-dated movements recorded after the snapshot, dated before it
+        _apply_dated(_daily_operations(days, part_ids[::3], storerooms),
+                     START_DATE + timedelta(days=snapshot_day - 1, hours=6))
+        movement_count = db.session.query(db.func.count(InventoryMovement.id)).scalar()
+
+        failures = []
+        now = datetime.utcnow()
+        current = {
+            (row.part_id, row.storeroom_id, row.location_id, row.bin_id): round(row.quantity_on_hand, 6)
+            for row in db.session.query(ActiveInventory).filter(ActiveInventory.quantity_on_hand != 0)
+        }
+        if _full_replay(manager, now)[0] != current:
+            failures.append('full replay != ActiveInventory')
+
+        results = {}
+        for label, as_of in (('before', START_DATE + timedelta(days=snapshot_day // 2, hours=1)),
+                             ('at', snapshot_at),
+                             ('after', START_DATE + timedelta(days=days - 1, hours=1)),
+                             ('now', now)):
+            with timed(results, f'replay_{label}'), count_queries(results, f'replay_{label}_queries'):
+                expected, results[f'replay_{label}_movements'] = _full_replay(manager, as_of)
+            with timed(results, f'as_of_{label}'), count_queries(results, f'as_of_{label}_queries'):
+                stock = manager.get_stock_as_of(as_of)
+            results[f'as_of_{label}_movements'] = stock.movements_replayed
+            if _quantities(stock.lines) != expected:
+                failures.append(f'as-of {label} snapshot')
+
+        with timed(results, 'snapshot'), count_queries(results, 'snapshot_queries'):
+            latest = manager.create_snapshot(created_by_id=0)
+            db.session.flush()
+        with timed(results, 'as_of_latest'), count_queries(results, 'as_of_latest_queries'):
+            stock = manager.get_stock_as_of(latest.snapshot_at)
+        if _quantities(stock.lines) != current:
+            failures.append('as-of latest snapshot')
+        db.session.rollback()
+
+        def row(label):
+            return (
+                f"As of {label}: replay / snapshot",
+                f"{results[f'replay_{label}']:.3f} s ({results[f'replay_{label}_movements']:,} movements) / "
+                f"{results[f'as_of_{label}']:.3f} s ({results[f'as_of_{label}_movements']:,} movements, "
+                f"{results[f'as_of_{label}_queries']} statements)"
+            )
+
+        print_results(
+            f"Point-in-time stock, {movement_count:,} movements over {days} days, {part_count:,} parts",
+            [
+                ("Snapshot lines (day %d)" % snapshot_day, f"{snapshot.line_count:,}"),
+                row('before'),
+                row('at'),
+                row('after'),
+                row('now'),
+                ("Create snapshot (now)",
+                 f"{results['snapshot']:.3f} s ({results['snapshot_queries']} statements, {latest.line_count:,} lines)"),
+                ("As of now, latest snapshot",
+                 f"{results['as_of_latest']:.3f} s ({results['as_of_latest_queries']} statements)"),
+                ("Mismatches", ', '.join(failures) or 'none'),
+            ]
+        )
+        return 0 if not failures else 1
+
+
+if __name__ == '__main__':
+    parts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    sys.exit(run_benchmark(parts, days))
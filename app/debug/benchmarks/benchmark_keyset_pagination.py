@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: OFFSET pagination vs keyset pagination on the event list
+
+Inserts events (with duplicate and NULL timestamps), then times fetching a
+deep page with query.paginate() (OFFSET + full COUNT) and with
+keyset_paginate() (index seek + capped count).
+
+Also walks every page forwards and backwards with keyset cursors and checks
+the rows match a single ordered query, with no gaps or duplicates.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_keyset_pagination [events] [page] [per_page]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_utils import create_benchmark_app, print_results
+
+
+def _insert_events(count):
+    """Insert count events; every 7 share a timestamp and every 97th has none"""
+    from app import db
+    from app.data.core.event_info.event import Event
+
+    start = datetime(2020, 1, 1)
+    db.session.execute(Event.__table__.insert(), [
+        {
+            'event_type': 'Benchmark',
+            'description': f'Benchmark event {index}',
+            'timestamp': None if index % 97 == 0 else start + timedelta(minutes=index // 7),
+            'created_by_id': 0,
+            'updated_by_id': 0,
+        }
+        for index in range(count)
+    ])
+    db.session.commit()
+
+
+def _best_of(runs, func):
+    """Return (best seconds, last result) over several runs"""
+    best, result = None, None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _walk_pages(query, per_page, backwards=False):
+    """Collect ids by following cursors from one end of the list to the other"""
+    from app.data.core.event_info.event import Event
+    from app.services.keyset_pagination import keyset_paginate
+
+    ids, cursor = [], None
+    page = keyset_paginate(query, Event.timestamp, Event.id, per_page=per_page)
+    if backwards:
+        # Jump to the last page by walking forward without recording
+        while page.has_next:
+            page = keyset_paginate(query, Event.timestamp, Event.id, cursor=page.next_cursor, per_page=per_page)
+        while True:
+            ids[:0] = [event.id for event in page.items]
+            if not page.has_prev:
+                return ids
+            page = keyset_paginate(query, Event.timestamp, Event.id, cursor=page.prev_cursor, per_page=per_page)
+    while True:
+        ids.extend(event.id for event in page.items)
+        if not page.has_next:
+            return ids
+        cursor = page.next_cursor
+        page = keyset_paginate(query, Event.timestamp, Event.id, cursor=cursor, per_page=per_page)
+
+
+def run_benchmark(event_count=50000, page_number=1000, per_page=20):
+    app = create_benchmark_app('keyset_pagination')
+
+    with app.app_context():
+        from app import db
+        from app.data.core.event_info.event import Event
+        from app.services.keyset_pagination import encode_cursor, keyset_paginate
+
+        _insert_events(event_count)
+        query = Event.query
+        expected_ids = [
+            row.id for row in db.session.query(Event.id)
+            .order_by(Event.timestamp.desc().nulls_last(), Event.id.desc())
+        ]
+
+        # Cursor pointing at the last row of the page before the target page
+        offset = (page_number - 1) * per_page
+        boundary = db.session.get(Event, expected_ids[offset - 1])
+        cursor = encode_cursor(boundary.timestamp, boundary.id)
+
+        offset_seconds, offset_page = _best_of(5, lambda: query.order_by(
+            Event.timestamp.desc().nulls_last(), Event.id.desc()
+        ).paginate(page=page_number, per_page=per_page, error_out=False))
+        keyset_seconds, keyset_page = _best_of(5, lambda: keyset_paginate(
+            query, Event.timestamp, Event.id, cursor=cursor, per_page=per_page
+        ))
+        keyset_total_seconds, keyset_total_page = _best_of(5, lambda: keyset_paginate(
+            query, Event.timestamp, Event.id, cursor=cursor, per_page=per_page, with_total=True
+        ))
+
+        same_page = [e.id for e in offset_page.items] == [e.id for e in keyset_page.items]
+        forward_ok = _walk_pages(query, 500) == expected_ids
+        backward_ok = _walk_pages(query, 500, backwards=True) == expected_ids
+
+        print_results(f"Event list page {page_number} ({per_page} rows/page, {event_count:,} events)", [
+            ("OFFSET paginate (with COUNT)", f"{offset_seconds * 1000:.2f} ms"),
+            ("Keyset", f"{keyset_seconds * 1000:.2f} ms"),
+            ("Keyset (with capped total)", f"{keyset_total_seconds * 1000:.2f} ms ({keyset_total_page.total_display})"),
+            ("Speedup (no total)", f"{offset_seconds / keyset_seconds:.1f}x"),
+            ("Same rows as OFFSET page", same_page),
+            ("Forward walk matches ordering", forward_ok),
+            ("Backward walk matches ordering", backward_ok),
+        ])
+        return 0 if same_page and forward_ok and backward_ok else 1
+
+
+if __name__ == '__main__':
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    page = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rows_per_page = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    sys.exit(run_benchmark(events, page, rows_per_page))
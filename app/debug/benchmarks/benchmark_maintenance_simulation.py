@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmark: what-if maintenance simulation over a fleet and many plans
+
+Builds a fleet spread over several models, one template per plan (duration,
+parts cost, two required and one optional part demand) and a mix of days,
+meter1 and time_or_meter1 plans that all match the whole fleet. Every asset
+has a meter1 usage rate, one completed maintenance with a meter reading for
+one template, and some assets have an open event. Then:
+
+- simulates every plan over 12 months in weekly steps (array path)
+- simulates a few plans on their own and checks they project the same
+  events as in the full run (chunking does not change the results)
+- checks the events the simulation puts in its first step against the
+  assets MaintenancePlanner finds due now, for one plan of each type
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_maintenance_simulation [assets] [plans] [months]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_utils import (
+    complete_maintenance_events,
+    create_benchmark_app,
+    create_benchmark_assets,
+    print_results,
+    timed,
+)
+
+# Models the fleet is spread over
+MODEL_COUNT = 20
+
+# Plans simulated on their own and compared with the full run
+COMPARED_PLANS = 6
+
+FREQUENCY_TYPES = ('days', 'meter1', 'time_or_meter1')
+
+
+def _build_fleet(asset_count, plan_count, now):
+    """Insert the fleet, parts, templates, plans, rates and history; return the plan IDs"""
+    from app import db
+    from app.data.core.asset_info.asset import Asset
+    from app.data.core.asset_info.meter_history import MeterHistory
+    from app.data.core.asset_info.meter_usage_rates import MeterUsageRate
+    from app.data.core.event_info.event import Event
+    from app.data.core.sequences import EventDetailIDManager
+    from app.data.core.supply.part_definition import PartDefinition
+    from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+    from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+    from app.data.maintenance.templates.template_action_sets import TemplateActionSet
+    from app.data.maintenance.templates.template_actions import TemplateActionItem
+    from app.data.maintenance.templates.template_part_demands import TemplatePartDemand
+
+    asset_ids = []
+    for model in range(MODEL_COUNT):
+        asset_ids += create_benchmark_assets(asset_count // MODEL_COUNT, make='Sim', model=f'Model {model}')
+    asset_ids.sort()
+    db.session.execute(Asset.__table__.update().where(Asset.id == db.bindparam('asset_id')), [
+        {
+            'asset_id': asset_id,
+            'meter1': None if index % 41 == 0 else float(index * 37 % 9000),
+            'is_active': index % 31 != 0,
+            'created_at': now - timedelta(days=index % 300 + 1),
+        }
+        for index, asset_id in enumerate(asset_ids)
+    ])
+    db.session.execute(db.insert(MeterUsageRate), [
+        {
+            'asset_id': asset_id, 'meter_field': 'meter1',
+            'rate_per_day': 10.0 + index % 50, 'rate_low': 8.0 + index % 50, 'rate_high': 12.0 + index % 50,
+            'reading_count': 10, 'last_reading_at': now, 'last_meter_history_id': 0, 'fitted_at': now,
+        }
+        for index, asset_id in enumerate(asset_ids) if index % 11 != 0
+    ])
+
+    part_ids = list(db.session.execute(
+        db.insert(PartDefinition).returning(PartDefinition.id, sort_by_parameter_order=True),
+        [{'part_number': f'SIM-{index:04d}', 'part_name': f'Sim part {index}', 'created_by_id': 0, 'updated_by_id': 0}
+         for index in range(50)]
+    ).scalars())
+
+    asset_type_id = db.session.get(Asset, asset_ids[0]).asset_type_id
+    plan_ids = []
+    template_ids = []
+    for index in range(plan_count):
+        template = TemplateActionSet(
+            task_name=f'Sim service {index}', estimated_duration=1.0 + index % 4, parts_cost=25.0 * (index % 5 + 1),
+            created_by_id=0, updated_by_id=0
+        )
+        db.session.add(template)
+        db.session.flush()
+        action = TemplateActionItem(
+            template_action_set_id=template.id, action_name='Service', sequence_order=1,
+            created_by_id=0, updated_by_id=0
+        )
+        db.session.add(action)
+        db.session.flush()
+        for offset, (quantity, optional) in enumerate(((1.0, False), (2.0 + index % 3, False), (5.0, True))):
+            db.session.add(TemplatePartDemand(
+                template_action_item_id=action.id, part_id=part_ids[(index + offset * 7) % len(part_ids)],
+                quantity_required=quantity, is_optional=optional, sequence_order=offset + 1,
+                created_by_id=0, updated_by_id=0
+            ))
+        frequency_type = FREQUENCY_TYPES[index % len(FREQUENCY_TYPES)]
+        plan = MaintenancePlan(
+            name=f'Sim plan {index} ({frequency_type})', asset_type_id=asset_type_id,
+            template_action_set_id=template.id, frequency_type=frequency_type,
+            delta_days=30.0 + 15 * (index % 10), delta_m1=2000.0 + 500 * (index % 8),
+            status='Active', created_by_id=0, updated_by_id=0
+        )
+        db.session.add(plan)
+        db.session.flush()
+        plan_ids.append(plan.id)
+        template_ids.append(template.id)
+
+    # One maintenance per asset, for a rotating template: completed, or open on every 13th asset
+    history = list(enumerate(asset_ids))
+    reading_ids = list(db.session.execute(
+        db.insert(MeterHistory).returning(MeterHistory.id, sort_by_parameter_order=True),
+        [{'asset_id': asset_id, 'meter1': float(index * 37 % 9000) - 1500 * (index % 4),
+          'recorded_at': now - timedelta(days=index % 120), 'created_by_id': 0, 'updated_by_id': 0}
+         for index, asset_id in history]
+    ).scalars())
+    event_ids = Event.bulk_add_events([
+        {'event_type': 'Maintenance', 'description': f'Sim service {index}',
+         'user_id': 0, 'asset_id': asset_id, 'major_location_id': None}
+        for index, asset_id in history
+    ])
+    detail_ids = EventDetailIDManager.get_next_ids(len(history))
+    action_set_ids = list(db.session.execute(
+        db.insert(MaintenanceActionSet).returning(MaintenanceActionSet.id, sort_by_parameter_order=True), [
+            {
+                'event_id': event_id, 'all_details_id': detail_id, 'asset_id': asset_id,
+                'task_name': 'Sim service', 'template_action_set_id': template_ids[index % plan_count],
+                'maintenance_plan_id': plan_ids[index % plan_count],
+                'status': 'Planned',
+                'end_date': now - timedelta(days=index % 120), 'meter_reading_id': reading_id,
+                'created_by_id': 0, 'updated_by_id': 0,
+            }
+            for (index, asset_id), reading_id, event_id, detail_id in zip(history, reading_ids, event_ids, detail_ids)
+        ]
+    ).scalars())
+    db.session.commit()
+    complete_maintenance_events([
+        action_set_id for (index, _), action_set_id in zip(history, action_set_ids) if index % 13 != 0
+    ])
+    return plan_ids
+
+
+def _event_counts(result):
+    """(month index, plan ID) -> events"""
+    return {
+        (index, plan_id): count
+        for index, month in enumerate(result.months)
+        for plan_id, count in month.events_by_plan.items()
+    }
+
+
+def run_benchmark(asset_count=20000, plan_count=200, months=12):
+    app = create_benchmark_app('maintenance_simulation')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+        from app.buisness.maintenance.planning.maintenance_simulator import MaintenanceSimulator
+
+        now = datetime.utcnow()
+        plan_ids = _build_fleet(asset_count, plan_count, now)
+        simulator = MaintenanceSimulator()
+
+        results = {}
+        with timed(results, 'simulate'):
+            simulation = simulator.simulate(months=months, start=now)
+
+        compared = plan_ids[:COMPARED_PLANS]
+        with timed(results, 'compared'):
+            alone = simulator.simulate(plan_ids=compared, months=months, start=now)
+        in_full_run = {key: count for key, count in _event_counts(simulation).items() if key[1] in compared}
+        runs_agree = _event_counts(alone) == in_full_run
+
+        # A first step as long as the month: its events are the pairs due at the start
+        planner = MaintenancePlanner()
+        first_step = simulator.simulate(plan_ids=plan_ids[:len(FREQUENCY_TYPES)], months=1, step_days=31, start=now)
+        planner_mismatches = []
+        for plan_id in plan_ids[:len(FREQUENCY_TYPES)]:
+            due_now = sum(
+                1 for result in planner.plan_maintenance(MaintenancePlanContext(plan_id))
+                if result.needs_maintenance
+            )
+            simulated = first_step.months[0].events_by_plan.get(plan_id, 0)
+            if due_now != simulated:
+                planner_mismatches.append((plan_id, due_now, simulated))
+            db.session.expunge_all()
+        for plan_id, due_now, simulated in planner_mismatches:
+            print(f"plan {plan_id}: planner finds {due_now} due, simulation {simulated}")
+
+        busiest = max(simulation.months, key=lambda month: month.event_count)
+        part_quantities = simulation.part_quantities
+        print_results(
+            f"Maintenance simulation, {asset_count:,} assets x {plan_count} plans, "
+            f"{months} months in {simulation.step_days}-day steps",
+            [
+                ("Asset/plan pairs", f"{simulation.pair_count:,}"),
+                ("Simulation", f"{results['simulate']:.2f} s"),
+                (f"{COMPARED_PLANS} plans on their own", f"{results['compared']:.2f} s"),
+                ("Events projected", f"{simulation.event_count:,}"),
+                ("Labor hours projected", f"{simulation.labor_hours:,.0f}"),
+                ("Parts cost projected", f"{simulation.parts_cost:,.0f}"),
+                ("Parts projected", f"{len(part_quantities)} part numbers, {sum(part_quantities.values()):,.0f} units"),
+                ("Busiest month", f"{busiest.month_start:%Y-%m}: {busiest.event_count:,} events"),
+                ("Plans alone match full run", runs_agree),
+                ("First step matches planner", not planner_mismatches),
+            ]
+        )
+        return 0 if runs_agree and not planner_mismatches and not simulation.errors else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    plans = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    months = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    sys.exit(run_benchmark(assets, plans, months))
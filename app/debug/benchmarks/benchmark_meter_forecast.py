@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fitting meter usage rates and forecasting meter-based due dates
+
+Builds a meter1 fleet (see create_planning_fleet) and gives every asset a
+series of daily readings since a meter reset, at a known usage rate with
+noise, plus one outlier reading on every seventh asset. Then:
+
+- fits every asset from scratch (MeterUsageForecaster.refresh)
+- refreshes again with new readings on 1% of the assets (only those are
+  refitted) and with no new readings
+- plans the fleet with the batch and the per-asset MeterBasedPlanner paths
+
+Checks the fitted rates against the true rates, how often the confidence
+band covers the true rate, that a meter update (AssetContext.update_meters)
+is refitted by the next incremental planning run, that an incremental run
+without dirty marks does not scan the meter history, and that both planner
+paths return the same forecast due dates.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_meter_forecast [assets] [readings]
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_utils import (
+    count_queries, create_benchmark_app, create_planning_fleet, planning_results_match, print_results, timed
+)
+
+
+def _true_rate(index):
+    """Usage rate of the asset at index, in units per day"""
+    return 20.0 + (index % 40) * 5
+
+
+def run_benchmark(asset_count=2000, reading_count=25):
+    app = create_benchmark_app('meter_forecast')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.core.asset_context import AssetContext
+        from app.buisness.core.meter_usage_forecaster import MeterUsageForecaster
+        from app.buisness.maintenance.planning.behaviors.meter_based_planner import MeterBasedPlanner
+        from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+        from app.data.core.asset_info.asset import Asset
+        from app.data.core.asset_info.meter_history import MeterHistory
+        from app.data.core.asset_info.meter_usage_rates import MeterUsageRate
+
+        plan_id = create_planning_fleet(asset_count, frequency_type='meter1', name='Forecast', delta_m1=5000)
+        asset_ids = [asset_id for (asset_id,) in db.session.query(Asset.id).order_by(Asset.id)]
+
+        # Daily readings since a reset to 0, newest today
+        generator = random.Random(42)
+        now = datetime.utcnow()
+        readings = []
+        current = {}
+        for index, asset_id in enumerate(asset_ids):
+            rate = _true_rate(index)
+            for day in range(reading_count):
+                days_ago = reading_count - 1 - day
+                value = rate * day * generator.uniform(0.98, 1.02)
+                if index % 7 == 0 and day == reading_count // 2:
+                    value += 3000
+                readings.append({
+                    'asset_id': asset_id, 'meter1': value,
+                    'recorded_at': now - timedelta(days=days_ago, hours=generator.uniform(0, 2)),
+                    'created_by_id': 0, 'updated_by_id': 0,
+                })
+            current[asset_id] = rate * (reading_count - 1)
+        readings.sort(key=lambda reading: (reading['asset_id'], reading['recorded_at']))
+        db.session.execute(db.insert(MeterHistory), readings)
+        db.session.execute(Asset.__table__.update().where(Asset.id == db.bindparam('asset_id_')),
+                           [{'asset_id_': asset_id, 'meter1': value} for asset_id, value in current.items()])
+        db.session.commit()
+
+        forecaster = MeterUsageForecaster()
+        results = {}
+        with timed(results, 'full'):
+            fitted = forecaster.refresh()
+            db.session.commit()
+
+        # Fit quality against the true rates
+        rates = forecaster.get_rates(asset_ids, 'meter1')
+        accurate = covered = 0
+        for index, asset_id in enumerate(asset_ids):
+            rate = rates.get(asset_id)
+            if rate is None:
+                continue
+            true_rate = _true_rate(index)
+            accurate += abs(rate.rate_per_day - true_rate) <= 0.03 * true_rate
+            covered += rate.rate_low <= true_rate <= rate.rate_high
+
+        # New raw readings on 1% of the assets: only those are refitted
+        changed_ids = asset_ids[::100]
+        db.session.execute(db.insert(MeterHistory), [
+            {'asset_id': asset_id, 'meter1': current[asset_id] + 10, 'recorded_at': now + timedelta(minutes=5),
+             'created_by_id': 0, 'updated_by_id': 0}
+            for asset_id in changed_ids
+        ])
+        with timed(results, 'incremental'):
+            refitted = forecaster.refresh()
+            db.session.commit()
+        with timed(results, 'noop'):
+            unchanged = forecaster.refresh()
+
+        # update_meters marks its asset; the next incremental run refits it
+        MaintenancePlanner().plan_incremental()
+        asset = db.session.get(Asset, asset_ids[1])
+        history = AssetContext(asset).update_meters(meter1=asset.meter1 + 50, updated_by_id=0)
+        with timed(results, 'marked'):
+            MaintenancePlanner().plan_incremental()
+        hook_refitted = MeterUsageRate.query.filter_by(
+            asset_id=asset.id, meter_field='meter1').one().last_meter_history_id == history.id
+        with timed(results, 'unmarked'), count_queries(results, 'unmarked_queries'):
+            MaintenancePlanner().plan_incremental()
+
+        # Both planner paths forecast the same due dates
+        planner = MeterBasedPlanner()
+        db.session.expunge_all()
+        with timed(results, 'batch'):
+            batch = planner.find_assets_needing_maintenance(MaintenancePlanContext(plan_id), batch=True)
+        with timed(results, 'per_asset'):
+            per_asset = planner.find_assets_needing_maintenance(MaintenancePlanContext(plan_id), batch=False)
+        differences = planning_results_match(per_asset, batch)
+        for difference in differences[:10]:
+            print(difference)
+        forecast = sum(1 for result in batch if result.due_date)
+
+        fitted_count = len(rates)
+        print_results(f"{asset_count:,} assets, {reading_count} readings each", [
+            ("Full fit", f"{results['full'] * 1000:.0f} ms, {len(fitted):,} assets"),
+            ("Incremental refresh (1% new readings)",
+             f"{results['incremental'] * 1000:.0f} ms, {len(refitted):,} assets"),
+            ("Refresh without new readings", f"{results['noop'] * 1000:.1f} ms, {len(unchanged)} assets"),
+            ("Rates within 3% of true rate", f"{accurate:,} / {fitted_count:,}"),
+            ("Band covers true rate", f"{covered / max(fitted_count, 1):.0%}"),
+            ("Planner batch / per-asset", f"{results['batch'] * 1000:.0f} ms / {results['per_asset'] * 1000:.0f} ms"),
+            ("Results with a forecast due date", f"{forecast:,} / {len(batch):,}"),
+            ("Incremental planning, one meter update",
+             f"{results['marked'] * 1000:.0f} ms, refitted {hook_refitted}"),
+            ("Incremental planning, no dirty marks",
+             f"{results['unmarked'] * 1000:.1f} ms, {results['unmarked_queries']} statements"),
+            ("Planner paths agree", not differences),
+        ])
+        ok = (
+            not differences
+            and hook_refitted
+            and sorted(refitted) == sorted(changed_ids)
+            and not unchanged
+            and accurate >= 0.99 * fitted_count
+            and forecast > 0
+        )
+        return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    readings = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    sys.exit(run_benchmark(assets, readings))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-asset vs batch meter-based planning
+
+Builds a fleet with maintenance history (see create_planning_fleet) and one
+meter1 plan, then times MeterBasedPlanner.find_assets_needing_maintenance
+with batch=False (one last-maintenance query plus one meter reading query per
+asset) and with the default batch pass (one window-function query, one-pass
+threshold evaluation).
+
+Also checks both paths return equivalent PlanningResult lists.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_meter_planning [assets]
+"""
+
+import sys
+
+from app.debug.benchmarks.benchmark_utils import (
+    create_benchmark_app, create_planning_fleet, planning_results_match, print_results, timed
+)
+
+
+def run_benchmark(asset_count=10000):
+    app = create_benchmark_app('meter_planning')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.planning.behaviors.meter_based_planner import MeterBasedPlanner
+        from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+
+        plan_id = create_planning_fleet(asset_count, frequency_type='meter1', delta_m1=5000)
+        planner = MeterBasedPlanner()
+
+        results = {}
+        db.session.expunge_all()
+        with timed(results, 'per_asset'):
+            expected = planner.find_assets_needing_maintenance(MaintenancePlanContext(plan_id), batch=False)
+        db.session.expunge_all()
+        with timed(results, 'batch'):
+            actual = planner.find_assets_needing_maintenance(MaintenancePlanContext(plan_id))
+
+        differences = planning_results_match(expected, actual)
+        for difference in differences[:10]:
+            print(difference)
+
+        print_results(f"Meter-based planning, {asset_count:,} assets ({len(expected):,} active)", [
+            ("Per-asset queries", f"{results['per_asset'] * 1000:.0f} ms"),
+            ("Batch", f"{results['batch'] * 1000:.0f} ms"),
+            ("Speedup", f"{results['per_asset'] / results['batch']:.1f}x"),
+            ("Assets due", sum(1 for result in actual if result.needs_maintenance)),
+            ("Equivalent results", not differences),
+        ])
+        return 0 if not differences else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sys.exit(run_benchmark(assets))
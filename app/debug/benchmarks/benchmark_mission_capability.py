@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fleet-wide mission capability recompute
+
+Builds a fleet where most assets have an open maintenance event and a
+share of those events carry one to three blockers with mixed statuses
+(some ended, some without a status). Then:
+
+- recomputes every asset the old way: calculate_asset_mission_capability
+  and one commit per asset
+- resets the statuses and recomputes with recompute_mission_capability
+  (one GROUP BY query and one executemany UPDATE)
+- checks both give every asset the same status
+- adds, updates and ends a blocker through MaintenanceBlockerManager and
+  checks the asset status follows each change
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_mission_capability [assets]
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_utils import count_queries, create_benchmark_app, create_benchmark_assets, print_results, timed
+
+STATUSES = (
+    'Non Mission Capable',
+    'Partially Mission Capable - Functional Limitations',
+    'Mission Capable - Temporary Procedural or Hardware Work Arounds',
+    'Mission Capable - Ignorable Damage or Issue',
+    None,
+)
+
+
+def _build_fleet(asset_count, now):
+    """Insert assets, open maintenance events and blockers; return (asset IDs, action set IDs)"""
+    from app import db
+    from app.data.core.event_info.event import Event
+    from app.data.core.sequences import EventDetailIDManager
+    from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+    from app.data.maintenance.base.maintenance_blockers import MaintenanceBlocker
+
+    asset_ids = sorted(create_benchmark_assets(asset_count, make='Mc', model='Mission'))
+    maintained = [asset_id for index, asset_id in enumerate(asset_ids) if index % 4 != 0]
+    event_ids = Event.bulk_add_events([
+        {'event_type': 'Maintenance', 'description': 'Blocked service',
+         'user_id': 0, 'asset_id': asset_id, 'major_location_id': None}
+        for asset_id in maintained
+    ])
+    detail_ids = EventDetailIDManager.get_next_ids(len(maintained))
+    action_set_ids = list(db.session.execute(
+        db.insert(MaintenanceActionSet).returning(MaintenanceActionSet.id, sort_by_parameter_order=True),
+        [
+            {'event_id': event_id, 'all_details_id': detail_id, 'asset_id': asset_id,
+             'task_name': 'Blocked service', 'status': 'Blocked', 'created_by_id': 0, 'updated_by_id': 0}
+            for asset_id, event_id, detail_id in zip(maintained, event_ids, detail_ids)
+        ]
+    ).scalars())
+    db.session.execute(db.insert(MaintenanceBlocker), [
+        {
+            'maintenance_action_set_id': action_set_id,
+            'mission_capability_status': STATUSES[(index + number) % len(STATUSES)],
+            'reason': 'Parts Not Available',
+            'start_date': now - timedelta(days=number + 1),
+            'end_date': now if (index + number) % 3 == 0 else None,
+            'priority': 'Medium', 'created_by_id': 0, 'updated_by_id': 0,
+        }
+        for index, action_set_id in enumerate(action_set_ids) if index % 3 != 0
+        for number in range(index % 3 + 1)
+    ])
+    db.session.commit()
+    return asset_ids, action_set_ids
+
+
+def _statuses():
+    from app import db
+    from app.data.core.asset_info.asset import Asset
+    return dict(db.session.query(Asset.id, Asset.mission_capability_status))
+
+
+def _reset_statuses():
+    from app import db
+    from app.data.core.asset_info.asset import Asset
+    db.session.execute(Asset.__table__.update().values(mission_capability_status=None))
+    db.session.commit()
+
+
+def run_benchmark(asset_count=10000):
+    app = create_benchmark_app('mission_capability')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.base.maintenance_blocker_manager import MaintenanceBlockerManager
+        from app.buisness.maintenance.base.structs.maintenance_action_set_struct import MaintenanceActionSetStruct
+        from app.data.core.asset_info.asset import Asset
+        from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+
+        now = datetime.utcnow()
+        asset_ids, action_set_ids = _build_fleet(asset_count, now)
+
+        results = {}
+        _reset_statuses()
+        action_set = db.session.get(MaintenanceActionSet, action_set_ids[0])
+        manager = MaintenanceBlockerManager(MaintenanceActionSetStruct(action_set))
+        with timed(results, 'per_asset'), count_queries(results, 'per_asset_queries'):
+            for asset_id in asset_ids:
+                status = manager.calculate_asset_mission_capability(asset_id)
+                db.session.execute(
+                    Asset.__table__.update().where(Asset.id == asset_id).values(mission_capability_status=status)
+                )
+                db.session.commit()
+        per_asset = _statuses()
+
+        _reset_statuses()
+        with timed(results, 'set_based'), count_queries(results, 'set_based_queries'):
+            changed = MaintenanceBlockerManager.recompute_mission_capability()
+            db.session.commit()
+        set_based = _statuses()
+
+        with timed(results, 'unchanged'):
+            unchanged = MaintenanceBlockerManager.recompute_mission_capability()
+            db.session.commit()
+
+        # Incremental: the manager keeps its asset up to date on add, update and end
+        asset_id = action_set.asset_id
+        for blocker in list(manager.active_blockers):
+            manager.end_blocker(blocker.id)
+        incremental = [db.session.get(Asset, asset_id).mission_capability_status == 'Fully Mission Capable']
+        with timed(results, 'incremental'):
+            blocker = manager.add_blocker('Non Mission Capable', 'Safety Concerns')
+        incremental.append(db.session.get(Asset, asset_id).mission_capability_status == 'Non Mission Capable')
+        manager.update_blocker(blocker.id, mission_capability_status='Mission Capable - Ignorable Damage or Issue')
+        incremental.append(
+            db.session.get(Asset, asset_id).mission_capability_status == 'Mission Capable - Ignorable Damage or Issue'
+        )
+        manager.end_blocker(blocker.id)
+        incremental.append(db.session.get(Asset, asset_id).mission_capability_status == 'Fully Mission Capable')
+
+        status_counts = {}
+        for status in set_based.values():
+            status_counts[status] = status_counts.get(status, 0) + 1
+        statuses_match = per_asset == set_based
+        print_results(
+            f"Mission capability recompute, {asset_count:,} assets",
+            [
+                ("Per-asset query + commit", f"{results['per_asset']:.2f} s ({results['per_asset_queries']:,} statements)"),
+                ("Set-based recompute", f"{results['set_based']:.3f} s ({results['set_based_queries']} statements)"),
+                ("Speedup", f"{results['per_asset'] / results['set_based']:.0f}x"),
+                ("Assets updated / on re-run", f"{changed:,} / {unchanged}"),
+                ("Re-run with nothing changed", f"{results['unchanged']:.3f} s"),
+                ("Add blocker incl. recompute", f"{results['incremental'] * 1000:.1f} ms"),
+                ("Non Mission Capable", f"{status_counts.get(STATUSES[0], 0):,}"),
+                ("Fully Mission Capable", f"{status_counts.get('Fully Mission Capable', 0):,}"),
+                ("Statuses match per-asset path", statuses_match),
+                ("Add/update/end keep asset in sync", all(incremental)),
+            ]
+        )
+        return 0 if statuses_match and unchanged == 0 and all(incremental) else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sys.exit(run_benchmark(assets))
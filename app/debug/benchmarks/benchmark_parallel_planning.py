@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: evaluating every active plan in-process vs across a process pool
+
+Builds a synthetic dataset of many small fleets, one plan each (alternating
+days and meter1 plans, see create_planning_fleet), then evaluates all active
+plans with ParallelPlanExecutor using one worker (in-process) and using a
+process pool. Event creation then runs as the single writer step for the
+due records of the first WRITER_PLANS plans (creating an event from a
+template costs the same either way, so the full set would only lengthen the
+run), and a second writer pass checks duplicate prevention.
+
+Also checks both evaluations return the same records, and that
+MaintenancePlanner.plan_all_active_plans returns the same results with
+PLANNING_WORKERS above 1 (process pool) as with 1 (one plan after another).
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_parallel_planning [plans] [assets_per_plan] [workers]
+"""
+
+import os
+import sys
+
+from app.debug.benchmarks.benchmark_utils import (
+    create_benchmark_app,
+    create_planning_fleet,
+    planning_results_match,
+    print_results,
+    timed,
+)
+
+# Plans whose due records go through the writer step
+WRITER_PLANS = 10
+
+
+def _comparable(records):
+    """Records without the fields that depend on when they were computed"""
+    return [
+        record._replace(days_since_last_maintenance=None, recommended_start_date=None)
+        for record in records
+    ]
+
+
+def run_benchmark(plan_count=200, assets_per_plan=100, workers=None):
+    workers = workers or max(2, os.cpu_count() or 1)
+    app = create_benchmark_app('parallel_planning')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+        from app.buisness.maintenance.planning.parallel_plan_executor import ParallelPlanExecutor
+
+        for index in range(plan_count):
+            if index % 2:
+                create_planning_fleet(assets_per_plan, frequency_type='meter1', name=f'Fleet {index}', delta_m1=5000)
+            else:
+                create_planning_fleet(assets_per_plan, frequency_type='days', name=f'Fleet {index}', delta_days=30)
+
+        results = {}
+        with timed(results, 'serial'):
+            expected = ParallelPlanExecutor(workers=1).evaluate()
+        executor = ParallelPlanExecutor(workers=workers)
+        with timed(results, 'parallel'):
+            records = executor.evaluate()
+        same_records = _comparable(expected) == _comparable(records)
+
+        # plan_all_active_plans picks the pool from the PLANNING_WORKERS setting
+        planner = MaintenancePlanner()
+        app.config['PLANNING_WORKERS'] = 1
+        db.session.expunge_all()
+        with timed(results, 'planner_serial'):
+            serial_results = planner.plan_all_active_plans()
+        app.config['PLANNING_WORKERS'] = workers
+        db.session.expunge_all()
+        with timed(results, 'planner_parallel'):
+            parallel_results = planner.plan_all_active_plans()
+        planner_differences = planning_results_match(serial_results, parallel_results)
+        for difference in planner_differences[:10]:
+            print(difference)
+
+        writer_plan_ids = sorted({record.maintenance_plan_id for record in records})[:WRITER_PLANS]
+        writer_records = [record for record in records if record.maintenance_plan_id in writer_plan_ids]
+        # Objects loaded by the in-process evaluation would be expired on every event commit
+        db.session.expunge_all()
+        with timed(results, 'writer'):
+            created = executor.create_events(writer_records, user_id=0)
+        repeated = executor.create_events(writer_records, user_id=0)
+
+        due = sum(1 for record in records if record.needs_maintenance)
+        writer_due = sum(1 for record in writer_records if record.needs_maintenance)
+        print_results(f"{plan_count} plans, {plan_count * assets_per_plan:,} assets, {os.cpu_count()} CPUs", [
+            ("In-process evaluation", f"{results['serial'] * 1000:.0f} ms"),
+            (f"Process pool ({workers} workers)", f"{results['parallel'] * 1000:.0f} ms"),
+            ("Speedup", f"{results['serial'] / results['parallel']:.1f}x"),
+            ("Records", f"{len(records):,} ({due:,} due)"),
+            (f"Writer step ({len(writer_plan_ids)} plans)", f"{results['writer'] * 1000:.0f} ms, {len(created):,} events"),
+            ("Events on second pass", len(repeated)),
+            ("Same records", same_records),
+            ("plan_all_active_plans, 1 / {} workers".format(workers),
+             f"{results['planner_serial'] * 1000:.0f} ms / {results['planner_parallel'] * 1000:.0f} ms"),
+            ("plan_all_active_plans results match", not planner_differences),
+        ])
+        return 0 if same_records and not planner_differences and len(created) == writer_due and not repeated else 1
+
+
+if __name__ == '__main__':
+    plans = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    assets = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    worker_count = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    sys.exit(run_benchmark(plans, assets, worker_count))
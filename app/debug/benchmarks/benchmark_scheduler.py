@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Benchmark: background scheduler over a planning fleet
+
+Builds a fleet with one meter-based plan, then:
+
+- checks CronSchedule.next_after against a minute-by-minute scan for a few
+  expressions
+- checks create_app starts no scheduler and init_scheduler starts one per
+  app however often it is called
+- starts two schedulers on the same lock file and checks only one becomes
+  the leader, and that run_now is refused by the other one
+- lets the leader run a fast interval job for a few ticks, and runs the
+  maintenance planning job with run_now
+- checks every run is recorded in ScheduledJobRun with its duration and
+  that the planning run created the due events
+- completes one created event through MaintenanceContext.complete(), blocks
+  another, and checks the next planning run creates no event for either
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_scheduler [assets]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.debug.benchmarks.benchmark_utils import create_benchmark_app, create_planning_fleet, print_results, timed
+
+CRON_EXPRESSIONS = ('*/15 * * * *', '30 2 * * 1-5', '0 0 1,15 * *', '0 6 13 * 5', '5 4 * 2 7')
+
+INTERVAL_SECONDS = 0.2
+TICK_SECONDS = 0.05
+INTERVAL_WAIT_SECONDS = 1.0
+
+PLANNING_JOB = 'app.buisness.maintenance.planning.maintenance_planner:MaintenancePlanner.run_scheduled_planning'
+
+
+def benchmark_tick():
+    """Interval job used by the benchmark"""
+    return 'tick'
+
+
+def _cron_matches_scan(expression, start, days=60):
+    """Compare next_after with a minute-by-minute scan; returns (checked, mismatches)"""
+    from app.utils.background_scheduler import CronSchedule
+
+    schedule = CronSchedule(expression)
+    matches = []
+    moment = start.replace(second=0, microsecond=0)
+    for _ in range(days * 24 * 60):
+        moment += timedelta(minutes=1)
+        day_match = moment.day in schedule.days
+        weekday_match = (moment.weekday() + 1) % 7 in schedule.weekdays
+        days_ok = (day_match or weekday_match) if (schedule._days_restricted and schedule._weekdays_restricted) \
+            else (day_match and weekday_match)
+        if (moment.minute in schedule.minutes and moment.hour in schedule.hours
+                and moment.month in schedule.months and days_ok):
+            matches.append(moment)
+
+    mismatches = 0
+    moment = start
+    for expected in matches:
+        moment = schedule.next_after(moment)
+        if moment != expected:
+            mismatches += 1
+            break
+    return len(matches), mismatches
+
+
+def run_benchmark(asset_count=1000):
+    app = create_benchmark_app('scheduler')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.base.maintenance_context import MaintenanceContext
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+        from app.data.core.scheduled_job_runs import ScheduledJobRun
+        from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+        from app.utils.background_scheduler import BackgroundScheduler, ScheduledJob, init_scheduler
+
+        create_planning_fleet(asset_count, 'meter1', delta_m1=5000)
+        open_before = MaintenanceActionSet.query.filter(MaintenanceActionSet.status != MaintenanceActionSet.COMPLETED_STATUS).count()
+
+        cron_checked = 0
+        cron_mismatches = 0
+        start = datetime(2026, 1, 1, 0, 0)
+        for expression in CRON_EXPRESSIONS:
+            checked, mismatches = _cron_matches_scan(expression, start)
+            cron_checked += checked
+            cron_mismatches += mismatches
+
+        lock_path = os.path.join(tempfile.mkdtemp(prefix='scheduler_lock_'), 'scheduler.lock')
+
+        def scheduler_threads():
+            return sum(1 for thread in threading.enumerate() if thread.name == 'scheduler')
+
+        # create_app leaves starting the scheduler to the web server
+        threads_after_create_app = scheduler_threads()
+        app.config['SCHEDULER_LOCK_FILE'] = lock_path + '.app'
+        single_instance = init_scheduler(app) is init_scheduler(app) and scheduler_threads() == 1
+        app.extensions.pop('scheduler').shutdown()
+
+        def make_scheduler():
+            jobs = [
+                ScheduledJob.from_config({'name': 'tick', 'func': f'{__name__}:benchmark_tick',
+                                          'interval': INTERVAL_SECONDS}),
+                ScheduledJob.from_config({'name': 'maintenance_planning', 'func': PLANNING_JOB,
+                                          'cron': '0 0 1 1 *'}),
+            ]
+            return BackgroundScheduler(app, jobs, workers=2, lock_path=lock_path,
+                                       tick_seconds=TICK_SECONDS, history_days=30)
+
+        first = make_scheduler()
+        second = make_scheduler()
+        first.start()
+        time.sleep(TICK_SECONDS * 4)
+        second.start()
+        time.sleep(INTERVAL_WAIT_SECONDS)
+        single_leader = first.is_leader != second.is_leader
+        follower_refused = not (second if first.is_leader else first).run_now('tick')
+
+        results = {}
+        leader = first if first.is_leader else second
+        with timed(results, 'planning_job'):
+            started = leader.run_now('maintenance_planning')
+            rejected_overlap = not leader.run_now('maintenance_planning')
+            while leader.jobs['maintenance_planning'].running:
+                time.sleep(0.01)
+
+        second.shutdown()
+        first.shutdown()
+        # Release on shutdown lets another scheduler take over
+        third = make_scheduler()
+        takeover = third._acquire_lock()
+        third.shutdown()
+
+        db.session.expire_all()
+        runs = ScheduledJobRun.query.all()
+        tick_runs = [run for run in runs if run.job_name == 'tick']
+        planning_runs = [run for run in runs if run.job_name == 'maintenance_planning']
+        workers = {run.worker for run in tick_runs}
+        planning_run = planning_runs[0] if planning_runs else None
+        open_after = MaintenanceActionSet.query.filter(MaintenanceActionSet.status != MaintenanceActionSet.COMPLETED_STATUS).count()
+
+        # The fleet's own events are In Progress or complete: Planned ones were created by the job
+        completed_event, blocked_event = MaintenanceActionSet.query.filter_by(status='Planned') \
+            .order_by(MaintenanceActionSet.id).limit(2).all()
+        asset = completed_event.asset
+        MaintenanceContext.from_maintenance_action_set(completed_event.id).complete(
+            meter1=asset.meter1, meter2=asset.meter2, meter3=asset.meter3, meter4=asset.meter4
+        )
+        MaintenanceContext.from_maintenance_action_set(blocked_event.id).get_blocker_manager().add_blocker(
+            mission_capability_status='Non Mission Capable', reason='Waiting for parts'
+        )
+        replanned = MaintenancePlanner.run_scheduled_planning()
+        recreated = MaintenanceActionSet.query.filter(
+            MaintenanceActionSet.asset_id.in_([completed_event.asset_id, blocked_event.asset_id]),
+            MaintenanceActionSet.status == 'Planned',
+        ).count()
+
+        recorded = (
+            bool(tick_runs)
+            and all(run.status == 'Succeeded' and run.duration_ms is not None for run in tick_runs)
+            and planning_run is not None and planning_run.status == 'Succeeded'
+        )
+        print_results(
+            f"Background scheduler, {asset_count:,} assets",
+            [
+                ("Cron matches checked", f"{cron_checked:,} ({cron_mismatches} mismatching expressions)"),
+                ("Scheduler threads after create_app", threads_after_create_app),
+                ("init_scheduler twice: one scheduler", single_instance),
+                ("Single leader on shared lock", single_leader),
+                ("run_now refused by non-leader", follower_refused),
+                ("Lock taken over after shutdown", takeover),
+                ("Interval runs recorded", f"{len(tick_runs)} (from {len(workers)} worker)"),
+                ("Overlapping run_now rejected", started and rejected_overlap),
+                ("Planning job wall time", f"{results['planning_job']:.2f} s"),
+                ("Planning job recorded duration",
+                 f"{planning_run.duration_ms:.0f} ms" if planning_run and planning_run.duration_ms else '-'),
+                ("Planning job result", planning_run.result if planning_run else '-'),
+                ("Open maintenance before / after", f"{open_before:,} / {open_after:,}"),
+                ("Runs recorded", recorded),
+                ("Re-run after complete / block", f"{replanned['events_created']} created, {recreated} for those assets"),
+            ]
+        )
+        if planning_run is not None and planning_run.error:
+            print(planning_run.error)
+        ok = (not cron_mismatches and not threads_after_create_app and single_instance
+              and single_leader and follower_refused and takeover and len(workers) == 1
+              and started and rejected_overlap and recorded and open_after > open_before
+              and replanned['events_created'] == 0 and recreated == 0)
+        return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    sys.exit(run_benchmark(assets))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-asset vs batch time-based planning with duplicate prevention
+
+Builds a fleet with maintenance history (see create_planning_fleet) and one
+days plan, then runs the planning step two ways:
+
+- per asset: TimeBasedPlanner with batch=False (last maintenance queried per
+  asset) plus one duplicate-event query per due asset, as plan_maintenance
+  used to do
+- batch: MaintenancePlanner.plan_maintenance (one window-function query for
+  last maintenance, one query for all open events of the plan)
+
+Reports time and SQL statement count for both and checks the PlanningResult
+lists are equivalent. Run it with two fleet sizes to see the batch query
+count stay constant.
+
+Usage:
+    python -m app.debug.benchmarks.benchmark_time_planning [assets] [delta_days]
+"""
+
+import sys
+
+from app.debug.benchmarks.benchmark_utils import (
+    count_queries, create_benchmark_app, create_planning_fleet, planning_results_match, print_results, timed
+)
+
+
+def _plan_per_asset(planner, plan_context):
+    """The previous flow: per-asset lookups, then one duplicate query per due result"""
+    from app.buisness.maintenance.planning.behaviors.time_based_planner import TimeBasedPlanner
+
+    results = TimeBasedPlanner().find_assets_needing_maintenance(plan_context, batch=False)
+    for result in results:
+        if result.needs_maintenance and planner._check_duplicate_events(result.asset_id, result.maintenance_plan_id):
+            result.needs_maintenance = False
+            result.reason = "Duplicate prevention: Existing open (Planned, In Progress or Blocked) maintenance event found"
+    return results
+
+
+def run_benchmark(asset_count=10000, delta_days=60):
+    app = create_benchmark_app('time_planning')
+
+    with app.app_context():
+        from app import db
+        from app.buisness.maintenance.planning.maintenance_plan_context import MaintenancePlanContext
+        from app.buisness.maintenance.planning.maintenance_planner import MaintenancePlanner
+
+        plan_id = create_planning_fleet(asset_count, frequency_type='days', delta_days=delta_days)
+        planner = MaintenancePlanner()
+
+        results = {}
+        queries = {}
+        db.session.expunge_all()
+        with timed(results, 'per_asset'), count_queries(queries, 'per_asset'):
+            expected = _plan_per_asset(planner, MaintenancePlanContext(plan_id))
+        db.session.expunge_all()
+        with timed(results, 'batch'), count_queries(queries, 'batch'):
+            actual = planner.plan_maintenance(MaintenancePlanContext(plan_id))
+
+        differences = planning_results_match(expected, actual)
+        for difference in differences[:10]:
+            print(difference)
+
+        print_results(f"Time-based planning, {asset_count:,} assets ({len(expected):,} active), every {delta_days} days", [
+            ("Per-asset queries", f"{results['per_asset'] * 1000:.0f} ms, {queries['per_asset']:,} statements"),
+            ("Batch", f"{results['batch'] * 1000:.0f} ms, {queries['batch']:,} statements"),
+            ("Speedup", f"{results['per_asset'] / results['batch']:.1f}x"),
+            ("Assets due", sum(1 for result in actual if result.needs_maintenance)),
+            ("Duplicates prevented", sum(1 for result in actual if result.reason.startswith('Duplicate prevention'))),
+            ("Equivalent results", not differences),
+        ])
+        return 0 if not differences else 1
+
+
+if __name__ == '__main__':
+    assets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    sys.exit(run_benchmark(assets, days))
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for benchmark scripts
+Builds an isolated SQLite database so benchmarks never touch instance/asset_management.db
+"""
+
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def create_benchmark_app(name):
+    """
+    Create an app bound to a fresh SQLite database in a temp directory
+
+    DATABASE_URL must be set before the app is created, so this imports the
+    app package lazily.
+
+    Args:
+        name (str): Benchmark name, used for the database file name
+
+    Returns:
+        Flask: App with all tables and critical data built
+    """
+    db_dir = Path(tempfile.mkdtemp(prefix=f'{name}_'))
+    os.environ['DATABASE_URL'] = f"sqlite:///{db_dir / f'{name}.db'}"
+
+    from app import create_app
+    from app.build import build_database
+
+    app = create_app()
+    build_database(build_phase='all', data_phase='none', enable_debug_data=False)
+
+    # Benchmarks measure database work, not log formatting
+    logging.getLogger('asset_management').setLevel(logging.WARNING)
+    return app
+
+
+@contextmanager
+def timed(results, label):
+    """
+    Time a block and store the elapsed seconds in results[label]
+    """
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
+
+
+@contextmanager
+def count_queries(results, label):
+    """
+    Count the SQL statements executed in a block and store the count in results[label]
+    """
+    from sqlalchemy import event
+    from app import db
+
+    count = 0
+
+    def before_cursor_execute(*args):
+        nonlocal count
+        count += 1
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        results[label] = count
+
+
+def print_results(title, rows):
+    """
+    Print benchmark rows as an aligned table
+
+    Args:
+        title (str): Table heading
+        rows (list): List of (label, value) tuples
+    """
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
+    width = max(len(label) for label, _ in rows)
+    for label, value in rows:
+        print(f"{label.ljust(width)}  {value}")
+
+
+def create_benchmark_assets(count, make='Bench', model='Model'):
+    """
+    Insert a make/model and count assets of the Vehicle asset type
+
+    Uses a single executemany insert so fleet setup does not dominate the
+    benchmark run time.
+
+    Returns:
+        list: IDs of the created assets
+    """
+    from app import db
+    from app.data.core.asset_info.asset import Asset
+    from app.data.core.asset_info.asset_type import AssetType
+    from app.data.core.asset_info.make_model import MakeModel
+
+    asset_type = AssetType.query.filter_by(name='Vehicle').first()
+    make_model = MakeModel(make=make, model=model, asset_type_id=asset_type.id,
+                           meter1_unit='miles', created_by_id=0, updated_by_id=0)
+    db.session.add(make_model)
+    db.session.flush()
+
+    first_serial = Asset.query.count()
+    db.session.execute(Asset.__table__.insert(), [
+        {
+            'name': f'{make} {index}',
+            'serial_number': f'{make.upper()}-{first_serial + index:07d}',
+            'status': 'Active',
+            'make_model_id': make_model.id,
+            'asset_type_id': asset_type.id,
+            'meter1': 0.0,
+            'is_active': True,
+            'created_by_id': 0,
+            'updated_by_id': 0,
+        }
+        for index in range(count)
+    ])
+    db.session.commit()
+    return [row.id for row in db.session.query(Asset.id).filter_by(make_model_id=make_model.id)]
+
+
+def complete_maintenance_events(action_set_ids):
+    """
+    Complete inserted maintenance events with the status the app stores
+
+    The first event goes through MaintenanceContext.complete(); the others
+    get the status it stored with one bulk UPDATE (completing thousands of
+    events one at a time would dominate fleet setup). Every event keeps the
+    end date and meter reading it was inserted with, and the meter reading
+    and planning marks written by complete() are removed again, so fleets
+    stay derived from the asset index alone.
+
+    Args:
+        action_set_ids (list): IDs of open MaintenanceActionSet rows
+
+    Returns:
+        str: The completed status
+    """
+    from app import db
+    from app.buisness.maintenance.base.maintenance_context import MaintenanceContext
+    from app.data.core.asset_info.asset import Asset
+    from app.data.core.asset_info.meter_history import MeterHistory
+    from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+    from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
+
+    if not action_set_ids:
+        return MaintenanceActionSet.COMPLETED_STATUS
+    first = db.session.get(MaintenanceActionSet, action_set_ids[0])
+    asset = db.session.get(Asset, first.asset_id)
+    inserted = {'end_date': first.end_date, 'meter_reading_id': first.meter_reading_id}
+    MaintenanceContext.from_maintenance_action_set(first.id).complete(
+        user_id=None, meter1=asset.meter1, meter2=asset.meter2, meter3=asset.meter3, meter4=asset.meter4
+    )
+    first = db.session.get(MaintenanceActionSet, action_set_ids[0])
+    completion_reading_id = first.meter_reading_id
+    status = first.status
+
+    db.session.execute(
+        db.update(MaintenanceActionSet).where(MaintenanceActionSet.id == first.id).values(**inserted)
+    )
+    db.session.execute(db.delete(MeterHistory).where(MeterHistory.id == completion_reading_id))
+    db.session.execute(db.delete(PlanningDirtyMark).where(PlanningDirtyMark.asset_id == asset.id))
+    remaining = action_set_ids[1:]
+    for start in range(0, len(remaining), 500):
+        db.session.execute(
+            db.update(MaintenanceActionSet)
+            .where(MaintenanceActionSet.id.in_(remaining[start:start + 500]))
+            .values(status=status)
+        )
+    db.session.commit()
+    db.session.expire_all()
+    return status
+
+
+def create_planning_fleet(count, frequency_type='meter1', name=None, **plan_fields):
+    """
+    Insert a fleet with maintenance history and one maintenance plan covering it
+
+    The fleet mixes the cases planners must handle: missing current meters,
+    inactive assets, assets never maintained, completed maintenance with and
+    without a meter reading, readings above the current meter (meter reset),
+    open (non-completed) maintenance and completed maintenance without an
+    end date. Everything is derived from the asset index, so two fleets of the
+    same size are identical.
+
+    Args:
+        count (int): Number of assets
+        frequency_type (str): Plan frequency type ('meter1'..'meter4', 'days', 'hours', 'time_or_meter1'..)
+        name (str): Fleet name used for the model, template and plan (default: 'Fleet <count>')
+        **plan_fields: Plan deltas, e.g. delta_m1=5000 or delta_days=90
+
+    Returns:
+        int: ID of the maintenance plan
+    """
+    from datetime import datetime, timedelta
+    from app import db
+    from app.data.core.asset_info.asset import Asset
+    from app.data.core.asset_info.meter_history import MeterHistory
+    from app.data.core.event_info.event import Event
+    from app.data.core.sequences import EventDetailIDManager
+    from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+    from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+    from app.data.maintenance.templates.template_action_sets import TemplateActionSet
+
+    name = name or f'Fleet {count}'
+    asset_ids = create_benchmark_assets(count, make='Plan', model=name)
+    asset_ids.sort()
+    now = datetime.utcnow()
+
+    # Vary current meters, activity and age per asset
+    db.session.execute(Asset.__table__.update().where(Asset.id == db.bindparam('asset_id')), [
+        {
+            'asset_id': asset_id,
+            'meter1': None if index % 17 == 0 else float(index * 37 % 20000) + 0.5,
+            'meter2': float(index % 3000),
+            'is_active': index % 23 != 0,
+            'created_at': now - timedelta(days=index % 400 + 1),
+        }
+        for index, asset_id in enumerate(asset_ids)
+    ])
+
+    first_asset = db.session.get(Asset, asset_ids[0])
+    template = TemplateActionSet(task_name=f'{name} service', created_by_id=0, updated_by_id=0)
+    db.session.add(template)
+    db.session.flush()
+    plan = MaintenancePlan(
+        name=f'{name} plan ({frequency_type})',
+        asset_type_id=first_asset.asset_type_id,
+        model_id=first_asset.make_model_id,
+        template_action_set_id=template.id,
+        frequency_type=frequency_type,
+        status='Active',
+        created_by_id=0,
+        updated_by_id=0,
+        **plan_fields
+    )
+    db.session.add(plan)
+    db.session.flush()
+
+    # (asset_id, index, history_number) for every maintenance record to create
+    history = [
+        (asset_id, index, number)
+        for index, asset_id in enumerate(asset_ids) if index % 5 != 0
+        for number in range(index % 3 + 1)
+    ]
+
+    readings = [
+        {
+            'asset_id': asset_id,
+            'meter1': None if index % 13 == 0 else float((index * 37 + number * 997) % 25000),
+            'meter2': float(number * 500),
+            'recorded_at': now - timedelta(days=30 * (number + 1)),
+            'created_by_id': 0,
+            'updated_by_id': 0,
+        }
+        for asset_id, index, number in history
+    ]
+    reading_ids = list(db.session.execute(
+        db.insert(MeterHistory).returning(MeterHistory.id, sort_by_parameter_order=True), readings
+    ).scalars())
+
+    event_ids = Event.bulk_add_events([
+        {'event_type': 'Maintenance', 'description': f'Fleet service {index}.{number}',
+         'user_id': 0, 'asset_id': asset_id, 'major_location_id': None}
+        for asset_id, index, number in history
+    ])
+    detail_ids = EventDetailIDManager.get_next_ids(len(history))
+
+    rows = []
+    completed = []
+    for (asset_id, index, number), reading_id, event_id, detail_id in zip(history, reading_ids, event_ids, detail_ids):
+        # Newest record (number 0) is sometimes still open or has no end date
+        completed.append(not (number == 0 and index % 29 == 0))
+        end_date = None if number == 0 and index % 19 == 0 else now - timedelta(days=40 * number + index % 90)
+        rows.append({
+            'event_id': event_id,
+            'all_details_id': detail_id,
+            'asset_id': asset_id,
+            'task_name': template.task_name,
+            'template_action_set_id': template.id,
+            'maintenance_plan_id': plan.id,
+            'status': 'In Progress',
+            'end_date': end_date,
+            'meter_reading_id': None if index % 7 == 0 else reading_id,
+            'created_by_id': 0,
+            'updated_by_id': 0,
+        })
+    action_set_ids = list(db.session.execute(
+        db.insert(MaintenanceActionSet).returning(MaintenanceActionSet.id, sort_by_parameter_order=True), rows
+    ).scalars())
+    db.session.commit()
+    complete_maintenance_events([
+        action_set_id for action_set_id, done in zip(action_set_ids, completed) if done
+    ])
+    return plan.id
+
+
+# Fields that depend on the moment each result was built
+PLANNING_TIME_FIELDS = ('days_since_last_maintenance', 'recommended_start_date')
+
+
+def planning_results_match(expected, actual, tolerance_seconds=60):
+    """
+    Compare two PlanningResult lists field by field
+
+    Time-dependent fields are compared within tolerance_seconds; everything
+    else (including the last maintenance record and the reason text) must
+    match exactly.
+
+    Returns:
+        list: Descriptions of the differences (empty when equivalent)
+    """
+    differences = []
+    if len(expected) != len(actual):
+        return [f"result count {len(expected)} != {len(actual)}"]
+
+    for left, right in zip(expected, actual):
+        for name in left.__dataclass_fields__:
+            if name in ('asset', 'maintenance_plan', 'last_maintenance'):
+                continue
+            a, b = getattr(left, name), getattr(right, name)
+            if name in PLANNING_TIME_FIELDS and a is not None and b is not None:
+                seconds = abs(a - b) * 86400 if isinstance(a, float) else abs((a - b).total_seconds())
+                if seconds > tolerance_seconds:
+                    differences.append(f"asset {left.asset_id} {name}: {a} != {b}")
+            elif a != b:
+                differences.append(f"asset {left.asset_id} {name}: {a!r} != {b!r}")
+        left_id = left.last_maintenance.id if left.last_maintenance else None
+        right_id = right.last_maintenance.id if right.last_maintenance else None
+        if left_id != right_id:
+            differences.append(f"asset {left.asset_id} last_maintenance: {left_id} != {right_id}")
+    return differences
@@ -28,7 +28,7 @@ def init_app(app):
     from .core.events import events as core_events
     from .core.events import comments as core_comments
     from .core.events import attachments as core_attachments
-    from .core.admin import settings_cache_viewer
+    from .core.admin import settings_cache_viewer, sql_profiler, scheduler
 
     # Register core dashboard
     app.register_blueprint(dashboard.bp, url_prefix='/core')
@@ -47,6 +47,8 @@ def init_app(app):
     
     # Register core admin blueprints
     app.register_blueprint(settings_cache_viewer.bp, url_prefix='/core/users')
+    app.register_blueprint(sql_profiler.bp, url_prefix='/core/admin')
+    app.register_blueprint(scheduler.bp, url_prefix='/core/admin')
     
     # Register main admin blueprint
     from . import admin
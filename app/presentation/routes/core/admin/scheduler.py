@@ -0,0 +1,88 @@
+"""
+Background Scheduler Routes
+Admin pages for the background scheduler (configured jobs, timings and run history)
+"""
+
+from flask import Blueprint, render_template, redirect, url_for, flash, abort, current_app
+from flask_login import login_required, current_user
+from sqlalchemy import case, func
+from app import db
+from app.data.core.scheduled_job_runs import ScheduledJobRun
+from app.logger import get_logger
+from app.presentation.routes.admin import admin_required
+from app.utils.background_scheduler import ScheduledJob
+
+bp = Blueprint('scheduler', __name__)
+logger = get_logger("asset_management.routes.core.admin.scheduler")
+
+# Most recent runs listed on the index page
+RECENT_RUN_LIMIT = 50
+
+
+@bp.route('/scheduler')
+@login_required
+@admin_required
+def index():
+    """List configured jobs with their run timings, and the most recent runs"""
+    scheduler = current_app.extensions.get('scheduler')
+    if scheduler is not None:
+        jobs = [job.to_dict() for job in scheduler.jobs.values()]
+    else:
+        jobs = []
+        for config in current_app.config.get('SCHEDULER_JOBS', []):
+            try:
+                jobs.append(ScheduledJob.from_config(config).to_dict())
+            except (KeyError, ValueError):
+                continue
+
+    stats = {
+        row.job_name: row
+        for row in db.session.query(
+            ScheduledJobRun.job_name,
+            func.count(ScheduledJobRun.id).label('run_count'),
+            func.sum(case((ScheduledJobRun.status == 'Failed', 1), else_=0)).label('failed_count'),
+            func.avg(ScheduledJobRun.duration_ms).label('avg_ms'),
+            func.max(ScheduledJobRun.duration_ms).label('max_ms'),
+            func.max(ScheduledJobRun.started_at).label('last_started_at')
+        ).group_by(ScheduledJobRun.job_name)
+    }
+    runs = (
+        ScheduledJobRun.query
+        .order_by(ScheduledJobRun.started_at.desc(), ScheduledJobRun.id.desc())
+        .limit(RECENT_RUN_LIMIT)
+        .all()
+    )
+
+    return render_template('core/admin/scheduler/index.html',
+                         jobs=jobs,
+                         stats=stats,
+                         runs=runs,
+                         enabled=scheduler is not None,
+                         is_leader=scheduler.is_leader if scheduler else False)
+
+
+@bp.route('/scheduler/runs/<int:run_id>')
+@login_required
+@admin_required
+def run_detail(run_id):
+    """Show the result summary or error of one run"""
+    run = db.session.get(ScheduledJobRun, run_id)
+    if run is None:
+        abort(404)
+    return render_template('core/admin/scheduler/run_detail.html', run=run)
+
+
+@bp.route('/scheduler/<job_name>/run', methods=['POST'])
+@login_required
+@admin_required
+def run_now(job_name):
+    """Run a job immediately in this process"""
+    scheduler = current_app.extensions.get('scheduler')
+    if scheduler is None:
+        flash('Background scheduler is disabled', 'warning')
+    elif scheduler.run_now(job_name):
+        logger.info(f"Admin user {current_user.username} started job {job_name}")
+        flash(f'Job {job_name} started', 'success')
+    else:
+        flash(f'Job {job_name} is unknown or already running, or another process runs the scheduler', 'warning')
+    return redirect(url_for('scheduler.index'))
@@ -0,0 +1,54 @@
+"""
+SQL Profiler Routes
+Admin pages for the per-request SQL instrumentation (query counts, N+1 suspects, slow queries)
+"""
+
+from flask import Blueprint, render_template, redirect, url_for, flash, abort, current_app
+from flask_login import login_required, current_user
+from app.logger import get_logger
+from app.presentation.routes.admin import admin_required
+from app.utils.sql_instrumentation import profile_history
+
+bp = Blueprint('sql_profiler', __name__)
+logger = get_logger("asset_management.routes.core.admin.sql_profiler")
+
+
+@bp.route('/sql-profiler')
+@login_required
+@admin_required
+def index():
+    """List recent request profiles, worst N+1 offenders first in each row"""
+    threshold = current_app.config['SQL_N_PLUS_ONE_THRESHOLD']
+    profiles = [profile.to_dict(threshold) for profile in profile_history.all()]
+    
+    return render_template('core/admin/sql_profiler/index.html',
+                         profiles=profiles,
+                         enabled=current_app.config['SQL_INSTRUMENTATION'],
+                         threshold=threshold,
+                         slow_query_ms=current_app.config['SQL_SLOW_QUERY_MS'])
+
+
+@bp.route('/sql-profiler/<int:profile_id>')
+@login_required
+@admin_required
+def detail(profile_id):
+    """Show repeated statements, N+1 suspects and slow query plans for one request"""
+    profile = profile_history.get(profile_id)
+    if profile is None:
+        abort(404)
+    
+    threshold = current_app.config['SQL_N_PLUS_ONE_THRESHOLD']
+    return render_template('core/admin/sql_profiler/detail.html',
+                         profile=profile.to_dict(threshold),
+                         threshold=threshold)
+
+
+@bp.route('/sql-profiler/clear', methods=['POST'])
+@login_required
+@admin_required
+def clear():
+    """Discard all recorded request profiles"""
+    profile_history.clear()
+    logger.info(f"Admin user {current_user.username} cleared SQL profiler history")
+    flash('SQL profiler history cleared', 'success')
+    return redirect(url_for('sql_profiler.index'))
@@ -21,16 +21,16 @@ def list():
     """List all events with optional condensed view"""
     condensed_view = request.args.get('condensed-view', False, type=bool)
 
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
     per_page = request.args.get('row_count', 20, type=int)
 
     if condensed_view:
-        page, per_page = 1, 10
+        cursor, per_page = None, 10
 
     # Use service to get list data
     events, filters = EventService.get_list_data(
         request=request,
-        page=page,
+        cursor=cursor,
         per_page=per_page
     )
 
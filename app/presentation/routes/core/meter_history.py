@@ -9,6 +9,7 @@ from app.data.core.asset_info.meter_history import MeterHistory
 from app.data.core.asset_info.asset import Asset
 from app import db
 from app.logger import get_logger
+from app.services.keyset_pagination import keyset_paginate
 from datetime import datetime
 
 bp = Blueprint('meter_history', __name__)
@@ -20,7 +21,7 @@ def list():
     """List meter history records with filtering"""
     logger.debug(f"User {current_user.username} accessing meter history list")
     
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
     per_page = 20
     
     # Filter parameters
@@ -49,16 +50,20 @@ def list():
         except (ValueError, AttributeError):
             logger.warning(f"Invalid datetime_end format: {datetime_end}")
     
-    # Order by recorded_at descending (newest first)
-    query = query.order_by(MeterHistory.recorded_at.desc())
-    
-    # Paginate
-    meter_history = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Paginate on (recorded_at, id), newest first
+    meter_history = keyset_paginate(
+        query,
+        MeterHistory.recorded_at,
+        MeterHistory.id,
+        cursor=cursor,
+        per_page=per_page,
+        with_total=True
+    )
     
     # Get all assets for filter dropdown
     assets = Asset.query.filter_by(is_active=True).order_by(Asset.name).all()
     
-    logger.info(f"Meter history list returned {meter_history.total} records (page {page})")
+    logger.info(f"Meter history list returned {len(meter_history.items)} of {meter_history.total_display} records")
     
     return render_template('core/meter_history/list.html',
                          meter_history=meter_history,
@@ -12,6 +12,7 @@ from app.data.core.asset_info.asset_type import AssetType
 from app.data.core.event_info.event import Event
 from app.data.core.user_info.user import User
 from app.data.core.major_location import MajorLocation
+from app.data.core.search_index import apply_text_search
 
 logger = get_logger("asset_management.routes.core.searchutils")
 
@@ -45,17 +46,17 @@ def searchbar_assets():
             query = query.filter(Asset.is_active == True)
         elif is_active.lower() == 'false':
             query = query.filter(Asset.is_active == False)
+        rank = None
         if name:
-            query = query.filter(
-                (Asset.name.ilike(f'%{name}%')) |
-                (Asset.serial_number.ilike(f'%{name}%'))
-            )
+            # Ranked prefix match on name and serial number
+            query, rank = apply_text_search(query, 'assets', name)
         
         # Get total count before limiting
         total_count = query.count()
         
-        # Apply limit
-        assets = query.order_by(Asset.name).limit(count).all()
+        # Apply limit (best matches first when searching)
+        order = [Asset.name] if rank is None else [rank, Asset.name]
+        assets = query.order_by(*order).limit(count).all()
         
         # Format results for template
         items = []
@@ -165,15 +166,17 @@ def searchbar_events():
             query = query.filter(Event.asset_id == asset_id)
         if status:
             query = query.filter(Event.status == status)
+        rank = None
         if title:
             # Search in description (events don't have a title field, description is used)
-            query = query.filter(Event.description.ilike(f'%{title}%'))
+            query, rank = apply_text_search(query, 'events', title)
         
         # Get total count before limiting
         total_count = query.count()
         
-        # Apply limit
-        events = query.order_by(Event.timestamp.desc()).limit(count).all()
+        # Apply limit (best matches first when searching)
+        order = [Event.timestamp.desc()] if rank is None else [rank, Event.timestamp.desc()]
+        events = query.order_by(*order).limit(count).all()
         
         # Format results for template
         items = []
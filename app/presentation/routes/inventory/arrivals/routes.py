@@ -9,7 +9,7 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
 from app.buisness.inventory.arrivals.part_arrival_context import PartArrivalContext
 from app.buisness.inventory.arrivals.package_arrival_context import PackageArrivalContext
-from app.buisness.inventory.stock.inventory_manager import InventoryManager
+from app.buisness.inventory.stock.inventory_manager import InventoryManager, IssueOperation
 from app.buisness.inventory.status.status_manager import InventoryStatusManager
 from app.data.inventory.arrivals import PackageHeader, PartArrival
 from app.data.inventory.ordering import PurchaseOrderLine, PurchaseOrderHeader, PartDemandPurchaseOrderLink
@@ -274,10 +274,19 @@ def register_arrival_routes(inventory_bp):
                 joinedload(PartArrival.purchase_order_line)
             ).all()
 
-            inv = InventoryManager()
-            status_mgr = InventoryStatusManager()
+            # Demand links of every arrival's PO line, in link order
+            po_line_ids = {arrival.purchase_order_line_id for arrival in arrivals if arrival.purchase_order_line_id}
+            links_by_po_line = {}
+            if po_line_ids:
+                for link in (
+                    PartDemandPurchaseOrderLink.query.filter(
+                        PartDemandPurchaseOrderLink.purchase_order_line_id.in_(po_line_ids)
+                    )
+                    .order_by(PartDemandPurchaseOrderLink.id.asc())
+                ):
+                    links_by_po_line.setdefault(link.purchase_order_line_id, []).append(link)
 
-            issued_any = False
+            operations = []
             for arrival in arrivals:
                 if arrival.status != "Accepted":
                     continue
@@ -290,30 +299,28 @@ def register_arrival_routes(inventory_bp):
                 if remaining_to_issue <= 0:
                     continue
 
-                links = (
-                    PartDemandPurchaseOrderLink.query.filter_by(purchase_order_line_id=po_line.id)
-                    .order_by(PartDemandPurchaseOrderLink.id.asc())
-                    .all()
-                )
-
-                for link in links:
+                for link in links_by_po_line.get(po_line.id, []):
                     if remaining_to_issue <= 0:
                         break
                     qty = min(float(link.quantity_allocated or 0.0), remaining_to_issue)
                     if qty <= 0:
                         continue
-                    movement, part_issue = inv.issue_to_part_demand(
+                    operations.append(IssueOperation(
                         part_demand_id=link.part_demand_id,
                         storeroom_id=arrival.storeroom_id,
                         major_location_id=arrival.major_location_id,
-                        quantity_to_issue=qty,
+                        quantity=qty,
                         from_location_id=None,
                         from_bin_id=None,
-                    )
-                    status_mgr.propagate_demand_status_update(link.part_demand_id, "Issued")
-                    issued_any = True
+                    ))
                     remaining_to_issue -= qty
 
+            InventoryManager().apply_batch(operations)
+            status_mgr = InventoryStatusManager()
+            for operation in operations:
+                status_mgr.propagate_demand_status_update(operation.part_demand_id, "Issued")
+            issued_any = bool(operations)
+
             db.session.commit()
             if issued_any:
                 flash("Direct issue completed: accepted quantities issued to linked part demands.", "success")
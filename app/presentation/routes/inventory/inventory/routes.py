@@ -7,8 +7,10 @@ from app import db
 from app.logger import get_logger
 from app.services.inventory.inventory.active_inventory_service import ActiveInventoryService
 from app.services.inventory.inventory.inventory_movement_service import InventoryMovementService
+from app.services.inventory.inventory.global_inventory_view import GlobalInventoryView
 from app.services.inventory.locations.storeroom_layout_service import StoreroomLayoutService
-from app.buisness.inventory.stock.inventory_manager import InventoryManager
+from app.services.keyset_pagination import keyset_paginate
+from app.buisness.inventory.stock.inventory_manager import InventoryManager, IssueOperation, TransferOperation
 from app.buisness.inventory.locations.storeroom_context import StoreroomContext
 from app.buisness.inventory.locations.location_context import LocationContext
 from app.data.inventory.inventory.active_inventory import ActiveInventory
@@ -37,7 +39,7 @@ def register_inventory_routes(inventory_bp):
         from app.data.core.asset_info.asset import Asset
         
         # Get filter parameters
-        page = request.args.get('page', 1, type=int)
+        cursor = request.args.get('cursor')
         issue_type = request.args.get('issue_type', '').strip() or None
         user_id = request.args.get('user_id', type=int)
         asset_id = request.args.get('asset_id', type=int)
@@ -73,11 +75,15 @@ def register_inventory_routes(inventory_bp):
             except ValueError:
                 pass
         
-        # Order by most recent first
-        query = query.order_by(PartIssue.issue_date.desc())
-        
-        # Paginate
-        pagination = query.paginate(page=page, per_page=50, error_out=False)
+        # Paginate on (issue_date, id), most recent first
+        pagination = keyset_paginate(
+            query,
+            PartIssue.issue_date,
+            PartIssue.id,
+            cursor=cursor,
+            per_page=50,
+            with_total=True
+        )
         
         # Get filter options
         users = User.query.order_by(User.username).all()
@@ -269,6 +275,93 @@ def register_inventory_routes(inventory_bp):
                                  'search': search or ''
                              })
     
+    # Global Inventory View
+    @inventory_bp.route('/global-inventory')
+    @login_required
+    def global_inventory_view():
+        """Inventory totals per part across all locations (cached summary)"""
+        logger.info(f"Global inventory view accessed by {current_user.username}")
+        
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = 100
+        search = request.args.get('search', '').strip() or None
+        
+        parts = GlobalInventoryView.get_global_summary()
+        if search:
+            term = search.lower()
+            parts = [
+                part for part in parts
+                if term in (part['part_number'] or '').lower() or term in (part['part_name'] or '').lower()
+            ]
+        
+        total = len(parts)
+        pages = max((total + per_page - 1) // per_page, 1)
+        page = min(page, pages)
+        
+        return render_template('inventory/inventory/global_inventory_view.html',
+                             parts=parts[(page - 1) * per_page:page * per_page],
+                             totals=GlobalInventoryView.get_global_totals(),
+                             avg_cost_days=GlobalInventoryView.AVG_COST_DAYS,
+                             page=page,
+                             pages=pages,
+                             total=total,
+                             search=search or '')
+    
+    # Point-in-time stock
+    @inventory_bp.route('/stock-as-of')
+    @login_required
+    def stock_as_of_view():
+        """On-hand stock per bin at the end of a past day (nearest snapshot plus movement replay)"""
+        from datetime import time as dt_time
+        from app.buisness.inventory.stock.inventory_snapshot_manager import InventorySnapshotManager
+        from app.data.core.supply.part_definition import PartDefinition
+        
+        logger.info(f"Stock as-of view accessed by {current_user.username}")
+        
+        as_of_date = datetime.utcnow().date()
+        as_of_str = request.args.get('as_of', '').strip()
+        if as_of_str:
+            try:
+                as_of_date = datetime.strptime(as_of_str, '%Y-%m-%d').date()
+            except ValueError:
+                flash('Invalid date, showing today', 'warning')
+        storeroom_id = request.args.get('storeroom_id', type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = 100
+        
+        stock = InventorySnapshotManager().get_stock_as_of(
+            datetime.combine(as_of_date, dt_time.max),
+            storeroom_id=storeroom_id
+        )
+        
+        total = len(stock.lines)
+        pages = max((total + per_page - 1) // per_page, 1)
+        page = min(page, pages)
+        lines = stock.lines[(page - 1) * per_page:page * per_page]
+        
+        # Names for the lines on this page
+        part_ids = {line['part_id'] for line in lines}
+        location_ids = {line['location_id'] for line in lines if line['location_id']}
+        bin_ids = {line['bin_id'] for line in lines if line['bin_id']}
+        parts = {part.id: part for part in PartDefinition.query.filter(PartDefinition.id.in_(part_ids))} if part_ids else {}
+        locations = {loc.id: loc for loc in Location.query.filter(Location.id.in_(location_ids))} if location_ids else {}
+        bins = {bin_obj.id: bin_obj for bin_obj in Bin.query.filter(Bin.id.in_(bin_ids))} if bin_ids else {}
+        storerooms = Storeroom.query.order_by(Storeroom.room_name).all()
+        
+        return render_template('inventory/inventory/stock_as_of.html',
+                             stock=stock,
+                             lines=lines,
+                             parts=parts,
+                             locations=locations,
+                             bins=bins,
+                             storerooms=storerooms,
+                             storeroom_names={room.id: room.room_name for room in storerooms},
+                             as_of=as_of_date.isoformat(),
+                             storeroom_id=storeroom_id,
+                             page=page,
+                             pages=pages,
+                             total=total)
+    
     # Inventory Movements View
     @inventory_bp.route('/movements')
     @login_required
@@ -277,7 +370,7 @@ def register_inventory_routes(inventory_bp):
         logger.info(f"Movements view accessed by {current_user.username}")
         
         # Get filter parameters
-        page = request.args.get('page', 1, type=int)
+        cursor = request.args.get('cursor')
         part_id = request.args.get('part_id', type=int)
         part_number = request.args.get('part_number', '').strip() or None
         part_name = request.args.get('part_name', '').strip() or None
@@ -304,7 +397,7 @@ def register_inventory_routes(inventory_bp):
         
         # Get paginated data
         pagination, form_options = InventoryMovementService.get_list_data(
-            page=page,
+            cursor=cursor,
             per_page=50,
             part_id=part_id,
             part_number=part_number,
@@ -629,21 +722,21 @@ def register_inventory_routes(inventory_bp):
             if not inventory_items:
                 return jsonify({'success': False, 'error': 'No valid unassigned inventory items found'}), 400
             
-            # Create movements for each inventory item
-            inventory_manager = InventoryManager()
-            movements_created = 0
-            
-            for inv in inventory_items:
-                # Use assign_unassigned_to_bin to create the movement
-                inventory_manager.assign_unassigned_to_bin(
+            # Move each unassigned item to the location/bin in one batch
+            results = InventoryManager().apply_batch([
+                TransferOperation(
                     part_id=inv.part_id,
-                    storeroom_id=storeroom_id,
-                    major_location_id=major_location_id,
-                    quantity_to_move=inv.quantity_on_hand,
+                    quantity=inv.quantity_on_hand,
+                    from_storeroom_id=storeroom_id,
+                    from_major_location_id=major_location_id,
+                    to_storeroom_id=storeroom_id,
+                    to_major_location_id=major_location_id,
                     to_location_id=location_id,
                     to_bin_id=bin_id
                 )
-                movements_created += 1
+                for inv in inventory_items
+            ])
+            movements_created = len(results)
             
             db.session.commit()
             
@@ -707,102 +800,64 @@ def register_inventory_routes(inventory_bp):
                 flash('No items in issue queue', 'error')
                 return redirect(url_for('inventory.issue_parts'))
             
-            # Import PartIssue model
-            from app.data.inventory.inventory.part_issue import PartIssue
-            from app.data.inventory.inventory.inventory_movement import InventoryMovement
-            from app.data.inventory.inventory.inventory_summary import InventorySummary
-            
-            inventory_manager = InventoryManager()
-            issues_created = []
-            
-            # Process each item in the queue
+            # Load every queued bin in one query; availability is checked against
+            # the quantity still available after earlier queue items
+            inventory_ids = {int(item['inventory_id']) for item in queue_data}
+            active_inventory = {
+                inv.id: inv
+                for inv in ActiveInventory.query.filter(ActiveInventory.id.in_(inventory_ids))
+            }
+            available = {
+                inv_id: (inv.quantity_on_hand or 0.0) - (inv.quantity_allocated or 0.0)
+                for inv_id, inv in active_inventory.items()
+            }
+            
+            operations = []
             for item in queue_data:
                 inventory_id = int(item['inventory_id'])
                 quantity = float(item['quantity'])
-                part_id = int(item['part_id'])
-                storeroom_id = int(item['storeroom_id'])
-                major_location_id = int(item['major_location_id'])
-                location_id = int(item['location_id']) if item.get('location_id') else None
-                bin_id = int(item['bin_id']) if item.get('bin_id') else None
-                
-                # Get active inventory record
-                active_inv = ActiveInventory.query.get_or_404(inventory_id)
+                active_inv = active_inventory.get(inventory_id)
+                if active_inv is None:
+                    flash(f'Inventory record {inventory_id} not found for {item["part_number"]}', 'error')
+                    db.session.rollback()
+                    return redirect(url_for('inventory.issue_parts'))
                 
                 # Check available quantity
-                available = active_inv.quantity_on_hand - active_inv.quantity_allocated
-                if available < quantity:
-                    flash(f'Insufficient quantity for {item["part_number"]}. Available: {available}, Requested: {quantity}', 'error')
+                if available[inventory_id] < quantity:
+                    flash(f'Insufficient quantity for {item["part_number"]}. Available: {available[inventory_id]}, Requested: {quantity}', 'error')
                     db.session.rollback()
                     return redirect(url_for('inventory.issue_parts'))
-                
-                # Update active inventory
-                active_inv.quantity_on_hand -= quantity
-                active_inv.last_movement_date = datetime.utcnow()
-                
-                # Delete if empty and flag is set
-                from app.buisness.inventory.stock.inventory_manager import DELETE_EMPTY_ACTIVE_ROWS
-                if DELETE_EMPTY_ACTIVE_ROWS and active_inv.quantity_on_hand <= 0:
-                    db.session.delete(active_inv)
-                
-                # Update inventory summary
-                summary = InventorySummary.query.filter_by(part_id=part_id).first()
-                if summary:
-                    summary.quantity_on_hand_total = (summary.quantity_on_hand_total or 0.0) - quantity
-                    summary.last_updated_at = datetime.utcnow()
-                
-                # Get unit cost
-                unit_cost_at_issue = summary.unit_cost_avg if summary else None
-                total_cost = (unit_cost_at_issue * quantity) if unit_cost_at_issue else None
-                
-                # Create InventoryMovement
-                movement = InventoryMovement(
-                    part_id=part_id,
-                    major_location_id=major_location_id,
-                    storeroom_id=storeroom_id,
-                    movement_type="Issue",
-                    quantity_delta=-quantity,
-                    from_major_location_id=major_location_id,
-                    from_storeroom_id=storeroom_id,
-                    from_location_id=location_id,
-                    from_bin_id=bin_id,
-                    unit_cost=unit_cost_at_issue,
-                )
-                db.session.add(movement)
-                db.session.flush()  # Get movement.id
+                available[inventory_id] -= quantity
                 
                 # Get part_demand_id from queue item if linked
                 part_demand_id = int(item.get('part_demand_id')) if item.get('part_demand_id') else None
                 
-                # Create PartIssue
-                part_issue = PartIssue(
-                    inventory_movement_id=movement.id,
-                    part_id=part_id,
-                    quantity_issued=quantity,
-                    unit_cost_at_issue=unit_cost_at_issue,
-                    total_cost=total_cost,
-                    issued_to_user_id=issued_to_user_id,
+                operations.append(IssueOperation(
+                    part_id=active_inv.part_id,
                     part_demand_id=part_demand_id,
+                    storeroom_id=active_inv.storeroom_id,
+                    major_location_id=int(item['major_location_id']),
+                    from_location_id=active_inv.location_id,
+                    from_bin_id=active_inv.bin_id,
+                    quantity=quantity,
+                    issue_type=issue_type,
+                    issued_to_user_id=issued_to_user_id,
                     asset_id=asset_id,
-                    issue_type='ForPartDemand' if part_demand_id else issue_type,
-                    issue_date=issue_date,
-                    issued_from_storeroom_id=storeroom_id,
-                    issued_from_location_id=location_id,
-                    issued_from_bin_id=bin_id,
                     issued_by_id=issued_by_id,
+                    issue_date=issue_date,
                     issue_reason=issue_reason,
                     issue_notes=issue_notes,
-                )
-                db.session.add(part_issue)
-                db.session.flush()  # Get part_issue.id
-                
-                # Link movement to part_issue
-                movement.part_issue_id = part_issue.id
-                
-                issues_created.append({
+                ))
+            
+            results = InventoryManager().apply_batch(operations)
+            issues_created = [
+                {
                     'part_number': item['part_number'],
-                    'quantity': quantity,
-                    'issue_id': part_issue.id
-                })
+                    'quantity': result.operation.quantity,
+                    'issue_id': result.part_issue_id
+                }
+                for item, result in zip(queue_data, results)
+            ]
             
             db.session.commit()
             
@@ -1019,7 +1019,7 @@ def register_purchase_order_routes(inventory_bp):
             'search_term': request.args.get('search', '').strip() or None,
             'order_by': request.args.get('order_by', 'created_at'),
             'order_direction': request.args.get('order_direction', 'desc'),
-            'page': request.args.get('page', 1, type=int)
+            'cursor': request.args.get('cursor')
         }
         
         # Parse date filters
@@ -1055,8 +1055,10 @@ def register_purchase_order_routes(inventory_bp):
         # Get paginated results
         po_lines = PurchaseOrderLineService.get_po_lines_with_enhanced_data(
             query,
-            page=filters['page'],
-            per_page=20
+            cursor=filters['cursor'],
+            per_page=20,
+            order_by=filters['order_by'],
+            order_direction=filters['order_direction']
         )
         
         # Get filter options
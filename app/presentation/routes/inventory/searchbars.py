@@ -3,8 +3,8 @@ Search bars for purchase order creator
 """
 from flask import render_template, request
 from flask_login import login_required
-from app import db
 from app.logger import get_logger
+from app.data.core.search_index import apply_text_search
 
 logger = get_logger("asset_management.routes.inventory.searchbars")
 
@@ -26,16 +26,13 @@ def register_search_bars_routes(inventory_bp):
             
             query = PartDefinition.query.filter(PartDefinition.status == 'Active')
             
+            rank = None
             if search:
-                query = query.filter(
-                    db.or_(
-                        PartDefinition.part_number.ilike(f'%{search}%'),
-                        PartDefinition.part_name.ilike(f'%{search}%'),
-                        PartDefinition.description.ilike(f'%{search}%')
-                    )
-                )
+                # Ranked prefix match on part number, name and description
+                query, rank = apply_text_search(query, 'parts', search)
             
-            parts = query.order_by(PartDefinition.part_name).limit(limit).all()
+            order = [PartDefinition.part_name] if rank is None else [rank, PartDefinition.part_name]
+            parts = query.order_by(*order).limit(limit).all()
             total_count = query.count()
             
             return render_template(
@@ -78,15 +75,11 @@ def register_search_bars_routes(inventory_bp):
 
             # Only search if we have a search term
             if search:
-                query = PartDefinition.query.filter(PartDefinition.status == "Active").filter(
-                    db.or_(
-                        PartDefinition.part_number.ilike(f"%{search}%"),
-                        PartDefinition.part_name.ilike(f"%{search}%"),
-                        PartDefinition.description.ilike(f"%{search}%"),
-                    )
-                )
-
-                parts = query.order_by(PartDefinition.part_name).limit(limit).all()
+                query = PartDefinition.query.filter(PartDefinition.status == "Active")
+                query, rank = apply_text_search(query, "parts", search)
+
+                order = [PartDefinition.part_name] if rank is None else [rank, PartDefinition.part_name]
+                parts = query.order_by(*order).limit(limit).all()
                 total_count = query.count()
 
                 logger.info(f"Found {len(parts)} parts (showing {len(parts)} of {total_count} total)")
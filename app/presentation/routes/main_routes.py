@@ -16,6 +16,9 @@ from app.data.dispatching.request import DispatchRequest
 from app.data.dispatching.outcomes.standard_dispatch import StandardDispatch
 from app.data.dispatching.outcomes.contract import Contract
 from app.data.dispatching.outcomes.reimbursement import Reimbursement
+from app.services.core.dashboard_stats_service import DashboardStatsService
+from app.data.core.event_info.comment import Comment
+from app.data.core import search_index
 from app import db
 
 # Import the main blueprint from the package
@@ -25,13 +28,8 @@ from . import main
 @login_required
 def index():
     """Home page with navigation and basic stats"""
-    # Get basic statistics
-    total_assets = Asset.query.count()
-    total_asset_types = AssetType.query.count()
-    total_make_models = MakeModel.query.count()
-    total_locations = MajorLocation.query.count()
-    total_users = User.query.count()
-    total_events = Event.query.count()
+    # Get basic statistics (cached, see DashboardStatsService)
+    totals = DashboardStatsService.get_totals()
     
     # Get recent assets
     recent_assets = Asset.query.order_by(Asset.created_at.desc()).limit(5).all()
@@ -40,33 +38,18 @@ def index():
     recent_events = Event.query.order_by(Event.timestamp.desc()).limit(5).all()
     
     # Get assets by location
-    locations_with_assets = []
-    for location in MajorLocation.query.all():
-        asset_count = Asset.query.filter_by(major_location_id=location.id).count()
-        if asset_count > 0:
-            locations_with_assets.append({
-                'location': location,
-                'asset_count': asset_count
-            })
+    locations_with_assets = DashboardStatsService.get_location_stats()
     
     # Get assets by type (through make/models)
-    asset_types_with_counts = []
-    for asset_type in AssetType.query.all():
-        make_models = MakeModel.query.filter_by(asset_type_id=asset_type.id).all()
-        asset_count = sum(Asset.query.filter_by(make_model_id=make_model.id).count() for make_model in make_models)
-        if asset_count > 0:
-            asset_types_with_counts.append({
-                'asset_type': asset_type,
-                'asset_count': asset_count
-            })
+    asset_types_with_counts = DashboardStatsService.get_asset_type_stats()
     
     return render_template('index.html', 
-                         total_assets=total_assets,
-                         total_asset_types=total_asset_types,
-                         total_make_models=total_make_models,
-                         total_locations=total_locations,
-                         total_users=total_users,
-                         total_events=total_events,
+                         total_assets=totals['total_assets'],
+                         total_asset_types=totals['total_asset_types'],
+                         total_make_models=totals['total_make_models'],
+                         total_locations=totals['total_locations'],
+                         total_users=totals['total_users'],
+                         total_events=totals['total_events'],
                          recent_assets=recent_assets,
                          recent_events=recent_events,
                          locations_with_assets=locations_with_assets,
@@ -76,13 +59,8 @@ def index():
 @login_required
 def asset_management():
     """Asset management dashboard with detailed statistics and recent activity"""
-    # Get basic statistics
-    total_assets = Asset.query.count()
-    total_asset_types = AssetType.query.count()
-    total_make_models = MakeModel.query.count()
-    total_locations = MajorLocation.query.count()
-    total_users = User.query.count()
-    total_events = Event.query.count()
+    # Get basic statistics (cached, see DashboardStatsService)
+    totals = DashboardStatsService.get_totals()
     
     # Get recent assets
     recent_assets = Asset.query.order_by(Asset.created_at.desc()).limit(5).all()
@@ -91,34 +69,18 @@ def asset_management():
     recent_events = Event.query.order_by(Event.timestamp.desc()).limit(5).all()
     
     # Get assets by location
-    locations_with_assets = []
-    for location in MajorLocation.query.all():
-        asset_count = Asset.query.filter_by(major_location_id=location.id).count()
-        if asset_count > 0:
-            locations_with_assets.append({
-                'location': location,
-                'asset_count': asset_count
-            })
+    locations_with_assets = DashboardStatsService.get_location_stats()
     
     # Get assets by type (through make/models)
-    asset_types_with_counts = []
-    for asset_type in AssetType.query.all():
-        # Get make_models for this asset type
-        make_models = MakeModel.query.filter_by(asset_type_id=asset_type.id).all()
-        asset_count = sum(Asset.query.filter_by(make_model_id=make_model.id).count() for make_model in make_models)
-        if asset_count > 0:
-            asset_types_with_counts.append({
-                'asset_type': asset_type,
-                'asset_count': asset_count
-            })
+    asset_types_with_counts = DashboardStatsService.get_asset_type_stats()
     
     return render_template('assets/index.html', 
-                         total_assets=total_assets,
-                         total_asset_types=total_asset_types,
-                         total_make_models=total_make_models,
-                         total_locations=total_locations,
-                         total_users=total_users,
-                         total_events=total_events,
+                         total_assets=totals['total_assets'],
+                         total_asset_types=totals['total_asset_types'],
+                         total_make_models=totals['total_make_models'],
+                         total_locations=totals['total_locations'],
+                         total_users=totals['total_users'],
+                         total_events=totals['total_events'],
                          recent_assets=recent_assets,
                          recent_events=recent_events,
                          locations_with_assets=locations_with_assets,
@@ -129,16 +91,17 @@ def asset_management():
 def dashboard():
     """Enhanced dashboard with more detailed statistics"""
     # Get comprehensive statistics - using variable names expected by template
-    assets_count = Asset.query.count()
-    asset_types_count = AssetType.query.count()
-    make_models_count = MakeModel.query.count()
-    events_count = Event.query.count()
+    totals = DashboardStatsService.get_totals()
+    assets_count = totals['total_assets']
+    asset_types_count = totals['total_asset_types']
+    make_models_count = totals['total_make_models']
+    events_count = totals['total_events']
     
     stats = {
         'total_assets': assets_count,
-        'active_assets': Asset.query.filter_by(status='Active').count(),
-        'total_locations': MajorLocation.query.count(),
-        'total_users': User.query.count(),
+        'active_assets': totals['active_assets'],
+        'total_locations': totals['total_locations'],
+        'total_users': totals['total_users'],
         'total_events': events_count,
         'total_asset_types': asset_types_count,
         'total_make_models': make_models_count
@@ -149,27 +112,10 @@ def dashboard():
     recent_events = Event.query.order_by(Event.timestamp.desc()).limit(10).all()
     
     # Get top locations by asset count
-    locations = MajorLocation.query.all()
-    location_stats = []
-    for location in locations:
-        asset_count = Asset.query.filter_by(major_location_id=location.id).count()
-        location_stats.append({
-            'location': location,
-            'asset_count': asset_count
-        })
-    location_stats.sort(key=lambda x: x['asset_count'], reverse=True)
+    location_stats = DashboardStatsService.get_location_stats(include_empty=True, sort_by_count=True)
     
     # Get top asset types by count
-    asset_type_stats = []
-    for asset_type in AssetType.query.all():
-        # Get make_models for this asset type
-        make_models = MakeModel.query.filter_by(asset_type_id=asset_type.id).all()
-        asset_count = sum(Asset.query.filter_by(make_model_id=make_model.id).count() for make_model in make_models)
-        asset_type_stats.append({
-            'asset_type': asset_type,
-            'asset_count': asset_count
-        })
-    asset_type_stats.sort(key=lambda x: x['asset_count'], reverse=True)
+    asset_type_stats = DashboardStatsService.get_asset_type_stats(include_empty=True, sort_by_count=True)
     
     return render_template('dashboard.html',
                          stats=stats,
@@ -190,11 +136,15 @@ def search():
     if not query:
         return render_template('search.html', results=None)
     
-    # Search assets
-    assets = Asset.query.filter(
-        Asset.name.ilike(f'%{query}%') |
-        Asset.serial_number.ilike(f'%{query}%')
-    ).limit(10).all()
+    # Ranked full-text search over the indexed entities
+    assets = search_index.search('assets', query, limit=10)
+    parts = search_index.search('parts', query, limit=10)
+    events = search_index.search('events', query, limit=10)
+    comments = search_index.search(
+        'comments', query, limit=10,
+        query=Comment.query.filter(Comment.user_viewable.is_(None))
+    )
+    templates = search_index.search('template_action_sets', query, limit=10)
     
     # Search locations
     locations = MajorLocation.query.filter(
@@ -218,7 +168,11 @@ def search():
         'assets': assets,
         'locations': locations,
         'make_models': make_models,
-        'users': users
+        'users': users,
+        'parts': parts,
+        'events': events,
+        'comments': comments,
+        'templates': templates
     }
     
     return render_template('search.html', results=results, query=query)
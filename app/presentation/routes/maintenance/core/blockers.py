@@ -147,9 +147,6 @@ def end_blocked_status(blocked_status_id):
                 )
             db.session.commit()
         
-        # Update asset blocked status after ending blocker
-        blocker_manager.update_asset_blocked_status()
-        
         flash('Blocked status ended successfully. Work can now continue.', 'success')
         return redirect(url_for('maintenance_event.view_maintenance_event', event_id=struct.event_id))
         
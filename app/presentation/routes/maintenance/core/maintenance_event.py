@@ -1392,9 +1392,6 @@ def create_blocker(event_id):
         if event_priority and event_priority in ['Low', 'Medium', 'High', 'Critical']:
             maintenance_context.update_action_set_details(priority=event_priority)
         
-        # Update asset blocked status based on all active blockers
-        blocker_manager.update_asset_blocked_status()
-        
         # Generate comment - use user's comment if provided, otherwise use automated one
         if maintenance_struct.event_id:
             event_context = EventContext(maintenance_struct.event_id)
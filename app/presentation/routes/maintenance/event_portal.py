@@ -69,8 +69,11 @@ def render_view_events_module(
     # Get paginated events with enhanced data
     events = EventPortalService.get_events_with_enhanced_data(
         query,
-        page=filters.get('page', 1),
-        per_page=per_page
+        cursor=filters.get('cursor'),
+        per_page=per_page,
+        order_by=filters.get('order_by', 'created_at'),
+        order_direction=filters.get('order_direction', 'desc'),
+        has_comments_by=filters.get('has_comments_by')
     )
     
     # Get filter options for dropdowns
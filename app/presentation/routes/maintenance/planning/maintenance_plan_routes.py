@@ -8,6 +8,7 @@ from flask_login import login_required, current_user
 from app.logger import get_logger
 from app import db
 from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+from app.data.maintenance.planning.planning_dirty_marks import PlanningDirtyMark
 from app.data.core.asset_info.asset_type import AssetType
 from app.data.core.asset_info.make_model import MakeModel
 from app.data.maintenance.templates.template_action_sets import TemplateActionSet
@@ -48,7 +49,8 @@ def view_plan(plan_id):
     return render_template('maintenance/planning/maintenance_plans/view.html',
                          plan=plan,
                          template_action_set=template_action_set,
-                         template_action_items=template_action_items)
+                         template_action_items=template_action_items,
+                         next_due_date=MaintenancePlanContext(plan).calculate_next_due_date())
 
 
 @bp.route('/maintenance-plan/<int:plan_id>/edit', methods=['GET', 'POST'])
@@ -75,6 +77,10 @@ def edit_plan(plan_id):
             
             plan.updated_by_id = current_user.id
             
+            # Criteria, template or frequency may have changed: the incremental
+            # planning job re-plans every asset
+            PlanningDirtyMark.mark(maintenance_plan_id=plan.id, reason='plan edited')
+            
             db.session.commit()
             
             flash('Maintenance plan updated successfully', 'success')
@@ -239,7 +245,7 @@ def plan_maintenance(plan_id):
                 asset_id=result.asset_id,
                 maintenance_plan_id=plan_id
             )
-            .filter(MaintenanceActionSet.status.in_(['Planned', 'In Progress']))
+            .filter(MaintenanceActionSet.status.in_(MaintenanceActionSet.OPEN_STATUSES))
             .first()
         )
         if existing_event:
@@ -272,7 +278,7 @@ def create_maintenance_event(plan_id):
                 asset_id=asset_id,
                 maintenance_plan_id=plan_id
             )
-            .filter(MaintenanceActionSet.status.in_(['Planned', 'In Progress']))
+            .filter(MaintenanceActionSet.status.in_(MaintenanceActionSet.OPEN_STATUSES))
             .first()
         )
         
@@ -10,6 +10,7 @@ from app.data.maintenance.templates.template_action_sets import TemplateActionSe
 from app.data.maintenance.proto_templates.proto_actions import ProtoActionItem
 from app.data.core.asset_info.asset_type import AssetType
 from app.data.core.asset_info.make_model import MakeModel
+from app.data.core.search_index import apply_text_search
 
 logger = get_logger("asset_management.routes.maintenance.search_utils")
 
@@ -38,14 +39,16 @@ def searchbar_template_action_set():
             query = query.filter(TemplateActionSet.asset_type_id == asset_type_id)
         if make_model_id:
             query = query.filter(TemplateActionSet.make_model_id == make_model_id)
+        rank = None
         if name:
-            query = query.filter(TemplateActionSet.task_name.ilike(f'%{name}%'))
+            query, rank = apply_text_search(query, 'template_action_sets', name)
         
         # Get total count before limiting
         total_count = query.count()
         
-        # Apply limit
-        templates = query.order_by(TemplateActionSet.task_name).limit(count).all()
+        # Apply limit (best matches first when searching)
+        order = [TemplateActionSet.task_name] if rank is None else [rank, TemplateActionSet.task_name]
+        templates = query.order_by(*order).limit(count).all()
         
         # Format results for template
         items = []
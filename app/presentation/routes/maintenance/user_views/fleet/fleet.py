@@ -3,7 +3,8 @@ Fleet/Admin Portal Main Routes
 Dashboard and main navigation for fleet-wide maintenance oversight
 """
 
-from flask import Blueprint, render_template
+from datetime import datetime, timedelta
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from app.logger import get_logger
 
@@ -30,10 +31,13 @@ def dashboard():
     }
     
     try:
-        from app.data.core.asset_info.asset import Asset
+        from app.services.core.dashboard_stats_service import DashboardStatsService
+        from app.services.maintenance.maintenance_due_service import MaintenanceDueService
         from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
         
-        stats['total_assets'] = Asset.query.count()
+        stats['total_assets'] = DashboardStatsService.get_totals()['total_assets']
+        stats['assets_due'] = MaintenanceDueService.count_assets_due(days=14)
+        stats['overdue_maintenance'] = MaintenanceDueService.count_overdue()
         stats['active_maintenance'] = MaintenanceActionSet.query.filter(
             MaintenanceActionSet.status.in_(['Planned', 'In Progress', 'Delayed'])
         ).count()
@@ -42,3 +46,60 @@ def dashboard():
     
     return render_template('maintenance/user_views/fleet/dashboard.html', stats=stats)
 
+
+
+def _availability_window():
+    """
+    Read the report window from the query string.
+
+    Accepts start/end dates (YYYY-MM-DD, end exclusive), a days count
+    ending today, or period=last_quarter. Defaults to the service window.
+    """
+    from app.services.maintenance.availability_service import AvailabilityService
+
+    if request.args.get('period') == 'last_quarter':
+        return AvailabilityService.previous_quarter()
+    default_start, default_end = AvailabilityService.default_window()
+    days = request.args.get('days', type=int)
+    if days and days > 0:
+        return default_end - timedelta(days=days), default_end
+    start = request.args.get('start', '').strip()
+    end = request.args.get('end', '').strip()
+    return (
+        datetime.strptime(start, '%Y-%m-%d') if start else default_start,
+        datetime.strptime(end, '%Y-%m-%d') if end else default_end,
+    )
+
+
+@fleet_bp.route('/availability')
+@login_required
+def availability():
+    """Downtime per mission capability level, by asset type, location and asset"""
+    from app.services.maintenance.availability_service import AvailabilityService
+
+    try:
+        start, end = _availability_window()
+        report = AvailabilityService.get_report(start, end)
+    except ValueError as e:
+        flash(f'Invalid report window: {e}', 'error')
+        return redirect(url_for('fleet_portal.availability'))
+
+    return render_template('maintenance/user_views/fleet/availability.html', report=report)
+
+
+@fleet_bp.route('/availability/data')
+@login_required
+def availability_data():
+    """Availability report as JSON (same query parameters as the report page)"""
+    from app.services.maintenance.availability_service import AvailabilityService
+
+    try:
+        start, end = _availability_window()
+        report = AvailabilityService.get_report(start, end)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    data = dict(report)
+    for key in ('window_start', 'window_end', 'computed_at'):
+        data[key] = report[key].isoformat()
+    return jsonify(data)
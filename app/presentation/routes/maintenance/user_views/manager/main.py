@@ -3,6 +3,7 @@ Manager Portal Main Routes
 Dashboard and main navigation for maintenance managers
 """
 
+from datetime import datetime, timedelta
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
 from flask_login import login_required, current_user
 from app.logger import get_logger
@@ -13,6 +14,7 @@ from app.buisness.maintenance import (
     ProtoActionContext,
 )
 from app.services.maintenance.part_demand_service import PartDemandService
+from app.services.maintenance.maintenance_due_service import MaintenanceDueService
 
 logger = get_logger("asset_management.routes.maintenance.manager")
 
@@ -146,6 +148,85 @@ def plan_maintenance():
     return render_template('maintenance/user_views/manager/plan_maintenance.html')
 
 
+@manager_bp.route('/plan-maintenance/due-work')
+@login_required
+def due_work():
+    """Due work - Assets due for maintenance by date range or meter units"""
+    logger.info(f"Due work accessed by {current_user.username}")
+    
+    # Get filter parameters
+    days = request.args.get('days', 14, type=int)
+    start = request.args.get('start', '').strip() or None
+    end = request.args.get('end', '').strip() or None
+    meter_units = request.args.get('meter_units', type=float)
+    asset_type_id = request.args.get('asset_type_id', type=int)
+    maintenance_plan_id = request.args.get('maintenance_plan_id', type=int)
+    include_scheduled = request.args.get('include_scheduled') == 'true'
+    
+    # Explicit dates ask "due between X and Y"; otherwise everything due within the horizon
+    due_items = []
+    try:
+        if start or end:
+            due_items = MaintenanceDueService.get_due_between(
+                start=datetime.strptime(start, '%Y-%m-%d') if start else None,
+                end=datetime.strptime(end, '%Y-%m-%d') + timedelta(days=1) if end else datetime.max,
+                asset_type_id=asset_type_id,
+                maintenance_plan_id=maintenance_plan_id,
+                include_scheduled=include_scheduled,
+                limit=500
+            )
+        elif meter_units is not None and not days:
+            due_items = MaintenanceDueService.get_due_within_meter(
+                meter_units,
+                asset_type_id=asset_type_id,
+                maintenance_plan_id=maintenance_plan_id,
+                include_scheduled=include_scheduled,
+                limit=500
+            )
+        else:
+            due_items = MaintenanceDueService.get_due_work(
+                days=days,
+                meter_units=meter_units,
+                asset_type_id=asset_type_id,
+                maintenance_plan_id=maintenance_plan_id,
+                include_scheduled=include_scheduled,
+                limit=500
+            )
+    except ValueError:
+        flash('Dates must be in YYYY-MM-DD format', 'error')
+    except Exception as e:
+        logger.error(f"Error loading due work: {e}")
+        flash('Error loading due work', 'error')
+    
+    # Get filter options
+    try:
+        from app.data.core.asset_info.asset_type import AssetType
+        from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+        
+        asset_types = AssetType.query.order_by(AssetType.name).all()
+        plans = MaintenancePlan.query.filter_by(status='Active').order_by(MaintenancePlan.name).all()
+    except Exception as e:
+        logger.warning(f"Could not load filter options: {e}")
+        asset_types = []
+        plans = []
+    
+    return render_template(
+        'maintenance/user_views/manager/due_work.html',
+        due_items=due_items,
+        asset_types=asset_types,
+        plans=plans,
+        filters={
+            'days': days,
+            'start': start or '',
+            'end': end or '',
+            'meter_units': meter_units,
+            'asset_type_id': asset_type_id,
+            'maintenance_plan_id': maintenance_plan_id,
+            'include_scheduled': include_scheduled
+        }
+    )
+
+
 @manager_bp.route('/build-maintenance-templates')
 @login_required
 def build_maintenance():
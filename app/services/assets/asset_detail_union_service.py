@@ -7,18 +7,19 @@ This service provides a unified way to query all asset detail tables together,
 returning unified results with metadata about which table each record came from.
 
 This file contains a service class that performs union queries across all asset detail tables
-(PurchaseInfo, VehicleRegistration, ToyotaWarrantyReceipt) based on the common fields
-inherited from AssetDetailVirtual and UserCreatedBase.
+(PurchaseInfo, VehicleRegistration, ToyotaWarrantyReceipt, SmogRecord) based on the common
+fields inherited from AssetDetailVirtual and UserCreatedBase.
 
-Now uses AssetDetailsStruct internally for structured access to detail records.
+Listing, date-range and user queries run as a single SQL UNION ALL (see detail_union_query);
+per-asset lookups use AssetDetailsStruct for structured access to detail records.
 """
 
 from app import db
-from app.data.assets.asset_type_details import PurchaseInfo, VehicleRegistration, ToyotaWarrantyReceipt
+from app.data.assets.asset_type_details import PurchaseInfo, VehicleRegistration, ToyotaWarrantyReceipt, SmogRecord
 from app.data.assets.asset_detail_virtual import AssetDetailVirtual
 from app.data.core.user_created_base import UserCreatedBase
 from app.buisness.assets.asset_type_details.asset_details_struct import AssetDetailsStruct
-from sqlalchemy import text, union_all
+from app.services.assets.detail_union_query import count_details, fetch_detail_page
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -35,7 +36,8 @@ class AssetDetailUnionService:
     ASSET_DETAIL_TABLES = [
         PurchaseInfo,
         VehicleRegistration, 
-        ToyotaWarrantyReceipt
+        ToyotaWarrantyReceipt,
+        SmogRecord
     ]
     
     @classmethod
@@ -74,40 +76,50 @@ class AssetDetailUnionService:
         return sorted(results, key=lambda x: x['all_asset_detail_id'])
     
     @classmethod
-    def get_all_details(cls, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_all_details(cls, limit: Optional[int] = None, offset: Optional[int] = None,
+                        asset_id: Optional[int] = None, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None,
+                        user_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get all detail records across all asset detail tables.
+        Get detail records across all asset detail tables, ordered by global ID.
+        
+        Runs as a single UNION ALL over the common detail columns with the
+        filters, ordering, limit and offset applied in SQL, then loads the full
+        rows for the page with one query per table.
         
         Args:
             limit: Maximum number of records to return
             offset: Number of records to skip
+            asset_id: Optional asset ID to limit records to
+            start_date: Optional start of created_at range (inclusive)
+            end_date: Optional end of created_at range (inclusive)
+            user_id: Optional ID of the user who created the records
             
         Returns:
             List of dictionaries containing detail records with metadata
         """
-        results = []
-        
-        for table_class in cls.ASSET_DETAIL_TABLES:
-            query = table_class.query
-            
-            if limit:
-                query = query.limit(limit)
-            if offset:
-                query = query.offset(offset)
-                
-            records = query.all()
-            
-            for record in records:
-                detail_data = cls._extract_common_fields(record)
-                detail_data.update({
-                    'table_name': table_class.__tablename__,
-                    'table_class': table_class.__name__,
-                    'record': record
-                })
-                results.append(detail_data)
+        return fetch_detail_page(
+            cls.ASSET_DETAIL_TABLES, 'all_asset_detail_id', 'asset_id',
+            limit=limit,
+            offset=offset,
+            owner_id=asset_id,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id
+        )
+    
+    @classmethod
+    def count_details(cls, asset_id: Optional[int] = None, start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None, user_id: Optional[int] = None) -> int:
+        """
+        Count detail records across all asset detail tables matching the filters.
         
-        # Sort by global ID for consistent ordering
-        return sorted(results, key=lambda x: x['all_asset_detail_id'])
+        Takes the same filters as get_all_details, for building pagers.
+        """
+        return count_details(
+            cls.ASSET_DETAIL_TABLES, 'all_asset_detail_id', 'asset_id',
+            owner_id=asset_id, start_date=start_date, end_date=end_date, user_id=user_id
+        )
     
     @classmethod
     def search_details(cls, search_term: str, asset_id: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -167,8 +179,6 @@ class AssetDetailUnionService:
         """
         Get detail records created within a specific date range.
         
-        Uses AssetDetailsStruct when asset_id is provided for structured access.
-        
         Args:
             start_date: Start of date range
             end_date: End of date range
@@ -177,54 +187,13 @@ class AssetDetailUnionService:
         Returns:
             List of dictionaries containing detail records with metadata
         """
-        results = []
-        
-        # If asset_id is provided, use AssetDetailsStruct for structured access
-        if asset_id:
-            struct = AssetDetailsStruct(asset_id)
-            details_dict = struct.asdict()
-            
-            for class_name, records in details_dict.items():
-                # records is now a list
-                if records:
-                    for record in records:
-                        # Check if record falls within date range
-                        if start_date <= record.created_at <= end_date:
-                            detail_data = cls._extract_common_fields(record)
-                            detail_data.update({
-                                'table_name': record.__tablename__,
-                                'table_class': class_name,
-                                'record': record
-                            })
-                            results.append(detail_data)
-        else:
-            # Query across all assets - need to query each table
-            for table_class in cls.ASSET_DETAIL_TABLES:
-                query = table_class.query.filter(
-                    table_class.created_at >= start_date,
-                    table_class.created_at <= end_date
-                )
-                
-                records = query.all()
-                
-                for record in records:
-                    detail_data = cls._extract_common_fields(record)
-                    detail_data.update({
-                        'table_name': table_class.__tablename__,
-                        'table_class': table_class.__name__,
-                        'record': record
-                    })
-                    results.append(detail_data)
-        
-        return sorted(results, key=lambda x: x['all_asset_detail_id'])
+        return cls.get_all_details(asset_id=asset_id, start_date=start_date, end_date=end_date)
     
     @classmethod
     def get_details_by_user(cls, user_id: int, asset_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get detail records created by a specific user.
         
-        Uses AssetDetailsStruct when asset_id is provided for structured access.
-        
         Args:
             user_id: ID of the user who created the records
             asset_id: Optional asset ID to limit search to
@@ -232,42 +201,7 @@ class AssetDetailUnionService:
         Returns:
             List of dictionaries containing detail records with metadata
         """
-        results = []
-        
-        # If asset_id is provided, use AssetDetailsStruct for structured access
-        if asset_id:
-            struct = AssetDetailsStruct(asset_id)
-            details_dict = struct.asdict()
-            
-            for class_name, records in details_dict.items():
-                # records is now a list
-                if records:
-                    for record in records:
-                        if record.created_by_id == user_id:
-                            detail_data = cls._extract_common_fields(record)
-                            detail_data.update({
-                                'table_name': record.__tablename__,
-                                'table_class': class_name,
-                                'record': record
-                            })
-                            results.append(detail_data)
-        else:
-            # Query across all assets - need to query each table
-            for table_class in cls.ASSET_DETAIL_TABLES:
-                query = table_class.query.filter_by(created_by_id=user_id)
-                
-                records = query.all()
-                
-                for record in records:
-                    detail_data = cls._extract_common_fields(record)
-                    detail_data.update({
-                        'table_name': table_class.__tablename__,
-                        'table_class': table_class.__name__,
-                        'record': record
-                    })
-                    results.append(detail_data)
-        
-        return sorted(results, key=lambda x: x['all_asset_detail_id'])
+        return cls.get_all_details(asset_id=asset_id, user_id=user_id)
     
     @classmethod
     def _extract_common_fields(cls, record) -> Dict[str, Any]:
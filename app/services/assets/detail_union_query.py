@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Detail Union Query
+Shared SQL UNION ALL paging for the asset and model detail union services.
+
+Every detail table shares the columns of its virtual base class
+(AssetDetailVirtual / ModelDetailVirtual plus UserCreatedBase), so the tables
+can be combined into one UNION ALL over those columns. Filtering, ordering by
+the global detail ID, LIMIT and OFFSET all run in SQL against the union; only
+the (table, id) keys of the requested page come back. Full rows for the page
+are then loaded with one IN query per table that appears on the page.
+
+Paging therefore costs the same however many detail tables are registered,
+and offset/limit apply to the combined ordering instead of to each table.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, literal, select, union_all
+
+from app import db
+
+# Columns every detail table inherits from UserCreatedBase
+AUDIT_COLUMNS = ('id', 'created_at', 'created_by_id', 'updated_at', 'updated_by_id')
+
+
+def build_detail_union(
+    tables: Sequence,
+    global_id_column: str,
+    owner_column: str,
+    owner_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = None
+):
+    """
+    Build a UNION ALL subquery over the common columns of the detail tables.
+
+    Filters are applied inside each branch so every table can use its own
+    indexes.
+
+    Args:
+        tables: Detail model classes to combine
+        global_id_column: Shared sequence column ('all_asset_detail_id' / 'all_model_detail_id')
+        owner_column: Owning entity column ('asset_id' / 'make_model_id')
+        owner_id: Optional owner ID to limit records to
+        start_date: Optional inclusive lower bound on created_at
+        end_date: Optional inclusive upper bound on created_at
+        user_id: Optional creator user ID
+
+    Returns:
+        Subquery with a 'table_name' column plus the common columns
+    """
+    branches = []
+    for table_class in tables:
+        criteria = []
+        if owner_id is not None:
+            criteria.append(getattr(table_class, owner_column) == owner_id)
+        if start_date is not None:
+            criteria.append(table_class.created_at >= start_date)
+        if end_date is not None:
+            criteria.append(table_class.created_at <= end_date)
+        if user_id is not None:
+            criteria.append(table_class.created_by_id == user_id)
+
+        branches.append(
+            select(
+                literal(table_class.__tablename__).label('table_name'),
+                getattr(table_class, global_id_column).label(global_id_column),
+                getattr(table_class, owner_column).label(owner_column),
+                *[getattr(table_class, name).label(name) for name in AUDIT_COLUMNS]
+            ).where(*criteria)
+        )
+
+    return union_all(*branches).subquery('detail_union')
+
+
+def fetch_detail_page(
+    tables: Sequence,
+    global_id_column: str,
+    owner_column: str,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    **filters
+) -> List[Dict[str, Any]]:
+    """
+    Fetch one page of detail records across all tables, ordered by global ID.
+
+    Args:
+        tables: Detail model classes to combine
+        global_id_column: Shared sequence column used for ordering
+        owner_column: Owning entity column
+        limit: Maximum number of records to return
+        offset: Number of records to skip
+        **filters: owner_id, start_date, end_date, user_id (see build_detail_union)
+
+    Returns:
+        List of dictionaries with the common fields plus 'table_name',
+        'table_class' and the hydrated 'record', in global ID order
+    """
+    union = build_detail_union(tables, global_id_column, owner_column, **filters)
+    page_query = (
+        select(union)
+        .order_by(getattr(union.c, global_id_column), union.c.table_name, union.c.id)
+    )
+    if limit:
+        page_query = page_query.limit(limit)
+    if offset:
+        page_query = page_query.offset(offset)
+
+    page = db.session.execute(page_query).mappings().all()
+    if not page:
+        return []
+
+    # Hydrate full rows with one query per table present on the page
+    ids_by_table = defaultdict(list)
+    for row in page:
+        ids_by_table[row['table_name']].append(row['id'])
+
+    classes_by_table = {table_class.__tablename__: table_class for table_class in tables}
+    records = {}
+    for table_name, ids in ids_by_table.items():
+        table_class = classes_by_table[table_name]
+        for record in table_class.query.filter(table_class.id.in_(ids)).all():
+            records[(table_name, record.id)] = record
+
+    results = []
+    for row in page:
+        record = records.get((row['table_name'], row['id']))
+        if record is None:
+            # Deleted between the two queries
+            continue
+        detail_data = {column: row[column] for column in row.keys() if column != 'table_name'}
+        detail_data.update({
+            'table_name': row['table_name'],
+            'table_class': classes_by_table[row['table_name']].__name__,
+            'record': record
+        })
+        results.append(detail_data)
+    return results
+
+
+def count_details(tables: Sequence, global_id_column: str, owner_column: str, **filters) -> int:
+    """Count detail records across all tables matching the filters."""
+    union = build_detail_union(tables, global_id_column, owner_column, **filters)
+    return db.session.execute(select(func.count()).select_from(union)).scalar()
@@ -10,7 +10,8 @@ This file contains a service class that performs union queries across all model
 (ModelInfo, EmissionsInfo) based on the common fields inherited from ModelDetailVirtual 
 and UserCreatedBase.
 
-Now uses ModelDetailsStruct internally for structured access to detail records.
+Listing, date-range and user queries run as a single SQL UNION ALL (see detail_union_query);
+per-model lookups use ModelDetailsStruct for structured access to detail records.
 """
 
 from app import db
@@ -18,7 +19,7 @@ from app.data.assets.model_details import ModelInfo, EmissionsInfo
 from app.data.assets.model_detail_virtual import ModelDetailVirtual
 from app.data.core.user_created_base import UserCreatedBase
 from app.buisness.assets.model_details.model_details_struct import ModelDetailsStruct
-from sqlalchemy import text, union_all
+from app.services.assets.detail_union_query import count_details, fetch_detail_page
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -72,40 +73,50 @@ class ModelDetailUnionService:
         return sorted(results, key=lambda x: x['all_model_detail_id'])
     
     @classmethod
-    def get_all_details(cls, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_all_details(cls, limit: Optional[int] = None, offset: Optional[int] = None,
+                        make_model_id: Optional[int] = None, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None,
+                        user_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get all detail records across all model detail tables.
+        Get detail records across all model detail tables, ordered by global ID.
+        
+        Runs as a single UNION ALL over the common detail columns with the
+        filters, ordering, limit and offset applied in SQL, then loads the full
+        rows for the page with one query per table.
         
         Args:
             limit: Maximum number of records to return
             offset: Number of records to skip
+            make_model_id: Optional make/model ID to limit records to
+            start_date: Optional start of created_at range (inclusive)
+            end_date: Optional end of created_at range (inclusive)
+            user_id: Optional ID of the user who created the records
             
         Returns:
             List of dictionaries containing detail records with metadata
         """
-        results = []
-        
-        for table_class in cls.MODEL_DETAIL_TABLES:
-            query = table_class.query
-            
-            if limit:
-                query = query.limit(limit)
-            if offset:
-                query = query.offset(offset)
-                
-            records = query.all()
-            
-            for record in records:
-                detail_data = cls._extract_common_fields(record)
-                detail_data.update({
-                    'table_name': table_class.__tablename__,
-                    'table_class': table_class.__name__,
-                    'record': record
-                })
-                results.append(detail_data)
+        return fetch_detail_page(
+            cls.MODEL_DETAIL_TABLES, 'all_model_detail_id', 'make_model_id',
+            limit=limit,
+            offset=offset,
+            owner_id=make_model_id,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id
+        )
+    
+    @classmethod
+    def count_details(cls, make_model_id: Optional[int] = None, start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None, user_id: Optional[int] = None) -> int:
+        """
+        Count detail records across all model detail tables matching the filters.
         
-        # Sort by global ID for consistent ordering
-        return sorted(results, key=lambda x: x['all_model_detail_id'])
+        Takes the same filters as get_all_details, for building pagers.
+        """
+        return count_details(
+            cls.MODEL_DETAIL_TABLES, 'all_model_detail_id', 'make_model_id',
+            owner_id=make_model_id, start_date=start_date, end_date=end_date, user_id=user_id
+        )
     
     @classmethod
     def search_details(cls, search_term: str, make_model_id: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -162,8 +173,6 @@ class ModelDetailUnionService:
         """
         Get detail records created within a specific date range.
         
-        Uses ModelDetailsStruct when make_model_id is provided for structured access.
-        
         Args:
             start_date: Start of date range
             end_date: End of date range
@@ -172,52 +181,13 @@ class ModelDetailUnionService:
         Returns:
             List of dictionaries containing detail records with metadata
         """
-        results = []
-        
-        # If make_model_id is provided, use ModelDetailsStruct for structured access
-        if make_model_id:
-            struct = ModelDetailsStruct(make_model_id)
-            details_dict = struct.asdict()
-            
-            for class_name, record in details_dict.items():
-                if record is not None:
-                    # Check if record falls within date range
-                    if start_date <= record.created_at <= end_date:
-                        detail_data = cls._extract_common_fields(record)
-                        detail_data.update({
-                            'table_name': record.__tablename__,
-                            'table_class': class_name,
-                            'record': record
-                        })
-                        results.append(detail_data)
-        else:
-            # Query across all models - need to query each table
-            for table_class in cls.MODEL_DETAIL_TABLES:
-                query = table_class.query.filter(
-                    table_class.created_at >= start_date,
-                    table_class.created_at <= end_date
-                )
-                
-                records = query.all()
-                
-                for record in records:
-                    detail_data = cls._extract_common_fields(record)
-                    detail_data.update({
-                        'table_name': table_class.__tablename__,
-                        'table_class': table_class.__name__,
-                        'record': record
-                    })
-                    results.append(detail_data)
-        
-        return sorted(results, key=lambda x: x['all_model_detail_id'])
+        return cls.get_all_details(make_model_id=make_model_id, start_date=start_date, end_date=end_date)
     
     @classmethod
     def get_details_by_user(cls, user_id: int, make_model_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get detail records created by a specific user.
         
-        Uses ModelDetailsStruct when make_model_id is provided for structured access.
-        
         Args:
             user_id: ID of the user who created the records
             make_model_id: Optional make/model ID to limit search to
@@ -225,39 +195,7 @@ class ModelDetailUnionService:
         Returns:
             List of dictionaries containing detail records with metadata
         """
-        results = []
-        
-        # If make_model_id is provided, use ModelDetailsStruct for structured access
-        if make_model_id:
-            struct = ModelDetailsStruct(make_model_id)
-            details_dict = struct.asdict()
-            
-            for class_name, record in details_dict.items():
-                if record is not None and record.created_by_id == user_id:
-                    detail_data = cls._extract_common_fields(record)
-                    detail_data.update({
-                        'table_name': record.__tablename__,
-                        'table_class': class_name,
-                        'record': record
-                    })
-                    results.append(detail_data)
-        else:
-            # Query across all models - need to query each table
-            for table_class in cls.MODEL_DETAIL_TABLES:
-                query = table_class.query.filter_by(created_by_id=user_id)
-                
-                records = query.all()
-                
-                for record in records:
-                    detail_data = cls._extract_common_fields(record)
-                    detail_data.update({
-                        'table_name': table_class.__tablename__,
-                        'table_class': table_class.__name__,
-                        'record': record
-                    })
-                    results.append(detail_data)
-        
-        return sorted(results, key=lambda x: x['all_model_detail_id'])
+        return cls.get_all_details(make_model_id=make_model_id, user_id=user_id)
     
     @classmethod
     def get_details_by_emissions_standard(cls, emissions_standard: str, 
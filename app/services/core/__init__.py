@@ -15,6 +15,7 @@ from .location_service import LocationService
 from .make_model_service import MakeModelService
 from .user_service import UserService
 from .event_service import EventService
+from .dashboard_stats_service import DashboardStatsService
 
 __all__ = [
     'AssetService',
@@ -23,5 +24,6 @@ __all__ = [
     'MakeModelService',
     'UserService',
     'EventService',
+    'DashboardStatsService',
 ]
 
@@ -0,0 +1,193 @@
+"""
+Dashboard Stats Service
+Presentation service for the fleet-wide counts shown on the home page, the
+asset management page and the dashboards.
+
+Handles:
+- Computing totals and per-location / per-asset-type / per-make-model asset
+  counts with a handful of GROUP BY queries
+- Caching the result in process
+- Invalidating the cache when assets, make/models, asset types or locations
+  are committed (app.utils.commit_invalidation). Event and user totals do
+  not invalidate it; they are refreshed when the snapshot expires after
+  DASHBOARD_STATS_TTL seconds
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import func, select
+
+from app import db
+from app.data.core.asset_info.asset import Asset
+from app.data.core.asset_info.asset_type import AssetType
+from app.data.core.asset_info.make_model import MakeModel
+from app.data.core.major_location import MajorLocation
+from app.data.core.user_info.user import User
+from app.data.core.event_info.event import Event
+from app.logger import get_logger
+from app.utils.commit_invalidation import register as register_commit_invalidation
+
+logger = get_logger("asset_management.services.core.dashboard_stats")
+
+# Asset columns whose changes move an asset between dashboard buckets
+_ASSET_BUCKET_COLUMNS = ('major_location_id', 'make_model_id', 'asset_type_id', 'status')
+
+
+class DashboardStatsService:
+    """
+    Service for cached dashboard statistics.
+
+    Provides methods for:
+    - Reading the cached stats snapshot (totals and grouped counts)
+    - Building location and asset type count lists for templates
+    - Invalidating the cache
+    """
+
+    DEFAULT_TTL_SECONDS = 300
+
+    _snapshot: Optional[Dict] = None
+    _expires_at: float = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_stats(cls) -> Dict:
+        """
+        Get the stats snapshot, recomputing it if invalidated or expired.
+
+        Returns:
+            Dictionary with 'totals' and the grouped count dictionaries
+            'assets_by_location', 'assets_by_asset_type', 'assets_by_make_model'
+        """
+        with cls._lock:
+            if cls._snapshot is not None and time.monotonic() < cls._expires_at:
+                return cls._snapshot
+
+            snapshot = cls._compute_stats()
+            cls._snapshot = snapshot
+            cls._expires_at = time.monotonic() + cls._get_ttl()
+            return snapshot
+
+    @classmethod
+    def get_totals(cls) -> Dict[str, int]:
+        """Get the entity totals (assets, asset types, make/models, locations, users, events)."""
+        return cls.get_stats()['totals']
+
+    @classmethod
+    def get_location_stats(cls, include_empty: bool = False, sort_by_count: bool = False) -> List[Dict]:
+        """
+        Get asset counts per location.
+
+        Args:
+            include_empty: Include locations without assets
+            sort_by_count: Order largest first instead of by location
+
+        Returns:
+            List of {'location': MajorLocation, 'asset_count': int}
+        """
+        counts = cls.get_stats()['assets_by_location']
+        location_stats = [
+            {'location': location, 'asset_count': counts.get(location.id, 0)}
+            for location in MajorLocation.query.all()
+        ]
+        if not include_empty:
+            location_stats = [item for item in location_stats if item['asset_count'] > 0]
+        if sort_by_count:
+            location_stats.sort(key=lambda x: x['asset_count'], reverse=True)
+        return location_stats
+
+    @classmethod
+    def get_asset_type_stats(cls, include_empty: bool = False, sort_by_count: bool = False) -> List[Dict]:
+        """
+        Get asset counts per asset type (through make/models).
+
+        Args:
+            include_empty: Include asset types without assets
+            sort_by_count: Order largest first instead of by asset type
+
+        Returns:
+            List of {'asset_type': AssetType, 'asset_count': int}
+        """
+        counts = cls.get_stats()['assets_by_asset_type']
+        asset_type_stats = [
+            {'asset_type': asset_type, 'asset_count': counts.get(asset_type.id, 0)}
+            for asset_type in AssetType.query.all()
+        ]
+        if not include_empty:
+            asset_type_stats = [item for item in asset_type_stats if item['asset_count'] > 0]
+        if sort_by_count:
+            asset_type_stats.sort(key=lambda x: x['asset_count'], reverse=True)
+        return asset_type_stats
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached snapshot so the next read recomputes it."""
+        with cls._lock:
+            cls._snapshot = None
+            cls._expires_at = 0.0
+        logger.debug("Dashboard stats cache invalidated")
+
+    @classmethod
+    def _get_ttl(cls) -> float:
+        if has_app_context():
+            return current_app.config.get('DASHBOARD_STATS_TTL', cls.DEFAULT_TTL_SECONDS)
+        return cls.DEFAULT_TTL_SECONDS
+
+    @staticmethod
+    def _compute_stats() -> Dict:
+        """
+        Compute all dashboard aggregates.
+
+        One query for the totals plus one GROUP BY per grouping, independent of
+        the number of locations, asset types and make/models.
+        """
+        def count_of(model, *criteria):
+            return select(func.count(model.id)).where(*criteria).scalar_subquery()
+
+        totals_row = db.session.execute(select(
+            count_of(Asset).label('total_assets'),
+            count_of(Asset, Asset.status == 'Active').label('active_assets'),
+            count_of(AssetType).label('total_asset_types'),
+            count_of(MakeModel).label('total_make_models'),
+            count_of(MajorLocation).label('total_locations'),
+            count_of(User).label('total_users'),
+            count_of(Event).label('total_events'),
+        )).one()
+
+        assets_by_location = dict(
+            db.session.query(Asset.major_location_id, func.count(Asset.id))
+            .filter(Asset.major_location_id.isnot(None))
+            .group_by(Asset.major_location_id)
+            .all()
+        )
+
+        assets_by_make_model = dict(
+            db.session.query(Asset.make_model_id, func.count(Asset.id))
+            .group_by(Asset.make_model_id)
+            .all()
+        )
+
+        # Asset types are counted through make/models, as the dashboards always have
+        assets_by_asset_type = dict(
+            db.session.query(MakeModel.asset_type_id, func.count(Asset.id))
+            .join(Asset, Asset.make_model_id == MakeModel.id)
+            .group_by(MakeModel.asset_type_id)
+            .all()
+        )
+
+        logger.debug("Dashboard stats recomputed")
+        return {
+            'totals': dict(totals_row._mapping),
+            'assets_by_location': assets_by_location,
+            'assets_by_make_model': assets_by_make_model,
+            'assets_by_asset_type': assets_by_asset_type,
+        }
+
+
+register_commit_invalidation(
+    (Asset, AssetType, MakeModel, MajorLocation),
+    DashboardStatsService.invalidate,
+    update_columns={Asset: _ASSET_BUCKET_COLUMNS}
+)
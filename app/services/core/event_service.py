@@ -15,6 +15,7 @@ from app.data.core.asset_info.asset import Asset
 from app.data.core.event_info.comment import Comment
 from app.buisness.core.event_context import EventContext
 from app.data.core.event_info.attachment import Attachment
+from app.services.keyset_pagination import keyset_paginate
 
 
 class EventService:
@@ -78,7 +79,7 @@ class EventService:
             )
         
         # Order by timestamp (newest first)
-        query = query.order_by(Event.timestamp.desc())
+        query = query.order_by(Event.timestamp.desc(), Event.id.desc())
         
         filters = {
             'event_type': event_type,
@@ -94,19 +95,19 @@ class EventService:
     @staticmethod
     def get_list_data(
         request: Request,
-        page: int = 1,
+        cursor: Optional[str] = None,
         per_page: int = 20
     ) -> Tuple:
         """
-        Get paginated event list with filters applied.
+        Get keyset-paginated event list with filters applied.
         
         Args:
             request: Flask request object
-            page: Page number (default: 1)
+            cursor: Pagination cursor from the previous page (default: first page)
             per_page: Items per page (default: 20)
             
         Returns:
-            Tuple of (pagination object, filters dict)
+            Tuple of (KeysetPage, filters dict)
         """
         # Extract filter parameters from request
         event_type = request.args.get('event_type')
@@ -125,8 +126,15 @@ class EventService:
             row_count=per_page
         )
         
-        # Paginate
-        events = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Paginate on (timestamp, id); the total is capped so deep tables stay cheap
+        events = keyset_paginate(
+            query,
+            Event.timestamp,
+            Event.id,
+            cursor=cursor,
+            per_page=per_page,
+            with_total=True
+        )
         
         return events, filters
     
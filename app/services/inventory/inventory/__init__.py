@@ -5,6 +5,7 @@ Presentation services for inventory management data retrieval and formatting.
 
 from .active_inventory_service import ActiveInventoryService
 from .inventory_movement_service import InventoryMovementService
+from .inventory_lineage_service import InventoryLineageService
 from .inventory_service import InventoryService
 from .global_inventory_view import GlobalInventoryView
 from .location_inventory_view import MajorLocationInventoryView
@@ -13,6 +14,7 @@ from .storeroom_inventory_view import StoreroomInventoryView
 __all__ = [
     'ActiveInventoryService',
     'InventoryMovementService',
+    'InventoryLineageService',
     'InventoryService',
     'GlobalInventoryView',
     'MajorLocationInventoryView',
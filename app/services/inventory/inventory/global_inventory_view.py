@@ -3,146 +3,209 @@ Global Inventory View Service
 
 Provides aggregated inventory summary across all locations.
 Includes part details and 6-month average cost.
+
+The summary is built with two statements, independent of the number of
+parts: stock totals per part (GROUP BY over active inventory in active
+storerooms, joined to part definitions, the part's inventory summary and
+a weighted-cost aggregate over the last six months of receipts), and the
+storeroom/location counts. The result is cached in process and
+invalidated (app.utils.commit_invalidation) when inventory movements or
+active inventory rows are committed, which every InventoryManager
+operation writes, and when part summaries are rewritten (the unit cost
+fallback). It expires after GLOBAL_INVENTORY_TTL seconds regardless.
 """
 
+import threading
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_
+from flask import current_app, has_app_context
+from sqlalchemy import func, select
 from app import db
 from app.data.inventory.inventory import ActiveInventory, Storeroom
 from app.data.core.supply.part_definition import PartDefinition
 from app.data.inventory.inventory import InventoryMovement
-from app.data.core.major_location import MajorLocation
+from app.data.inventory.inventory.inventory_summary import InventorySummary
+from app.logger import get_logger
+from app.utils.commit_invalidation import register as register_commit_invalidation
+
+logger = get_logger("asset_management.services.inventory.global_inventory_view")
 
 
 class GlobalInventoryView:
     """
     Service for global inventory aggregation.
-    
+
     Provides methods to get aggregated inventory data across all locations,
     including part details and 6-month average costs.
     """
-    
-    @staticmethod
-    def get_global_summary() -> List[Dict[str, Any]]:
+
+    DEFAULT_TTL_SECONDS = 300
+
+    # Days of movements averaged for six_month_avg_cost
+    AVG_COST_DAYS = 180
+
+    # Movements that carry an acquisition cost (receipts priced from the PO line)
+    COST_MOVEMENT_TYPES = ('Receipt',)
+
+    _snapshot: Optional[Dict] = None
+    _expires_at: float = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_global_summary(cls) -> List[Dict[str, Any]]:
         """
         Get aggregated inventory summary across all locations.
-        
+
         Returns:
-            List of dictionaries with inventory summary per part
+            List of dictionaries with inventory summary per part, ordered by
+            part number. The list is shared with the cache: do not modify it.
         """
-        # Get all active inventory
-        inventory_records = ActiveInventory.query.join(
-            Storeroom
-        ).filter(
-            Storeroom.is_active == True
-        ).all()
-        
-        # Group by part_id and aggregate
-        part_summaries = {}
-        
-        for inv in inventory_records:
-            part_id = inv.part_id
-            
-            if part_id not in part_summaries:
-                part = PartDefinition.query.get(part_id)
-                part_summaries[part_id] = {
-                    'part_id': part_id,
-                    'part_number': part.part_number if part else None,
-                    'part_name': part.part_name if part else None,
-                    'total_quantity_on_hand': 0.0,
-                    'total_quantity_allocated': 0.0,
-                    'total_quantity_available': 0.0,
-                    'total_value': 0.0,
-                    'major_location_count': set(),
-                    'storeroom_count': set(),
-                    'bin_count': 0,
-                    'six_month_avg_cost': None
-                }
-            
-            summary = part_summaries[part_id]
-            summary['total_quantity_on_hand'] += inv.quantity_on_hand
-            summary['total_quantity_allocated'] += inv.quantity_allocated
-            summary['total_quantity_available'] += inv.quantity_available
-            summary['total_value'] += inv.total_value
-            summary['major_location_count'].add(inv.major_location_id)
-            summary['storeroom_count'].add(inv.storeroom_id)
-            summary['bin_count'] += 1
-        
-        # Convert sets to counts
-        for summary in part_summaries.values():
-            summary['major_location_count'] = len(summary['major_location_count'])
-            summary['storeroom_count'] = len(summary['storeroom_count'])
-        
-        # Calculate 6-month average cost for each part
-        six_months_ago = datetime.utcnow() - timedelta(days=180)
-        
-        for part_id, summary in part_summaries.items():
-            # Get movements for this part in last 6 months
-            movements = InventoryMovement.query.filter(
-                and_(
-                    InventoryMovement.part_id == part_id,
-                    InventoryMovement.movement_date >= six_months_ago,
-                    InventoryMovement.movement_type.in_(['Arrival', 'Transfer'])
-                )
-            ).all()
-            
-            if movements:
-                # Calculate weighted average cost
-                total_cost = sum(m.unit_cost * abs(m.quantity) for m in movements if m.unit_cost)
-                total_quantity = sum(abs(m.quantity) for m in movements)
-                
-                if total_quantity > 0:
-                    summary['six_month_avg_cost'] = total_cost / total_quantity
-        
-        return list(part_summaries.values())
-    
-    @staticmethod
-    def get_global_total_value() -> float:
+        return cls._get_snapshot()['parts']
+
+    @classmethod
+    def get_global_totals(cls) -> Dict[str, Any]:
+        """
+        Get the global totals (value, part, location and storeroom counts).
+
+        Returns:
+            Dictionary with 'total_value', 'part_count', 'location_count',
+            'storeroom_count' and 'computed_at'
+        """
+        return cls._get_snapshot()['totals']
+
+    @classmethod
+    def get_global_total_value(cls) -> float:
         """
         Get total inventory value across all locations.
-        
+
         Returns:
             Total value as float
         """
-        summary = GlobalInventoryView.get_global_summary()
-        return sum(item['total_value'] for item in summary)
-    
-    @staticmethod
-    def get_global_part_count() -> int:
+        return cls.get_global_totals()['total_value']
+
+    @classmethod
+    def get_global_part_count(cls) -> int:
         """
         Get count of unique parts globally.
-        
+
         Returns:
             Count of unique parts
         """
-        return db.session.query(func.count(func.distinct(ActiveInventory.part_id)))\
-            .join(Storeroom).filter(Storeroom.is_active == True).scalar() or 0
-    
-    @staticmethod
-    def get_global_location_count() -> int:
+        return cls.get_global_totals()['part_count']
+
+    @classmethod
+    def get_global_location_count(cls) -> int:
         """
         Get count of major locations with inventory.
-        
+
         Returns:
             Count of major locations
         """
-        return db.session.query(func.count(func.distinct(Storeroom.major_location_id)))\
-            .filter(Storeroom.is_active == True).scalar() or 0
-    
-    @staticmethod
-    def get_global_storeroom_count() -> int:
+        return cls.get_global_totals()['location_count']
+
+    @classmethod
+    def get_global_storeroom_count(cls) -> int:
         """
         Get count of storerooms with inventory.
-        
+
         Returns:
             Count of storerooms
         """
-        return db.session.query(func.count(func.distinct(ActiveInventory.storeroom_id)))\
-            .join(Storeroom).filter(Storeroom.is_active == True).scalar() or 0
+        return cls.get_global_totals()['storeroom_count']
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached summary so the next read recomputes it."""
+        with cls._lock:
+            cls._snapshot = None
+            cls._expires_at = 0.0
+        logger.debug("Global inventory summary cache invalidated")
+
+    @classmethod
+    def _get_snapshot(cls) -> Dict:
+        with cls._lock:
+            if cls._snapshot is not None and time.monotonic() < cls._expires_at:
+                return cls._snapshot
+
+            snapshot = cls._compute_snapshot()
+            cls._snapshot = snapshot
+            cls._expires_at = time.monotonic() + cls._get_ttl()
+            return snapshot
 
+    @classmethod
+    def _get_ttl(cls) -> float:
+        if has_app_context():
+            return current_app.config.get('GLOBAL_INVENTORY_TTL', cls.DEFAULT_TTL_SECONDS)
+        return cls.DEFAULT_TTL_SECONDS
 
+    @classmethod
+    def _compute_snapshot(cls) -> Dict:
+        """Per-part totals and global counts in two statements"""
+        six_months_ago = datetime.utcnow() - timedelta(days=cls.AVG_COST_DAYS)
+
+        # Quantity-weighted unit cost of priced receipts in the last six months
+        moved_quantity = func.abs(InventoryMovement.quantity_delta)
+        avg_cost = select(
+            InventoryMovement.part_id.label('part_id'),
+            (func.sum(InventoryMovement.unit_cost * moved_quantity) / func.sum(moved_quantity)).label('avg_cost')
+        ).where(
+            InventoryMovement.movement_date >= six_months_ago,
+            InventoryMovement.movement_type.in_(cls.COST_MOVEMENT_TYPES),
+            InventoryMovement.unit_cost.isnot(None),
+            InventoryMovement.quantity_delta != 0
+        ).group_by(InventoryMovement.part_id).subquery()
+
+        # Bin cost when stored, else the part's rolling average
+        unit_cost = func.coalesce(ActiveInventory.unit_cost_avg, InventorySummary.unit_cost_avg, 0.0)
+        quantity_on_hand = func.coalesce(ActiveInventory.quantity_on_hand, 0.0)
+        quantity_allocated = func.coalesce(ActiveInventory.quantity_allocated, 0.0)
+        rows = db.session.execute(
+            select(
+                ActiveInventory.part_id,
+                PartDefinition.part_number,
+                PartDefinition.part_name,
+                func.sum(quantity_on_hand).label('total_quantity_on_hand'),
+                func.sum(quantity_allocated).label('total_quantity_allocated'),
+                func.sum(quantity_on_hand - quantity_allocated).label('total_quantity_available'),
+                func.sum(quantity_on_hand * unit_cost).label('total_value'),
+                func.count(func.distinct(Storeroom.major_location_id)).label('major_location_count'),
+                func.count(func.distinct(ActiveInventory.storeroom_id)).label('storeroom_count'),
+                func.count(ActiveInventory.id).label('bin_count'),
+                func.max(avg_cost.c.avg_cost).label('six_month_avg_cost'),
+            )
+            .join(Storeroom, ActiveInventory.storeroom_id == Storeroom.id)
+            .outerjoin(PartDefinition, ActiveInventory.part_id == PartDefinition.id)
+            .outerjoin(InventorySummary, ActiveInventory.part_id == InventorySummary.part_id)
+            .outerjoin(avg_cost, ActiveInventory.part_id == avg_cost.c.part_id)
+            .where(Storeroom.is_active == True)
+            .group_by(ActiveInventory.part_id, PartDefinition.part_number, PartDefinition.part_name)
+            .order_by(PartDefinition.part_number, ActiveInventory.part_id)
+        ).all()
+        parts = [dict(row._mapping) for row in rows]
 
+        counts = db.session.execute(select(
+            select(func.count(func.distinct(Storeroom.major_location_id)))
+            .where(Storeroom.is_active == True).scalar_subquery().label('location_count'),
+            select(func.count(func.distinct(ActiveInventory.storeroom_id)))
+            .join(Storeroom, ActiveInventory.storeroom_id == Storeroom.id)
+            .where(Storeroom.is_active == True).scalar_subquery().label('storeroom_count'),
+        )).one()
 
+        logger.debug(f"Global inventory summary recomputed for {len(parts)} parts")
+        return {
+            'parts': parts,
+            'totals': {
+                'total_value': float(sum(part['total_value'] or 0.0 for part in parts)),
+                'part_count': len(parts),
+                'location_count': counts.location_count or 0,
+                'storeroom_count': counts.storeroom_count or 0,
+                'computed_at': datetime.utcnow(),
+            },
+        }
 
 
+register_commit_invalidation(
+    (InventoryMovement, ActiveInventory, InventorySummary, Storeroom),
+    GlobalInventoryView.invalidate
+)
@@ -0,0 +1,205 @@
+"""
+Inventory Lineage Service
+
+Read-only traceability queries over the inventory movement chain.
+
+Movements link to the movement they continue through previous_movement_id,
+as written by InventoryManager: the "in" leg of a bin transfer or relocation
+points at its "out" leg, and an "out" leg or issue points at the latest
+movement into its source bin, back to the receipt of a part arrival.
+Each lookup walks the chain with one recursive CTE instead of loading
+previous_movement / subsequent_movements one row at a time, and returns
+plain dictionaries rather than ORM instances. Walks stop after max_depth
+links, which also bounds the query if a chain ever loops.
+"""
+
+from typing import Dict, Iterable, List, Optional, Any
+from sqlalchemy import bindparam, literal, select
+from sqlalchemy.orm import aliased
+from app import db
+from app.data.inventory.inventory import InventoryMovement, PartIssue
+from app.logger import get_logger
+
+logger = get_logger("asset_management.services.inventory.inventory_lineage")
+
+UPSTREAM = 'upstream'
+DOWNSTREAM = 'downstream'
+
+# What the ids passed to a lineage query identify
+SEED_MOVEMENT = 'movement'
+SEED_ARRIVAL = 'arrival'
+SEED_ISSUE = 'issue'
+
+
+class InventoryLineageService:
+    """
+    Service for movement lineage (traceability) queries.
+
+    Provides methods to get:
+    - the upstream chain of a movement or part issue (where the stock came from)
+    - the downstream chain of a movement or part arrival (where the stock went)
+    - upstream chains of many part issues at once (recall investigations)
+    """
+
+    DEFAULT_MAX_DEPTH = 100
+
+    # Seed ids per recursive query when tracing many issues
+    TRACE_CHUNK_SIZE = 500
+
+    _statements: Dict[tuple, Any] = {}
+
+    @classmethod
+    def get_movement_lineage(
+        cls,
+        movement_id: int,
+        direction: str = UPSTREAM,
+        max_depth: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the chain of movements before or after a movement.
+
+        Args:
+            movement_id: Inventory movement ID
+            direction: 'upstream' (previous movements) or 'downstream' (subsequent movements)
+            max_depth: Maximum number of links followed (default DEFAULT_MAX_DEPTH)
+
+        Returns:
+            List of movement dictionaries ordered by depth, the movement itself at depth 0
+        """
+        return cls._trace(SEED_MOVEMENT, [movement_id], direction, max_depth)
+
+    @classmethod
+    def get_arrival_lineage(cls, part_arrival_id: int, max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get everything that happened to the stock received by a part arrival.
+
+        Args:
+            part_arrival_id: Part arrival ID
+            max_depth: Maximum number of links followed from each receipt movement
+
+        Returns:
+            List of movement dictionaries ordered by depth; the arrival's receipt movements are at depth 0
+        """
+        return cls._trace(SEED_ARRIVAL, [part_arrival_id], DOWNSTREAM, max_depth)
+
+    @classmethod
+    def get_issue_lineage(cls, part_issue_id: int, max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the chain of movements that led to a part issue.
+
+        Args:
+            part_issue_id: Part issue ID
+            max_depth: Maximum number of links followed
+
+        Returns:
+            List of movement dictionaries ordered by depth; the issue movement is at depth 0
+        """
+        return cls._trace(SEED_ISSUE, [part_issue_id], UPSTREAM, max_depth)
+
+    @classmethod
+    def trace_issues(
+        cls,
+        part_issue_ids: Iterable[int],
+        max_depth: Optional[int] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Get the upstream chains of many part issues, one query per TRACE_CHUNK_SIZE issues.
+
+        Args:
+            part_issue_ids: Part issue IDs
+            max_depth: Maximum number of links followed per issue
+
+        Returns:
+            Dictionary of part issue ID to its chain (as get_issue_lineage); issues
+            without an inventory movement are left out
+        """
+        part_issue_ids = sorted(set(part_issue_ids))
+        chains = {}
+        for start in range(0, len(part_issue_ids), cls.TRACE_CHUNK_SIZE):
+            chunk = part_issue_ids[start:start + cls.TRACE_CHUNK_SIZE]
+            for row in cls._trace(SEED_ISSUE, chunk, UPSTREAM, max_depth):
+                chains.setdefault(row['root_id'], []).append(row)
+        logger.debug(f"Traced {len(chains)} of {len(part_issue_ids)} part issues")
+        return chains
+
+    @classmethod
+    def _trace(cls, seed: str, seed_ids: List[int], direction: str, max_depth: Optional[int]) -> List[Dict[str, Any]]:
+        """Walk the chain from the seed rows in one recursive query"""
+        if direction not in (UPSTREAM, DOWNSTREAM):
+            raise ValueError(f"direction must be '{UPSTREAM}' or '{DOWNSTREAM}'")
+        rows = db.session.execute(cls._get_statement(seed, direction), {
+            'seed_ids': list(seed_ids),
+            'max_depth': cls.DEFAULT_MAX_DEPTH if max_depth is None else max_depth,
+        }).mappings()
+        return [dict(row) for row in rows]
+
+    @classmethod
+    def _get_statement(cls, seed: str, direction: str):
+        """
+        Recursive lineage query for a seed kind and direction.
+
+        Built once per combination (constructing the CTE costs more than
+        running it for a single chain); seed_ids and max_depth are bound per call.
+        """
+        key = (seed, direction)
+        statement = cls._statements.get(key)
+        if statement is not None:
+            return statement
+
+        seed_ids = bindparam('seed_ids', expanding=True)
+        if seed == SEED_MOVEMENT:
+            seed_rows = select(InventoryMovement.id.label('root_id'), InventoryMovement.id.label('movement_id')) \
+                .where(InventoryMovement.id.in_(seed_ids))
+        elif seed == SEED_ARRIVAL:
+            seed_rows = select(InventoryMovement.part_arrival_id.label('root_id'), InventoryMovement.id.label('movement_id')) \
+                .where(InventoryMovement.part_arrival_id.in_(seed_ids))
+        else:
+            seed_rows = select(PartIssue.id.label('root_id'), PartIssue.inventory_movement_id.label('movement_id')) \
+                .where(PartIssue.id.in_(seed_ids))
+        seed_rows = seed_rows.subquery('seed')
+
+        anchor = select(
+            seed_rows.c.root_id,
+            literal(0).label('depth'),
+            *cls._row_columns(InventoryMovement)
+        ).join(seed_rows, InventoryMovement.id == seed_rows.c.movement_id)
+        lineage = anchor.cte('lineage', recursive=True)
+
+        step = aliased(InventoryMovement)
+        if direction == UPSTREAM:
+            link = step.id == lineage.c.previous_movement_id
+        else:
+            link = step.previous_movement_id == lineage.c.id
+        lineage = lineage.union_all(
+            select(
+                lineage.c.root_id,
+                (lineage.c.depth + 1).label('depth'),
+                *cls._row_columns(step)
+            ).join(lineage, link).where(lineage.c.depth < bindparam('max_depth'))
+        )
+
+        statement = select(lineage).order_by(lineage.c.root_id, lineage.c.depth, lineage.c.id)
+        cls._statements[key] = statement
+        return statement
+
+    @staticmethod
+    def _row_columns(movement):
+        """Columns returned per movement, labelled with attribute names"""
+        return (
+            movement.id.label('id'),
+            movement.previous_movement_id.label('previous_movement_id'),
+            movement.part_id.label('part_id'),
+            movement.movement_type.label('movement_type'),
+            movement.quantity_delta.label('quantity_delta'),
+            movement.unit_cost.label('unit_cost'),
+            movement.movement_date.label('movement_date'),
+            movement.from_storeroom_id.label('from_storeroom_id'),
+            movement.from_location_id.label('from_location_id'),
+            movement.from_bin_id.label('from_bin_id'),
+            movement.to_storeroom_id.label('to_storeroom_id'),
+            movement.to_location_id.label('to_location_id'),
+            movement.to_bin_id.label('to_bin_id'),
+            movement.part_arrival_id.label('part_arrival_id'),
+            movement.initial_arrival_id.label('initial_arrival_id'),
+            movement.part_issue_id.label('part_issue_id'),
+        )
@@ -5,7 +5,7 @@ Presentation service for inventory movement history and traceability queries.
 
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
-from flask_sqlalchemy.pagination import Pagination
+from app.services.keyset_pagination import KeysetPage, keyset_paginate
 from app.data.inventory.inventory import InventoryMovement
 from app.data.core.major_location import MajorLocation
 from app.data.core.supply.part_definition import PartDefinition
@@ -23,7 +23,7 @@ class InventoryMovementService:
     
     @staticmethod
     def get_list_data(
-        page: int = 1,
+        cursor: Optional[str] = None,
         per_page: int = 50,
         part_id: Optional[int] = None,
         part_number: Optional[str] = None,
@@ -34,12 +34,12 @@ class InventoryMovementService:
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         search: Optional[str] = None
-    ) -> Tuple[Pagination, Dict[str, Any]]:
+    ) -> Tuple[KeysetPage, Dict[str, Any]]:
         """
-        Get paginated inventory movements with filters.
+        Get keyset-paginated inventory movements with filters.
         
         Args:
-            page: Page number
+            cursor: Pagination cursor from the previous page (None for the first page)
             per_page: Items per page
             part_id: Filter by part ID
             part_number: Filter by part number (partial match)
@@ -98,11 +98,15 @@ class InventoryMovementService:
         if date_to:
             query = query.filter(InventoryMovement.movement_date <= date_to)
         
-        # Order by movement date (most recent first)
-        query = query.order_by(InventoryMovement.movement_date.desc())
-        
-        # Pagination
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Paginate on (movement_date, id), most recent first
+        pagination = keyset_paginate(
+            query,
+            InventoryMovement.movement_date,
+            InventoryMovement.id,
+            cursor=cursor,
+            per_page=per_page,
+            with_total=True
+        )
         
         # Get form options
         from app.data.core.major_location import MajorLocation
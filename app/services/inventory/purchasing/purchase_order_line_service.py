@@ -5,7 +5,6 @@ Service for building queries and retrieving data for purchase order line viewing
 
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
-from flask_sqlalchemy.pagination import Pagination
 from sqlalchemy import or_, and_, exists, select, func
 from sqlalchemy.orm import Query, joinedload
 from app import db
@@ -17,6 +16,7 @@ from app.data.maintenance.base.actions import Action
 from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
 from app.data.core.supply.part_definition import PartDefinition
 from app.data.core.user_info.user import User
+from app.services.keyset_pagination import KeysetPage, keyset_paginate
 
 
 class PurchaseOrderLineService:
@@ -150,51 +150,66 @@ class PurchaseOrderLineService:
         # ORDERING
         # ============================================================================
         
-        # Handle ordering
-        if order_by == 'part_number':
+        # Handle ordering (joins needed by the order column)
+        if order_by in ('part_number', 'part_name'):
             if not (part_number or part_name):
                 query = query.join(PartDefinition, PurchaseOrderLine.part_id == PartDefinition.id)
-            order_col = PartDefinition.part_number
-        elif order_by == 'part_name':
-            if not (part_number or part_name):
-                query = query.join(PartDefinition, PurchaseOrderLine.part_id == PartDefinition.id)
-            order_col = PartDefinition.part_name
-        elif order_by == 'vendor':
+        elif order_by in ('vendor', 'order_date'):
             if not (vendor or date_from or date_to or created_by_id):
                 query = query.join(PurchaseOrderHeader, PurchaseOrderLine.purchase_order_id == PurchaseOrderHeader.id)
-            order_col = PurchaseOrderHeader.vendor_name
-        elif order_by == 'order_date':
-            if not (vendor or date_from or date_to or created_by_id):
-                query = query.join(PurchaseOrderHeader, PurchaseOrderLine.purchase_order_id == PurchaseOrderHeader.id)
-            order_col = PurchaseOrderHeader.order_date
-        elif order_by == 'status':
-            order_col = PurchaseOrderLine.status
-        else:  # Default: created_at
-            order_col = PurchaseOrderLine.created_at
         
+        order_col = PurchaseOrderLineService.get_order_column(order_by)
+        
+        # Ties are broken by id so ordering is stable across pages
         if order_direction == 'asc':
-            query = query.order_by(order_col.asc())
+            query = query.order_by(order_col.asc(), PurchaseOrderLine.id.asc())
         else:
-            query = query.order_by(order_col.desc())
+            query = query.order_by(order_col.desc(), PurchaseOrderLine.id.desc())
         
         return query
     
+    @staticmethod
+    def get_order_column(order_by: Optional[str] = None):
+        """
+        Get the column a PO line list is ordered by.
+        
+        Part and header columns require the query built by build_po_lines_query,
+        which adds the matching joins.
+        
+        Args:
+            order_by: Order field name (defaults to created_at)
+            
+        Returns:
+            SQLAlchemy column
+        """
+        return {
+            'part_number': PartDefinition.part_number,
+            'part_name': PartDefinition.part_name,
+            'vendor': PurchaseOrderHeader.vendor_name,
+            'order_date': PurchaseOrderHeader.order_date,
+            'status': PurchaseOrderLine.status,
+        }.get(order_by, PurchaseOrderLine.created_at)
+    
     @staticmethod
     def get_po_lines_with_enhanced_data(
         query: Query,
-        page: int = 1,
-        per_page: int = 20
-    ) -> Pagination:
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        order_by: str = 'created_at',
+        order_direction: str = 'desc'
+    ) -> KeysetPage:
         """
-        Get paginated purchase order lines with enhanced relationship data.
+        Get keyset-paginated purchase order lines with enhanced relationship data.
         
         Args:
-            query: SQLAlchemy query object
-            page: Page number
+            query: SQLAlchemy query object from build_po_lines_query
+            cursor: Pagination cursor from the previous page (None for the first page)
             per_page: Items per page
+            order_by: Order field the query was built with
+            order_direction: Order direction the query was built with
             
         Returns:
-            Pagination object with enhanced PO line data
+            KeysetPage with enhanced PO line data
         """
         # Eager load relationships to avoid N+1 queries
         # Note: part_demands is a dynamic relationship, so we can't eager load it
@@ -203,7 +218,15 @@ class PurchaseOrderLineService:
             joinedload(PurchaseOrderLine.part)
         )
         
-        return query.paginate(page=page, per_page=per_page, error_out=False)
+        return keyset_paginate(
+            query,
+            PurchaseOrderLineService.get_order_column(order_by),
+            PurchaseOrderLine.id,
+            cursor=cursor,
+            per_page=per_page,
+            descending=order_direction != 'asc',
+            with_total=True
+        )
     
     @staticmethod
     def get_po_line_by_id(po_line_id: int) -> Optional[PurchaseOrderLine]:
@@ -0,0 +1,300 @@
+"""
+Keyset Pagination
+Reusable seek-based pagination for list views.
+
+Unlike query.paginate(), which runs OFFSET scans plus a full COUNT(*) on every
+page, keyset pagination remembers the (sort value, id) of the last row shown
+and asks the database for rows after it. Every page costs the same no matter
+how deep it is.
+
+- Ordering is always stable on (sort column, id)
+- Cursors are opaque URL-safe strings; a malformed cursor falls back to page one
+- NULL sort values are ordered last in both directions
+- The total is optional and bounded: counting stops at total_cap rows and the
+  page then reports an approximate total such as "1,000+"
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from flask import request, url_for
+from sqlalchemy import func, tuple_
+
+from app import db
+from app.logger import get_logger
+
+logger = get_logger("asset_management.services.keyset_pagination")
+
+DEFAULT_TOTAL_CAP = 1000
+
+# Query-string parameter carrying the cursor
+CURSOR_ARG = 'cursor'
+
+
+class KeysetPage:
+    """
+    One page of keyset-paginated results.
+
+    Exposes items, per_page and total like Flask-SQLAlchemy's Pagination so
+    templates that only list items keep working.
+    """
+
+    def __init__(
+        self,
+        items: List[Any],
+        per_page: int,
+        next_cursor: Optional[str] = None,
+        prev_cursor: Optional[str] = None,
+        total: Optional[int] = None,
+        total_is_estimate: bool = False
+    ):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    @property
+    def total_display(self) -> str:
+        """Total formatted for display, e.g. '123' or '1,000+'"""
+        if self.total is None:
+            return ''
+        return f"{self.total:,}+" if self.total_is_estimate else f"{self.total:,}"
+
+    def url_for_cursor(self, cursor: Optional[str]) -> str:
+        """
+        Build a URL for the current endpoint with the given cursor.
+
+        Keeps every other query-string argument (filters, ordering) and drops
+        any page number left over from offset pagination.
+        """
+        args = request.args.to_dict(flat=False)
+        args.pop(CURSOR_ARG, None)
+        args.pop('page', None)
+        if cursor:
+            args[CURSOR_ARG] = cursor
+        return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    def first_url(self) -> str:
+        return self.url_for_cursor(None)
+
+    def next_url(self) -> Optional[str]:
+        return self.url_for_cursor(self.next_cursor) if self.has_next else None
+
+    def prev_url(self) -> Optional[str]:
+        return self.url_for_cursor(self.prev_cursor) if self.has_prev else None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+        raise ValueError(f"Unknown cursor value type: {value}")
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: int, direction: str = 'next') -> str:
+    """
+    Encode a (sort value, id) position into an opaque cursor string.
+
+    Args:
+        sort_value: Sort column value of the boundary row
+        row_id: ID of the boundary row
+        direction: 'next' (rows after the position) or 'prev' (rows before it)
+    """
+    payload = json.dumps([direction, _encode_value(sort_value), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, int]:
+    """
+    Decode a cursor string.
+
+    Returns:
+        Tuple of (direction, sort value, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception as e:
+        raise ValueError(f"Invalid pagination cursor: {e}")
+    if direction not in ('next', 'prev') or not isinstance(row_id, int):
+        raise ValueError("Invalid pagination cursor")
+    return direction, _decode_value(sort_value), row_id
+
+
+def _is_nullable(column) -> bool:
+    """Best-effort check whether a sort expression can be NULL"""
+    expression = getattr(column, 'expression', column)
+    return getattr(expression, 'nullable', True)
+
+
+def _fetch_segment(query, sort_column, id_column, null_segment, position, ascending, limit):
+    """
+    Fetch rows from one segment of the ordering.
+
+    Rows with a non-NULL sort value and rows with a NULL sort value are read
+    with separate queries so each one can seek through an index on
+    (sort column, id) instead of scanning past earlier pages.
+
+    Args:
+        null_segment: Read the NULL segment (ordered by id only)
+        position: (sort value, id) to seek past, or None to start at the edge
+        ascending: Read direction
+        limit: Maximum rows to return
+    """
+    if null_segment:
+        query = query.filter(sort_column.is_(None))
+        if position is not None:
+            query = query.filter(id_column > position[1] if ascending else id_column < position[1])
+        order = [id_column.asc() if ascending else id_column.desc()]
+    else:
+        if position is not None:
+            boundary = tuple_(sort_column, id_column)
+            query = query.filter(boundary > tuple_(*position) if ascending else boundary < tuple_(*position))
+        else:
+            query = query.filter(sort_column.isnot(None))
+        if ascending:
+            order = [sort_column.asc(), id_column.asc()]
+        else:
+            order = [sort_column.desc(), id_column.desc()]
+
+    return (
+        query
+        .order_by(*order)
+        .add_columns(sort_column.label('keyset_sort_value'), id_column.label('keyset_id_value'))
+        .limit(limit)
+        .all()
+    )
+
+
+def keyset_paginate(
+    query,
+    sort_column,
+    id_column,
+    cursor: Optional[str] = None,
+    per_page: int = 20,
+    descending: bool = True,
+    with_total: bool = False,
+    total_cap: int = DEFAULT_TOTAL_CAP,
+    nullable: Optional[bool] = None
+) -> KeysetPage:
+    """
+    Fetch one page of a query using keyset pagination.
+
+    Any ORDER BY already on the query is replaced by (sort_column, id_column),
+    with NULL sort values last. The query must return a single entity (joins
+    and eager loads are fine).
+
+    Args:
+        query: SQLAlchemy ORM query with filters applied
+        sort_column: Column or expression to order by
+        id_column: Unique tie-breaker column (normally the primary key)
+        cursor: Cursor from a previous page, or None for the first page
+        per_page: Rows per page
+        descending: Sort newest/largest first
+        with_total: Also count matching rows (bounded by total_cap)
+        total_cap: Stop counting after this many rows and report an estimate
+        nullable: Whether sort_column can be NULL (inferred from the column if None)
+
+    Returns:
+        KeysetPage
+    """
+    per_page = max(1, per_page)
+    if nullable is None:
+        nullable = _is_nullable(sort_column)
+
+    direction, position = 'next', None
+    if cursor:
+        try:
+            direction, sort_value, row_id = decode_cursor(cursor)
+            position = (sort_value, row_id)
+        except ValueError as e:
+            logger.warning(f"{e}; showing first page")
+            cursor = None
+
+    base_query = query.order_by(None)
+
+    total, total_is_estimate = None, False
+    if with_total:
+        capped = base_query.with_entities(id_column).limit(total_cap + 1).subquery()
+        total = db.session.query(func.count()).select_from(capped).scalar()
+        if total > total_cap:
+            total, total_is_estimate = total_cap, True
+
+    # The logical order is the non-NULL segment followed by the NULL segment.
+    # Going backwards reads both segments in reverse, NULL segment first.
+    backwards = direction == 'prev'
+    ascending = descending == backwards
+    in_null_segment = position is not None and position[0] is None
+    if backwards:
+        segments = [True, False] if in_null_segment else [False]
+    else:
+        segments = [True] if in_null_segment else [False, True]
+    if not nullable:
+        segments = [segment for segment in segments if not segment]
+
+    limit = per_page + 1
+    rows = []
+    for null_segment in segments:
+        # The cursor position only applies to the segment it points into
+        segment_position = position if null_segment == in_null_segment else None
+        rows.extend(_fetch_segment(
+            base_query, sort_column, id_column, null_segment, segment_position, ascending, limit - len(rows)
+        ))
+        if len(rows) >= limit:
+            break
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    items = [row[0] for row in rows]
+    next_cursor = prev_cursor = None
+    if rows:
+        first, last = rows[0], rows[-1]
+        # Coming back from a later page means there is always a next page,
+        # and any cursor means we are past the first page
+        if has_more or backwards:
+            next_cursor = encode_cursor(last.keyset_sort_value, last.keyset_id_value, 'next')
+        if (has_more and backwards) or (cursor and not backwards):
+            prev_cursor = encode_cursor(first.keyset_sort_value, first.keyset_id_value, 'prev')
+
+    return KeysetPage(
+        items=items,
+        per_page=per_page,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        total=total,
+        total_is_estimate=total_is_estimate
+    )
@@ -5,10 +5,12 @@ Presentation services for maintenance domain entities
 
 from .base import MaintenanceQueryService
 from .template_builder_service import TemplateBuilderService
+from .availability_service import AvailabilityService
 
 __all__ = [
     'MaintenanceQueryService',
     'TemplateBuilderService',
+    'AvailabilityService',
 ]
 
 
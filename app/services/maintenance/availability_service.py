@@ -0,0 +1,314 @@
+"""
+Availability Service
+Presentation service for asset availability and downtime analytics built
+from maintenance blocker intervals.
+
+Handles:
+- Loading the blocker intervals that overlap a time window in one query
+- Unioning overlapping intervals per asset, so two blockers open at the
+  same time count once
+- Downtime hours and percentage of time per mission capability level, per
+  asset, asset type and location
+- Caching reports by window, invalidated when blockers are committed
+  (app.utils.commit_invalidation). Reports expire after
+  AVAILABILITY_STATS_TTL seconds regardless, which also covers assets
+  moving between types and locations
+
+Time is attributed to the worst level active at that moment, the same rule
+MaintenanceBlockerManager uses for Asset.mission_capability_status: the
+union of intervals at level L or worse, minus the union at levels worse
+than L, is the time spent at exactly L. Open blockers count up to now.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import current_app, has_app_context
+from sqlalchemy import func, or_, select
+
+from app import db
+from app.data.core.asset_info.asset import Asset
+from app.data.core.asset_info.asset_type import AssetType
+from app.data.core.asset_info.make_model import MakeModel
+from app.data.core.event_info.event import Event
+from app.data.core.major_location import MajorLocation
+from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+from app.data.maintenance.base.maintenance_blockers import MaintenanceBlocker
+from app.logger import get_logger
+from app.utils.commit_invalidation import register as register_commit_invalidation
+
+logger = get_logger("asset_management.services.maintenance.availability")
+
+
+class AvailabilityService:
+    """
+    Service for cached downtime reports over a time window.
+
+    Provides methods for:
+    - Building (or reading the cached) report for a window
+    - Default and previous-quarter windows
+    - Invalidating the cache
+    """
+
+    # Downtime levels, worst first: (code, mission capability status)
+    LEVELS = (
+        ('NMC', 'Non Mission Capable'),
+        ('PMC', 'Partially Mission Capable - Functional Limitations'),
+        ('MCW', 'Mission Capable - Temporary Procedural or Hardware Work Arounds'),
+        ('MCI', 'Mission Capable - Ignorable Damage or Issue'),
+    )
+
+    DEFAULT_WINDOW_DAYS = 90
+    DEFAULT_TTL_SECONDS = 300
+
+    # Windows kept in the cache (least recently used are dropped)
+    MAX_CACHED_WINDOWS = 16
+
+    _reports: 'OrderedDict[Tuple[datetime, datetime], Tuple[float, Dict]]' = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_report(cls, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict:
+        """
+        Get the downtime report for a window, computing it if not cached.
+
+        Args:
+            start: Window start (default: DEFAULT_WINDOW_DAYS before end)
+            end: Window end (default: start of tomorrow, UTC)
+
+        Returns:
+            Dictionary with the window, 'levels', and 'fleet', 'by_asset_type',
+            'by_location' and 'by_asset' rows. Each row has 'asset_count',
+            'downtime_hours' and 'percent' per level code,
+            'total_downtime_hours' and 'availability_percent'. by_asset only
+            lists assets with downtime, most downtime first.
+
+        Raises:
+            ValueError: If the window is empty
+        """
+        if end is None:
+            end = cls.default_window()[1]
+        if start is None:
+            start = end - timedelta(days=cls.DEFAULT_WINDOW_DAYS)
+        if start >= end:
+            raise ValueError("Window start must be before its end")
+
+        key = (start, end)
+        with cls._lock:
+            cached = cls._reports.get(key)
+            if cached is not None and time.monotonic() < cached[0]:
+                cls._reports.move_to_end(key)
+                return cached[1]
+
+        report = cls._compute_report(start, end, datetime.utcnow())
+        with cls._lock:
+            cls._reports[key] = (time.monotonic() + cls._get_ttl(), report)
+            cls._reports.move_to_end(key)
+            while len(cls._reports) > cls.MAX_CACHED_WINDOWS:
+                cls._reports.popitem(last=False)
+        return report
+
+    @classmethod
+    def default_window(cls) -> Tuple[datetime, datetime]:
+        """The last DEFAULT_WINDOW_DAYS days, ending at the start of tomorrow (UTC)"""
+        end = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        return end - timedelta(days=cls.DEFAULT_WINDOW_DAYS), end
+
+    @staticmethod
+    def previous_quarter(moment: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+        """Start and end of the calendar quarter before the one containing moment"""
+        moment = moment or datetime.utcnow()
+        quarter_start_month = (moment.month - 1) // 3 * 3 + 1
+        end = datetime(moment.year, quarter_start_month, 1)
+        if quarter_start_month == 1:
+            return datetime(moment.year - 1, 10, 1), end
+        return datetime(moment.year, quarter_start_month - 3, 1), end
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop every cached report so the next read recomputes it."""
+        with cls._lock:
+            cls._reports.clear()
+        logger.debug("Availability report cache invalidated")
+
+    @classmethod
+    def _get_ttl(cls) -> float:
+        if has_app_context():
+            return current_app.config.get('AVAILABILITY_STATS_TTL', cls.DEFAULT_TTL_SECONDS)
+        return cls.DEFAULT_TTL_SECONDS
+
+    @classmethod
+    def _compute_report(cls, start: datetime, end: datetime, now: datetime) -> Dict:
+        """Build the report from the blocker intervals overlapping the window"""
+        # Downtime can only have happened up to now
+        elapsed_end = min(end, now)
+        elapsed_seconds = max((elapsed_end - start).total_seconds(), 0.0)
+
+        fleet = db.session.execute(
+            select(Asset.id, Asset.name, MakeModel.asset_type_id, Asset.major_location_id)
+            .join(MakeModel, Asset.make_model_id == MakeModel.id)
+        ).all()
+        asset_index = {row.id: index for index, row in enumerate(fleet)}
+
+        asset_rows, levels, starts, ends = cls._load_intervals(start, elapsed_end, asset_index)
+        level_count = len(cls.LEVELS)
+        at_or_worse = [
+            cls._union_seconds(asset_rows, starts, ends, levels <= level, len(fleet))
+            for level in range(level_count)
+        ]
+
+        # Seconds at exactly each level, per asset with downtime
+        downtime = {}
+        for row_index in sorted(set(int(value) for value in asset_rows)):
+            seconds = [float(at_or_worse[level][row_index]) for level in range(level_count)]
+            exact = [seconds[0]] + [seconds[level] - seconds[level - 1] for level in range(1, level_count)]
+            downtime[row_index] = exact
+
+        asset_type_names = dict(db.session.query(AssetType.id, AssetType.name))
+        location_names = dict(db.session.query(MajorLocation.id, MajorLocation.name))
+        totals = {'fleet': [0.0] * level_count}
+        type_totals: Dict[Optional[int], List[float]] = {}
+        location_totals: Dict[Optional[int], List[float]] = {}
+        type_counts: Dict[Optional[int], int] = {}
+        location_counts: Dict[Optional[int], int] = {}
+        for row in fleet:
+            type_counts[row.asset_type_id] = type_counts.get(row.asset_type_id, 0) + 1
+            location_counts[row.major_location_id] = location_counts.get(row.major_location_id, 0) + 1
+        for row_index, exact in downtime.items():
+            row = fleet[row_index]
+            for group, key in ((type_totals, row.asset_type_id), (location_totals, row.major_location_id)):
+                group_seconds = group.setdefault(key, [0.0] * level_count)
+                for level in range(level_count):
+                    group_seconds[level] += exact[level]
+            for level in range(level_count):
+                totals['fleet'][level] += exact[level]
+
+        def report_row(row_id, name, asset_count, seconds):
+            return cls._report_row(row_id, name, asset_count, seconds or [0.0] * level_count, elapsed_seconds)
+
+        by_asset = [
+            report_row(fleet[row_index].id, fleet[row_index].name, 1, exact)
+            for row_index, exact in downtime.items()
+        ]
+        by_asset.sort(key=lambda item: item['total_downtime_hours'], reverse=True)
+
+        logger.debug(f"Availability report computed for {start} - {end}: {len(starts)} intervals")
+        return {
+            'window_start': start,
+            'window_end': end,
+            'window_hours': (end - start).total_seconds() / 3600,
+            'elapsed_hours': elapsed_seconds / 3600,
+            'computed_at': now,
+            'interval_count': len(starts),
+            'levels': [{'code': code, 'status': status} for code, status in cls.LEVELS],
+            'fleet': report_row(None, 'Fleet', len(fleet), totals['fleet']),
+            'by_asset_type': sorted(
+                (report_row(type_id, asset_type_names.get(type_id, 'Unknown'), count, type_totals.get(type_id))
+                 for type_id, count in type_counts.items()),
+                key=lambda item: item['name']
+            ),
+            'by_location': sorted(
+                (report_row(location_id, location_names.get(location_id, 'No location'), count,
+                            location_totals.get(location_id))
+                 for location_id, count in location_counts.items()),
+                key=lambda item: item['name']
+            ),
+            'by_asset': by_asset,
+        }
+
+    @classmethod
+    def _report_row(cls, row_id, name: str, asset_count: int, seconds: Sequence[float], elapsed_seconds: float) -> Dict:
+        capacity = asset_count * elapsed_seconds
+        total = sum(seconds)
+        return {
+            'id': row_id,
+            'name': name,
+            'asset_count': asset_count,
+            'downtime_hours': {code: value / 3600 for (code, _), value in zip(cls.LEVELS, seconds)},
+            'percent': {
+                code: (value / capacity * 100 if capacity else 0.0)
+                for (code, _), value in zip(cls.LEVELS, seconds)
+            },
+            'total_downtime_hours': total / 3600,
+            'availability_percent': (1 - total / capacity) * 100 if capacity else 100.0,
+        }
+
+    @classmethod
+    def _load_intervals(cls, start: datetime, end: datetime, asset_index: Dict[int, int]):
+        """
+        Blocker intervals overlapping [start, end), clipped to it.
+
+        Returns:
+            (asset row indexes, level indexes, start and end seconds from the
+            window start), as arrays
+        """
+        level_index = {status: index for index, (_, status) in enumerate(cls.LEVELS)}
+        blocker_start = func.coalesce(MaintenanceBlocker.start_date, MaintenanceBlocker.created_at)
+        rows = db.session.execute(
+            select(Event.asset_id, MaintenanceBlocker.mission_capability_status, blocker_start, MaintenanceBlocker.end_date)
+            .join(MaintenanceActionSet, MaintenanceBlocker.maintenance_action_set_id == MaintenanceActionSet.id)
+            .join(Event, MaintenanceActionSet.event_id == Event.id)
+            .where(
+                Event.asset_id.isnot(None),
+                MaintenanceBlocker.mission_capability_status.in_(list(level_index)),
+                blocker_start < end,
+                or_(MaintenanceBlocker.end_date.is_(None), MaintenanceBlocker.end_date > start)
+            )
+        ).all()
+
+        asset_rows, levels, starts, ends = [], [], [], []
+        window_seconds = (end - start).total_seconds()
+        for asset_id, status, blocker_start_date, blocker_end_date in rows:
+            row_index = asset_index.get(asset_id)
+            if row_index is None or blocker_start_date is None:
+                continue
+            interval_start = max((blocker_start_date - start).total_seconds(), 0.0)
+            interval_end = window_seconds if blocker_end_date is None else \
+                min((blocker_end_date - start).total_seconds(), window_seconds)
+            if interval_end <= interval_start:
+                continue
+            asset_rows.append(row_index)
+            levels.append(level_index[status])
+            starts.append(interval_start)
+            ends.append(interval_end)
+
+        return (np.array(asset_rows, dtype=np.int64), np.array(levels, dtype=np.int64),
+                np.array(starts, dtype=np.float64), np.array(ends, dtype=np.float64))
+
+    @staticmethod
+    def _union_seconds(asset_rows, starts, ends, selected, asset_count: int):
+        """
+        Length of the union of the selected intervals, per asset.
+
+        Intervals are shifted by asset_row * span (span exceeds every end),
+        so after one sort by shifted start all intervals of an asset are
+        contiguous and a running maximum of the shifted ends never carries
+        over from one asset to the next. An interval starting after the
+        running maximum of the ends before it opens a new merged interval.
+        """
+        asset_rows = np.asarray(asset_rows)[selected]
+        if not len(asset_rows):
+            return np.zeros(asset_count)
+        span = float(np.max(np.asarray(ends))) + 1.0
+        shifted_starts = np.asarray(starts)[selected] + asset_rows * span
+        shifted_ends = np.asarray(ends)[selected] + asset_rows * span
+
+        order = np.argsort(shifted_starts, kind='stable')
+        shifted_starts = shifted_starts[order]
+        shifted_ends = shifted_ends[order]
+        asset_rows = asset_rows[order]
+
+        reach = np.maximum.accumulate(shifted_ends)
+        opens = np.empty(len(shifted_starts), dtype=bool)
+        opens[0] = True
+        opens[1:] = shifted_starts[1:] > reach[:-1]
+        open_positions = np.flatnonzero(opens)
+        merged = np.maximum.reduceat(shifted_ends, open_positions) - shifted_starts[open_positions]
+        return np.bincount(asset_rows[open_positions], weights=merged, minlength=asset_count)
+
+
+register_commit_invalidation((MaintenanceBlocker,), AvailabilityService.invalidate)
@@ -11,8 +11,7 @@ Provides:
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from flask import Request
-from flask_sqlalchemy.pagination import Pagination
-from sqlalchemy import func, select, case, or_, and_, exists, desc, asc
+from sqlalchemy import func, select, case, or_, and_, exists
 from sqlalchemy.orm import joinedload, selectinload, Query
 from app import db
 from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
@@ -23,6 +22,7 @@ from app.data.core.asset_info.asset import Asset
 from app.data.core.asset_info.make_model import MakeModel
 from app.data.core.major_location import MajorLocation
 from app.data.core.user_info.user import User
+from app.services.keyset_pagination import KeysetPage, keyset_paginate
 
 
 class EventPortalService:
@@ -159,71 +159,55 @@ class EventPortalService:
         # ORDERING
         # ============================================================================
         
-        # Special handling for ordering by last_comment_date
+        order_column = EventPortalService.get_order_column(order_by, has_comments_by)
+        
+        # NULLs last in both directions; ties broken by id so ordering is stable across pages
+        if order_direction == 'desc':
+            query = query.order_by(order_column.desc().nulls_last(), MaintenanceActionSet.id.desc())
+        else:
+            query = query.order_by(order_column.asc().nulls_last(), MaintenanceActionSet.id.asc())
+        
+        return query
+    
+    @staticmethod
+    def get_order_column(order_by: str = 'created_at', has_comments_by: Optional[int] = None):
+        """
+        Get the expression maintenance events are ordered by.
+        
+        last_comment_date is a correlated subquery (latest visible comment on the
+        event, optionally only comments by has_comments_by); anything else is a
+        MaintenanceActionSet column, defaulting to created_at.
+        
+        Returns:
+            SQLAlchemy column or scalar subquery
+        """
         if order_by == 'last_comment_date':
-            # Create subquery for last comment date per event
-            # If has_comments_by is set, only consider comments by that user
             comment_filter = Comment.user_viewable.is_(None)  # Only visible comments
             if has_comments_by:
-                comment_filter = and_(
-                    Comment.user_viewable.is_(None),
-                    Comment.created_by_id == has_comments_by
-                )
-            
-            last_comment_subq = (
-                select(
-                    Comment.event_id,
-                    func.max(Comment.created_at).label('last_comment_date')
-                )
-                .where(comment_filter)
-                .group_by(Comment.event_id)
-                .subquery()
-            )
-            
-            # Join with the subquery and order by last comment date
-            query = query.join(Event, MaintenanceActionSet.event_id == Event.id)
-            query = query.outerjoin(
-                last_comment_subq,
-                Event.id == last_comment_subq.c.event_id
+                comment_filter = and_(comment_filter, Comment.created_by_id == has_comments_by)
+            return (
+                select(func.max(Comment.created_at))
+                .where(Comment.event_id == MaintenanceActionSet.event_id, comment_filter)
+                .correlate(MaintenanceActionSet)
+                .scalar_subquery()
             )
-            
-            # Use CASE to handle NULLs (put them last)
-            if order_direction == 'desc':
-                query = query.order_by(
-                    case(
-                        (last_comment_subq.c.last_comment_date.is_(None), 1),
-                        else_=0
-                    ),
-                    desc(last_comment_subq.c.last_comment_date),
-                    desc(MaintenanceActionSet.created_at)  # Secondary sort
-                )
-            else:
-                query = query.order_by(
-                    case(
-                        (last_comment_subq.c.last_comment_date.is_(None), 1),
-                        else_=0
-                    ),
-                    asc(last_comment_subq.c.last_comment_date),
-                    asc(MaintenanceActionSet.created_at)  # Secondary sort
-                )
-        else:
-            # Standard ordering by MaintenanceActionSet columns
-            order_column = getattr(MaintenanceActionSet, order_by, MaintenanceActionSet.created_at)
-            if order_direction == 'desc':
-                query = query.order_by(order_column.desc())
-            else:
-                query = query.order_by(order_column.asc())
         
-        return query
+        order_column = getattr(MaintenanceActionSet, order_by, None)
+        if order_column is None or not hasattr(order_column, 'desc'):
+            order_column = MaintenanceActionSet.created_at
+        return order_column
     
     @staticmethod
     def get_events_with_enhanced_data(
         query: Query,
-        page: int = 1,
-        per_page: int = 20
-    ) -> Pagination:
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        order_by: str = 'created_at',
+        order_direction: str = 'desc',
+        has_comments_by: Optional[int] = None
+    ) -> KeysetPage:
         """
-        Execute query with pagination and add enhanced data to each event.
+        Execute query with keyset pagination and add enhanced data to each event.
         
         Enhanced data includes:
         - assigned_user (User object)
@@ -236,8 +220,10 @@ class EventPortalService:
         - last_comment_date (datetime or None)
         - last_comment_by (User or None)
         
+        The order arguments must match the ones the query was built with.
+        
         Returns:
-            Flask-SQLAlchemy Pagination object with enhanced items
+            KeysetPage with enhanced items
         """
         # Add eager loading for relationships
         query = query.options(
@@ -250,10 +236,14 @@ class EventPortalService:
         )
         
         # Paginate
-        pagination = query.paginate(
-            page=page,
+        pagination = keyset_paginate(
+            query,
+            EventPortalService.get_order_column(order_by, has_comments_by),
+            MaintenanceActionSet.id,
+            cursor=cursor,
             per_page=per_page,
-            error_out=False
+            descending=order_direction == 'desc',
+            with_total=True
         )
         
         # Get event IDs for batch queries
@@ -453,11 +443,6 @@ class EventPortalService:
             except ValueError:
                 pass
         
-        # Get page number
-        page = request.args.get('page', 1, type=int)
-        if page < 1:
-            page = 1
-        
         return {
             'status': request.args.get('status') or None,
             'priority': request.args.get('priority') or None,
@@ -473,7 +458,7 @@ class EventPortalService:
             'search_term': request.args.get('search') or None,
             'order_by': request.args.get('order_by', 'created_at'),
             'order_direction': request.args.get('order_direction', 'desc'),
-            'page': page,
+            'cursor': request.args.get('cursor') or None,
         }
     
     @staticmethod
@@ -486,6 +471,6 @@ class EventPortalService:
         """
         active = {}
         for key, value in filters.items():
-            if value is not None and key != 'page' and key != 'order_by' and key != 'order_direction':
+            if value is not None and key != 'cursor' and key != 'order_by' and key != 'order_direction':
                 active[key] = value
         return active
@@ -0,0 +1,242 @@
+"""
+Maintenance Due Service
+Service layer for "what is due" queries over the maintenance due index.
+Answers date and meter range questions for the manager and fleet views
+without running the planner.
+"""
+
+from typing import Dict, Any, Optional, List
+from datetime import datetime, timedelta
+from sqlalchemy import and_, case, exists, func, or_, select
+from app.data.maintenance.planning.maintenance_due_index import MaintenanceDueIndex
+from app.data.maintenance.planning.maintenance_plans import MaintenancePlan
+from app.data.maintenance.base.maintenance_action_sets import MaintenanceActionSet
+from app.data.core.asset_info.asset import Asset
+from app import db
+
+
+class MaintenanceDueService:
+    """
+    Service for due-work range queries.
+
+    Rows come from MaintenanceDueIndex (kept current by MaintenancePlanner)
+    joined to active plans. Meter thresholds are compared with the asset's
+    live meter, so meter updates show up without re-planning.
+    """
+
+    # Remaining meter units until the next due meter value (live asset meter)
+    _current_meter = case(
+        (MaintenanceDueIndex.meter_field == 'meter1', Asset.meter1),
+        (MaintenanceDueIndex.meter_field == 'meter2', Asset.meter2),
+        (MaintenanceDueIndex.meter_field == 'meter3', Asset.meter3),
+        (MaintenanceDueIndex.meter_field == 'meter4', Asset.meter4),
+        else_=None
+    )
+    _meter_remaining = MaintenanceDueIndex.next_due_meter - _current_meter
+
+    # Pair already has an open (Planned, In Progress or Blocked) event
+    _has_open_event = exists().where(
+        MaintenanceActionSet.asset_id == MaintenanceDueIndex.asset_id,
+        MaintenanceActionSet.maintenance_plan_id == MaintenanceDueIndex.maintenance_plan_id,
+        MaintenanceActionSet.status.in_(MaintenanceActionSet.OPEN_STATUSES)
+    )
+
+    @staticmethod
+    def get_due_between(
+        start: Optional[datetime],
+        end: datetime,
+        asset_type_id: Optional[int] = None,
+        maintenance_plan_id: Optional[int] = None,
+        include_scheduled: bool = True,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get (asset, plan) pairs whose next due date falls in a date range.
+
+        Args:
+            start: Start of the range (None includes everything already overdue)
+            end: End of the range (inclusive)
+            asset_type_id: Filter by the plan's asset type ID
+            maintenance_plan_id: Filter by maintenance plan ID
+            include_scheduled: Include pairs that already have an open event
+            limit: Maximum number of results to return (None for all)
+
+        Returns:
+            List of due-work dictionaries, soonest first
+        """
+        condition = MaintenanceDueIndex.next_due_date <= end
+        if start is not None:
+            condition = and_(condition, MaintenanceDueIndex.next_due_date >= start)
+        return MaintenanceDueService._fetch(
+            condition, asset_type_id, maintenance_plan_id, include_scheduled, limit
+        )
+
+    @staticmethod
+    def get_due_within_meter(
+        units: float,
+        asset_type_id: Optional[int] = None,
+        maintenance_plan_id: Optional[int] = None,
+        include_scheduled: bool = True,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get meter-based pairs within some meter units of their next due meter value.
+
+        Args:
+            units: Remaining meter units (0 or less means already past due)
+            asset_type_id: Filter by the plan's asset type ID
+            maintenance_plan_id: Filter by maintenance plan ID
+            include_scheduled: Include pairs that already have an open event
+            limit: Maximum number of results to return (None for all)
+
+        Returns:
+            List of due-work dictionaries, soonest first
+        """
+        return MaintenanceDueService._fetch(
+            MaintenanceDueService._meter_remaining <= units,
+            asset_type_id, maintenance_plan_id, include_scheduled, limit
+        )
+
+    @staticmethod
+    def get_due_work(
+        days: int = 14,
+        meter_units: Optional[float] = None,
+        asset_type_id: Optional[int] = None,
+        maintenance_plan_id: Optional[int] = None,
+        include_scheduled: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get everything due now or within a horizon: pairs the planner found due,
+        due dates within the next days, and meter values within meter_units.
+
+        Args:
+            days: Date horizon in days from now
+            meter_units: Meter horizon in units (None: only meters already past due)
+            asset_type_id: Filter by the plan's asset type ID
+            maintenance_plan_id: Filter by maintenance plan ID
+            include_scheduled: Include pairs that already have an open event
+            limit: Maximum number of results to return (None for all)
+
+        Returns:
+            List of due-work dictionaries, soonest first
+        """
+        return MaintenanceDueService._fetch(
+            MaintenanceDueService._due_condition(datetime.utcnow() + timedelta(days=days), meter_units or 0),
+            asset_type_id, maintenance_plan_id, include_scheduled, limit
+        )
+
+    @staticmethod
+    def count_assets_due(days: int = 14, meter_units: Optional[float] = None) -> int:
+        """
+        Count assets with unscheduled work due now or within the horizon.
+
+        Args:
+            days: Date horizon in days from now
+            meter_units: Meter horizon in units (None: only meters already past due)
+
+        Returns:
+            Number of distinct assets
+        """
+        condition = MaintenanceDueService._due_condition(datetime.utcnow() + timedelta(days=days), meter_units or 0)
+        query = MaintenanceDueService._base_query(
+            select(func.count(func.distinct(MaintenanceDueIndex.asset_id))), condition, include_scheduled=False
+        )
+        return db.session.execute(query).scalar() or 0
+
+    @staticmethod
+    def count_overdue() -> int:
+        """
+        Count unscheduled (asset, plan) pairs that are due now.
+
+        Returns:
+            Number of overdue pairs
+        """
+        condition = MaintenanceDueService._due_condition(datetime.utcnow(), 0)
+        query = MaintenanceDueService._base_query(select(func.count()), condition, include_scheduled=False)
+        return db.session.execute(query).scalar() or 0
+
+    @staticmethod
+    def _due_condition(until: datetime, meter_units: float):
+        """Due by the planner, by date before until, or by meter within meter_units"""
+        return or_(
+            MaintenanceDueIndex.needs_maintenance.is_(True),
+            MaintenanceDueIndex.next_due_date <= until,
+            MaintenanceDueService._meter_remaining <= meter_units
+        )
+
+    @staticmethod
+    def _base_query(
+        query,
+        condition,
+        asset_type_id: Optional[int] = None,
+        maintenance_plan_id: Optional[int] = None,
+        include_scheduled: bool = True
+    ):
+        """Join the index to assets and active plans and apply the filters"""
+        query = (
+            query.select_from(MaintenanceDueIndex)
+            .join(Asset, Asset.id == MaintenanceDueIndex.asset_id)
+            .join(MaintenancePlan, MaintenancePlan.id == MaintenanceDueIndex.maintenance_plan_id)
+            .where(MaintenancePlan.status == 'Active', condition)
+        )
+        if asset_type_id:
+            query = query.where(MaintenancePlan.asset_type_id == asset_type_id)
+        if maintenance_plan_id:
+            query = query.where(MaintenanceDueIndex.maintenance_plan_id == maintenance_plan_id)
+        if not include_scheduled:
+            query = query.where(~MaintenanceDueService._has_open_event)
+        return query
+
+    @staticmethod
+    def _fetch(
+        condition,
+        asset_type_id: Optional[int],
+        maintenance_plan_id: Optional[int],
+        include_scheduled: bool,
+        limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Run a due-work query and format its rows"""
+        meter_remaining = MaintenanceDueService._meter_remaining
+        query = MaintenanceDueService._base_query(
+            select(
+                MaintenanceDueIndex,
+                Asset.name,
+                MaintenancePlan.name,
+                MaintenanceDueService._current_meter,
+                MaintenanceDueService._has_open_event
+            ),
+            condition, asset_type_id, maintenance_plan_id, include_scheduled
+        ).order_by(
+            MaintenanceDueIndex.next_due_date.is_(None),
+            MaintenanceDueIndex.next_due_date,
+            meter_remaining.is_(None),
+            meter_remaining,
+            MaintenanceDueIndex.id
+        )
+        if limit:
+            query = query.limit(limit)
+
+        now = datetime.utcnow()
+        result = []
+        for row, asset_name, plan_name, current_meter, has_open_event in db.session.execute(query):
+            result.append({
+                'asset_id': row.asset_id,
+                'asset_name': asset_name,
+                'maintenance_plan_id': row.maintenance_plan_id,
+                'plan_name': plan_name,
+                'needs_maintenance': row.needs_maintenance,
+                'next_due_date': row.next_due_date,
+                'days_remaining': (row.next_due_date - now).days if row.next_due_date else None,
+                'meter_field': row.meter_field,
+                'current_meter': current_meter,
+                'next_due_meter': row.next_due_meter,
+                'meter_remaining': (
+                    row.next_due_meter - current_meter
+                    if row.next_due_meter is not None and current_meter is not None else None
+                ),
+                'last_completed_at': row.last_completed_at,
+                'has_open_event': bool(has_open_event),
+                'evaluated_at': row.evaluated_at,
+            })
+        return result
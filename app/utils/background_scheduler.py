@@ -0,0 +1,395 @@
+"""
+Background Scheduler
+In-process job scheduler, started by the web server (app.py) with init_scheduler.
+
+- Jobs are declared in the SCHEDULER_JOBS setting: a name, the dotted path
+  of a callable ('package.module:function' or 'package.module:Class.method')
+  and either a 5-field cron expression (minute hour day month weekday, UTC)
+  or an interval in seconds
+- A daemon thread wakes up every SCHEDULER_TICK_SECONDS and hands due jobs
+  to a thread pool of SCHEDULER_WORKERS threads; a job never overlaps
+  itself
+- Only one process runs scheduled jobs: the one holding an exclusive lock
+  on SCHEDULER_LOCK_FILE. The other worker processes retry the lock on
+  every tick, so another one takes over when the leader exits
+- Every run is recorded in ScheduledJobRun with its duration, the summary
+  the callable returned, or the error it raised. Runs older than
+  SCHEDULER_HISTORY_DAYS are pruned
+
+Jobs run inside an app context, with their own database session. Disable
+with SCHEDULER_ENABLED=0 or app.py --no-scheduler. Manual runs (run_now)
+need the lock too, so they never overlap a run of the leader process.
+"""
+
+import importlib
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from app.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows: every scheduler process considers itself the leader
+    fcntl = None
+
+logger = get_logger("asset_management.utils.background_scheduler")
+
+
+class CronSchedule:
+    """
+    5-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept '*', numbers, ranges 'a-b', steps '*/n' and 'a-b/n', and
+    comma-separated lists. Day of week runs 0-6 from Sunday (7 is Sunday
+    too). As in cron, when both day fields are restricted a day matching
+    either one matches.
+    """
+
+    FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.FIELD_RANGES)
+        )
+        # 7 is Sunday as well
+        self.weekdays = {weekday % 7 for weekday in self.weekdays}
+        self._days_restricted = fields[2] != '*'
+        self._weekdays_restricted = fields[4] != '*'
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute after moment"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + candidate.month // 12
+                candidate = candidate.replace(year=year, month=candidate.month % 12 + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+    def describe(self) -> str:
+        return f"cron {self.expression}"
+
+    def _day_matches(self, candidate: datetime) -> bool:
+        day_match = candidate.day in self.days
+        weekday_match = (candidate.weekday() + 1) % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> set:
+        values = set()
+        for part in field.split(','):
+            range_part, _, step = part.partition('/')
+            if range_part == '*':
+                start, end = low, high
+            elif '-' in range_part:
+                start, end = (int(value) for value in range_part.split('-', 1))
+            else:
+                start = end = int(range_part)
+            step = int(step) if step else 1
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Invalid cron field '{field}' (allowed {low}-{high})")
+            values.update(range(start, end + 1, step))
+        return values
+
+
+class IntervalSchedule:
+    """Fixed interval in seconds"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def describe(self) -> str:
+        return f"every {self.seconds:g} s"
+
+
+class ScheduledJob:
+    """A configured job and its in-memory scheduling state"""
+
+    def __init__(self, name: str, func_path: str, schedule, description: str = ''):
+        self.name = name
+        self.func_path = func_path
+        self.schedule = schedule
+        self.description = description
+        self.next_run_at: Optional[datetime] = None
+        self.running = False
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'ScheduledJob':
+        """
+        Build a job from a SCHEDULER_JOBS entry.
+
+        Args:
+            config: Dict with 'name', 'func' and either 'cron' or 'interval'
+                (seconds), optionally 'description'
+        """
+        if config.get('cron'):
+            schedule = CronSchedule(config['cron'])
+        elif config.get('interval'):
+            schedule = IntervalSchedule(float(config['interval']))
+        else:
+            raise ValueError(f"Job '{config.get('name')}' needs a 'cron' or 'interval' schedule")
+        return cls(config['name'], config['func'], schedule, config.get('description', ''))
+
+    def resolve(self) -> Callable:
+        """Import the job's callable"""
+        module_path, _, attribute_path = self.func_path.partition(':')
+        target = importlib.import_module(module_path)
+        for attribute in attribute_path.split('.'):
+            target = getattr(target, attribute)
+        return target
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'func': self.func_path,
+            'schedule': self.schedule.describe(),
+            'description': self.description,
+            'next_run_at': self.next_run_at,
+            'running': self.running,
+        }
+
+
+class BackgroundScheduler:
+    """
+    Runs configured jobs on a thread pool in the leader process.
+
+    Usage:
+        scheduler = BackgroundScheduler(app, jobs)
+        scheduler.start()
+        scheduler.run_now('maintenance_planning')
+        scheduler.shutdown()
+    """
+
+    def __init__(
+        self,
+        app,
+        jobs: List[ScheduledJob],
+        workers: int = 2,
+        lock_path: Optional[str] = None,
+        tick_seconds: float = 5.0,
+        history_days: int = 30
+    ):
+        self.app = app
+        self.jobs = {job.name: job for job in jobs}
+        self.tick_seconds = tick_seconds
+        self.history_days = history_days
+        self.lock_path = lock_path
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scheduler-job')
+        self._state_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_file = None
+        self._leader = False
+
+    @property
+    def is_leader(self) -> bool:
+        """True when this process holds the scheduler lock"""
+        return self._leader
+
+    def start(self) -> None:
+        """Start the scheduling thread"""
+        if self._thread is not None:
+            return
+        now = datetime.utcnow()
+        for job in self.jobs.values():
+            job.next_run_at = job.schedule.next_after(now)
+        self._thread = threading.Thread(target=self._loop, name='scheduler', daemon=True)
+        self._thread.start()
+        logger.info(f"Background scheduler started with {len(self.jobs)} jobs ({self.worker})")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop scheduling, finish running jobs and release the leader lock"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.tick_seconds + 1)
+            self._thread = None
+        self._executor.shutdown(wait=wait)
+        self._release_lock()
+
+    def run_now(self, name: str) -> bool:
+        """
+        Run a job immediately on the pool, in this process.
+
+        Returns:
+            False if the job is unknown or already running, or another
+            process holds the scheduler lock
+        """
+        job = self.jobs.get(name)
+        if job is None:
+            return False
+        with self._state_lock:
+            leader = self.is_leader or self._acquire_lock()
+        if not leader or not self._claim(job):
+            return False
+        self._executor.submit(self._run_job, job, 'manual')
+        return True
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self._state_lock:
+                    leader = self.is_leader or self._acquire_lock()
+                if leader:
+                    self._submit_due_jobs(datetime.utcnow())
+            except Exception as e:
+                logger.error(f"Background scheduler tick failed: {e}")
+            self._stop.wait(self.tick_seconds)
+
+    def _submit_due_jobs(self, now: datetime) -> None:
+        for job in self.jobs.values():
+            if job.next_run_at is None or job.next_run_at > now:
+                continue
+            job.next_run_at = job.schedule.next_after(now)
+            if not self._claim(job):
+                logger.warning(f"Skipping scheduled run of '{job.name}': previous run still in progress")
+                continue
+            self._executor.submit(self._run_job, job, 'schedule')
+
+    def _claim(self, job: ScheduledJob) -> bool:
+        """Mark a job running unless it already is"""
+        with self._state_lock:
+            if job.running:
+                return False
+            job.running = True
+            return True
+
+    def _run_job(self, job: ScheduledJob, trigger: str) -> None:
+        """Run a job in an app context and record the run"""
+        from app import db
+        from app.data.core.scheduled_job_runs import ScheduledJobRun
+
+        try:
+            with self.app.app_context():
+                run_id = None
+                try:
+                    run = ScheduledJobRun(job_name=job.name, trigger=trigger, status='Running', worker=self.worker)
+                    db.session.add(run)
+                    db.session.commit()
+                    run_id = run.id
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Could not record start of job '{job.name}': {e}")
+
+                started = time.perf_counter()
+                status, result, error = 'Succeeded', None, None
+                try:
+                    summary = job.resolve()()
+                    result = None if summary is None else str(summary)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    status, error = 'Failed', f"{e}\n{traceback.format_exc()}"
+                    logger.error(f"Scheduled job '{job.name}' failed: {e}")
+                duration_ms = (time.perf_counter() - started) * 1000
+
+                try:
+                    run = db.session.get(ScheduledJobRun, run_id) if run_id else None
+                    if run is None:
+                        run = ScheduledJobRun(job_name=job.name, trigger=trigger, worker=self.worker)
+                        db.session.add(run)
+                    run.status = status
+                    run.finished_at = datetime.utcnow()
+                    run.duration_ms = duration_ms
+                    run.result = result
+                    run.error = error
+                    cutoff = datetime.utcnow() - timedelta(days=self.history_days)
+                    ScheduledJobRun.query.filter(ScheduledJobRun.started_at < cutoff).delete(synchronize_session=False)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Could not record end of job '{job.name}': {e}")
+                logger.info(f"Scheduled job '{job.name}' {status.lower()} in {duration_ms:.0f} ms")
+        finally:
+            with self._state_lock:
+                job.running = False
+
+    def _acquire_lock(self) -> bool:
+        """Try to become the leader (non-blocking)"""
+        if fcntl is None or not self.lock_path:
+            self._leader = True
+            return True
+        lock_file = open(self.lock_path, 'a+')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(self.worker)
+        lock_file.flush()
+        self._lock_file = lock_file
+        self._leader = True
+        logger.info(f"Background scheduler leader: {self.worker}")
+        return True
+
+    def _release_lock(self) -> None:
+        if self._lock_file is not None:
+            try:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            finally:
+                self._lock_file.close()
+        self._lock_file = None
+        self._leader = False
+
+
+def init_scheduler(app) -> Optional[BackgroundScheduler]:
+    """
+    Create and start the app's scheduler from its SCHEDULER_* settings.
+
+    The scheduler is stored in app.extensions['scheduler']; calling this
+    again for the same app returns the running one. A job whose
+    configuration is invalid is logged and left out.
+
+    Returns:
+        The started BackgroundScheduler, or None when there are no valid jobs
+    """
+    if 'scheduler' in app.extensions:
+        return app.extensions['scheduler']
+    jobs = []
+    for config in app.config.get('SCHEDULER_JOBS', []):
+        try:
+            jobs.append(ScheduledJob.from_config(config))
+        except (KeyError, ValueError) as e:
+            logger.error(f"Invalid scheduler job {config.get('name')!r}: {e}")
+    if not jobs:
+        return None
+
+    scheduler = BackgroundScheduler(
+        app,
+        jobs,
+        workers=app.config['SCHEDULER_WORKERS'],
+        lock_path=app.config['SCHEDULER_LOCK_FILE'],
+        tick_seconds=app.config['SCHEDULER_TICK_SECONDS'],
+        history_days=app.config['SCHEDULER_HISTORY_DAYS']
+    )
+    app.extensions['scheduler'] = scheduler
+    scheduler.start()
+    return scheduler
@@ -0,0 +1,153 @@
+"""
+Commit Invalidation
+Calls a cache's invalidate callback after a transaction that wrote one of
+the cache's models commits.
+
+- Mapper hooks (after_insert / after_update / after_delete) flag the
+  flushing session; ORM bulk statements (session.execute(insert(Model)),
+  update(Model), delete(Model), including executemany by primary key) flag
+  it from do_orm_execute
+- after_commit runs the callbacks of the flagged registrations; a rollback
+  out of the transaction drops the flags, so rolled-back writes never
+  invalidate
+- Updates can be limited to columns of a model: ORM updates only count when
+  one of them changed, bulk updates when they set one of them
+
+Core statements on Model.__table__ and raw SQL are not seen: code writing
+that way calls mark_written itself. Other worker processes are not seen
+either; the caches using this keep a TTL for those.
+
+Usage:
+    register((MaintenanceBlocker,), AvailabilityService.invalidate)
+    mark_written(db.session, Asset, ['mission_capability_status'])
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+
+class _Registration:
+    """Models watched for one cache and the callback that invalidates it"""
+
+    def __init__(self, models: Sequence[type], callback: Callable[[], None], update_columns: Dict[type, Sequence[str]]):
+        self.models = tuple(models)
+        self.callback = callback
+        self.update_columns = update_columns
+        # Session.info key set during flush and consumed on commit
+        self.flag = f"commit_invalidation:{callback.__module__}.{getattr(callback, '__qualname__', callback)}"
+
+    def watched_columns(self, cls: type) -> Optional[Sequence[str]]:
+        """Columns whose updates count for a model class (None: every update)"""
+        for model, columns in self.update_columns.items():
+            if issubclass(cls, model):
+                return columns
+        return None
+
+    def mark(self, session: Optional[Session]) -> None:
+        if session is not None:
+            session.info[self.flag] = True
+
+    def after_insert_or_delete(self, mapper, connection, target) -> None:
+        self.mark(object_session(target))
+
+    def after_update(self, mapper, connection, target) -> None:
+        columns = self.watched_columns(type(target))
+        if columns is not None:
+            state = inspect(target)
+            if not any(state.attrs[column].history.has_changes() for column in columns):
+                return
+        self.mark(object_session(target))
+
+
+_registrations: List[_Registration] = []
+
+
+def register(
+    models: Iterable[type],
+    callback: Callable[[], None],
+    update_columns: Optional[Dict[type, Sequence[str]]] = None
+) -> None:
+    """
+    Invalidate a cache when a transaction writing any of models commits.
+
+    Args:
+        models: Mapped classes the cache is built from (subclasses included)
+        callback: Called without arguments after such a commit
+        update_columns: Per model, the only columns whose updates count
+            (default: any update)
+    """
+    registration = _Registration(list(models), callback, update_columns or {})
+    for model in registration.models:
+        event.listen(model, 'after_insert', registration.after_insert_or_delete)
+        event.listen(model, 'after_delete', registration.after_insert_or_delete)
+        event.listen(model, 'after_update', registration.after_update)
+    _registrations.append(registration)
+
+
+def mark_written(session: Session, model: type, columns: Optional[Iterable[str]] = None) -> None:
+    """
+    Flag a session for a write the hooks cannot see (Core statements).
+
+    Args:
+        session: Session whose transaction made the write
+        model: Mapped class of the written table
+        columns: Columns an UPDATE set (default: a row insert or delete)
+    """
+    columns = None if columns is None else set(columns)
+    for registration in _registrations:
+        if not issubclass(model, registration.models):
+            continue
+        watched = registration.watched_columns(model)
+        if columns is not None and watched is not None and not columns.intersection(watched):
+            continue
+        registration.mark(session)
+
+
+def _bulk_update_keys(orm_execute_state) -> set:
+    """Attribute names a bulk UPDATE sets, from .values() and the parameters"""
+    keys = set()
+    for key in (getattr(orm_execute_state.statement, '_values', None) or {}):
+        keys.add(getattr(key, 'key', key))
+    parameters = orm_execute_state.parameters
+    if isinstance(parameters, dict):
+        parameters = [parameters]
+    for row in parameters or ():
+        keys.update(row)
+    return keys
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_session_dirty_on_bulk_write(orm_execute_state):
+    """ORM bulk insert/update/delete statements skip the mapper hooks"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    update_keys = None
+    for registration in _registrations:
+        if not issubclass(mapper.class_, registration.models):
+            continue
+        columns = registration.watched_columns(mapper.class_) if orm_execute_state.is_update else None
+        if columns is not None:
+            if update_keys is None:
+                update_keys = _bulk_update_keys(orm_execute_state)
+            if not update_keys.intersection(columns):
+                continue
+        registration.mark(orm_execute_state.session)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    for registration in _registrations:
+        if session.info.pop(registration.flag, False):
+            registration.callback()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_flags(session, previous_transaction):
+    if not session.in_transaction():
+        for registration in _registrations:
+            session.info.pop(registration.flag, None)
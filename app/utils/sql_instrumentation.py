@@ -0,0 +1,267 @@
+"""
+SQL Instrumentation
+Opt-in per-request SQL profiling attached to the SQLAlchemy engine.
+
+For every request it records:
+- query count and total database time
+- repeated statement shapes (same SQL text, any parameters)
+- likely N+1 patterns: the same statement run more than SQL_N_PLUS_ONE_THRESHOLD
+  times with different parameters
+- slow statements (over SQL_SLOW_QUERY_MS) together with their EXPLAIN QUERY PLAN
+
+Finished request profiles are kept in a bounded in-memory history that the
+admin SQL profiler page reads. Enable with SQL_INSTRUMENTATION=1.
+"""
+
+import itertools
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from app.logger import get_logger
+
+logger = get_logger("asset_management.utils.sql_instrumentation")
+
+# Cap on distinct parameter sets remembered per statement shape
+_MAX_TRACKED_PARAMETER_SETS = 200
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class StatementStats:
+    """Aggregated timings for one statement shape within a request"""
+
+    def __init__(self, statement):
+        self.statement = statement
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self._parameter_sets = set()
+
+    def record(self, parameters, elapsed):
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        if len(self._parameter_sets) < _MAX_TRACKED_PARAMETER_SETS:
+            self._parameter_sets.add(repr(parameters))
+
+    @property
+    def distinct_parameter_sets(self):
+        return len(self._parameter_sets)
+
+    def to_dict(self):
+        return {
+            'statement': self.statement,
+            'count': self.count,
+            'distinct_parameter_sets': self.distinct_parameter_sets,
+            'total_ms': round(self.total_time * 1000, 2),
+            'max_ms': round(self.max_time * 1000, 2),
+        }
+
+
+class RequestProfile:
+    """SQL activity collected for a single HTTP request"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method, path, endpoint):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.started_at = datetime.utcnow()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.request_time = 0.0
+        self.status_code = None
+        self.statements = {}
+        self.slow_queries = []
+        self._start = time.perf_counter()
+
+    def record(self, statement, parameters, elapsed):
+        """Record one executed statement"""
+        shape = normalize_statement(statement)
+        stats = self.statements.get(shape)
+        if stats is None:
+            stats = self.statements[shape] = StatementStats(shape)
+        stats.record(parameters, elapsed)
+        self.query_count += 1
+        self.db_time += elapsed
+
+    def finish(self, status_code=None):
+        self.request_time = time.perf_counter() - self._start
+        self.status_code = status_code
+
+    def repeated_statements(self):
+        """Statement shapes executed more than once, most frequent first"""
+        repeated = [s for s in self.statements.values() if s.count > 1]
+        return sorted(repeated, key=lambda s: (s.count, s.total_time), reverse=True)
+
+    def n_plus_one_suspects(self, threshold):
+        """Shapes run more than threshold times with differing parameters"""
+        return [
+            s for s in self.repeated_statements()
+            if s.count > threshold and s.distinct_parameter_sets > 1
+        ]
+
+    def to_dict(self, threshold):
+        return {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'endpoint': self.endpoint,
+            'started_at': self.started_at,
+            'status_code': self.status_code,
+            'query_count': self.query_count,
+            'db_ms': round(self.db_time * 1000, 2),
+            'request_ms': round(self.request_time * 1000, 2),
+            'repeated_statements': [s.to_dict() for s in self.repeated_statements()],
+            'n_plus_one': [s.to_dict() for s in self.n_plus_one_suspects(threshold)],
+            'slow_queries': self.slow_queries,
+        }
+
+
+class ProfileHistory:
+    """Thread-safe bounded history of finished request profiles"""
+
+    def __init__(self, max_size=50):
+        self._profiles = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.appendleft(profile)
+
+    def all(self):
+        with self._lock:
+            return list(self._profiles)
+
+    def get(self, profile_id):
+        with self._lock:
+            for profile in self._profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+    def resize(self, max_size):
+        with self._lock:
+            self._profiles = deque(self._profiles, maxlen=max_size)
+
+
+# Module-level history read by the admin SQL profiler page
+profile_history = ProfileHistory()
+
+
+def normalize_statement(statement):
+    """Collapse whitespace so identical statements share one shape"""
+    return _WHITESPACE_RE.sub(' ', statement).strip()
+
+
+def explain_query_plan(dbapi_connection, statement, parameters):
+    """
+    Run EXPLAIN QUERY PLAN for a statement on the raw DBAPI connection
+
+    Uses the raw connection so the explain itself is not instrumented.
+
+    Returns:
+        list: Plan detail lines, or an empty list if the plan is unavailable
+    """
+    if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return []
+    try:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            return [row[-1] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as e:
+        logger.debug(f"EXPLAIN QUERY PLAN failed: {e}")
+        return []
+
+
+def init_sql_instrumentation(app, engine):
+    """
+    Attach SQL instrumentation to an engine and the app's request lifecycle
+
+    Args:
+        app: Flask application (reads SQL_* config keys)
+        engine: SQLAlchemy engine to instrument
+    """
+    threshold = app.config['SQL_N_PLUS_ONE_THRESHOLD']
+    slow_seconds = app.config['SQL_SLOW_QUERY_MS'] / 1000.0
+    explain_enabled = engine.dialect.name == 'sqlite'
+    profile_history.resize(app.config['SQL_PROFILE_HISTORY'])
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('sql_instrumentation_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['sql_instrumentation_start'].pop()
+        if not has_request_context():
+            return
+        profile = g.get('sql_profile')
+        if profile is None:
+            return
+
+        profile.record(statement, parameters, elapsed)
+
+        if elapsed >= slow_seconds:
+            explain_parameters = parameters[0] if executemany and parameters else parameters
+            plan = explain_query_plan(cursor.connection, statement, explain_parameters) if explain_enabled else []
+            profile.slow_queries.append({
+                'statement': normalize_statement(statement),
+                'parameters': repr(explain_parameters),
+                'ms': round(elapsed * 1000, 2),
+                'plan': plan,
+            })
+            logger.warning(
+                f"Slow SQL ({elapsed * 1000:.1f} ms) on {profile.method} {profile.path}: "
+                f"{normalize_statement(statement)[:500]} | plan: {'; '.join(plan) or 'n/a'}"
+            )
+
+    @app.before_request
+    def _start_sql_profile():
+        if request.endpoint == 'static':
+            return
+        g.sql_profile = RequestProfile(request.method, request.path, request.endpoint)
+
+    @app.after_request
+    def _record_status_code(response):
+        profile = g.get('sql_profile')
+        if profile is not None:
+            profile.status_code = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_sql_profile(exc):
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return
+        profile.finish(profile.status_code if exc is None else 500)
+        profile_history.add(profile)
+
+        for stats in profile.n_plus_one_suspects(threshold):
+            logger.warning(
+                f"Possible N+1 on {profile.method} {profile.path}: statement ran {stats.count} times "
+                f"with {stats.distinct_parameter_sets} parameter sets: {stats.statement[:500]}"
+            )
+        logger.debug(
+            f"SQL profile {profile.method} {profile.path}: {profile.query_count} queries, "
+            f"{profile.db_time * 1000:.1f} ms in database"
+        )
+
+    logger.info(
+        f"SQL instrumentation enabled (N+1 threshold {threshold}, slow query {app.config['SQL_SLOW_QUERY_MS']} ms)"
+    )